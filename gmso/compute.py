@@ -0,0 +1,179 @@
+"""Energies and forces of the bonded interactions of a topology"""
+import numpy as np
+import unyt as u
+
+from gmso.utils.conversions import _dihedral_form
+from gmso.utils.expression import _lambdified_expression
+from gmso.utils.parameter_table import ParameterTable, _stack_quantities
+from gmso.utils.units import UnitSystem
+from gmso.exceptions import GMSOError
+
+__all__ = ['bonded_energy', 'forces']
+
+# The expressions are evaluated in a consistent unit system, with angles in radians
+_EVALUATION_UNITS = UnitSystem('evaluation',
+                               length=u.nm,
+                               mass=u.Unit('amu'),
+                               time=u.ps,
+                               energy=u.Unit('kJ/mol'),
+                               angle=u.radian)
+
+# Dihedral forms whose angle is not the IUPAC dihedral angle (cis = 0), but
+# is offset by pi (trans = 0), see gmso.utils.conversions
+_DIHEDRAL_ANGLE_OFFSETS = {
+    'RyckaertBellemansTorsionPotential': np.pi
+}
+
+# Lower bound of the denominators of the gradients of linear angles and
+# collinear dihedrals, whose numerators vanish with them
+_EPSILON = 1e-12
+
+
+def _bond_geometry(xyz, members):
+    """Return the lengths of bonds and their gradients with respect to the members"""
+    d = xyz[members[:, 0]] - xyz[members[:, 1]]
+    r = np.linalg.norm(d, axis=1)
+    grad_i = d / r[:, np.newaxis]
+    return r, (grad_i, -grad_i)
+
+
+def _angle_geometry(xyz, members):
+    """Return the values of angles (in radians) and their gradients with respect to the members"""
+    a = xyz[members[:, 0]] - xyz[members[:, 1]]
+    b = xyz[members[:, 2]] - xyz[members[:, 1]]
+    a_norm = np.linalg.norm(a, axis=1)[:, np.newaxis]
+    b_norm = np.linalg.norm(b, axis=1)[:, np.newaxis]
+    a_hat, b_hat = a / a_norm, b / b_norm
+    cos_theta = np.clip(np.sum(a_hat * b_hat, axis=1), -1.0, 1.0)[:, np.newaxis]
+    sin_theta = np.maximum(np.sqrt(1.0 - cos_theta ** 2), _EPSILON)
+    grad_i = (cos_theta * a_hat - b_hat) / (a_norm * sin_theta)
+    grad_k = (cos_theta * b_hat - a_hat) / (b_norm * sin_theta)
+    return np.arccos(cos_theta[:, 0]), (grad_i, -grad_i - grad_k, grad_k)
+
+
+def _dihedral_geometry(xyz, members):
+    """Return the values of dihedrals (IUPAC, in radians) and their gradients with respect to the members"""
+    b1 = xyz[members[:, 1]] - xyz[members[:, 0]]
+    b2 = xyz[members[:, 2]] - xyz[members[:, 1]]
+    b3 = xyz[members[:, 3]] - xyz[members[:, 2]]
+    m = np.cross(b1, b2)
+    n = np.cross(b2, b3)
+    b2_norm = np.linalg.norm(b2, axis=1)[:, np.newaxis]
+    phi = np.arctan2(np.sum(np.cross(m, n) * b2, axis=1) / b2_norm[:, 0],
+                     np.sum(m * n, axis=1))
+
+    grad_i = -b2_norm * m / np.maximum(np.sum(m * m, axis=1), _EPSILON)[:, np.newaxis]
+    grad_l = b2_norm * n / np.maximum(np.sum(n * n, axis=1), _EPSILON)[:, np.newaxis]
+    p = (-np.sum(b1 * b2, axis=1) / b2_norm[:, 0] ** 2)[:, np.newaxis]
+    q = (-np.sum(b3 * b2, axis=1) / b2_norm[:, 0] ** 2)[:, np.newaxis]
+    grad_j = (p - 1.0) * grad_i - q * grad_l
+    grad_k = (q - 1.0) * grad_l - p * grad_i
+    return phi, (grad_i, grad_j, grad_k, grad_l)
+
+
+_GEOMETRIES = (
+    ('bonds', _bond_geometry),
+    ('angles', _angle_geometry),
+    ('dihedrals', _dihedral_geometry),
+    ('impropers', _dihedral_geometry)
+)
+
+
+def _bonded_terms(top):
+    """Evaluate every parametrized bonded interaction of a topology, grouped by expression
+
+    Yields the member indices of the interactions, the gradients of their
+    variable with respect to the members, their energies and the derivatives
+    of the energies with respect to their variable, in the evaluation units.
+    """
+    site_index = {id(site): idx for idx, site in enumerate(top.sites)}
+    xyz = _EVALUATION_UNITS.in_system(_stack_quantities([site.position for site in top.sites]))
+
+    for attribute, geometry in _GEOMETRIES:
+        groups = {}
+        for connection in getattr(top, attribute):
+            if connection.connection_type is not None:
+                groups.setdefault(connection.connection_type.expression, []).append(connection)
+
+        for expression, connections in groups.items():
+            # One table row per unique connection type of the group
+            rows = {}
+            for connection in connections:
+                rows.setdefault(id(connection.connection_type), (len(rows), connection.connection_type))
+            table = ParameterTable(connection_type for _, connection_type in rows.values())
+            if len(table.independent_variables) != 1:
+                raise GMSOError('Only potentials with a single independent variable can be evaluated, '
+                                'found {}'.format(table.independent_variables))
+            variable = next(iter(table.independent_variables))
+            parameter_names = tuple(table.parameters.keys())
+            parameters = table.in_units(_EVALUATION_UNITS)
+            if any(parameters[name].ndim > 1 for name in parameter_names):
+                raise GMSOError('Potentials with list parameters cannot be evaluated')
+
+            members = np.array([[site_index[id(member)] for member in connection.connection_members]
+                                for connection in connections])
+            type_rows = np.array([rows[id(connection.connection_type)][0] for connection in connections])
+            values, gradients = geometry(xyz, members)
+            if geometry is _dihedral_geometry:
+                values = values - _DIHEDRAL_ANGLE_OFFSETS.get(_dihedral_form(table), 0.0)
+
+            args = [values] + [parameters[name].value[type_rows] for name in parameter_names]
+            energy = _lambdified_expression(expression, (variable,), parameter_names)
+            derivative = _lambdified_expression(expression, (variable,), parameter_names,
+                                                derivative=variable)
+            shape = (len(connections),)
+            yield (members,
+                   gradients,
+                   np.broadcast_to(energy(*args), shape),
+                   np.broadcast_to(derivative(*args), shape))
+
+
+def bonded_energy(top):
+    """Compute the total energy of the bonded interactions of a topology
+
+    Parameters
+    ----------
+    top : gmso.Topology
+        The topology, whose bonds, angles, dihedrals and impropers without
+        a connection type are ignored
+
+    Returns
+    -------
+    unyt.unyt_quantity
+        The sum of the energies of the bonds, angles, dihedrals and impropers
+    """
+    total = 0.0
+    if top.n_sites > 0:
+        for _, _, energies, _ in _bonded_terms(top):
+            total += float(np.sum(energies))
+    return total * u.Unit('kJ/mol')
+
+
+def forces(top):
+    """Compute the force on every site of a topology due to its bonded interactions
+
+    The derivatives of the potentials with respect to their independent
+    variable (bond length, angle or dihedral angle) are derived and
+    lambdified once per unique expression, see
+    `gmso.ParametricPotential.compile_gradient`, and evaluated for all the
+    interactions with that expression at once. They are combined with the
+    analytic derivatives of the geometry with respect to the positions of
+    the members. Impropers are treated as dihedrals of their members in order.
+
+    Parameters
+    ----------
+    top : gmso.Topology
+        The topology, whose bonds, angles, dihedrals and impropers without
+        a connection type are ignored
+
+    Returns
+    -------
+    unyt.unyt_array
+        The N x 3 forces on the N sites of the topology
+    """
+    site_forces = np.zeros(shape=(top.n_sites, 3))
+    if top.n_sites > 0:
+        for members, gradients, _, derivatives in _bonded_terms(top):
+            for position, gradient in enumerate(gradients):
+                np.add.at(site_forces, members[:, position], -derivatives[:, np.newaxis] * gradient)
+    return u.unyt_array(site_forces, u.Unit('kJ/(mol*nm)'))
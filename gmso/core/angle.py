@@ -57,6 +57,18 @@ class Angle(Connection):
                 tuple(reversed(self.connection_members))
                 ])
 
+    def _equivalent_members(self):
+        """Return the connection members in a form which is equal for all equivalent connections
+
+        The returned object is hashable and is the same for
+        an angle and its equivalent, see `_equivalent_members_hash`.
+        """
+        return tuple([
+            self.connection_members[1],
+            frozenset([self.connection_members[0],
+                       self.connection_members[2]])
+            ])
+
     def _equivalent_members_hash(self):
         """Returns a unique hash representing the connection
         Returns
@@ -71,11 +83,7 @@ class Angle(Connection):
         Here, j is fixed and i and k are replaceable.
         """
 
-        return hash(tuple([
-            self.connection_members[1],
-            frozenset([self.connection_members[0],
-                       self.connection_members[2]])
-            ]))
+        return hash(self._equivalent_members())
 
     def __setattr__(self, key, value):
         if key == 'connection_type':
@@ -56,6 +56,15 @@ class Bond(Connection):
                 tuple(reversed(self.connection_members))
                 ])
 
+    def _equivalent_members(self):
+        """Return the connection members in a form which is equal for all equivalent connections
+
+        The returned object is hashable and is the same for
+        a bond and its equivalent, see `_equivalent_members_hash`.
+        """
+        return frozenset([self.connection_members[0],
+                          self.connection_members[1]])
+
     def _equivalent_members_hash(self):
         """Returns a unique hash representing the connection
         Returns
@@ -70,10 +79,7 @@ class Bond(Connection):
         Here, i and j are interchangeable.
         """
 
-        return hash(
-            frozenset([self.connection_members[0],
-                      self.connection_members[1]])
-            )
+        return hash(self._equivalent_members())
 
     def __setattr__(self, key, value):
         if key == 'connection_type':
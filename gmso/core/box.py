@@ -94,10 +94,22 @@ class Box(object):
 
     Methods
     -------
+    from_vectors(vectors)
+        Construct a `Box` from the vectors describing its shape.
     get_vectors()
         Output the vectors describing the shape of the `Box`.
     get_unit_vectors()
         Output the unit vectors describing the shape of the `Box`.
+    to_fractional(xyz)
+        Convert Cartesian positions to fractional coordinates of the `Box`.
+    from_fractional(fractional)
+        Convert fractional coordinates of the `Box` to Cartesian positions.
+    wrap(xyz, centered=False)
+        Wrap positions into the periodic `Box`.
+    minimum_image(dxyz)
+        Apply the minimum image convention to displacements.
+    make_molecules_whole(top)
+        Unwrap the molecules of a `Topology` split across the `Box`.
 
     """
 
@@ -106,6 +118,34 @@ class Box(object):
 
         self._lengths = _validate_lengths(lengths)
         self._angles = _validate_angles(angles)
+        self._matrices = None
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """Construct a `Box` from its vectors
+
+        Parameters
+        ----------
+        vectors : unyt.unyt_array or np.ndarray, shape(3, 3)
+            The vectors a, b and c of the box, as rows. Vectors without
+            units are assumed to be in nm
+
+        Returns
+        -------
+        gmso.Box
+            The box with the lengths and angles of the vectors
+        """
+        units = vectors.units if isinstance(vectors, u.unyt_array) else u.nm
+        vectors = np.asarray(vectors, dtype=float).reshape(3, 3)
+        lengths = np.linalg.norm(vectors, axis=1)
+
+        # alpha is the angle between b and c, beta between a and c, gamma between a and b
+        first, second = np.array([1, 0, 0]), np.array([2, 2, 1])
+        cosines = np.sum(vectors[first] * vectors[second], axis=1) / (lengths[first] * lengths[second])
+        if not cosines.any():
+            return cls(lengths=lengths * units)
+        angles = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0)))
+        return cls(lengths=lengths * units, angles=angles * u.degree)
 
     @property
     def lengths(self):
@@ -118,10 +158,12 @@ class Box(object):
     @lengths.setter
     def lengths(self, lengths):
         self._lengths = _validate_lengths(lengths)
+        self._matrices = None
 
     @angles.setter
     def angles(self, angles):
         self._angles = _validate_angles(angles)
+        self._matrices = None
 
     def _unit_vectors_from_angles(self):
         """From the `Box` parameters, return unit vectors describing prism."""
@@ -160,6 +202,138 @@ class Box(object):
         """ Return the normalized vectors of the box."""
         return self._unit_vectors_from_angles()
 
+    def _box_matrices(self):
+        """Return the box vectors (as rows, in nm) and their inverse, computed once per shape"""
+        if self._matrices is None:
+            matrix = np.asarray(self.get_vectors().to_value(u.nm), dtype=float)
+            self._matrices = (matrix, np.linalg.inv(matrix))
+        return self._matrices
+
+    def to_fractional(self, xyz):
+        """Convert Cartesian positions to fractional coordinates of the box
+
+        Parameters
+        ----------
+        xyz : unyt.unyt_array or np.ndarray
+            The N x 3 positions (or a single position). Positions without
+            units are assumed to be in nm
+
+        Returns
+        -------
+        np.ndarray
+            The coordinates of the positions in the basis of the box vectors,
+            which are in [0, 1) for positions inside the box
+        """
+        xyz = xyz.to_value(u.nm) if isinstance(xyz, u.unyt_array) else xyz
+        return np.asarray(xyz, dtype=float).dot(self._box_matrices()[1])
+
+    def from_fractional(self, fractional):
+        """Convert fractional coordinates of the box to Cartesian positions
+
+        Parameters
+        ----------
+        fractional : np.ndarray
+            The N x 3 coordinates (or a single coordinate) in the basis of the box vectors
+
+        Returns
+        -------
+        unyt.unyt_array
+            The positions, in nm
+        """
+        return u.unyt_array(np.asarray(fractional, dtype=float).dot(self._box_matrices()[0]), u.nm)
+
+    def wrap(self, xyz, centered=False):
+        """Wrap positions into the periodic box
+
+        Parameters
+        ----------
+        xyz : unyt.unyt_array or np.ndarray
+            The N x 3 positions (or a single position). Positions without
+            units are assumed to be in nm
+        centered : bool, optional, default=False
+            Wrap the positions into the box centered on the origin, i.e.
+            fractional coordinates in [-0.5, 0.5), instead of [0, 1)
+
+        Returns
+        -------
+        unyt.unyt_array or np.ndarray
+            The wrapped positions, in the units of `xyz` (nm without units)
+        """
+        fractional = self.to_fractional(xyz)
+        fractional -= np.floor(fractional + 0.5) if centered else np.floor(fractional)
+        return self._like(self.from_fractional(fractional), xyz)
+
+    def minimum_image(self, dxyz):
+        """Apply the minimum image convention to displacements
+
+        The displacements are reduced to the nearest periodic image in
+        fractional coordinates, which is exact for orthorhombic boxes and
+        for displacements shorter than half of the box in triclinic boxes.
+
+        Parameters
+        ----------
+        dxyz : unyt.unyt_array or np.ndarray
+            The N x 3 displacements (or a single displacement). Displacements
+            without units are assumed to be in nm
+
+        Returns
+        -------
+        unyt.unyt_array or np.ndarray
+            The displacements to the nearest images, in the units of `dxyz`
+            (nm without units)
+        """
+        fractional = self.to_fractional(dxyz)
+        fractional -= np.round(fractional)
+        return self._like(self.from_fractional(fractional), dxyz)
+
+    def make_molecules_whole(self, top):
+        """Unwrap the molecules of a topology split across the periodic box
+
+        The molecules (connected components of the bonds) are traversed
+        breadth first from their first site, one level of bonds at a time for
+        all the molecules at once, and every site is placed at the minimum
+        image of its bond to the site it was reached from. The first site of
+        each molecule keeps its position.
+
+        Parameters
+        ----------
+        top : gmso.Topology
+            The topology, which is not modified
+
+        Returns
+        -------
+        unyt.unyt_array
+            The N x 3 positions of the sites of the topology with whole molecules, in nm
+        """
+        from gmso.utils.connectivity import _member_indices, connected_components, neighbor_lists
+
+        xyz = np.asarray(top.positions.to_value(u.nm), dtype=float)
+        bonds = _member_indices(top, top.bonds)
+        indptr, indices = neighbor_lists(top.n_sites, bonds)
+        visited = np.zeros(top.n_sites, dtype=bool)
+        frontier = np.unique(connected_components(top.n_sites, bonds), return_index=True)[1]
+        visited[frontier] = True
+        while frontier.size > 0:
+            counts = indptr[frontier + 1] - indptr[frontier]
+            parents = np.repeat(frontier, counts)
+            starts = np.repeat(indptr[frontier] - np.cumsum(counts) + counts, counts)
+            children = indices[starts + np.arange(counts.sum())]
+            unvisited = ~visited[children]
+            # A site reached from several parents is placed relative to the first one
+            children, first = np.unique(children[unvisited], return_index=True)
+            parents = parents[unvisited][first]
+            xyz[children] = xyz[parents] + self.minimum_image(xyz[children] - xyz[parents])
+            visited[children] = True
+            frontier = children
+        return u.unyt_array(xyz, u.nm)
+
+    @staticmethod
+    def _like(xyz, reference):
+        """Return positions in nm in the units of a reference, or as floats if it has none"""
+        if isinstance(reference, u.unyt_array):
+            return xyz.to(reference.units)
+        return xyz.value
+
     def __repr__(self):
         return "Box(a={}, b={}, c={}, alpha={}, beta={}, gamma={})"\
             .format(*self._lengths, *self._angles)
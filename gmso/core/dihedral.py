@@ -61,6 +61,21 @@ class Dihedral(Connection):
                 tuple(reversed(self.connection_members))
                 ])
 
+    def _equivalent_members(self):
+        """Return the connection members in a form which is equal for all equivalent connections
+
+        The returned object is hashable and is the same for
+        a dihedral and its equivalent, see `_equivalent_members_hash`.
+        """
+        return frozenset([
+            frozenset([self.connection_members[0],
+                       self.connection_members[1]]),
+            frozenset([self.connection_members[1],
+                       self.connection_members[2]]),
+            frozenset([self.connection_members[2],
+                       self.connection_members[3]])
+            ])
+
     def _equivalent_members_hash(self):
         """Returns a unique hash representing the connection
         Returns
@@ -77,14 +92,7 @@ class Dihedral(Connection):
         one another.
         """
 
-        return hash(frozenset([
-            frozenset([self.connection_members[0],
-                       self.connection_members[1]]),
-            frozenset([self.connection_members[1],
-                       self.connection_members[2]]),
-            frozenset([self.connection_members[2],
-                       self.connection_members[3]])
-            ]))
+        return hash(self._equivalent_members())
 
     def __setattr__(self, key, value):
         if key == 'connection_type':
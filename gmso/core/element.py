@@ -170,10 +170,9 @@ def element_by_mass(mass, exact=True):
         matched_element = mass_dict.get(mass_trimmed)
     else:
         # Closest match mode
-        mass_closest = min(mass_dict.keys(), key=lambda k: abs(k-mass_trimmed))
-        msg2 = 'Closest mass to {}: {}'.format(mass_trimmed, mass_closest)
+        matched_element = elements[int(elements_by_mass(mass_trimmed, exact=False))]
+        msg2 = 'Closest mass to {}: {}'.format(mass_trimmed, np.round(float(matched_element.mass.to('amu')), 1))
         warnings.warn(msg2)
-        matched_element = mass_dict.get(mass_closest)
     return matched_element
 
 
@@ -266,6 +265,89 @@ def element_by_atom_type(atom_type):
     return matched_element
 
 
+def elements_by_mass(masses, exact=True):
+    """Search for the elements of an array of masses
+
+    The vectorized equivalent of `element_by_mass`: the masses are rounded
+    to the first decimal place and looked up with `np.searchsorted` in the
+    sorted masses of the known elements, without any warning.
+
+    Parameters
+    ----------
+    masses : unyt.unyt_array or np.ndarray
+        The masses to look for, in amu unless they have units
+    exact : bool, optional, default=True
+        If True, only match elements with the same mass (up to the first
+        decimal place), otherwise match the element with the closest mass
+
+    Returns
+    -------
+    np.ndarray
+        The index in `gmso.core.element.elements` of the element of each mass,
+        or -1 if no element matches
+    """
+    if isinstance(masses, u.unyt_array):
+        masses = masses.to_value('amu')
+    masses = np.round(np.asarray(masses, dtype=float), 1)
+    positions = np.searchsorted(_sorted_masses, masses)
+    if exact:
+        positions = np.minimum(positions, len(_sorted_masses) - 1)
+        return np.where(_sorted_masses[positions] == masses, _mass_elements[positions], -1)
+
+    # The closest of the masses on each side of the searched position
+    upper = np.minimum(positions, len(_sorted_masses) - 1)
+    lower = np.maximum(positions - 1, 0)
+    closest = np.where(np.abs(_sorted_masses[lower] - masses) <= np.abs(_sorted_masses[upper] - masses),
+                       lower, upper)
+    return _mass_elements[closest]
+
+
+def elements_by_symbol(symbols):
+    """Search for the elements of a list of symbols
+
+    The vectorized equivalent of `element_by_symbol`: each unique symbol is
+    trimmed of digits and spaces and looked up once, without any warning.
+
+    Parameters
+    ----------
+    symbols : list of str or np.ndarray
+        The symbols to look for
+
+    Returns
+    -------
+    np.ndarray
+        The index in `gmso.core.element.elements` of the element of each symbol,
+        or -1 if no element matches
+    """
+    unique_symbols, inverse = np.unique(np.asarray(symbols, dtype=str), return_inverse=True)
+    indices = np.array([
+        _symbol_index.get(sub(r'[0-9 -]', '', symbol).capitalize(), -1)
+        for symbol in unique_symbols.tolist()
+    ], dtype=np.int64)
+    return indices[inverse].reshape(-1) if indices.size else np.empty(0, dtype=np.int64)
+
+
+def elements_by_atomic_number(atomic_numbers):
+    """Search for the elements of an array of atomic numbers
+
+    Parameters
+    ----------
+    atomic_numbers : np.ndarray
+        The atomic numbers to look for
+
+    Returns
+    -------
+    np.ndarray
+        The index in `gmso.core.element.elements` of the element of each
+        atomic number, or -1 if no element matches
+    """
+    atomic_numbers = np.asarray(atomic_numbers, dtype=np.int64)
+    positions = np.minimum(np.searchsorted(_sorted_atomic_numbers, atomic_numbers),
+                           len(_sorted_atomic_numbers) - 1)
+    return np.where(_sorted_atomic_numbers[positions] == atomic_numbers,
+                    _atomic_number_elements[positions], -1)
+
+
 Hydrogen = 	Element(atomic_number=1, name='hydrogen', symbol='H', mass=1.0079 * u.amu)
 Helium = 	Element(atomic_number=2, name='helium', symbol='He', mass=4.0026 * u.amu)
 Lithium = 	Element(atomic_number=3, name='lithium', symbol='Li', mass=6.941 * u.amu)
@@ -404,3 +486,14 @@ symbol_dict = {element.symbol: element for element in elements}
 name_dict = {element.name: element for element in elements}
 atomic_dict = {element.atomic_number: element for element in elements}
 mass_dict = {np.round(float(element.mass.to('amu')), 1): element for element in elements}
+
+# Sorted arrays of the known elements for the vectorized searches, e.g. the
+# element of the mass _sorted_masses[i] is elements[_mass_elements[i]].
+# Elements with the same rounded mass resolve to the last one, as in mass_dict
+_element_index = {element: idx for idx, element in enumerate(elements)}
+_symbol_index = {symbol: _element_index[element] for symbol, element in symbol_dict.items()}
+_sorted_masses = np.array(sorted(mass_dict.keys()))
+_mass_elements = np.array([_element_index[mass_dict[mass]] for mass in _sorted_masses], dtype=np.int64)
+_sorted_atomic_numbers = np.array(sorted(atomic_dict.keys()), dtype=np.int64)
+_atomic_number_elements = np.array([_element_index[atomic_dict[number]] for number in _sorted_atomic_numbers],
+                                   dtype=np.int64)
@@ -1,12 +1,14 @@
 import typing
-from collections import ChainMap
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 from lxml import etree
 
-from gmso.utils.ff_utils import (validate,
-                                 parse_ff_metadata,
-                                 parse_ff_atomtypes,
-                                 parse_ff_connection_types)
+from gmso.utils.ff_utils import (parse_ff_file,
+                                 index_ff_file,
+                                 check_member_types,
+                                 LazyPotentialDict,
+                                 DICT_KEY_SEPARATOR)
 
 
 def _group_by_expression(potential_types):
@@ -184,7 +186,7 @@ class ForceField(object):
         return _group_by_expression(self.improper_types)
 
     @classmethod
-    def from_xml(cls, xmls_or_etrees):
+    def from_xml(cls, xmls_or_etrees, n_workers=None, lazy=False):
         """Create a gmso.Forcefield object from XML File(s)
 
         This class method creates a ForceFiled object from the reference
@@ -196,6 +198,18 @@ class ForceField(object):
         ----------
         xmls_or_etrees : Union[str, Iterable[str], etree._ElementTree, Iterable[etree._ElementTree]]
           The forcefield XML locations or XML Element Trees
+        n_workers : int, optional, default=None
+          If greater than 1, validate and parse the XML files in a pool of
+          `n_workers` processes. The parsed files are merged in the order they
+          were provided, same as the sequential path. Only applies to XML
+          file locations, element trees are always parsed sequentially.
+          Ignored if `lazy` is True.
+        lazy : bool, optional, default=False
+          If True, only index the XML files and create each potential the
+          first time it is looked up, e.g. `ff.dihedral_types['CT~CT~CT~HC']`.
+          The potential dictionaries of the returned ForceField are then
+          `gmso.utils.ff_utils.LazyPotentialDict` objects. This is much faster
+          for large forcefields of which only a few types are used.
 
         Returns
         --------
@@ -216,103 +230,83 @@ class ForceField(object):
         if all(map(lambda x: isinstance(x, str), xmls_or_etrees)):
             should_parse_xml = True
 
-        versions = []
-        names = []
-        ff_atomtypes_list = []
-        ff_bondtypes_list = []
-        ff_angletypes_list = []
-        ff_dihedraltypes_list = []
-
-        atom_types_dict = ChainMap()
-        bond_types_dict = {}
-        angle_types_dict = {}
-        dihedral_types_dict = {}
-        improper_types_dict = {}
-        potential_groups = {}
-
-        for loc_or_etree in set(xmls_or_etrees):
-            validate(loc_or_etree)
-            ff_tree = loc_or_etree
+        # Drop duplicates but keep the order in which the files were provided
+        xmls_or_etrees = list(dict.fromkeys(xmls_or_etrees))
 
+        if lazy:
+            parsed_ffs = [index_ff_file(loc_or_etree) for loc_or_etree in xmls_or_etrees]
+        elif n_workers is not None and n_workers > 1 and len(xmls_or_etrees) > 1:
             if should_parse_xml:
-                ff_tree = etree.parse(loc_or_etree)
-
-            ff_el = ff_tree.getroot()
-            versions.append(ff_el.attrib['version'])
-            names.append(ff_el.attrib['name'])
-            ff_meta_tree = ff_tree.find('FFMetaData')
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    parsed_ffs = list(executor.map(parse_ff_file, xmls_or_etrees))
+            else:
+                warnings.warn('XML Element Trees cannot be sent to worker processes, '
+                              'parsing them sequentially')
+                parsed_ffs = [parse_ff_file(ff_tree) for ff_tree in xmls_or_etrees]
+        else:
+            parsed_ffs = [parse_ff_file(loc_or_etree) for loc_or_etree in xmls_or_etrees]
 
-            if ff_meta_tree is not None:
-                ff_meta_map = parse_ff_metadata(ff_meta_tree)
+        return cls._from_parsed_ffs(parsed_ffs, lazy=lazy)
 
-            ff_atomtypes_list.extend(ff_tree.findall('AtomTypes'))
-            ff_bondtypes_list.extend(ff_tree.findall('BondTypes'))
-            ff_angletypes_list.extend(ff_tree.findall('AngleTypes'))
-            ff_dihedraltypes_list.extend(ff_tree.findall('DihedralTypes'))
+    @classmethod
+    def _from_parsed_ffs(cls, parsed_ffs, lazy=False):
+        """Merge the output of `parse_ff_file` (or `index_ff_file`) for one or more files into a ForceField"""
+        potentials_dict_cls = LazyPotentialDict if lazy else dict
+        atom_types_dict = potentials_dict_cls()
+        bond_types_dict = potentials_dict_cls()
+        angle_types_dict = potentials_dict_cls()
+        dihedral_types_dict = potentials_dict_cls()
+        improper_types_dict = potentials_dict_cls()
+        potential_groups = {}
 
         # Consolidate AtomTypes
-        for atom_types in ff_atomtypes_list:
-            this_atom_types_group = parse_ff_atomtypes(atom_types, ff_meta_map)
-            this_atom_group_name = atom_types.attrib.get('name', None)
-            if this_atom_group_name:
-                potential_groups[this_atom_group_name] = this_atom_types_group
-            atom_types_dict.update(this_atom_types_group)
-
-        # Consolidate BondTypes
-        for bond_types in ff_bondtypes_list:
-            this_bond_types_group = parse_ff_connection_types(
-                bond_types,
-                atom_types_dict,
-                child_tag='BondType'
-            )
-            this_bond_types_group_name = bond_types.attrib.get('name', None)
-
-            if this_bond_types_group_name:
-                potential_groups[this_bond_types_group_name] = this_bond_types_group
-
-            bond_types_dict.update(this_bond_types_group)
-
-        # Consolidate AngleTypes
-        for angle_types in ff_angletypes_list:
-            this_angle_types_group = parse_ff_connection_types(
-                angle_types,
-                atom_types_dict,
-                child_tag='AngleType'
-            )
-            this_angle_types_group_name = angle_types.attrib.get('name', None)
-
-            if this_angle_types_group_name:
-                potential_groups[this_angle_types_group_name] = this_angle_types_group
-
-            angle_types_dict.update(this_angle_types_group)
-
-        # Consolidate DihedralTypes
-        for dihedral_types in ff_dihedraltypes_list:
-            this_dihedral_types_group = parse_ff_connection_types(
-                dihedral_types,
-                atom_types_dict,
-                child_tag='DihedralType'
-            )
-            this_improper_types_group = parse_ff_connection_types(
-                dihedral_types,
-                atom_types_dict,
-                child_tag='ImproperType'
-            )
-            this_group_name = dihedral_types.attrib.get('name', None)
-
-            dihedral_types_dict.update(this_dihedral_types_group)
-            improper_types_dict.update(this_improper_types_group)
-
-            if this_group_name:
-                this_dihedral_types_group.update(this_improper_types_group)
-                potential_groups[this_group_name] = this_dihedral_types_group
+        for parsed_ff in parsed_ffs:
+            for group_name, this_atom_types_group in parsed_ff['atom_types']:
+                if group_name:
+                    potential_groups[group_name] = this_atom_types_group
+                atom_types_dict.update(this_atom_types_group)
+
+        atom_classes_set = set.union(*(parsed_ff['atom_classes'] for parsed_ff in parsed_ffs))
+
+        def _checked(connection_types_group):
+            # The keys hold the member types, so no (lazy) potential is created here
+            for connection_type_key in connection_types_group:
+                check_member_types(connection_type_key.split(DICT_KEY_SEPARATOR),
+                                   atom_types_dict,
+                                   atom_classes_set)
+            return connection_types_group
+
+        # Consolidate BondTypes and AngleTypes
+        for key, types_dict in (('bond_types', bond_types_dict),
+                                ('angle_types', angle_types_dict)):
+            for parsed_ff in parsed_ffs:
+                for group_name, this_types_group in parsed_ff[key]:
+                    _checked(this_types_group)
+                    if group_name:
+                        potential_groups[group_name] = this_types_group
+                    types_dict.update(this_types_group)
+
+        # Consolidate DihedralTypes, ImproperTypes share the group of their DihedralTypes tag
+        for parsed_ff in parsed_ffs:
+            for (group_name, this_dihedral_types_group), (_, this_improper_types_group) in zip(
+                    parsed_ff['dihedral_types'], parsed_ff['improper_types']):
+                _checked(this_dihedral_types_group)
+                _checked(this_improper_types_group)
+                dihedral_types_dict.update(this_dihedral_types_group)
+                improper_types_dict.update(this_improper_types_group)
+
+                if group_name:
+                    this_dihedral_types_group.update(this_improper_types_group)
+                    potential_groups[group_name] = this_dihedral_types_group
+
+        ff_meta_map = parsed_ffs[-1]['meta']
 
         ff = cls()
-        ff.name = names[0]
-        ff.version = versions[0]
+        ff.name = parsed_ffs[0]['name']
+        ff.version = parsed_ffs[0]['version']
         ff.scaling_factors = ff_meta_map['scaling_factors']
         ff.units = ff_meta_map['Units']
-        ff.atom_types = atom_types_dict.maps[0]
+        ff.atom_types = atom_types_dict
         ff.bond_types = bond_types_dict
         ff.angle_types = angle_types_dict
         ff.dihedral_types = dihedral_types_dict
@@ -71,6 +71,19 @@ class Improper(Connection):
                 tuple(equiv_members)
                 ])
 
+    def _equivalent_members(self):
+        """Return the connection members in a form which is equal for all equivalent connections
+
+        The returned object is hashable and is the same for
+        an improper and its equivalent, see `_equivalent_members_hash`.
+        """
+        return tuple([
+            self.connection_members[0],
+            self.connection_members[3],
+            frozenset([self.connection_members[1],
+                       self.connection_members[2]])
+            ])
+
     def _equivalent_members_hash(self):
         """Returns a unique hash representing the connection
         Returns
@@ -85,12 +98,7 @@ class Improper(Connection):
         Here j and k are interchangeable and i and l are fixed.
         """
 
-        return hash(tuple([
-            self.connection_members[0],
-            self.connection_members[3],
-            frozenset([self.connection_members[1],
-                       self.connection_members[2]])
-            ]))
+        return hash(self._equivalent_members())
 
 
     def __setattr__(self, key, value):
@@ -4,7 +4,7 @@ import unyt as u
 from pydantic import Field, validator
 
 from gmso.abc.abstract_potential import AbstractPotential
-from gmso.utils.expression import _PotentialExpression
+from gmso.utils.expression import _PotentialExpression, _lambdified_expression
 from gmso.utils.decorators import confirm_dict_existence
 from gmso.exceptions import GMSOError
 
@@ -124,6 +124,50 @@ class ParametricPotential(AbstractPotential):
             parameters=parameters
         )
 
+    def compile_gradient(self, unit_system=None):
+        """Compile the gradient of the potential to a NumPy function
+
+        The expression is differentiated with respect to each independent
+        variable and lambdified once per unique expression. The compiled
+        functions are cached and shared by all the potentials with the same
+        expression, only the parameter values of this potential are bound.
+
+        Parameters
+        ----------
+        unit_system : gmso.utils.units.UnitSystem, optional, default=None
+            The unit system to bind the parameters in, e.g. one with angles in
+            radians to evaluate angle potentials. If None, the values of the
+            parameters are bound in their own units
+
+        Returns
+        -------
+        callable
+            A function taking the values of the independent variables (as
+            keyword arguments, scalars or arrays) and returning a dictionary
+            mapping the name of each independent variable to the derivative
+            of the potential with respect to it
+        """
+        variables = tuple(sorted(self.independent_variables, key=lambda symbol: symbol.name))
+        parameter_names = tuple(self.parameters.keys())
+        derivatives = {
+            variable.name: _lambdified_expression(self.expression, variables, parameter_names,
+                                                  derivative=variable)
+            for variable in variables
+        }
+        parameter_values = [
+            unit_system.in_system(value) if unit_system is not None else value.value
+            for value in self.parameters.values()
+        ]
+
+        def gradient(**variable_values):
+            missing = set(derivatives) - set(variable_values)
+            if missing:
+                raise GMSOError('Missing values of the independent variables {}'.format(missing))
+            args = [variable_values[variable.name] for variable in variables] + parameter_values
+            return {name: derivative(*args) for name, derivative in derivatives.items()}
+
+        return gradient
+
     @classmethod
     def from_template(cls, potential_template, parameters, topology=None):
         """Create a potential object from the potential_template
@@ -16,6 +16,9 @@ from gmso.core.angle_type import AngleType
 from gmso.core.dihedral_type import DihedralType
 from gmso.core.improper_type import ImproperType
 from gmso.utils.connectivity import identify_connections as _identify_connections
+from gmso.utils.connectivity import adjacency_matrix, _member_indices
+from gmso.utils.mixing import PairParameterTable
+from gmso.utils.parameter_table import parameter_tables_by_expression, _stack_quantities
 from gmso.utils._constants import ATOM_TYPE_DICT, BOND_TYPE_DICT, ANGLE_TYPE_DICT, DIHEDRAL_TYPE_DICT, IMPROPER_TYPE_DICT
 from gmso.exceptions import GMSOError
 
@@ -46,6 +49,9 @@ class Topology(object):
     combining_rule : str, ['lorentz', 'geometric']
         The combining rule for the topology, can be either 'lorentz' or 'geometric'
 
+    pair_overrides : dict
+        The sigma and epsilon of pairs of AtomTypes (by name) which override the combining rule
+
     n_sites : int
         Number of sites in the topology
 
@@ -150,6 +156,9 @@ class Topology(object):
         self._improper_types = {}
         self._improper_types_idx = {}
         self._combining_rule = 'lorentz'
+        self._pair_overrides = {}
+        self._pair_parameter_table = None
+        self._pair_parameter_table_key = None
         self._set_refs = {
             ATOM_TYPE_DICT: self._atom_types,
             BOND_TYPE_DICT: self._bond_types,
@@ -167,6 +176,10 @@ class Topology(object):
         }
 
         self._unique_connections = {}
+        # The bonded neighbors of the sites, and the bonding state of the pairs
+        # of sites whose bonds changed since connections were last identified
+        self._bond_neighbors = {}
+        self._bond_edits = {}
 
 
     @property
@@ -203,6 +216,10 @@ class Topology(object):
             raise GMSOError('Combining rule must be `lorentz` or `geometric`')
         self._combining_rule = rule
 
+    @property
+    def pair_overrides(self):
+        return dict(self._pair_overrides)
+
     @property
     def positions(self):
         xyz = np.empty(shape=(self.n_sites, 3)) * u.nm
@@ -333,14 +350,46 @@ class Topology(object):
         """
         self._sites.add(site)
         if update_types and site.atom_type:
-            site.atom_type.topology = self
-            if site.atom_type in self._atom_types:
-                site.atom_type = self._atom_types[site.atom_type]
-            else:
-                self._atom_types[site.atom_type] = site.atom_type
-                self._atom_types_idx[site.atom_type] = len(self._atom_types) - 1
+            site.atom_type = self._add_atom_type(site.atom_type)
             self.is_typed(updated=False)
 
+    def add_sites(self, sites, update_types=True):
+        """Add many sites to the topology at once
+
+        Unlike calling `Topology.add_site` for each site, the AtomTypes
+        of the sites are gathered in a single pass and the topology is
+        only checked for types once, which keeps building large
+        topologies (e.g. from a file) linear in the number of sites.
+
+        Parameters
+        ----------
+        sites : iterable of gmso.core.Site
+            Sites to be added to this topology
+        update_types : (bool), default=True
+            If true, add the sites' atom types to the topology's set of AtomTypes
+        """
+        # Sites commonly share AtomType instances, whose content hash is
+        # costly, so each instance is only looked up once
+        canonical = {}
+        for site in sites:
+            self._sites.add(site)
+            if update_types and site.atom_type:
+                atom_type = site.atom_type
+                if id(atom_type) not in canonical:
+                    canonical[id(atom_type)] = (atom_type, self._add_atom_type(atom_type))
+                if canonical[id(atom_type)][1] is not atom_type:
+                    site.atom_type = canonical[id(atom_type)][1]
+        if update_types:
+            self._typed = len(self._atom_types) > 0 or len(self._connection_types) > 0
+
+    def _add_atom_type(self, atom_type):
+        """Add an AtomType to the topology, or return its equivalent in the topology"""
+        atom_type.topology = self
+        if atom_type not in self._atom_types:
+            self._atom_types[atom_type] = atom_type
+            self._atom_types_idx[atom_type] = len(self._atom_types) - 1
+        return self._atom_types[atom_type]
+
     def update_sites(self):
         """Update the sites of the topology.
 
@@ -395,34 +444,298 @@ class Topology(object):
             The Connection object or equivalent Connection object that
             is in the topology
         """
+        connection = self._add_connection(connection)
+        if update_types:
+            self.update_connection_types()
+
+        return connection
+
+    def add_connections(self, connections, update_types=True):
+        """Add many gmso.Connection objects to the topology at once
+
+        Unlike calling `Topology.add_connection` for each connection, the
+        connection types are only gathered once after all the connections
+        have been added, which keeps building large topologies (e.g. from a
+        file) linear in the number of connections.
+
+        Parameters
+        ----------
+        connections : iterable of gmso.Connection
+            The Bonds, Angles, Dihedrals or Impropers to add
+        update_types : bool, default=True
+            If True also add any Potential object associated with the connections
+            to the topology.
+
+        Returns
+        -------
+        list of gmso.Connection
+            The Connection objects or equivalent Connection objects that
+            are in the topology
+        """
+        connections = [self._add_connection(connection) for connection in connections]
+        if update_types:
+            self.update_connection_types()
+
+        return connections
+
+    def _add_connection(self, connection):
+        """Add a connection and its members to the collections of the topology"""
         # Check if an equivalent connection is in the topology
-        equivalent_members = connection._equivalent_members_hash()
+        equivalent_members = connection._equivalent_members()
         if equivalent_members in self._unique_connections:
             warnings.warn('An equivalent connection already exists. '
                         'Providing the existing equivalent Connection.')
             connection = self._unique_connections[equivalent_members]
 
         for conn_member in connection.connection_members:
-            if conn_member not in self.sites:
+            if conn_member not in self._sites:
                 self.add_site(conn_member)
         self._connections.add(connection)
         self._unique_connections.update(
                 {equivalent_members : connection})
         if isinstance(connection, Bond):
             self._bonds.add(connection)
+            self._edit_bond(connection, bonded=True)
         if isinstance(connection, Angle):
             self._angles.add(connection)
         if isinstance(connection, Dihedral):
             self._dihedrals.add(connection)
         if isinstance(connection, Improper):
             self._impropers.add(connection)
-        if update_types:
-            self.update_connection_types()
+        return connection
+
+    def remove_connection(self, connection):
+        """Remove a gmso.Connection object from the topology
+
+        The members of the connection and its connection type are kept in
+        the topology. The angles, dihedrals and impropers through a removed
+        bond are not removed with it, but by the next call to
+        `Topology.identify_connections`, e.g. with `incremental=True`.
 
+        Parameters
+        ----------
+        connection : one of gmso.Connection, gmso.Bond, gmso.Angle, gmso.Dihedral, or gmso.Improper object
+            The connection to remove, or an equivalent connection
+
+        Returns
+        -------
+        gmso.Connection
+            The Connection object that was removed from the topology
+        """
+        equivalent_members = connection._equivalent_members()
+        if equivalent_members not in self._unique_connections:
+            raise GMSOError('Connection {} is not in the topology'.format(connection))
+        connection = self._unique_connections.pop(equivalent_members)
+
+        self._connections.remove(connection)
+        for connections in (self._bonds, self._angles, self._dihedrals, self._impropers):
+            connections.discard(connection)
+        if isinstance(connection, Bond):
+            self._edit_bond(connection, bonded=False)
         return connection
 
-    def identify_connections(self):
-        _identify_connections(self)
+    def _edit_bond(self, bond, bonded):
+        """Update the bonded neighbors of the members of a bond that was added or removed"""
+        site1, site2 = bond.connection_members
+        neighbors1 = self._bond_neighbors.setdefault(site1, {})
+        neighbors2 = self._bond_neighbors.setdefault(site2, {})
+        self._bond_edits.setdefault(frozenset([site1, site2]), site2 in neighbors1)
+        if bonded:
+            neighbors1[site2] = None
+            neighbors2[site1] = None
+        else:
+            neighbors1.pop(site2, None)
+            neighbors2.pop(site1, None)
+
+    def add_pair_override(self, atom_type1, atom_type2, sigma, epsilon):
+        """Set the nonbonded parameters of a pair of AtomTypes, overriding the combining rule
+
+        This is the equivalent of an NBFIX in CHARMM or an entry
+        of [ nonbond_params ] in GROMACS.
+
+        Parameters
+        ----------
+        atom_type1 : gmso.AtomType or str
+            The first AtomType (or its name) of the pair
+        atom_type2 : gmso.AtomType or str
+            The second AtomType (or its name) of the pair
+        sigma : unyt.unyt_quantity
+            The sigma of the pair
+        epsilon : unyt.unyt_quantity
+            The epsilon of the pair
+
+        See Also
+        --------
+        gmso.Topology.pair_parameter_table :
+            Get the table of nonbonded parameters of every pair of AtomTypes
+        """
+        names = tuple(sorted(
+            atom_type if isinstance(atom_type, str) else atom_type.name
+            for atom_type in (atom_type1, atom_type2)
+        ))
+        if not (isinstance(sigma, u.unyt_quantity) and isinstance(epsilon, u.unyt_quantity)):
+            raise GMSOError('sigma and epsilon of a pair override should be unyt quantities')
+        self._pair_overrides[names] = {'sigma': sigma, 'epsilon': epsilon}
+        self._pair_parameter_table = None
+
+    def pair_parameter_table(self, combining_rule=None):
+        """Get the sigma and epsilon of every pair of AtomTypes in the topology
+
+        The full T x T matrices are built in a single vectorized pass over the
+        topology's AtomTypes (in the order of `Topology.atom_types`), applying
+        the combining rule and then the pair overrides. The table is cached
+        and only rebuilt when the AtomTypes, the combining rule or the pair
+        overrides change.
+
+        Parameters
+        ----------
+        combining_rule : str, ['lorentz', 'geometric'], optional, default=None
+            The combining rule to use, defaults to the topology's combining rule
+
+        Returns
+        -------
+        gmso.utils.mixing.PairParameterTable
+            The table of pair parameters
+
+        See Also
+        --------
+        gmso.Topology.add_pair_override :
+            Set the nonbonded parameters of a pair of AtomTypes
+        """
+        combining_rule = combining_rule or self.combining_rule
+        key = (combining_rule, tuple(hash(atom_type) for atom_type in self._atom_types))
+        if self._pair_parameter_table is None or key != self._pair_parameter_table_key:
+            self._pair_parameter_table = PairParameterTable(self.atom_types,
+                                                            combining_rule=combining_rule,
+                                                            overrides=self._pair_overrides)
+            self._pair_parameter_table_key = key
+        return self._pair_parameter_table
+
+    def to_unit_system(self, unit_system):
+        """Get the positions, charges, masses and parameters of the topology in a unit system
+
+        Each quantity is tabulated into a single array and converted with
+        one multiplication by a conversion factor cached per dimensions and
+        unit system, instead of converting the values one by one.
+
+        Parameters
+        ----------
+        unit_system : gmso.utils.units.UnitSystem
+            The unit system to convert to, e.g. `gmso.utils.units.LAMMPS_REAL`
+
+        Returns
+        -------
+        dict
+            A dictionary with the following keys:
+
+            * 'positions', 'charges' and 'masses': the N x 3 positions and the
+              N charges and masses of the sites, as unyt arrays. Missing charges
+              and masses are zero
+            * 'box_lengths' and 'box_angles': the lengths and angles of the
+              box, as unyt arrays, or None if the topology has no box
+            * 'atom_types', 'bond_types', 'angle_types', 'dihedral_types'
+              and 'improper_types': dictionaries mapping each expression
+              (as a string) to the ParameterTable of the potentials with that
+              expression, with parameters converted to the unit system
+
+        See Also
+        --------
+        gmso.utils.parameter_table.ParameterTable :
+            The parameters of a group of potentials sharing an expression
+        """
+        sites = self.sites
+        compiled = {
+            'positions': u.unyt_array(np.empty(shape=(0, 3)), u.nm),
+            'charges': u.unyt_array(np.empty(shape=(0,)), u.elementary_charge),
+            'masses': u.unyt_array(np.empty(shape=(0,)), u.Unit('amu'))
+        }
+        if sites:
+            compiled['positions'] = _stack_quantities([site.position for site in sites])
+            compiled['charges'] = _stack_quantities([
+                site.charge if site.charge is not None else 0.0 * u.elementary_charge
+                for site in sites
+            ])
+            compiled['masses'] = _stack_quantities([
+                site.mass if site.mass is not None else 0.0 * u.Unit('amu')
+                for site in sites
+            ])
+        for key, values in compiled.items():
+            compiled[key] = unit_system.convert(values)
+
+        compiled['box_lengths'] = None
+        compiled['box_angles'] = None
+        if self.box is not None:
+            compiled['box_lengths'] = unit_system.convert(self.box.lengths)
+            compiled['box_angles'] = unit_system.convert(self.box.angles)
+
+        for key, potentials in (('atom_types', self.atom_types),
+                                ('bond_types', self.bond_types),
+                                ('angle_types', self.angle_types),
+                                ('dihedral_types', self.dihedral_types),
+                                ('improper_types', self.improper_types)):
+            tables = parameter_tables_by_expression(potentials)
+            for table in tables.values():
+                table.convert_to_units(unit_system)
+            compiled[key] = tables
+
+        return compiled
+
+    def identify_connections(self, incremental=False):
+        """Identify the angles, dihedrals and impropers of the bonding graph of the topology
+
+        Parameters
+        ----------
+        incremental : bool, optional, default=False
+            If True, only the connections through the bonds added or removed
+            since connections were last identified are updated: the missing
+            ones are added and those through removed bonds are removed.
+            Otherwise, every missing connection of the bonding graph is added
+
+        See Also
+        --------
+        gmso.utils.connectivity.identify_connections :
+            Identify the connections of a topology
+        """
+        _identify_connections(self, incremental=incremental)
+
+    def adjacency(self, format='csr', weights=None):
+        """Get the adjacency matrix of the bonding graph of the topology
+
+        The matrix is built from the indices of the members of the bonds,
+        without creating a graph object per site, and can be used with
+        `scipy.sparse.csgraph` instead of exporting the topology to networkx.
+        Requires scipy.
+
+        Parameters
+        ----------
+        format : str, optional, default='csr'
+            The scipy.sparse format of the matrix, e.g. 'csr', 'csc', 'coo' or 'lil'
+        weights : str, optional, default=None
+            The entries of the bonds in the matrix. If None, every entry
+            is 1. If 'bond_type', the entries are the index of the type of
+            each bond in `Topology.bond_types` plus one, or -1 for bonds
+            without a type
+
+        Returns
+        -------
+        scipy.sparse.spmatrix
+            The symmetric N x N adjacency matrix of the N sites of the topology
+        """
+        bonds = list(self.bonds)
+        if weights is None:
+            values = None
+        elif weights == 'bond_type':
+            bond_types = self.bond_types
+            type_index = {id(bond_type): idx for idx, bond_type in enumerate(bond_types)}
+            values = np.full(len(bonds), -1, dtype=np.int64)
+            for idx, bond in enumerate(bonds):
+                if bond.bond_type is not None:
+                    # Equal bond types are only stored once in the topology
+                    position = type_index.get(id(bond.bond_type))
+                    values[idx] = 1 + (position if position is not None else bond_types.index(bond.bond_type))
+        else:
+            raise GMSOError('Unknown adjacency weights {}, use None or `bond_type`'.format(weights))
+        return adjacency_matrix(self.n_sites, _member_indices(self, bonds), weights=values, format=format)
 
     def update_connection_types(self):
         """Update the connection types based on the connection collection in the topology.
@@ -435,36 +748,54 @@ class Topology(object):
         --------
         gmso.Topology.update_atom_types : Update atom types in the topology.
         """
+        # Connections commonly share potential instances, whose content hash
+        # is costly, so each instance is only looked up once
+        canonical = {}
+        untyped = []
         for c in self.connections:
-            if c.connection_type is None:
-                warnings.warn('Non-parametrized Connection {} detected'.format(c))
-            elif not isinstance(c.connection_type, ParametricPotential):
+            connection_type = c.connection_type
+            if connection_type is None:
+                untyped.append(c)
+            elif not isinstance(connection_type, ParametricPotential):
                 raise GMSOError('Non-Potential {} found'
-                                    'in Connection {}'.format(c.connection_type, c))
-            elif c.connection_type not in self._connection_types:
-                c.connection_type.topology = self
-                self._connection_types[c.connection_type] = c.connection_type
-                if isinstance(c.connection_type, BondType):
-                    self._bond_types[c.connection_type] = c.connection_type
-                    self._bond_types_idx[c.connection_type] = len(self._bond_types) - 1
-                if isinstance(c.connection_type, AngleType):
-                    self._angle_types[c.connection_type] = c.connection_type
-                    self._angle_types_idx[c.connection_type] = len(self._angle_types) - 1
-                if isinstance(c.connection_type, DihedralType):
-                    self._dihedral_types[c.connection_type] = c.connection_type
-                    self._dihedral_types_idx[c.connection_type] = len(self._dihedral_types) - 1
-                if isinstance(c.connection_type, ImproperType):
-                    self._improper_types[c.connection_type] = c.connection_type
-                    self._improper_types_idx[c.connection_type] = len(self._improper_types) - 1
-            elif c.connection_type in self.connection_types:
-                if isinstance(c.connection_type, BondType):
-                    c.connection_type = self._bond_types[c.connection_type]
-                if isinstance(c.connection_type, AngleType):
-                    c.connection_type = self._angle_types[c.connection_type]
-                if isinstance(c.connection_type, DihedralType):
-                    c.connection_type = self._dihedral_types[c.connection_type]
-                if isinstance(c.connection_type, ImproperType):
-                    c.connection_type = self._improper_types[c.connection_type]
+                                    'in Connection {}'.format(connection_type, c))
+            else:
+                if id(connection_type) not in canonical:
+                    canonical[id(connection_type)] = (connection_type, self._add_connection_type(connection_type))
+                if canonical[id(connection_type)][1] is not connection_type:
+                    c.connection_type = canonical[id(connection_type)][1]
+        # A single warning, formatting every connection is slow for large topologies
+        if untyped:
+            warnings.warn('{:d} non-parametrized Connections detected, e.g. {}'.format(
+                len(untyped), untyped[0]))
+
+    def _add_connection_type(self, connection_type):
+        """Add a connection type to the topology, or return its equivalent in the topology"""
+        if connection_type not in self._connection_types:
+            connection_type.topology = self
+            self._connection_types[connection_type] = connection_type
+            if isinstance(connection_type, BondType):
+                self._bond_types[connection_type] = connection_type
+                self._bond_types_idx[connection_type] = len(self._bond_types) - 1
+            if isinstance(connection_type, AngleType):
+                self._angle_types[connection_type] = connection_type
+                self._angle_types_idx[connection_type] = len(self._angle_types) - 1
+            if isinstance(connection_type, DihedralType):
+                self._dihedral_types[connection_type] = connection_type
+                self._dihedral_types_idx[connection_type] = len(self._dihedral_types) - 1
+            if isinstance(connection_type, ImproperType):
+                self._improper_types[connection_type] = connection_type
+                self._improper_types_idx[connection_type] = len(self._improper_types) - 1
+            return connection_type
+        if isinstance(connection_type, BondType):
+            return self._bond_types[connection_type]
+        if isinstance(connection_type, AngleType):
+            return self._angle_types[connection_type]
+        if isinstance(connection_type, DihedralType):
+            return self._dihedral_types[connection_type]
+        if isinstance(connection_type, ImproperType):
+            return self._improper_types[connection_type]
+        return self._connection_types[connection_type]
 
     def update_atom_types(self):
         """Update atom types in the topology
@@ -478,17 +809,24 @@ class Topology(object):
         gmso.Topology.update_connection_types :
             Update the connection types based on the connection collection in the topology
         """
+        # Sites commonly share AtomType instances, whose content hash is
+        # costly, so each instance is only looked up once
+        canonical = {}
+        untyped = []
         for site in self._sites:
-            if site.atom_type is None:
-                warnings.warn('Non-parametrized site detected {}'.format(site))
-            elif not isinstance(site.atom_type, AtomType):
+            atom_type = site.atom_type
+            if atom_type is None:
+                untyped.append(site)
+            elif not isinstance(atom_type, AtomType):
                 raise GMSOError('Non AtomType instance found in site {}'.format(site))
-            elif site.atom_type not in self._atom_types:
-                site.atom_type.topology = self
-                self._atom_types[site.atom_type] = site.atom_type
-                self._atom_types_idx[site.atom_type] = len(self._atom_types) - 1
-            elif site.atom_type in self._atom_types:
-                site.atom_type = self._atom_types[site.atom_type]
+            else:
+                if id(atom_type) not in canonical:
+                    canonical[id(atom_type)] = (atom_type, self._add_atom_type(atom_type))
+                if canonical[id(atom_type)][1] is not atom_type:
+                    site.atom_type = canonical[id(atom_type)][1]
+        if untyped:
+            warnings.warn('{:d} non-parametrized sites detected, e.g. {}'.format(
+                len(untyped), untyped[0]))
         self.is_typed(updated=True)
 
     def add_subtopology(self, subtop, update=True):
@@ -510,7 +848,7 @@ class Topology(object):
         """
         self._subtops.add(subtop)
         subtop.parent = self
-        self._sites.union(subtop.sites)
+        self._sites.update(subtop.sites)
         if update:
             self.update_topology()
 
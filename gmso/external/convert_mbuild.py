@@ -12,7 +12,9 @@ from gmso.utils.io import has_mbuild
 from gmso.core.element import (element_by_symbol,
                                    element_by_name,
                                    element_by_atomic_number,
-                                   element_by_mass)
+                                   element_by_mass,
+                                   elements,
+                                   elements_by_symbol)
 
 if has_mbuild:
     import mbuild as mb
@@ -75,44 +77,42 @@ def from_mbuild(compound, box=None, search_method=element_by_symbol):
     if compound.name != mb.Compound().name:
         top.name = compound.name
 
-    site_map = dict()
-    for child in compound.children:
-        if len(child.children) == 0:
-            continue
-        else:
-            subtop = SubTopology(name=child.name)
-            top.add_subtopology(subtop, update=False)
-            for particle in child.particles():
-                pos = particle.xyz[0] * u.nanometer
-                ele = search_method(particle.name)
-                site = Atom(name=particle.name, position=pos, element=ele)
-                site_map[particle] = site
-                subtop.add_site(site, update_types=False)
-
-    for particle in compound.particles():
-        already_added_site = site_map.get(particle, None)
-        if already_added_site:
-            continue
-
-        pos = particle.xyz[0] * u.nanometer
-        ele = search_method(particle.name)
-        site = Atom(name=particle.name, position=pos, element=ele)
-        site_map[particle] = site
-
-        # If the top has subtopologies, then place this particle into
-        # a single-site subtopology -- ensures that all sites are in the
-        # same level of hierarchy.
-        if len(top.subtops) > 0:
-            subtop = SubTopology(name=particle.name)
-            top.add_subtopology(subtop)
-            subtop.add_site(site, update_types=False)
-        else:
-            top.add_site(site, update_types=False)
-
+    particles = list(compound.particles())
+    particle_index = {id(particle): idx for idx, particle in enumerate(particles)}
+
+    # Sites are grouped by the second level Compound they belong to, the
+    # other particles being placed last, each in its own group
+    groups = [(child.name, list(child.particles()))
+              for child in compound.children if len(child.children) > 0]
+    grouped = set(id(particle) for _, group in groups for particle in group)
+    loose = [particle for particle in particles if id(particle) not in grouped]
+    ordered = [particle for _, group in groups for particle in group] + loose
+
+    sites = _sites_from_particles(ordered,
+                                  compound.xyz[[particle_index[id(particle)] for particle in ordered]],
+                                  search_method)
+    site_map = {id(particle): site for particle, site in zip(ordered, sites)}
+    top.add_sites(sites, update_types=False)
+
+    # If the top has subtopologies, then place each other particle into
+    # a single-site subtopology -- ensures that all sites are in the
+    # same level of hierarchy.
+    if groups:
+        groups.extend((particle.name, [particle]) for particle in loose)
+    for name, group in groups:
+        subtop = SubTopology(name=name)
+        for particle in group:
+            subtop.add_site(site_map[id(particle)], update_types=False)
+        top.add_subtopology(subtop, update=False)
+
+    bonds = list()
     for b1, b2 in compound.bonds():
-        new_bond = Bond(connection_members=[site_map[b1], site_map[b2]],
-                bond_type=None)
-        top.add_connection(new_bond, update_types=False)
+        members = (site_map[id(b1)], site_map[id(b2)])
+        if bonds:
+            bonds.append(bonds[0].copy(update={'connection_members_': members}))
+        else:
+            bonds.append(Bond(connection_members=list(members), bond_type=None))
+    top.add_connections(bonds, update_types=False)
     top.update_topology()
 
     if box:
@@ -131,6 +131,35 @@ def from_mbuild(compound, box=None, search_method=element_by_symbol):
     return top
 
 
+def _sites_from_particles(particles, xyz, search_method):
+    """Create the gmso.Atom of each particle, from their positions as an array
+
+    The element of each unique particle name is searched for once, and every
+    site is a copy of a validated prototype with the name, position and
+    element of its particle.
+    """
+    names = [particle.name for particle in particles]
+    if search_method is element_by_symbol:
+        # The vectorized search does not warn for every particle
+        unique_names = sorted(set(names))
+        element_map = {
+            name: elements[idx] if idx >= 0 else None
+            for name, idx in zip(unique_names, elements_by_symbol(unique_names).tolist())
+        }
+    else:
+        element_map = {name: search_method(name) for name in set(names)}
+
+    prototype = Atom(name='Atom')
+    return [
+        prototype.copy(update={
+            'name_': name or prototype.name,
+            'position_': u.unyt_array(position, u.nm),
+            'element_': element_map[name]
+        })
+        for name, position in zip(names, np.asarray(xyz, dtype=float).tolist())
+    ]
+
+
 def to_mbuild(topology):
     """ Convert a gmso.Topology to mbuild.Compound
 
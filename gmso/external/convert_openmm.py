@@ -1,6 +1,12 @@
+import numpy as np
 import unyt as u
 
+from gmso.core.element import elements, elements_by_mass
+from gmso.lib.potential_templates import PotentialTemplateLibrary
+from gmso.utils.connectivity import connected_components
 from gmso.utils.io import import_, has_openmm, has_simtk_unit
+from gmso.utils.units import UnitSystem
+from gmso.exceptions import GMSOError
 
 
 if has_openmm & has_simtk_unit:
@@ -40,10 +46,16 @@ def to_openmm(topology, openmm_object='topology'):
     residue = openmm_top.addResidue(name='RES',
                                     chain=chain)
 
-    for site in topology.sites:
+    atoms = [
         openmm_top.addAtom(name=site.name,
-                           element=site.element.name,
+                           element=site.element.name if site.element else None,
                            residue=residue)
+        for site in topology.sites
+    ]
+    site_index = {id(site): idx for idx, site in enumerate(topology.sites)}
+    for bond in topology.bonds:
+        i, j = (site_index[id(site)] for site in bond.connection_members)
+        openmm_top.addBond(atoms[i], atoms[j])
 
     # Set box
     box = topology.box
@@ -52,7 +64,6 @@ def to_openmm(topology, openmm_object='topology'):
     openmm_top.setUnitCellDimensions(lengths)
 
     # TODO: Figure out how to add residues
-    # TODO: Convert connections to OpenMM Bonds
 
     if openmm_object == 'topology':
 
@@ -81,17 +92,36 @@ def to_system(topology,
               ewaldErrorTolerance=0.0005,
               flexibleConstraints=True,
               verbose=False,
-              splitDihedrals=False):
+              splitDihedrals=False,
+              scaling_factors=None):
     """
     Convert a typed topology object to a typed OpenMM System.  See http://openmm.org for more information.
 
+    The positions, charges, masses and parameters of the topology are
+    compiled in the OpenMM units with `gmso.Topology.to_unit_system`, the
+    potentials of each expression being matched to a template once. The
+    parameters of the connections are then gathered with index arrays, so
+    that the conversion is dominated by the calls adding them to the forces.
+
+    Harmonic bonds and angles are added to a HarmonicBondForce and a
+    HarmonicAngleForce. Periodic, Ryckaert-Bellemans and OPLS dihedrals
+    (and periodic impropers) are added to a PeriodicTorsionForce or an
+    RBTorsionForce, and harmonic dihedrals and impropers to a
+    CustomTorsionForce. The Lennard-Jones AtomTypes and the charges are
+    added to a NonbondedForce, whose exceptions exclude the 1-2 and 1-3
+    pairs and scale the 1-4 pairs by the scaling factors. If the
+    combining rule of the topology is geometric, or pairs of AtomTypes are
+    overridden, the Lennard-Jones interactions are computed by a
+    CustomNonbondedForce from the pair parameter table of the topology.
+
     Parameters
     ----------
     topology : `Topology` object, default=None
-        An untyped topology object.
+        A typed topology object.
     nonbondedMethod : cutoff method, optional, default=None
         Cutoff method specified for OpenMM system.  
-        Options supported are 'NoCutoff', 'CutoffNonPeriodic', 'CutoffPeriodic', 'PME', or Ewald objects from simtk.openmm.app.
+        Options supported are 'NoCutoff', 'CutoffNonPeriodic', 'CutoffPeriodic', 'Ewald', 'PME', 'LJPME'
+        or the equivalent objects from simtk.openmm.app. Defaults to 'NoCutoff'.
     nonbondedCutoff : unyt array or float, default=0.8*u.nm
         The nonbonded cutoff must either be a float or a unyt array.  
         Float interpreted in units of nm.
@@ -103,9 +133,11 @@ def to_system(topology,
         Type of constraints to add to the System (e.g., SHAKE).
     rigidWater : boolean, optional, default=True
         If True, water is kept rigid regardless of constraint values.
-        False value is overriden if constraints is not None
+        False value is overriden if constraints is not None.
+        Water molecules are the molecules of one oxygen and two hydrogens
     implicitSolvent : 'None', 'app.HCT', 'app.OBC1', 'app.OBC2', 'app.GBn', 'app.GBn2'. Default=None
-        The Generalized Born implicit solvent model to use.
+        The Generalized Born implicit solvent model to use. Implicit
+        solvents are not supported yet, this must be None
     implicitSolventKappa : 1/distance unyt array or float, default=None
         Debye kappa property related to modeling saltware conditions in GB.  
         It should have units of 1/distance (interpreted as 1/nanometers if no units reported).  
@@ -120,14 +152,12 @@ def to_system(topology,
         The dielectric constant of protein interior used in GB.
     solventDielectric : float, default=78.5
         The dielectric constant of water used in GB
-    useSASA : boolean, default=False
-        If True, use the ACE non-polar solvation model.  
-        Otherwise, no SASA-based nonpolar solvation model is used.
     removeCMMotion : boolean, default=True
         If True, the center-of-mass motion will be removed periodically during the simulation.  
         If False, it will not.
     hydrogenMass : mass unyt array or float, default=None
         If not None, hydrogen masses will be changed to this mass and the difference subtracted from the attached heavy atom (hydrogen mass repartitioning).
+        Float interpreted in units of amu.
     ewaldErrorTolerance : float, default=0.0005
         When using PME or Ewald, the Ewald parameters will be calculated from this value.
     flexibleConstraints : boolean, optional, default=True
@@ -138,11 +168,381 @@ def to_system(topology,
     splitDihedrals : boolean, optional, default=False
         If True, the dihedrals will be split into two forces -- propers and impropers.  
         This is primarily useful for debugging torsion parameter assignments.
+    scaling_factors : dict, optional, default=None
+        The scaling factors of the 1-4 interactions, with the keys
+        'electrostatics14Scale' and 'nonBonded14Scale', e.g. the
+        `scaling_factors` of a gmso.ForceField. Defaults to 1.0 for both
 
     Returns
     -------
     openmm_system : A typed OpenMM System object
 
     """
+    if implicitSolvent is not None:
+        raise GMSOError('Implicit solvents are not supported yet')
+    method = 'NoCutoff' if nonbondedMethod is None else str(nonbondedMethod)
+    if method not in _NONBONDED_METHODS:
+        raise GMSOError('Unknown nonbonded method {}, supported methods are {}'.format(
+            method, list(_NONBONDED_METHODS)))
+    if method not in ['NoCutoff', 'CutoffNonPeriodic'] and topology.box is None:
+        raise GMSOError('The nonbonded method {} requires a topology with a box'.format(method))
+    constraints = None if constraints is None else str(constraints)
+    if constraints not in [None, 'HBonds', 'AllBonds', 'HAngles']:
+        raise GMSOError('Unknown constraints {}'.format(constraints))
+    scaling_factors = {'electrostatics14Scale': 1.0, 'nonBonded14Scale': 1.0, **(scaling_factors or {})}
+
+    compiled = topology.to_unit_system(_OPENMM_UNITS)
+    sites = topology.sites
+    site_index = {id(site): idx for idx, site in enumerate(sites)}
+    masses = np.array(compiled['masses'].value, dtype=float)
+    # Sites without an element are identified by their mass
+    by_mass = elements_by_mass(masses).tolist()
+    atomic_numbers = np.array([
+        site.element.atomic_number if site.element
+        else elements[idx].atomic_number if idx >= 0 else 0
+        for site, idx in zip(sites, by_mass)
+    ], dtype=np.int64)
+    is_hydrogen = atomic_numbers == 1
+
+    bonds = _typed_connections(topology.bonds, topology.bond_types, compiled['bond_types'],
+                               ['HarmonicBondPotential'], site_index, 'Bond')
+    angles = _typed_connections(topology.angles, topology.angle_types, compiled['angle_types'],
+                                ['HarmonicAnglePotential'], site_index, 'Angle')
+    dihedrals = _typed_connections(topology.dihedrals, topology.dihedral_types, compiled['dihedral_types'],
+                                   _TORSION_TEMPLATES, site_index, 'Dihedral')
+    impropers = _typed_connections(topology.impropers, topology.improper_types, compiled['improper_types'],
+                                   _TORSION_TEMPLATES, site_index, 'Improper')
+    bond_members = np.concatenate([members for _, members, _ in bonds] + [np.empty((0, 2), dtype=np.int64)])
+    bond_lengths = np.concatenate([parameters['r_eq'] for _, _, parameters in bonds] + [np.empty(0)])
+    angle_members = np.concatenate([members for _, members, _ in angles] + [np.empty((0, 3), dtype=np.int64)])
+    angle_values = np.concatenate([parameters['theta_eq'] for _, _, parameters in angles] + [np.empty(0)])
+
+    if hydrogenMass is not None:
+        if verbose:
+            print('Repartitioning the mass of the hydrogens')
+        hydrogen_mass = _in_units(hydrogenMass, u.Unit('amu'))
+        masses = _repartition_hydrogen_masses(masses, is_hydrogen, bond_members, hydrogen_mass)
+
+    system = System()
+    for mass in masses.tolist():
+        system.addParticle(mass)
+    if topology.box is not None:
+        system.setDefaultPeriodicBoxVectors(*[Vec3(*vector)
+                                              for vector in topology.box.get_vectors().to_value(u.nm).tolist()])
+
+    # Constraints, the constrained bonds and angles being skipped by
+    # the forces unless the constraints are flexible
+    if verbose:
+        print('Adding constraints')
+    constrained_bonds, constrained_angles = _constrained(constraints, rigidWater or constraints is not None,
+                                                         is_hydrogen, atomic_numbers, bond_members, angle_members)
+    for (i, j), r_eq in zip(bond_members[constrained_bonds].tolist(), bond_lengths[constrained_bonds].tolist()):
+        system.addConstraint(i, j, r_eq)
+    for (i, j), distance in zip(*_angle_constraints(bond_members, bond_lengths,
+                                                    angle_members[constrained_angles],
+                                                    angle_values[constrained_angles])):
+        system.addConstraint(i, j, distance)
+    if flexibleConstraints:
+        constrained_bonds[:] = False
+        constrained_angles[:] = False
+
+    if verbose:
+        print('Adding bonded forces')
+    if bonds:
+        force = HarmonicBondForce()
+        offset = 0
+        for _, members, parameters in bonds:
+            skip = constrained_bonds[offset:offset + len(members)].tolist()
+            offset += len(members)
+            for (i, j), r_eq, k, constrained in zip(members.tolist(), parameters['r_eq'].tolist(),
+                                                    parameters['k'].tolist(), skip):
+                if not constrained:
+                    force.addBond(i, j, r_eq, k)
+        system.addForce(force)
+    if angles:
+        force = HarmonicAngleForce()
+        offset = 0
+        for _, members, parameters in angles:
+            skip = constrained_angles[offset:offset + len(members)].tolist()
+            offset += len(members)
+            for (i, j, k), theta_eq, k_theta, constrained in zip(members.tolist(), parameters['theta_eq'].tolist(),
+                                                                 parameters['k'].tolist(), skip):
+                if not constrained:
+                    force.addAngle(i, j, k, theta_eq, k_theta)
+        system.addForce(force)
+    torsion_forces = _add_torsions(system, dihedrals, dict())
+    _add_torsions(system, impropers, dict() if splitDihedrals else torsion_forces)
+
+    if verbose:
+        print('Adding nonbonded forces')
+    _add_nonbonded(system, topology, compiled, method, bond_members, scaling_factors,
+                   _in_units(nonbondedCutoff, u.nm), _in_units(switchDistance, u.nm), ewaldErrorTolerance)
+
+    if removeCMMotion:
+        system.addForce(CMMotionRemover())
+
+    return system
+
+
+# The units of OpenMM, whose angles are in radians
+_OPENMM_UNITS = UnitSystem('openmm',
+                           length=u.nm,
+                           mass=u.Unit('amu'),
+                           time=u.ps,
+                           energy=u.Unit('kJ/mol'),
+                           angle=u.radian)
+
+# The NonbondedForce and CustomNonbondedForce methods of each nonbonded method
+_NONBONDED_METHODS = {
+    'NoCutoff': ('NoCutoff', 'NoCutoff'),
+    'CutoffNonPeriodic': ('CutoffNonPeriodic', 'CutoffNonPeriodic'),
+    'CutoffPeriodic': ('CutoffPeriodic', 'CutoffPeriodic'),
+    'Ewald': ('Ewald', 'CutoffPeriodic'),
+    'PME': ('PME', 'CutoffPeriodic'),
+    'LJPME': ('LJPME', 'CutoffPeriodic')
+}
+
+_TORSION_TEMPLATES = ['PeriodicTorsionPotential',
+                      'RyckaertBellemansTorsionPotential',
+                      'OPLSTorsionPotential',
+                      'HarmonicTorsionPotential',
+                      'HarmonicImproperPotential']
+
+# The energy of harmonic torsions, with the difference of angles wrapped to [0, pi]
+_HARMONIC_TORSION_ENERGY = '0.5*k*dphi^2; dphi=min(diff, 2*pi-diff); diff=abs(theta-phi_eq); pi=3.141592653589793'
+
+
+def _in_units(value, units):
+    """Return a unyt quantity (or a float, already in the units) as a float in the units"""
+    if isinstance(value, u.unyt_array):
+        return float(value.to_value(units))
+    return float(value)
+
+
+def _typed_connections(connections, potentials, tables, names, site_index, kind):
+    """Group the connections of a topology by the ParameterTable of their type
+
+    The table of each expression is matched to one of the templates `names`
+    once, OPLS torsions being converted to Ryckaert-Bellemans torsions.
+
+    Returns
+    -------
+    list of tuple
+        The template name, the C x n array of the site indices of the members
+        and the per connection parameters (as plain arrays in the OpenMM units)
+        of the connections of each table
+    """
+    library = PotentialTemplateLibrary()
+    templates = list()
+    rows = dict()
+    for table_idx, table in enumerate(tables.values()):
+        template = library.match(table, names=names)
+        if template is None:
+            raise GMSOError('{} types of expression {} cannot be converted to OpenMM forces, '
+                            'the supported forms are {}'.format(kind, table.expression, ', '.join(names)))
+        name = template.name
+        if name == 'OPLSTorsionPotential':
+            name = 'RyckaertBellemansTorsionPotential'
+            table = table.convert_form(name)
+        templates.append((name, table))
+        for row, potential in enumerate(table.potentials):
+            rows[id(potential)] = (table_idx, row)
+
+    groups = [([], []) for _ in templates]
+    for connection in connections:
+        connection_type = connection.connection_type
+        if connection_type is None:
+            raise GMSOError('Cannot convert a topology with {}s without a type '
+                            'to an OpenMM System'.format(kind))
+        key = rows.get(id(connection_type))
+        if key is None:
+            equivalent = next(other for other in potentials if other == connection_type)
+            key = rows[id(equivalent)]
+        members, type_rows = groups[key[0]]
+        members.append([site_index[id(site)] for site in connection.connection_members])
+        type_rows.append(key[1])
+
+    return [
+        (name, np.array(members, dtype=np.int64), {
+            parameter: np.asarray(values.value, dtype=float)[type_rows]
+            for parameter, values in table.parameters.items()
+        })
+        for (name, table), (members, type_rows) in zip(templates, groups) if members
+    ]
+
+
+def _repartition_hydrogen_masses(masses, is_hydrogen, bond_members, hydrogen_mass):
+    """Set the mass of the hydrogens, moving the difference to the heavy atoms they are bonded to"""
+    masses = masses.copy()
+    hydrogens = is_hydrogen[bond_members]
+    single = hydrogens[:, 0] != hydrogens[:, 1]
+    hydrogen = np.where(hydrogens[single, 0], bond_members[single, 0], bond_members[single, 1])
+    heavy = np.where(hydrogens[single, 0], bond_members[single, 1], bond_members[single, 0])
+    delta = hydrogen_mass - masses[hydrogen]
+    np.add.at(masses, heavy, -delta)
+    masses[hydrogen] = hydrogen_mass
+    return masses
+
+
+def _constrained(constraints, rigid_water, is_hydrogen, atomic_numbers, bond_members, angle_members):
+    """Return the masks of the bonds and angles to constrain
+
+    Angles are constrained by the distance between their outer members.
+    With rigid water, the bonds and angles of the molecules made of one
+    oxygen and two hydrogens are constrained whatever the constraints.
+    """
+    n_bonds, n_angles = len(bond_members), len(angle_members)
+    if constraints is None:
+        bonds = np.zeros(n_bonds, dtype=bool)
+    elif constraints == 'HBonds':
+        bonds = is_hydrogen[bond_members].any(axis=1)
+    else:
+        bonds = np.ones(n_bonds, dtype=bool)
+
+    angles = np.zeros(n_angles, dtype=bool)
+    if constraints == 'HAngles':
+        ends = is_hydrogen[angle_members[:, [0, 2]]]
+        oxygen_center = atomic_numbers[angle_members[:, 1]] == 8
+        angles = ends.all(axis=1) | (ends.any(axis=1) & oxygen_center)
+
+    if rigid_water and len(is_hydrogen) > 0:
+        molecules = connected_components(len(is_hydrogen), bond_members)
+        n_hydrogens = np.bincount(molecules, weights=is_hydrogen)
+        n_oxygens = np.bincount(molecules, weights=atomic_numbers == 8)
+        sizes = np.bincount(molecules)
+        water = ((sizes == 3) & (n_hydrogens == 2) & (n_oxygens == 1))[molecules]
+        bonds |= water[bond_members[:, 0]]
+        angles |= water[angle_members[:, 0]]
+    return bonds, angles
+
+
+def _angle_constraints(bond_members, bond_lengths, angle_members, angle_values):
+    """Return the pairs of sites and the distances constraining angles
+
+    An angle is constrained by the distance between its outer members at
+    the equilibrium of its bonds and angle, the vertex being the member
+    bonded to the two others.
+    """
+    lengths = {(min(i, j), max(i, j)): r_eq for (i, j), r_eq in zip(bond_members.tolist(), bond_lengths.tolist())}
+    pairs, distances = [], []
+    for (i, j, k), theta_eq in zip(angle_members.tolist(), angle_values.tolist()):
+        for first, vertex, second in ((i, j, k), (j, i, k), (i, k, j)):
+            first_length = lengths.get((min(first, vertex), max(first, vertex)))
+            second_length = lengths.get((min(second, vertex), max(second, vertex)))
+            if first_length is not None and second_length is not None:
+                break
+        else:
+            raise GMSOError('Cannot constrain the angle {}-{}-{}, whose members are not bonded'.format(i, j, k))
+        pairs.append((first, second))
+        distances.append(np.sqrt(first_length ** 2 + second_length ** 2
+                                 - 2 * first_length * second_length * np.cos(theta_eq)))
+    return pairs, distances
+
+
+def _add_torsions(system, torsions, forces):
+    """Add dihedrals or impropers to the torsion forces (created as needed) of a system"""
+    for name, members, parameters in torsions:
+        if name not in forces:
+            if name == 'PeriodicTorsionPotential':
+                forces[name] = PeriodicTorsionForce()
+            elif name == 'RyckaertBellemansTorsionPotential':
+                forces[name] = RBTorsionForce()
+            else:
+                forces[name] = CustomTorsionForce(_HARMONIC_TORSION_ENERGY)
+                forces[name].addPerTorsionParameter('k')
+                forces[name].addPerTorsionParameter('phi_eq')
+            system.addForce(forces[name])
+        force = forces[name]
+
+        if name == 'PeriodicTorsionPotential':
+            for (i, j, k, l), n, phi_eq, k_phi in zip(members.tolist(),
+                                                      np.rint(parameters['n']).astype(int).tolist(),
+                                                      parameters['phi_eq'].tolist(),
+                                                      parameters['k'].tolist()):
+                force.addTorsion(i, j, k, l, n, phi_eq, k_phi)
+        elif name == 'RyckaertBellemansTorsionPotential':
+            coefficients = np.column_stack([parameters['c{}'.format(idx)] for idx in range(6)])
+            for (i, j, k, l), c in zip(members.tolist(), coefficients.tolist()):
+                force.addTorsion(i, j, k, l, *c)
+        else:
+            for (i, j, k, l), k_phi, phi_eq in zip(members.tolist(),
+                                                   parameters['k'].tolist(),
+                                                   parameters['phi_eq'].tolist()):
+                force.addTorsion(i, j, k, l, [k_phi, phi_eq])
+    return forces
+
+
+def _add_nonbonded(system, topology, compiled, method, bond_members, scaling_factors,
+                   cutoff, switch_distance, ewald_error_tolerance):
+    """Add the NonbondedForce (and the CustomNonbondedForce if needed) of a topology to a system"""
+    library = PotentialTemplateLibrary()
+    for table in compiled['atom_types'].values():
+        if library.match(table, names=['LennardJonesPotential']) is None:
+            raise GMSOError('Atom types of expression {} cannot be converted to OpenMM forces, '
+                            'only Lennard-Jones atom types are supported'.format(table.expression))
+
+    sites = topology.sites
+    pair_table = topology.pair_parameter_table()
+    type_index = {id(atom_type): idx for idx, atom_type in enumerate(pair_table.atom_types)}
+    types = np.empty(len(sites), dtype=np.int64)
+    for idx, site in enumerate(sites):
+        if site.atom_type is None:
+            raise GMSOError('Cannot convert a topology with sites without an atom type to an OpenMM System')
+        position = type_index.get(id(site.atom_type))
+        types[idx] = position if position is not None else pair_table.index(site.atom_type)
+    sigma = np.asarray(pair_table.sigma.value, dtype=float)
+    epsilon = np.asarray(pair_table.epsilon.value, dtype=float)
+    charges = np.asarray(compiled['charges'].value, dtype=float)
+    custom = pair_table.combining_rule != 'lorentz' or pair_table.overridden.any()
+
+    nonbonded_method, custom_method = _NONBONDED_METHODS[method]
+    force = NonbondedForce()
+    force.setNonbondedMethod(getattr(NonbondedForce, nonbonded_method))
+    force.setCutoffDistance(cutoff)
+    force.setEwaldErrorTolerance(ewald_error_tolerance)
+    use_switch = method != 'NoCutoff' and 0.0 < switch_distance < cutoff
+    if use_switch:
+        force.setUseSwitchingFunction(True)
+        force.setSwitchingDistance(switch_distance)
+
+    for charge, sigma_ii, epsilon_ii in zip(charges.tolist(),
+                                            sigma[types, types].tolist(),
+                                            epsilon[types, types].tolist()):
+        force.addParticle(charge, sigma_ii, epsilon_ii)
+    force.createExceptionsFromBonds([tuple(bond) for bond in bond_members.tolist()],
+                                    scaling_factors['electrostatics14Scale'],
+                                    scaling_factors['nonBonded14Scale'])
+    system.addForce(force)
+    if not custom:
+        return
+
+    # The 1-4 exceptions follow the pair table, and the other pairs are computed
+    # by a CustomNonbondedForce, the NonbondedForce only computing electrostatics
+    for idx in range(force.getNumExceptions()):
+        i, j, charge_product, _, exception_epsilon = force.getExceptionParameters(idx)
+        if exception_epsilon.value_in_unit(exception_epsilon.unit) != 0.0:
+            force.setExceptionParameters(idx, i, j, charge_product,
+                                         sigma[types[i], types[j]],
+                                         scaling_factors['nonBonded14Scale'] * epsilon[types[i], types[j]])
+    for idx, charge in enumerate(charges.tolist()):
+        force.setParticleParameters(idx, charge, 1.0, 0.0)
 
-    # TODO: Everything
+    n_types = len(pair_table)
+    lennard_jones = CustomNonbondedForce('4*epsilon*((sigma/r)^12-(sigma/r)^6); '
+                                         'sigma=sigma_table(type1, type2); '
+                                         'epsilon=epsilon_table(type1, type2)')
+    lennard_jones.addTabulatedFunction('sigma_table', Discrete2DFunction(n_types, n_types,
+                                                                         sigma.ravel(order='F').tolist()))
+    lennard_jones.addTabulatedFunction('epsilon_table', Discrete2DFunction(n_types, n_types,
+                                                                           epsilon.ravel(order='F').tolist()))
+    lennard_jones.addPerParticleParameter('type')
+    lennard_jones.setNonbondedMethod(getattr(CustomNonbondedForce, custom_method))
+    lennard_jones.setCutoffDistance(cutoff)
+    lennard_jones.setUseLongRangeCorrection(force.getUseDispersionCorrection() and method != 'NoCutoff')
+    if use_switch:
+        lennard_jones.setUseSwitchingFunction(True)
+        lennard_jones.setSwitchingDistance(switch_distance)
+    for atom_type in types.tolist():
+        lennard_jones.addParticle([float(atom_type)])
+    lennard_jones.createExclusionsFromBonds([tuple(bond) for bond in bond_members.tolist()], 3)
+    system.addForce(lennard_jones)
@@ -1,16 +1,25 @@
 import numpy as np
 import unyt as u
-import sympy as sym
-from sympy.parsing.sympy_parser import parse_expr
 import warnings
 
 import gmso
 from gmso.utils.io import import_, has_parmed
-from gmso.core.element import element_by_name, element_by_symbol, element_by_atom_type
+from gmso.core.element import element_by_atom_type
+from gmso.lib.potential_templates import PotentialTemplateLibrary
+from gmso.utils.units import UnitSystem
+from gmso.exceptions import GMSOError
 
 if has_parmed:
     pmd = import_('parmed')
 
+# The units of ParmEd, whose angle stiffnesses are per squared radian
+_PARMED_UNITS = UnitSystem('parmed',
+                           length=u.angstrom,
+                           mass=u.Unit('amu'),
+                           time=u.ps,
+                           energy=u.Unit('kcal/mol'),
+                           angle=u.degree)
+
 def from_parmed(structure, refer_type=True):
     """Convert a parmed.Structure to a gmso.Topology
 
@@ -19,6 +28,11 @@ def from_parmed(structure, refer_type=True):
     At this point, this method can only convert AtomType, BondType and AngleType.
     Conversion of DihedralType will be implement in the near future.
 
+    The coordinates and charges of the structure are converted as arrays,
+    each ParmEd type is converted once and the sites and connections are
+    copied from a validated prototype, so that the conversion is linear in
+    the size of the structure.
+
     Parameters
     ----------
     structure : parmed.Structure
@@ -35,7 +49,6 @@ def from_parmed(structure, refer_type=True):
     assert isinstance(structure, pmd.Structure), msg
 
     top = gmso.Topology(name=structure.title)
-    site_map = dict()
 
     if np.all(structure.box):
         # This is if we choose for topology to have abox
@@ -49,135 +62,122 @@ def from_parmed(structure, refer_type=True):
     # is_parametrized = True if (isinstance(structure.atoms[i].atom_type,
     #        pmd.AtomType) for i in range(len(structure.atoms))) else False
 
-    # Consolidate parmed atomtypes and relate topology atomtypes
+    # The converted types are looked up by the identity of the ParmEd
+    # types, as comparing and hashing ParmEd types is comparatively slow
+    atom_types, bond_types, angle_types, dihedral_types = {}, {}, {}, {}
     if refer_type:
+        # Consolidate parmed atomtypes and relate topology atomtypes
         pmd_top_atomtypes = _atom_types_from_pmd(structure)
-        # Consolidate parmed bondtypes and relate to topology bondtypes
+        for atom in structure.atoms:
+            if id(atom.atom_type) not in atom_types:
+                atom_types[id(atom.atom_type)] = pmd_top_atomtypes.get(atom.atom_type) \
+                    if isinstance(atom.atom_type, pmd.AtomType) else None
+        # Consolidate parmed bondtypes, angletypes and dihedraltypes
+        # and relate them to topology bondtypes, angletypes and dihedraltypes
         pmd_top_bondtypes = _bond_types_from_pmd(structure)
-        # Consolidate parmed angletypes and relate to topology angletypes
+        bond_types = {id(btype): pmd_top_bondtypes[btype] for btype in structure.bond_types}
         pmd_top_angletypes = _angle_types_from_pmd(structure)
-        # Consolidate parmed dihedraltypes and relate to topology dihedraltypes
+        angle_types = {id(angletype): pmd_top_angletypes[angletype]
+                       for angletype in structure.angle_types}
         pmd_top_dihedraltypes = _dihedral_types_from_pmd(structure)
+        for dihedraltype in list(structure.dihedral_types) + list(structure.rb_torsion_types):
+            dihedral_types[id(dihedraltype)] = pmd_top_dihedraltypes[dihedraltype]
 
-    subtops = list()
+    sites = _sites_from_pmd(structure, atom_types)
+    top.add_sites(sites, update_types=refer_type)
     for residue in structure.residues:
-        subtop_name = ("{}[{}]").format(residue.name, residue.idx)
-        subtops.append(gmso.SubTopology(name=subtop_name, parent=top))
+        subtop = gmso.SubTopology(name="{}[{}]".format(residue.name, residue.idx))
         for atom in residue.atoms:
-            if refer_type and isinstance(atom.atom_type, pmd.AtomType):
-                site = gmso.Atom(
-                    name=atom.name,
-                    charge=atom.charge * u.elementary_charge,
-                    position=([atom.xx, atom.xy, atom.xz] * u.angstrom).in_units(
-                        u.nm),
-                    atom_type=pmd_top_atomtypes[atom.atom_type])
-            else:
-                site = gmso.Atom(
-                    name=atom.name,
-                    charge=atom.charge * u.elementary_charge,
-                    position=([atom.xx, atom.xy, atom.xz] * u.angstrom).in_units(
-                        u.nm),
-                    atom_type=None)
-            site_map[atom] = site
-            subtops[-1].add_site(site)
-        top.add_subtopology(subtops[-1])
-
-    for bond in structure.bonds:
-        # Generate bond parameters for BondType that gets passed
-        # to Bond
-        if refer_type and isinstance(bond.type, pmd.BondType):
-            top_connection = gmso.Bond(connection_members=[site_map[bond.atom1],
-                                              site_map[bond.atom2]],
-                bond_type=pmd_top_bondtypes[bond.type])
-
-        # No bond parameters, make Connection with no connection_type
-        else:
-            top_connection = gmso.Bond(connection_members=[site_map[bond.atom1],
-                                              site_map[bond.atom2]],
-                                              bond_type=None)
-
-        top.add_connection(top_connection, update_types=False)
-    top.update_topology()
-
-    for angle in structure.angles:
-        # Generate angle parameters for AngleType that gets passed
-        # to Angle
-        if refer_type and isinstance(angle.type, pmd.AngleType):
-            top_connection = gmso.Angle(connection_members=[site_map[angle.atom1],
-                                               site_map[angle.atom2],
-                                               site_map[angle.atom3]],
-                angle_type=pmd_top_angletypes[angle.type])
-        # No bond parameters, make Connection with no connection_type
-        else:
-            top_connection = gmso.Angle(connection_members=[
-                                    site_map[angle.atom1],
-                                    site_map[angle.atom2],
-                                    site_map[angle.atom3]],
-                                    angle_type=None)
-        top.add_connection(top_connection, update_types=False)
-
-    for dihedral in structure.dihedrals:
-        # Generate dihedral parameters for DihedralType that gets passed
-        # to Dihedral
-        # These all follow periodic torsions functions
-        # (even if they are improper dihedrals)
-        # Which are the default expression in top.DihedralType
-        # These periodic torsion dihedrals get stored in top.dihedrals
-        if dihedral.improper:
-            warnings.warn("ParmEd improper dihedral {} ".format(dihedral) +
-                    "following periodic torsion " +
+            subtop.add_site(sites[atom.idx], update_types=False)
+        top.add_subtopology(subtop, update=False)
+
+    # These all follow periodic torsions or RB torsions functions (even if
+    # they are improper dihedrals) and get stored in top.dihedrals
+    for attribute, expression in [('dihedrals', 'periodic torsion'),
+                                  ('rb_torsions', 'RB torsion')]:
+        n_impropers = sum(1 for dihedral in getattr(structure, attribute) if dihedral.improper)
+        if n_impropers > 0:
+            warnings.warn("{} ParmEd improper dihedrals ".format(n_impropers) +
+                    "following {} ".format(expression) +
                     "expression detected, currently accounted for as " +
-                    "topology.Dihedral with a periodic torsion expression")
-        if refer_type and isinstance(dihedral.type, pmd.DihedralType):
-            top_connection = gmso.Dihedral(connection_members=
-                    [site_map[dihedral.atom1],
-                     site_map[dihedral.atom2],
-                     site_map[dihedral.atom3],
-                     site_map[dihedral.atom4]],
-                dihedral_type=pmd_top_dihedraltypes[dihedral.type])
-        # No bond parameters, make Connection with no connection_type
-        else:
-            top_connection = gmso.Dihedral(connection_members=
-                    [site_map[dihedral.atom1],
-                     site_map[dihedral.atom2],
-                     site_map[dihedral.atom3],
-                     site_map[dihedral.atom4]],
-                dihedral_type=None)
-        top.add_connection(top_connection, update_types=False)
-
-    for rb_torsion in structure.rb_torsions:
-        # Generate dihedral parameters for DihedralType that gets passed
-        # to Dihedral
-        # These all follow RB torsion functions
-        # These RB torsion dihedrals get stored in top.dihedrals
-        if rb_torsion.improper:
-            warnings.warn("ParmEd improper dihedral {} ".format(rb_torsion) +
-                    "following RB torsion " +
-                    "expression detected, currently accounted for as " +
-                    "topology.Dihedral with a RB torsion expression")
-        if refer_type and isinstance(rb_torsion.type, pmd.RBTorsionType):
-            top_connection = gmso.Dihedral(connection_members=
-                    [site_map[rb_torsion.atom1],
-                     site_map[rb_torsion.atom2],
-                     site_map[rb_torsion.atom3],
-                     site_map[rb_torsion.atom4]],
-                dihedral_type=pmd_top_dihedraltypes[rb_torsion.type])
-        # No bond parameters, make Connection with no connection_type
-        else:
-            top_connection = gmso.Dihedral(connection_members=
-                    [site_map[rb_torsion.atom1],
-                     site_map[rb_torsion.atom2],
-                     site_map[rb_torsion.atom3],
-                     site_map[rb_torsion.atom4]],
-                dihedral_type=None)
-        top.add_connection(top_connection, update_types=False)
-
-    top.update_topology()
+                    "topology.Dihedral with a {} expression".format(expression))
+
+    connections = list()
+    for pmd_connections, connection_class, type_field, connection_types in [
+            (structure.bonds, gmso.Bond, 'bond_type', bond_types),
+            (structure.angles, gmso.Angle, 'angle_type', angle_types),
+            (structure.dihedrals, gmso.Dihedral, 'dihedral_type', dihedral_types),
+            (structure.rb_torsions, gmso.Dihedral, 'dihedral_type', dihedral_types)]:
+        connections.extend(_connections_from_pmd(pmd_connections,
+                                                 connection_class,
+                                                 type_field,
+                                                 sites,
+                                                 connection_types))
+    top.add_connections(connections, update_types=refer_type)
 
     top.combining_rule = structure.combining_rule
     return top
 
 
+def _sites_from_pmd(structure, atom_types):
+    """Create the gmso.Atom of each atom of a parmed.Structure, in order
+
+    Every site is a copy of a validated prototype with the name, charge,
+    position and atom type of its atom, the positions and charges being
+    converted for all the atoms at once.
+    """
+    n_atoms = len(structure.atoms)
+    if structure.coordinates is None:
+        xyz = np.full((n_atoms, 3), np.nan)
+    else:
+        xyz = (structure.coordinates * u.angstrom).to_value(u.nm)
+
+    charges = [atom.charge for atom in structure.atoms] * u.elementary_charge
+
+    # Iterating over unyt arrays is slow, the quantities are created from plain values
+    prototype = gmso.Atom(name='Atom', charge=0.0 * u.elementary_charge)
+    return [
+        prototype.copy(update={
+            'name_': atom.name or prototype.name,
+            'charge_': u.unyt_quantity(charge, charges.units),
+            'position_': u.unyt_array(position, u.nm),
+            'atom_type_': atom_types.get(id(atom.atom_type))
+        })
+        for atom, charge, position in zip(structure.atoms, charges.value.tolist(), xyz.tolist())
+    ]
+
+
+def _connections_from_pmd(pmd_connections, connection_class, type_field, sites, connection_types):
+    """Create the gmso connections of ParmEd bonds, angles or dihedrals
+
+    The first connection is validated and the others are copied from it
+    with their members and connection type.
+    """
+    connections = list()
+    for pmd_connection in pmd_connections:
+        members = tuple(sites[atom.idx] for atom in _pmd_members(pmd_connection))
+        connection_type = connection_types.get(id(pmd_connection.type))
+        if connections:
+            connections.append(connections[0].copy(update={
+                'connection_members_': members,
+                type_field + '_': connection_type
+            }))
+        else:
+            connections.append(connection_class(connection_members=list(members),
+                                                **{type_field: connection_type}))
+    return connections
+
+
+def _pmd_members(pmd_connection):
+    """Return the atoms of a ParmEd bond, angle or dihedral"""
+    if isinstance(pmd_connection, pmd.Bond):
+        return pmd_connection.atom1, pmd_connection.atom2
+    if isinstance(pmd_connection, pmd.Angle):
+        return pmd_connection.atom1, pmd_connection.atom2, pmd_connection.atom3
+    return (pmd_connection.atom1, pmd_connection.atom2,
+            pmd_connection.atom3, pmd_connection.atom4)
+
+
 def _atom_types_from_pmd(structure):
     """ Helper function to convert GMSO AtomType
 
@@ -197,11 +197,12 @@ def _atom_types_from_pmd(structure):
             A dictionary linking a pmd.AtomType object to its
             corresponding GMSO.AtomType object.
     """
-    unique_atom_types = set()
+    # Atoms share their AtomType instances, which are only hashed once
+    unique_atom_types = dict()
     for atom in structure.atoms:
         if isinstance(atom.atom_type, pmd.AtomType):
-            unique_atom_types.add(atom.atom_type)
-    unique_atom_types = list(unique_atom_types)
+            unique_atom_types.setdefault(id(atom.atom_type), atom.atom_type)
+    unique_atom_types = list(set(unique_atom_types.values()))
     pmd_top_atomtypes = {}
     for atom_type in unique_atom_types:
         top_atomtype = gmso.AtomType(
@@ -337,6 +338,12 @@ def to_parmed(top, refer_type=True):
     this method will need some re-work. Tentative plan is to have the
     Parmed Residue to be equivalent to the Subtopology right above Site.
 
+    The positions, charges, masses and parameters of the topology are
+    compiled in the ParmEd units with `gmso.Topology.to_unit_system`, the
+    coordinates of the structure are set as a single array and each unique
+    AtomType, BondType, AngleType and DihedralType is converted to a ParmEd
+    type exactly once.
+
     Parameters
     ----------
     top : topology.Topology
@@ -351,261 +358,274 @@ def to_parmed(top, refer_type=True):
     """
     # Sanity check
     msg = "Provided argument is not a topology.Topology."
-    assert isinstance(top, gmso.Topology)
+    assert isinstance(top, gmso.Topology), msg
+
+    compiled = top.to_unit_system(_PARMED_UNITS)
 
     # Set up Parmed structure and define general properties
     structure = pmd.Structure()
     structure.title = top.name
-    structure.box = np.concatenate((top.box.lengths.to('angstrom').value,
-                                    top.box.angles.to('degree').value))
-
-    # Maps
-    subtop_map = dict() # Map site to subtop
-    atom_map = dict() # Map site to atom
-    bond_map = dict() # Map top's bond to structure's bond
-    angle_map = dict() # Map top's angle to strucutre's angle
-    dihedral_map = dict() # Map top's dihedral to structure's dihedral
-
-    # Set up unparametrized system
-    # Build subtop_map (site -> top)
-    default_residue = pmd.Residue('RES')
-    for subtop in top.subtops:
+    if top.box is not None:
+        structure.box = np.concatenate((compiled['box_lengths'].value,
+                                        compiled['box_angles'].value))
+
+    # Map each site to the residue of its subtop, subtops being
+    # named after the residue name and number, e.g. RES[0]
+    residue_map = dict()
+    for idx, subtop in enumerate(top.subtops):
+        residue = _residue_from_subtop(subtop, idx)
         for site in subtop.sites:
-            subtop_map[site] = subtop
-
-    # Build up atom
-    for site in top.sites:
-        if site in subtop_map:
-            residue = subtop_map[site].name
-            residue_name = residue[:residue.find('[')]
-            residue_idx = int(residue[residue.find('[')+1:residue.find(']')])
-            #since subtop contains information needed to build residue
-        else:
-            residue = default_residue
-        # Check element
-        if site.element:
-            atomic_number = site.element.atomic_number
-            charge = site.element.charge
-        else:
-            atomic_number = 0
-            charge = 0
-
+            residue_map[id(site)] = residue
+
+    # Build up atoms, whose coordinates are set at once afterwards
+    for site, mass, charge in zip(top.sites,
+                                  compiled['masses'].value.tolist(),
+                                  compiled['charges'].value.tolist()):
+        residue_name, residue_idx = residue_map.get(id(site), ('RES', 0))
+        atomic_number = site.element.atomic_number if site.element else 0
         pmd_atom = pmd.Atom(atomic_number=atomic_number, name=site.name,
-                            mass=site.mass, charge=site.charge)
-        pmd_atom.xx, pmd_atom.xy, pmd_atom.xz = site.position.to('angstrom').value
-
-        # Add atom to structure
+                            mass=mass, charge=charge)
         structure.add_atom(pmd_atom, resname=residue_name, resnum=residue_idx)
-        atom_map[site] = pmd_atom
 
     # "Claim" all of the item it contains and subsequently index all of its item
     structure.residues.claim()
+    if top.n_sites > 0:
+        structure.coordinates = compiled['positions'].value
 
-    # Create and add bonds to Parmed structure
-    for bond in top.bonds:
-        site1, site2 = bond.connection_members
-        pmd_bond = pmd.Bond(atom_map[site1], atom_map[site2])
-        structure.bonds.append(pmd_bond)
-        bond_map[bond] = pmd_bond
-
-    # Create and add angles to Parmed structure
-    for angle in top.angles:
-        site1, site2, site3 = angle.connection_members
-        pmd_angle = pmd.Angle(atom_map[site1],
-                              atom_map[site2],
-                              atom_map[site3])
-        structure.angles.append(pmd_angle)
-        angle_map[angle] = pmd_angle
-
-    # Create and add dihedrals to Parmed structure
-
+    # Convert the types of each expression at once
+    atype_map, btype_map, agltype_map, dtype_map = dict(), dict(), dict(), dict()
+    if refer_type:
+        # Need to add a warning if Topology does not have types information
+        atype_map = _atom_types_from_gmso(compiled['atom_types'])
+        btype_map = _bond_types_from_gmso(structure, compiled['bond_types'])
+        agltype_map = _angle_types_from_gmso(structure, compiled['angle_types'])
+        dtype_map = _dihedral_types_from_gmso(structure, compiled['dihedral_types'])
+
+        for site, pmd_atom in zip(top.sites, structure.atoms):
+            if site.atom_type is not None:
+                atype = _pmd_type(atype_map, site.atom_type, top.atom_types)
+                pmd_atom.type = atype.name
+                pmd_atom.atom_type = atype
+
+    atoms = structure.atoms
+    site_index = {id(site): idx for idx, site in enumerate(top.sites)}
+
+    # Create and add bonds and angles to Parmed structure
+    for connections, pmd_class, pmd_connections, type_map, types in [
+            (top.bonds, pmd.Bond, structure.bonds, btype_map, top.bond_types),
+            (top.angles, pmd.Angle, structure.angles, agltype_map, top.angle_types)]:
+        for connection in connections:
+            pmd_connections.append(pmd_class(
+                *[atoms[site_index[id(site)]] for site in connection.connection_members],
+                type=_pmd_type(type_map, connection.connection_type, types)
+            ))
+
+    # Create and add dihedrals to Parmed structure, RB torsions
+    # being added to the rb_torsions of the structure
+    rb_torsion_types = _rb_torsion_types(compiled['dihedral_types'])
     for dihedral in top.dihedrals:
-        site1, site2, site3, site4 = dihedral.connection_members
-        pmd_dihedral = pmd.Dihedral(atom_map[site1],
-                                      atom_map[site2],
-                                      atom_map[site3],
-                                      atom_map[site4])
-        if (dihedral.connection_type and
-         dihedral.connection_type.expression == parse_expr(
-                                        'c0 * cos(phi)**0 + ' +
-                                        'c1 * cos(phi)**1 + ' +
-                                        'c2 * cos(phi)**2 + ' +
-                                        'c3 * cos(phi)**3 + ' +
-                                        'c4 * cos(phi)**4 + ' +
-                                        'c5 * cos(phi)**5')):
+        pmd_dihedral = pmd.Dihedral(
+            *[atoms[site_index[id(site)]] for site in dihedral.connection_members],
+            type=_pmd_type(dtype_map, dihedral.connection_type, top.dihedral_types)
+        )
+        if dihedral.connection_type is not None and id(dihedral.connection_type) in rb_torsion_types:
             structure.rb_torsions.append(pmd_dihedral)
         else:
             structure.dihedrals.append(pmd_dihedral)
-        dihedral_map[dihedral] = pmd_dihedral
-
-    # Set up structure for Connection Type conversion
-    if refer_type:
-    # Need to add a warning if Topology does not have types information
-        if top.atom_types:
-            _atom_types_from_gmso(top, structure, atom_map)
-        if top.bond_types:
-            _bond_types_from_gmso(top, structure, bond_map)
-        if top.angle_types:
-            _angle_types_from_gmso(top, structure, angle_map)
-        if top.dihedral_types:
-            _dihedral_types_from_gmso(top, structure, dihedral_map)
 
+    structure.bond_types.claim()
+    structure.angle_types.claim()
+    structure.dihedral_types.claim()
+    structure.rb_torsion_types.claim()
     return structure
 
-def _atom_types_from_gmso(top, structure, atom_map):
+
+def _residue_from_subtop(subtop, idx):
+    """Return the residue name and number of a subtop named e.g. RES[0]
+
+    Subtops which are not named after a residue are numbered by their index.
+    """
+    name = subtop.name
+    start = name.rfind('[')
+    if start > 0 and name.endswith(']'):
+        try:
+            return name[:start], int(name[start + 1:-1])
+        except ValueError:
+            pass
+    return name, idx
+
+
+def _pmd_type(type_map, potential, potentials):
+    """Return the ParmEd type of a gmso potential
+
+    The ParmEd types are mapped by the identity of the gmso potentials of the
+    topology, which a potential equal to one of those is looked up by otherwise.
+    """
+    if potential is None or not type_map:
+        return None
+    pmd_type = type_map.get(id(potential))
+    if pmd_type is None:
+        equivalent = next(other for other in potentials if other == potential)
+        pmd_type = type_map[id(equivalent)]
+    return pmd_type
+
+
+def _match_tables(tables, names, kind):
+    """Yield the ParameterTables of a topology with the name of their matching template"""
+    library = PotentialTemplateLibrary()
+    for table in tables.values():
+        template = library.match(table, names=names)
+        if template is None:
+            raise GMSOError(
+                "{} types of expression {} do not match the ParmEd default "
+                "expressions ({})".format(kind, table.expression, ', '.join(names))
+            )
+        yield template.name, table
+
+
+def _rb_torsion_types(tables):
+    """Return the ids of the dihedral types with a Ryckaert-Bellemans expression"""
+    library = PotentialTemplateLibrary()
+    return set(
+        id(dihedral_type)
+        for table in tables.values()
+        if library.match(table, names=['RyckaertBellemansTorsionPotential']) is not None
+        for dihedral_type in table.potentials
+    )
+
+
+def _atom_types_from_gmso(tables):
     """Helper function to convert Topology AtomType to Structure AtomType
 
-    This function will first check the AtomType expression of Topology and make sure it match with the one default in Parmed.
-    After that, it would start atomtyping and parametrizing this part of the structure.
+    This function will first check that the AtomType expressions of the
+    Topology match the Lennard-Jones expression of Parmed AtomTypes.
+    After that, it converts each AtomType once, from the parameters of
+    the tables of the compiled topology.
 
     Parameters
     ----------
-    top : topology.Topology
-        The topology that need to be converted
-    structure: parmed.Structure
-        The destination parmed Structure
+    tables : dict
+        The ParameterTable of the AtomTypes of each expression, in the ParmEd units
+
+    Returns
+    -------
+    atype_map : dict
+        A dictionary mapping the id of each gmso.AtomType to its parmed.AtomType
     """
-    # Maps
     atype_map = dict()
-    for atom_type in top.atom_types:
-        msg = "Atom type {} expression does not match Parmed AtomType default expression".format(atom_type.name)
-        assert atom_type.expression == parse_expr("4*epsilon*(-sigma**6/r**6 + sigma**12/r**12)"), msg
-        # Extract Topology atom type information
-        atype_name = atom_type.name
-        # Convert charge to elementary_charge
-        atype_charge = float(atom_type.charge.to('Coulomb').value) / (1.6 * 10**(-19))
-        atype_sigma = float(atom_type.parameters['sigma'].to('angstrom').value)
-        atype_epsilon = float(atom_type.parameters['epsilon'].to('kcal/mol').value)
-        atype_element = element_by_atom_type(atom_type)
-        atype_rmin = atype_sigma * 2**(1/6) / 2 # to rmin/2
-        # Create unique Parmed AtomType object
-        atype = pmd.AtomType(atype_name, None, atype_element.mass,
-                             atype_element.atomic_number, atype_charge)
-        atype.set_lj_params(atype_epsilon, atype_rmin)
-        # Type map to match AtomType to its name
-        atype_map[atype_name] = atype
-
-    for site in top.sites:
-        #Assign atom_type to atom
-        pmd_atom = atom_map[site]
-        pmd_atom.type = site.atom_type.name
-        pmd_atom.atom_type = atype_map[site.atom_type.name]
-
-def _bond_types_from_gmso(top, structure, bond_map):
+    for _, table in _match_tables(tables, ['LennardJonesPotential'], 'Atom'):
+        # Sigma to rmin/2
+        rmins = (table['sigma'].value * 2 ** (1 / 6) / 2).tolist()
+        epsilons = table['epsilon'].value.tolist()
+        for atom_type, rmin, epsilon in zip(table.potentials, rmins, epsilons):
+            atype_element = element_by_atom_type(atom_type)
+            atype_charge = float(_PARMED_UNITS.convert(atom_type.charge).value)
+            atype = pmd.AtomType(atom_type.name, None,
+                                 float(atype_element.mass.to_value(u.amu)),
+                                 atype_element.atomic_number, atype_charge)
+            atype.set_lj_params(epsilon, rmin)
+            atype_map[id(atom_type)] = atype
+    return atype_map
+
+
+def _bond_types_from_gmso(structure, tables):
     """Helper function to convert Topology BondType to Structure BondType
 
-    This function will first check the BondType expression of Topology and make sure it match with the one default in Parmed.
-    After that, it would start atomtyping and parametrizing this part of the structure.
+    This function will first check that the BondType expressions of the
+    Topology match the harmonic expression of Parmed BondTypes. After that,
+    it converts each BondType once and adds it to the structure.
 
     Parameters
     ----------
-    top : topology.Topology
-        The topology that need to be converted
     structure: parmed.Structure
         The destination parmed Structure
+    tables : dict
+        The ParameterTable of the BondTypes of each expression, in the ParmEd units
+
+    Returns
+    -------
+    btype_map : dict
+        A dictionary mapping the id of each gmso.BondType to its parmed.BondType
     """
     btype_map = dict()
-    for bond_type in top.bond_types:
-        msg = "Bond type {} expression does not match Parmed BondType default expression".format(bond_type.name)
-        assert bond_type.expression == parse_expr("0.5 * k * (r-r_eq)**2"), msg
-        # Extract Topology bond_type information
-        btype_k =  0.5 * float(bond_type.parameters['k'].to('kcal / (angstrom**2 * mol)').value)
-        btype_r_eq = float(bond_type.parameters['r_eq'].to('angstrom').value)
-        # Create unique Parmed BondType object
-        btype = pmd.BondType(btype_k, btype_r_eq)
-        # Type map to match Topology BondType with Parmed BondType
-        btype_map[bond_type] = btype
-        # Add BondType to structure.bond_types
-        structure.bond_types.append(btype)
-
-    for bond in top.bonds:
-        #Assign bond_type to bond
-        pmd_bond = bond_map[bond]
-        pmd_bond.type = btype_map[bond.connection_type]
-    structure.bond_types.claim()
-
-def _angle_types_from_gmso(top, structure, angle_map):
+    for _, table in _match_tables(tables, ['HarmonicBondPotential'], 'Bond'):
+        # ParmEd omits the factor 1/2 of harmonic potentials
+        for bond_type, k, r_eq in zip(table.potentials,
+                                      (table['k'].value / 2).tolist(),
+                                      table['r_eq'].value.tolist()):
+            btype = pmd.BondType(k, r_eq)
+            structure.bond_types.append(btype)
+            btype_map[id(bond_type)] = btype
+    return btype_map
+
+
+def _angle_types_from_gmso(structure, tables):
     """Helper function to convert Topology AngleType to Structure AngleType
 
-    This function will first check the AngleType expression of Topology and make sure it match with the one default in Parmed.
-    After that, it would start atomtyping and parametrizing the structure.
+    This function will first check that the AngleType expressions of the
+    Topology match the harmonic expression of Parmed AngleTypes. After that,
+    it converts each AngleType once and adds it to the structure.
 
     Parameters
     ----------
-    top : topology.Topology
-        The topology that need to be converted
     structure: parmed.Structure
         The destination parmed Structure
+    tables : dict
+        The ParameterTable of the AngleTypes of each expression, in the ParmEd units
+
+    Returns
+    -------
+    agltype_map : dict
+        A dictionary mapping the id of each gmso.AngleType to its parmed.AngleType
     """
     agltype_map = dict()
-    for angle_type in top.angle_types:
-        msg = "Angle type {} expression does not match Parmed AngleType default expression".format(angle_type.name)
-        assert angle_type.expression == parse_expr("0.5 * k * (theta-theta_eq)**2"), msg
-        # Extract Topology angle_type information
-        agltype_k = 0.5 * float(angle_type.parameters['k'].to('kcal / (rad**2 * mol)').value)
-        agltype_theta_eq = float(angle_type.parameters['theta_eq'].to('degree').value)
-        # Create unique Parmed AngleType object
-        agltype = pmd.AngleType(agltype_k, agltype_theta_eq)
-        # Type map to match Topology AngleType with Parmed AngleType
-        agltype_map[angle_type] = agltype
-        # Add AngleType to structure.angle_types
-        structure.angle_types.append(agltype)
-
-    for angle in top.angles:
-        #Assign angle_type to angle
-        pmd_angle = angle_map[angle]
-        pmd_angle.type = agltype_map[angle.connection_type]
-    structure.angle_types.claim()
-
-def _dihedral_types_from_gmso(top, structure, dihedral_map):
+    for _, table in _match_tables(tables, ['HarmonicAnglePotential'], 'Angle'):
+        # ParmEd omits the factor 1/2 of harmonic potentials
+        for angle_type, k, theta_eq in zip(table.potentials,
+                                           (table['k'].value / 2).tolist(),
+                                           table['theta_eq'].value.tolist()):
+            agltype = pmd.AngleType(k, theta_eq)
+            structure.angle_types.append(agltype)
+            agltype_map[id(angle_type)] = agltype
+    return agltype_map
+
+
+def _dihedral_types_from_gmso(structure, tables):
     """Helper function to convert Topology DihedralType to Structure DihedralType
 
-    This function will first check the DihedralType expression of Topology and
-    make sure it match with the one default in Parmed.
-    After that, it would start atomtyping and parametrizing the structure.
+    This function will first check that the DihedralType expressions of the
+    Topology match the periodic or RB torsion expressions of Parmed.
+    After that, it converts each DihedralType once and adds it to the
+    dihedral_types or rb_torsion_types of the structure.
 
     Parameters
     ----------
-    top : topology.Topology
-        The topology that need to be converted
     structure: parmed.Structure
         The destination parmed Structure
+    tables : dict
+        The ParameterTable of the DihedralTypes of each expression, in the ParmEd units
+
+    Returns
+    -------
+    dtype_map : dict
+        A dictionary mapping the id of each gmso.DihedralType to its
+        parmed.DihedralType or parmed.RBTorsionType
     """
     dtype_map = dict()
-    for dihedral_type in top.dihedral_types:
-        msg = "Dihedral type {} expression does not match Parmed DihedralType default expressions (Periodics, RBTorsions)".format(dihedral_type.name)
-        if dihedral_type.expression == parse_expr('k * (1 + cos(n * phi - phi_eq))**2'):
-            dtype_k = float(dihedral_type.parameters['k'].to('kcal/mol').value)
-            dtype_phi_eq = float(dihedral_type.parameters['phi_eq'].to('degrees').value)
-            dtype_n = float(dihedral_type.parameters['n'].value)
-            # Create unique Parmed DihedralType object
-            dtype = pmd.DihedralType(dtype_k, dtype_n, dtype_phi_eq)
-            # Add DihedralType to structure.dihedral_types
-            structure.dihedral_types.append(dtype)
-        elif (dihedral_type.expression == parse_expr(
-                                                  'c0 * cos(phi)**0 + ' +
-                                                  'c1 * cos(phi)**1 + ' +
-                                                  'c2 * cos(phi)**2 + ' +
-                                                  'c3 * cos(phi)**3 + ' +
-                                                  'c4 * cos(phi)**4 + ' +
-                                                  'c5 * cos(phi)**5')):
-            dtype_c0 = float(dihedral_type.parameters['c0'].to('kcal/mol').value)
-            dtype_c1 = float(dihedral_type.parameters['c1'].to('kcal/mol').value)
-            dtype_c2 = float(dihedral_type.parameters['c2'].to('kcal/mol').value)
-            dtype_c3 = float(dihedral_type.parameters['c3'].to('kcal/mol').value)
-            dtype_c4 = float(dihedral_type.parameters['c4'].to('kcal/mol').value)
-            dtype_c5 = float(dihedral_type.parameters['c5'].to('kcal/mol').value)
-            # Create unique DihedralType object
-            dtype = pmd.RBTorsionType(dtype_c0, dtype_c1, dtype_c2,
-                                      dtype_c3, dtype_c4, dtype_c5)
-            # Add RBTorsionType to structure.rb_torsion_types
-            structure.rb_torsion_types.append(dtype)
+    names = ['PeriodicTorsionPotential', 'RyckaertBellemansTorsionPotential']
+    for name, table in _match_tables(tables, names, 'Dihedral'):
+        if name == 'PeriodicTorsionPotential':
+            rows = zip(table['k'].value.tolist(),
+                       table['n'].value.tolist(),
+                       table['phi_eq'].value.tolist())
+            for dihedral_type, (k, n, phi_eq) in zip(table.potentials, rows):
+                dtype = pmd.DihedralType(k, n, phi_eq)
+                structure.dihedral_types.append(dtype)
+                dtype_map[id(dihedral_type)] = dtype
         else:
-            raise GMSOException('msg')
-        dtype_map[dihedral_type] = dtype
-
-    for dihedral in top.dihedrals:
-        pmd_dihedral = dihedral_map[dihedral]
-        pmd_dihedral.type = dtype_map[dihedral.connection_type]
-    structure.dihedral_types.claim()
-    structure.rb_torsions.claim()
+            rows = zip(*[table['c{}'.format(idx)].value.tolist() for idx in range(6)])
+            for dihedral_type, coefficients in zip(table.potentials, rows):
+                dtype = pmd.RBTorsionType(*coefficients)
+                structure.rb_torsion_types.append(dtype)
+                dtype_map[id(dihedral_type)] = dtype
+    return dtype_map
@@ -1,5 +1,6 @@
-from .top import write_top
+from .top import read_top, write_top
 from .gro import read_gro, write_gro
-from .gsd import write_gsd
+from .gsd import read_gsd, iter_gsd_frames, write_gsd, GSDTrajectoryWriter
 from .xyz import read_xyz, write_xyz
 from .lammpsdata import write_lammpsdata
+from .lammpstrj import iter_lammpstrj, write_lammpstrj
@@ -114,7 +114,7 @@ def write_gro(top, filename):
 
     """
 
-    top = _prepare_topology_to_gro(top)
+    top, xyz = _prepare_topology_to_gro(top)
 
 
     with open(filename, 'w') as out_file:
@@ -122,7 +122,7 @@ def write_gro(top, filename):
             top.name if top.name is not None else '',
             str(datetime.datetime.now())))
         out_file.write('{:d}\n'.format(top.n_sites))
-        for idx, site in enumerate(top.sites):
+        for idx, (site, position) in enumerate(zip(top.sites, xyz.tolist())):
             warnings.warn('Residue information is not currently '
                     'stored or written to GRO files.',
                      NotYetImplementedWarning)
@@ -136,9 +136,7 @@ def write_gro(top, filename):
                 res_name,
                 atom_name,
                 atom_id,
-                site.position[0].in_units(u.nm).value,
-                site.position[1].in_units(u.nm).value,
-                site.position[2].in_units(u.nm).value,
+                *position
             ))
 
         if allclose_units(top.box.angles, u.degree * [90, 90, 90], rtol= 1e-5, atol=0.1*u.degree):
@@ -165,9 +163,14 @@ def write_gro(top, filename):
 
 
 def _prepare_topology_to_gro(top):
-    """Modify topology, as necessary, to fit limitations of the GRO format."""
-    if np.min(top.positions) < 0:
-        warnings.warn('Topology contains some negative positions. Translating '
-                      'in order to ensure all coordinates are non-negative.')
+    """Modify topology, as necessary, to fit limitations of the GRO format.
 
-    return top
+    Returns the topology and the positions of its sites to write, in nm.
+    """
+    xyz = top.positions.to_value(u.nm)
+    if np.min(xyz) < 0:
+        warnings.warn('Topology contains some negative positions. Wrapping them '
+                      'into the box in order to ensure all coordinates are non-negative.')
+        xyz = top.box.wrap(xyz)
+
+    return top, xyz
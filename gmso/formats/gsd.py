@@ -1,21 +1,168 @@
-from __future__ import division
 import warnings
 
 import numpy as np
 import unyt as u
-import pytest
 from unyt.array import allclose_units
+from gmso.core.topology import Topology
+from gmso.core.atom import Atom
 from gmso.core.bond import Bond
+from gmso.core.angle import Angle
+from gmso.core.dihedral import Dihedral
+from gmso.core.improper import Improper
+from gmso.core.box import Box
 from gmso.utils.geometry import coord_shift
-from gmso.exceptions import NotYetImplementedWarning
+from gmso.utils.units import UnitSystem
+from gmso.exceptions import GMSOError, NotYetImplementedWarning
 from gmso.utils.io import has_gsd
 
-__all__ = ['write_gsd']
+__all__ = ['read_gsd', 'iter_gsd_frames', 'write_gsd', 'GSDTrajectoryWriter']
 
 if has_gsd:
     import gsd
+    import gsd.fl
     import gsd.hoomd
 
+# The HOOMD default of an orthorhombic box of unit lengths
+_DEFAULT_GSD_BOX = np.array([1.0, 1.0, 1.0, 0.0, 0.0, 0.0])
+
+
+def read_gsd(filename,
+             frame=0,
+             ref_distance=1.0 * u.nm,
+             ref_mass=1.0 * u.Unit('g/mol'),
+             ref_energy=1.0 * u.Unit('kcal/mol')):
+    """Read a frame of a GSD file (HOOMD v2 default data format) into a topology.
+
+    The particles, bonds, angles, dihedrals and impropers of the frame are
+    created first and added to the topology in bulk, and the positions,
+    masses and charges are scaled from reduced units once for all the
+    particles, see `gmso.utils.units.UnitSystem.reduced`.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the GSD file
+    frame : int, optional, default=0
+        The index of the frame to read
+    ref_distance : unyt.unyt_quantity, optional, default=1.0*u.nm
+        Reference distance for conversion from reduced units
+    ref_mass : unyt.unyt_quantity, optional, default=1.0*u.Unit('g/mol')
+        Reference mass for conversion from reduced units
+    ref_energy : unyt.unyt_quantity, optional, default=1.0*u.Unit('kcal/mol')
+        Reference energy for conversion from reduced units
+
+    Returns
+    -------
+    gmso.Topology
+        A topology whose sites are named after their particle type
+
+    Notes
+    -----
+    GSD files do not store force field parameters, so the returned topology
+    is not typed. Periodic positions are read as they are, i.e. in [-L/2, L/2]
+    for files written by HOOMD.
+
+    See Also
+    --------
+    gmso.formats.gsd.iter_gsd_frames :
+        Iterate over the positions and boxes of the frames of a GSD file
+    """
+    unit_system = UnitSystem.reduced(ref_distance=ref_distance,
+                                     ref_mass=ref_mass,
+                                     ref_energy=ref_energy)
+    with gsd.hoomd.open(filename, mode='rb') as gsd_file:
+        snapshot = gsd_file[frame]
+
+    base = unit_system.base_quantities
+    positions = (snapshot.particles.position * base['length']).to(u.nm)
+    masses = snapshot.particles.mass * base['mass']
+    charges = snapshot.particles.charge * base['charge']
+    type_names = np.asarray(snapshot.particles.types, dtype=object)[snapshot.particles.typeid]
+
+    top = Topology(name=str(filename))
+    top.box = _box_from_gsd(snapshot.configuration.box, base['length'])
+    sites = [
+        Atom(name=name, position=position, mass=mass, charge=charge)
+        for name, position, mass, charge in zip(type_names, positions, masses, charges)
+    ]
+    top.add_sites(sites, update_types=False)
+
+    for group, connection_class in ((snapshot.bonds, Bond),
+                                    (snapshot.angles, Angle),
+                                    (snapshot.dihedrals, Dihedral),
+                                    (snapshot.impropers, Improper)):
+        if group.N > 0:
+            top.add_connections(
+                (connection_class(connection_members=[sites[idx] for idx in members])
+                 for members in group.group.tolist()),
+                update_types=False
+            )
+    return top
+
+
+def iter_gsd_frames(filename,
+                    start=0,
+                    stop=None,
+                    step=1,
+                    ref_distance=1.0 * u.nm):
+    """Iterate over the positions and boxes of the frames of a GSD file
+
+    Only the positions and the box of each frame are read from the file,
+    one frame at a time, so long trajectories can be processed in constant
+    memory alongside a topology read once with `gmso.formats.gsd.read_gsd`.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the GSD file
+    start : int, optional, default=0
+        The index of the first frame
+    stop : int, optional, default=None
+        The index after the last frame, defaults to the number of frames
+    step : int, optional, default=1
+        The step between the frames
+    ref_distance : unyt.unyt_quantity, optional, default=1.0*u.nm
+        Reference distance for conversion from reduced units
+
+    Yields
+    ------
+    positions : unyt.unyt_array
+        The N x 3 positions of the particles in the frame
+    box : gmso.Box
+        The box of the frame
+    """
+    with gsd.fl.open(name=filename, mode='rb') as gsd_file:
+        for frame in range(*slice(start, stop, step).indices(gsd_file.nframes)):
+            positions = _read_chunk(gsd_file, frame, 'particles/position', None)
+            if positions is None:
+                n_particles = _read_chunk(gsd_file, frame, 'particles/N', np.zeros(1))
+                positions = np.zeros(shape=(int(n_particles[0]), 3))
+            box = _read_chunk(gsd_file, frame, 'configuration/box', _DEFAULT_GSD_BOX)
+            yield (positions.reshape(-1, 3) * ref_distance,
+                   _box_from_gsd(box, ref_distance))
+
+
+def _read_chunk(gsd_file, frame, name, default):
+    """Read a chunk of a frame, falling back to frame 0 and then to a default like HOOMD"""
+    for index in (frame, 0):
+        if gsd_file.chunk_exists(frame=index, name=name):
+            return gsd_file.read_chunk(frame=index, name=name)
+    return default
+
+
+def _box_from_gsd(gsd_box, ref_distance):
+    """Return the gmso.Box of a GSD box [lx, ly, lz, xy, xz, yz] in reduced units
+
+    The box vectors are a = (lx, 0, 0), b = (xy ly, ly, 0) and
+    c = (xz lz, yz lz, lz), following the HOOMD convention.
+    """
+    lx, ly, lz, xy, xz, yz = np.asarray(gsd_box, dtype=float)
+    vectors = np.array([[lx, 0.0, 0.0],
+                        [xy * ly, ly, 0.0],
+                        [xz * lz, yz * lz, lz]])
+    return Box.from_vectors(vectors * ref_distance)
+
+
 def write_gsd(top,
               filename,
               ref_distance=1.0 * u.nm,
@@ -48,7 +195,8 @@ def write_gsd(top,
         associated with. A value of None indicates the atom is not part of a
         rigid body.
     shift_coords : bool, optional, default=True
-        Shift coordinates from (0, L) to (-L/2, L/2) if necessary.
+        Shift coordinates from (0, L) to (-L/2, L/2) if necessary, and wrap
+        them into the (possibly triclinic) box centered on the origin.
     write_special_pairs : bool, optional, default=True
         Writes out special pair information necessary to correctly use the OPLS
         fudged 1,4 interactions in HOOMD.
@@ -61,260 +209,298 @@ def write_gsd(top,
 
     """
 
-    xyz = u.unyt_array([site.position for site in top.sites])
+    unit_system = UnitSystem.reduced(ref_distance=ref_distance,
+                                     ref_mass=ref_mass,
+                                     ref_energy=ref_energy)
+    gsd_snapshot = _topology_snapshot(top, unit_system, rigid_bodies, shift_coords, write_special_pairs)
+    with gsd.hoomd.open(filename, mode='wb') as gsd_file:
+        gsd_file.append(gsd_snapshot)
+
+
+class GSDTrajectoryWriter(object):
+    """Write a topology and a trajectory of its configurations to a GSD file
+
+    The static data of the topology (particle types, masses, charges, bonds,
+    angles, dihedrals, impropers and special pairs) is written once, with
+    its positions and box, as the first frame. Each call to
+    `GSDTrajectoryWriter.append` then writes the positions (and optionally
+    the box and velocities) of a new frame directly from arrays, which
+    readers fill in with the static data of the first frame.
+
+    Parameters
+    ----------
+    top : gmso.Topology
+        gmso.Topology object
+    filename : str
+        Path of the output file.
+    ref_distance : unyt.unyt_quantity, optional, default=1.0*u.nm
+        Reference distance for conversion to reduced units
+    ref_mass : unyt.unyt_quantity, optional, default=1.0*u.Unit('g/mol')
+        Reference mass for conversion to reduced units
+    ref_energy : unyt.unyt_quantity, optional, default=1.0*u.Unit('kcal/mol')
+        Reference energy for conversion to reduced units
+    rigid_bodies : list of int, optional, default=None
+        List of rigid body information, see `gmso.formats.gsd.write_gsd`
+    shift_coords : bool, optional, default=True
+        Shift coordinates from (0, L) to (-L/2, L/2) if necessary, and wrap
+        them into the box centered on the origin, in every frame.
+    write_special_pairs : bool, optional, default=True
+        Writes out special pair information necessary to correctly use the OPLS
+        fudged 1,4 interactions in HOOMD.
+
+    Examples
+    --------
+        >>> with GSDTrajectoryWriter(top, 'traj.gsd') as writer:  # doctest: +SKIP
+        ...     for positions in conformers:
+        ...         writer.append(positions)
+    """
+    def __init__(self,
+                 top,
+                 filename,
+                 ref_distance=1.0 * u.nm,
+                 ref_mass=1.0 * u.Unit('g/mol'),
+                 ref_energy=1.0 * u.Unit('kcal/mol'),
+                 rigid_bodies=None,
+                 shift_coords=True,
+                 write_special_pairs=True):
+        self.unit_system = UnitSystem.reduced(ref_distance=ref_distance,
+                                              ref_mass=ref_mass,
+                                              ref_energy=ref_energy)
+        self.n_sites = top.n_sites
+        self.shift_coords = shift_coords
+        self._box = top.box
+        self._step = 0
+
+        gsd_snapshot = _topology_snapshot(top, self.unit_system, rigid_bodies, shift_coords, write_special_pairs)
+        self._gsd_file = gsd.hoomd.open(filename, mode='wb')
+        self._gsd_file.append(gsd_snapshot)
+
+    @property
+    def n_frames(self):
+        """The number of frames written, including the first frame of the topology"""
+        return len(self._gsd_file)
+
+    def append(self, positions, box=None, velocities=None, step=None):
+        """Write a frame of the trajectory
+
+        Parameters
+        ----------
+        positions : unyt.unyt_array or np.ndarray
+            The N x 3 positions of the sites of the topology, in order.
+            Positions without units are assumed to be in nm
+        box : gmso.Box, optional, default=None
+            The box of the frame, the box of the previous frame if None
+        velocities : unyt.unyt_array or np.ndarray, optional, default=None
+            The N x 3 velocities of the sites. Velocities without units are
+            assumed to be in nm/ps
+        step : int, optional, default=None
+            The timestep of the frame, the timestep of the previous frame plus one if None
+        """
+        gsd_snapshot = gsd.hoomd.Snapshot()
+        # Unset data is not written, and read from the first frame instead
+        for group in (gsd_snapshot.bonds, gsd_snapshot.angles, gsd_snapshot.dihedrals,
+                      gsd_snapshot.impropers, gsd_snapshot.constraints, gsd_snapshot.pairs):
+            group.N = None
+        self._step = self._step + 1 if step is None else int(step)
+        gsd_snapshot.configuration.step = self._step
+        if box is not None:
+            self._box = box
+        # The box is written in every frame, gsd skips it when it is that of the first frame
+        gsd_snapshot.configuration.box = _gsd_box(self._box, self.unit_system)
+
+        xyz = self._in_system(positions, u.nm)
+        if xyz.shape != (self.n_sites, 3):
+            raise GMSOError('Expected positions of shape ({}, 3), got {}'.format(self.n_sites, xyz.shape))
+        if self.shift_coords:
+            xyz = _shift_coords(xyz, self._box, self.unit_system)
+        gsd_snapshot.particles.N = self.n_sites
+        gsd_snapshot.particles.position = xyz
+
+        if velocities is not None:
+            gsd_snapshot.particles.velocity = self._in_system(velocities, u.nm / u.ps)
+        self._gsd_file.append(gsd_snapshot)
+
+    def close(self):
+        """Close the GSD file"""
+        self._gsd_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _in_system(self, values, default_units):
+        """Return values (in default_units if they have none) in the reduced units, as floats"""
+        if isinstance(values, u.unyt_array):
+            return np.asarray(self.unit_system.in_system(values), dtype=float)
+        return np.asarray(values, dtype=float) * self.unit_system.conversion_factor(default_units)
+
+
+def _topology_snapshot(top, unit_system, rigid_bodies, shift_coords, write_special_pairs):
+    """Return the GSD snapshot of a topology, in the reduced units of unit_system"""
+    compiled = top.to_unit_system(unit_system)
+    xyz = np.asarray(compiled['positions'], dtype=float)
     if shift_coords:
         warnings.warn("Shifting coordinates to [-L/2, L/2]")
-        xyz = coord_shift(xyz, top.box)
+        xyz = _shift_coords(xyz, top.box, unit_system)
 
     gsd_snapshot = gsd.hoomd.Snapshot()
 
     gsd_snapshot.configuration.step = 0
     gsd_snapshot.configuration.dimensions = 3
+    gsd_snapshot.configuration.box = _gsd_box(top.box, unit_system)
 
-    # Write box information
-    if allclose_units(top.box.angles, np.array([90, 90, 90]) * u.degree, rtol=1e-5, atol=1e-8):
-        warnings.warn("Orthorhombic box detected")
-        gsd_snapshot.configuration.box = np.hstack((top.box.lengths / ref_distance,
-                                                np.zeros(3)))
-    else:
-        warnings.warn("Non-orthorhombic box detected")
-        u_vectors = top.box.get_unit_vectors()
-        lx, ly, lz = top.box.lengths / ref_distance
-        xy = u_vectors[1][0]
-        xz = u_vectors[2][0]
-        yz = u_vectors[2][1]
-        gsd_snapshot.configuration.box = np.array([lx, ly, lz, xy, xz, yz])
-
-    warnings.warn(
-        "Only writing particle and bond information."
-        " Angle and dihedral is not currently written to GSD files",
-        NotYetImplementedWarning)
-    _write_particle_information(gsd_snapshot, top, xyz, ref_distance, ref_mass,
-                                ref_energy, rigid_bodies)
-    #if write_special_pairs:
-    #    _write_pair_information(gsd_snapshot, top)
-    if top.n_bonds > 0:
-        _write_bond_information(gsd_snapshot, top)
-    #if structure.angles:
-    #    _write_angle_information(gsd_snapshot, top)
-    #if structure.rb_torsions:
-    #    _write_dihedral_information(gsd_snapshot, top)
+    type_names = _site_type_names(top)
+    _write_particle_information(gsd_snapshot, top, xyz, compiled, type_names, rigid_bodies)
 
-    with gsd.hoomd.open(filename, mode='wb') as gsd_file:
-        gsd_file.append(gsd_snapshot)
+    site_index = {id(site): idx for idx, site in enumerate(top.sites)}
+    bonds = _connection_members(top.bonds, site_index, 2)
+    angles = _connection_members(top.angles, site_index, 3)
+    dihedrals = _connection_members(top.dihedrals, site_index, 4)
+    impropers = _connection_members(top.impropers, site_index, 4)
 
+    if write_special_pairs:
+        _write_group_information(gsd_snapshot.pairs,
+                                 _special_pairs(bonds, angles, dihedrals),
+                                 type_names,
+                                 _bond_type_names)
+    _write_group_information(gsd_snapshot.bonds, bonds, type_names, _bond_type_names)
+    _write_group_information(gsd_snapshot.angles, angles, type_names, _angle_type_names)
+    _write_group_information(gsd_snapshot.dihedrals, dihedrals, type_names, _dihedral_type_names)
+    _write_group_information(gsd_snapshot.impropers, impropers, type_names, _improper_type_names)
+    return gsd_snapshot
 
-def _write_particle_information(gsd_snapshot, top, xyz, ref_distance, ref_mass,
-                                ref_energy, rigid_bodies):
-    """Write out the particle information."""
 
-    gsd_snapshot.particles.N = top.n_sites
-    warnings.warn("{} particles detected".format(top.n_sites))
-    gsd_snapshot.particles.position = xyz / ref_distance
+def _shift_coords(xyz, box, unit_system):
+    """Shift and wrap reduced positions into a box centered on the origin, see coord_shift"""
+    nm = unit_system.conversion_factor(u.nm)
+    return coord_shift(xyz / nm, box) * nm
 
-    types = [
+
+def _gsd_box(box, unit_system):
+    """Return the GSD box [lx, ly, lz, xy, xz, yz] of a box in the reduced units of unit_system
+
+    The box vectors of a gmso.Box are a = (lx, 0, 0), b = (xy ly, ly, 0)
+    and c = (xz lz, yz lz, lz), as those of a GSD box.
+    """
+    (lx, _, _), (xy, ly, _), (xz, yz, lz) = np.asarray(unit_system.in_system(box.get_vectors()), dtype=float)
+    if allclose_units(box.angles, np.array([90, 90, 90]) * u.degree, rtol=1e-5, atol=1e-8):
+        warnings.warn("Orthorhombic box detected")
+        return np.array([lx, ly, lz, 0.0, 0.0, 0.0])
+    else:
+        warnings.warn("Non-orthorhombic box detected")
+        return np.array([lx, ly, lz, xy / ly, xz / lz, yz / lz])
+
+
+def _site_type_names(top):
+    """Return the type of every site, its AtomType name or its name if it is untyped"""
+    return np.array([
         site.name if site.atom_type is None else site.atom_type.name
         for site in top.sites
-    ]
+    ], dtype=str)
 
-    unique_types = list(set(types))
-    unique_types = sorted(unique_types)
-    gsd_snapshot.particles.types = unique_types
-    warnings.warn("{} unique particle types detected".format(
-        len(unique_types)))
 
-    typeids = np.array([unique_types.index(t) for t in types])
-    gsd_snapshot.particles.typeid = typeids
+def _connection_members(connections, site_index, n_members):
+    """Return the indices of the members of connections as an M x n_members array"""
+    members = np.array([
+        [site_index[id(member)] for member in connection.connection_members]
+        for connection in connections
+    ], dtype=np.int64)
+    return members.reshape(-1, n_members)
 
-    masses = np.array([site.mass for site in top.sites])
-    masses[masses == 0] = 1.0
-    gsd_snapshot.particles.mass = masses / ref_mass
-
-    charges = np.array([site.charge for site in top.sites])
-    e0 = u.physical_constants.eps_0.in_units(
-        u.elementary_charge**2 / u.Unit('kcal*angstrom/mol'))
-    '''
-    Permittivity of free space = 2.39725e-4 e^2/((kcal/mol)(angstrom)),
-    where e is the elementary charge
-    '''
-    charge_factor = (4.0 * np.pi * e0 * ref_distance * ref_energy)**0.5
-    gsd_snapshot.particles.charge = charges / charge_factor
 
-    if rigid_bodies:
-        warnings.warn(
-            "Rigid bodies detected, but not yet implemented for GSD",
-            NotYetImplementedWarning)
-    #if rigid_bodies:
-    #    rigid_bodies = [-1 if body is None else body for body in rigid_bodies]
-    #gsd_snapshot.particles.body = rigid_bodies
+def _special_pairs(bonds, angles, dihedrals):
+    """Return the unique 1-4 pairs of the dihedrals which are not also 1-2 or 1-3 pairs"""
+    pairs = np.sort(dihedrals[:, [0, 3]], axis=1)
+    pairs = np.unique(pairs, axis=0).reshape(-1, 2)
+    excluded = np.vstack((np.sort(bonds, axis=1), np.sort(angles[:, [0, 2]], axis=1)))
+    if len(pairs) > 0 and len(excluded) > 0:
+        n = max(pairs.max(), excluded.max()) + 1
+        mask = np.isin(pairs[:, 0] * n + pairs[:, 1], excluded[:, 0] * n + excluded[:, 1])
+        pairs = pairs[~mask]
+    return pairs
 
 
-def _write_pair_information(gsd_snapshot, top):
-    """Write the special pairs in the system.
+def _join(*columns):
+    """Join columns of type names with '-'"""
+    joined = columns[0]
+    for column in columns[1:]:
+        joined = np.char.add(np.char.add(joined, '-'), column)
+    return joined
 
-        Parameters
-    ----------
-    gsd_snapshot :
-        The file object of the GSD file being written
-    structure : parmed.Structure
-        Parmed structure object holding system information
 
-    Warnings
-    --------
-    Not yet implemented for `gmso.core.topology` objects.
+def _bond_type_names(names):
+    """Return the type names of bonds (or pairs) from the M x 2 type names of their members"""
+    names = np.sort(names, axis=1)
+    return _join(names[:, 0], names[:, 1])
 
-    """
-    #pair_types = []
-    #pair_typeid = []
-    #pairs = []
-    #for ai in structure.atoms:
-    #    for aj in ai.dihedral_partners:
-    #        #make sure we don't double add
-    #        if ai.idx > aj.idx:
-    #            ps = '-'.join(sorted([ai.type, aj.type], key=natural_sort))
-    #            if ps not in pair_types:
-    #                pair_types.append(ps)
-    #            pair_typeid.append(pair_types.index(ps))
-    #            pairs.append((ai.idx, aj.idx))
-    #gsd_snapshot.pairs.types = pair_types
-    #gsd_snapshot.pairs.typeid = pair_typeid
-    #gsd_snapshot.pairs.group = pairs
-    #gsd_snapshot.pairs.N = len(pairs)
-
-
-def _write_bond_information(gsd_snapshot, top):
-    """Write the bonds in the system.
 
-    Parameters
-    ----------
-    gsd_snapshot :
-        The file object of the GSD file being written
-    top : gmso.Topology
-        Topology object holding system information
+def _angle_type_names(names):
+    """Return the type names of angles from the M x 3 type names of their members"""
+    ends = np.sort(names[:, [0, 2]], axis=1)
+    return _join(ends[:, 0], names[:, 1], ends[:, 1])
+
 
+def _dihedral_type_names(names):
+    """Return the type names of dihedrals from the M x 4 type names of their members
+
+    The members are reversed if the two central types are not in order.
     """
+    reverse = names[:, 1] > names[:, 2]
+    names = np.where(reverse[:, np.newaxis], names[:, ::-1], names)
+    return _join(names[:, 0], names[:, 1], names[:, 2], names[:, 3])
 
-    gsd_snapshot.bonds.N = top.n_bonds
-    warnings.warn("{} bonds detected".format(top.n_bonds))
-
-    unique_bond_types = set()
-    for bond in top.connections:
-        if isinstance(bond, Bond):
-            t1, t2 = bond.connection_members[0].atom_type, bond.connection_members[1].atom_type
-            if t1 is None or t2 is None:
-                t1, t2 = bond.connection_members[0].name, bond.connection_members[1].name
-            t1, t2 = sorted([t1, t2], key=lambda x: x.name)
-            bond_type = ('-'.join((t1.name, t2.name)))
-
-            unique_bond_types.add(bond_type)
-    unique_bond_types = sorted(list(unique_bond_types))
-    gsd_snapshot.bonds.types = unique_bond_types
-    warnings.warn("{} unique bond types detected".format(
-        len(unique_bond_types)))
-
-    bond_typeids = []
-    bond_groups = []
-    for bond in top.bonds:
-        if isinstance(bond, Bond):
-            t1, t2 = bond.connection_members[0].atom_type, bond.connection_members[1].atom_type
-            if t1 is None or t2 is None:
-                t1, t2 = bond.connection_members[0].name, bond.connection_members[1].name
-            t1, t2 = sorted([t1, t2], key=lambda x: x.name)
-
-            bond_type = ('-'.join((t1.name, t2.name)))
-            bond_typeids.append(unique_bond_types.index(bond_type))
-            bond_groups.append((top.sites.index(bond.connection_members[0]),
-                                top.sites.index(bond.connection_members[1])))
-
-    gsd_snapshot.bonds.typeid = bond_typeids
-    gsd_snapshot.bonds.group = bond_groups
-
-
-def _write_angle_information(gsd_snapshot, structure):
-    """Write the angles in the system.
 
-    Parameters
-    ----------
-    gsd_snapshot :
-        The file object of the GSD file being written
-    structure : parmed.Structure
-        Parmed structure object holding system information
+def _improper_type_names(names):
+    """Return the type names of impropers from the M x 4 type names of their members, in order"""
+    return _join(names[:, 0], names[:, 1], names[:, 2], names[:, 3])
 
-    Warnings
-    --------
-    Not yet implemented for gmso.core.topology objects
 
-    """
+def _write_particle_information(gsd_snapshot, top, xyz, compiled, type_names, rigid_bodies):
+    """Write out the particle information."""
 
-    #gsd_snapshot.angles.N = len(structure.angles)
+    gsd_snapshot.particles.N = top.n_sites
+    warnings.warn("{} particles detected".format(top.n_sites))
+    gsd_snapshot.particles.position = xyz
 
-    #unique_angle_types = set()
-    #for angle in structure.angles:
-    #    t1, t2, t3 = angle.atom1.type, angle.atom2.type, angle.atom3.type
-    #    t1, t3 = sorted([t1, t3], key=natural_sort)
-    #    angle_type = ('-'.join((t1, t2, t3)))
-    #    unique_angle_types.add(angle_type)
-    #unique_angle_types = sorted(list(unique_angle_types), key=natural_sort)
-    #gsd_snapshot.angles.types = unique_angle_types
+    unique_types, typeids = np.unique(type_names, return_inverse=True)
+    gsd_snapshot.particles.types = unique_types.tolist()
+    warnings.warn("{} unique particle types detected".format(
+        len(unique_types)))
+    gsd_snapshot.particles.typeid = typeids
+
+    masses = compiled['masses'].value
+    masses[masses == 0] = 1.0
+    gsd_snapshot.particles.mass = masses
 
-    #angle_typeids = []
-    #angle_groups = []
-    #for angle in structure.angles:
-    #    t1, t2, t3 = angle.atom1.type, angle.atom2.type, angle.atom3.type
-    #    t1, t3 = sorted([t1, t3], key=natural_sort)
-    #    angle_type = ('-'.join((t1, t2, t3)))
-    #    angle_typeids.append(unique_angle_types.index(angle_type))
-    #    angle_groups.append((angle.atom1.idx, angle.atom2.idx,
-    #                         angle.atom3.idx))
+    gsd_snapshot.particles.charge = compiled['charges'].value
 
-    #gsd_snapshot.angles.typeid = angle_typeids
-    #gsd_snapshot.angles.group = angle_groups
-    pass
+    if rigid_bodies:
+        warnings.warn(
+            "Rigid bodies detected, but not yet implemented for GSD",
+            NotYetImplementedWarning)
 
 
-def _write_dihedral_information(gsd_snapshot, structure):
-    """Write the dihedrals in the system.
+def _write_group_information(group, members, type_names, group_type_names):
+    """Write the members and types of a group (bonds, angles, dihedrals, impropers or pairs)
 
     Parameters
     ----------
-    gsd_snapshot :
-        The file object of the GSD file being written
-    structure : parmed.Structure
-        Parmed structure object holding system information
-
-    Warnings
-    --------
-    Not yet implemented for gmso.core.topology objects
-
+    group :
+        The group of the GSD snapshot being written, e.g. `gsd_snapshot.bonds`
+    members : np.ndarray
+        The M x k indices of the members of the M entries of the group
+    type_names : np.ndarray
+        The type name of every site
+    group_type_names : callable
+        A function returning the type name of each entry from the M x k
+        type names of their members
     """
-
-    #gsd_snapshot.dihedrals.N = len(structure.rb_torsions)
-
-    #unique_dihedral_types = set()
-    #for dihedral in structure.rb_torsions:
-    #    t1, t2 = dihedral.atom1.type, dihedral.atom2.type
-    #    t3, t4 = dihedral.atom3.type, dihedral.atom4.type
-    #    if [t2, t3] == sorted([t2, t3], key=natural_sort):
-    #        dihedral_type = ('-'.join((t1, t2, t3, t4)))
-    #    else:
-    #        dihedral_type = ('-'.join((t4, t3, t2, t1)))
-    #    unique_dihedral_types.add(dihedral_type)
-    #unique_dihedral_types = sorted(list(unique_dihedral_types), key=natural_sort)
-    #gsd_snapshot.dihedrals.types = unique_dihedral_types
-
-    #dihedral_typeids = []
-    #dihedral_groups = []
-    #for dihedral in structure.rb_torsions:
-    #    t1, t2 = dihedral.atom1.type, dihedral.atom2.type
-    #    t3, t4 = dihedral.atom3.type, dihedral.atom4.type
-    #    if [t2, t3] == sorted([t2, t3], key=natural_sort):
-    #        dihedral_type = ('-'.join((t1, t2, t3, t4)))
-    #    else:
-    #        dihedral_type = ('-'.join((t4, t3, t2, t1)))
-    #    dihedral_typeids.append(unique_dihedral_types.index(dihedral_type))
-    #    dihedral_groups.append((dihedral.atom1.idx, dihedral.atom2.idx,
-    #                            dihedral.atom3.idx, dihedral.atom4.idx))
-
-    #gsd_snapshot.dihedrals.typeid = dihedral_typeids
-    #gsd_snapshot.dihedrals.group = dihedral_groups
-    pass
+    group.N = len(members)
+    if len(members) == 0:
+        return
+    unique_types, typeids = np.unique(group_type_names(type_names[members]), return_inverse=True)
+    group.types = unique_types.tolist()
+    group.typeid = typeids
+    group.group = members
@@ -4,9 +4,7 @@ import warnings
 import numpy as np
 import unyt as u
 import datetime
-from sympy import sympify
 
-from unyt.array import allclose_units
 from gmso.core.atom import Atom
 from gmso.core.atom_type import AtomType
 from gmso.core.bond_type import BondType
@@ -15,228 +13,284 @@ from gmso.core.bond import Bond
 from gmso.core.angle import Angle
 from gmso.core.topology import Topology
 from gmso.core.box import Box
-from gmso.core.element import element_by_mass
-from gmso.utils.conversions import convert_opls_to_ryckaert, convert_ryckaert_to_opls
+from gmso.core.element import elements, elements_by_mass
 from gmso.lib.potential_templates import PotentialTemplateLibrary
-
-def write_lammpsdata(topology, filename, atom_style='full'):
+from gmso.utils.connectivity import connected_components
+from gmso.utils.units import LAMMPS_REAL
+from gmso.exceptions import GMSOError
+
+
+def _cvff_sign(parameters):
+    """Return the sign d of LAMMPS cvff impropers, K [1 + d cos(n phi)], from phi_eq"""
+    phi_eq = parameters['phi_eq'].to_value(u.degree)
+    sign = np.where(np.isclose(phi_eq % 360.0, 0.0), 1, -1)
+    if not np.all(np.isclose(phi_eq % 360.0, 0.0) | np.isclose(phi_eq % 360.0, 180.0)):
+        raise GMSOError('Only periodic impropers with phi_eq of 0 or 180 degrees '
+                        'can be written to LAMMPS, found {}'.format(phi_eq))
+    return sign
+
+
+# The LAMMPS style of each potential template, the format of its coefficients
+# and the function returning the columns of coefficients from the parameters
+# of a ParameterTable in the unit system. LAMMPS omits the factor 1/2 of
+# harmonic potentials, and RB torsions are written as OPLS torsions
+_BOND_STYLES = {
+    'HarmonicBondPotential': ('harmonic', '{:.5f}\t{:.5f}',
+                              lambda p: (p['k'] / 2, p['r_eq']))
+}
+
+_ANGLE_STYLES = {
+    'HarmonicAnglePotential': ('harmonic', '{:.5f}\t{:.5f}',
+                               lambda p: (p['k'] / 2, p['theta_eq']))
+}
+
+_DIHEDRAL_STYLES = {
+    'OPLSTorsionPotential': ('opls', '{:.5f}\t{:.5f}\t{:.5f}\t{:.5f}',
+                             lambda p: (p['k1'], p['k2'], p['k3'], p['k4'])),
+    'PeriodicTorsionPotential': ('fourier', '1\t{:.5f}\t{:d}\t{:.5f}',
+                                 lambda p: (p['k'], np.rint(p['n']).astype(int), p['phi_eq'])),
+    'HarmonicTorsionPotential': ('quadratic', '{:.5f}\t{:.5f}',
+                                 lambda p: (p['k'] / 2, p['phi_eq']))
+}
+
+_IMPROPER_STYLES = {
+    'HarmonicImproperPotential': ('harmonic', '{:.5f}\t{:.5f}',
+                                  lambda p: (p['k'] / 2, p['phi_eq'])),
+    'PeriodicTorsionPotential': ('cvff', '{:.5f}\t{:d}\t{:d}',
+                                 lambda p: (p['k'], _cvff_sign(p), np.rint(p['n']).astype(int)))
+}
+
+
+def write_lammpsdata(topology, filename, atom_style='full', unit_system=LAMMPS_REAL):
     """Output a LAMMPS data file.
 
     Outputs a LAMMPS data file in the 'full' atom style format.
-    Assumes use of 'real' units.
     See http://lammps.sandia.gov/doc/atom_style.html for more information on atom styles.
 
+    The positions, charges, masses and parameters of the topology are
+    converted to the unit system with `gmso.Topology.to_unit_system`, and
+    every section is formatted in bulk from index maps built once, so large
+    systems are written in seconds.
+
     Parameters
     ----------
     Topology : `Topology`
-        A Topology Object
+        A typed Topology Object
     filename : str
         Path of the output file
     atom_style : str, optional, default='full'
         Defines the style of atoms to be saved in a LAMMPS data file.
         The following atom styles are currently supported: 'full', 'atomic', 'charge', 'molecular'
         see http://lammps.sandia.gov/doc/atom_style.html for more information on atom styles.
+    unit_system : gmso.utils.units.UnitSystem, optional, default=gmso.utils.units.LAMMPS_REAL
+        The LAMMPS unit system of the data file, e.g. `gmso.utils.units.LAMMPS_METAL`
 
     Notes
     -----
-    See http://lammps.sandia.gov/doc/2001/data_format.html for a full description of the LAMMPS data format.  
-    This is a work in progress, as only atoms, masses, and atom_type information can be written out.
+    See http://lammps.sandia.gov/doc/2001/data_format.html for a full description of the LAMMPS data format.
+
+    The molecule ids of the 'full' and 'molecular' atom styles are the
+    connected components of the bond graph, numbered from 1.
+
+    If the topology has a box, the positions are wrapped into it (see
+    `gmso.Box.wrap`) and the image flags of the sites are written after their
+    positions, so that LAMMPS recovers the unwrapped positions.
 
-    Some of this function has been adopted from `mdtraj`'s support of the LAMMPSTRJ trajectory format. 
+    Pair coefficients are written per AtomType for topologies using the
+    geometric combining rule (the LAMMPS default), and for every pair of
+    AtomTypes (`PairIJ Coeffs`) if the topology uses another combining rule
+    or overrides any pair.
+
+    The following styles are written, the `Dihedral Coeffs` and
+    `Improper Coeffs` sections use the hybrid style if the topology has
+    potentials of several forms:
+
+    * bonds: harmonic
+    * angles: harmonic
+    * dihedrals: opls (OPLS and Ryckaert-Bellemans torsions), fourier (periodic
+      torsions) and quadratic (harmonic torsions)
+    * impropers: harmonic (harmonic impropers) and cvff (periodic impropers with
+      phi_eq of 0 or 180 degrees)
+
+    Some of this function has been adopted from `mdtraj`'s support of the LAMMPSTRJ trajectory format.
     See https://github.com/mdtraj/mdtraj/blob/master/mdtraj/formats/lammpstrj.py for details.
 
     """
     if atom_style not in ['atomic', 'charge', 'molecular', 'full']:
         raise ValueError('Atom style "{}" is invalid or is not currently supported'.format(atom_style))
-
-    # TODO: Support various unit styles
-
-    box = topology.box
+    if not topology.is_typed():
+        raise GMSOError('Cannot write the LAMMPS data file of a topology without AtomTypes')
+    molecular = atom_style in ['full', 'molecular']
+
+    compiled = topology.to_unit_system(unit_system)
+    sites = topology.sites
+    site_index = {id(site): idx for idx, site in enumerate(sites)}
+    atom_types = _type_indices(topology, topology.atom_types, [site.atom_type for site in sites])
+
+    sections = []
+    if molecular:
+        for name, connections, potentials, tables, styles in (
+                ('Bond', topology.bonds, topology.bond_types, compiled['bond_types'], _BOND_STYLES),
+                ('Angle', topology.angles, topology.angle_types, compiled['angle_types'], _ANGLE_STYLES),
+                ('Dihedral', topology.dihedrals, topology.dihedral_types, compiled['dihedral_types'], _DIHEDRAL_STYLES),
+                ('Improper', topology.impropers, topology.improper_types, compiled['improper_types'], _IMPROPER_STYLES)):
+            sections.append((name, connections, potentials, _coefficients(name, potentials, tables, styles)))
 
     with open(filename, 'w') as data:
         data.write('{} written by topology at {}\n\n'.format(
             topology.name if topology.name is not None else '',
             str(datetime.datetime.now())))
         data.write('{:d} atoms\n'.format(topology.n_sites))
-        if atom_style in ['full', 'molecular']:
-            if topology.n_bonds != 0:
-                data.write('{:d} bonds\n'.format(topology.n_bonds))
-            else:
-                data.write('0 bonds\n')
-            if topology.n_angles != 0:
-                data.write('{:d} angles\n'.format(topology.n_angles))
-            else:
-                data.write('0 angles\n')
-            if topology.n_dihedrals != 0:
-                data.write('{:d} dihedrals\n\n'.format(topology.n_dihedrals))
-            else:
-                data.write('0 dihedrals\n\n')
+        if molecular:
+            for name, connections, _, _ in sections:
+                data.write('{:d} {}s\n'.format(len(connections), name.lower()))
+            data.write('\n')
 
         data.write('\n{:d} atom types\n'.format(len(topology.atom_types)))
-        data.write('{:d} bond types\n'.format(len(topology.bond_types)))
-        data.write('{:d} angle types\n'.format(len(topology.angle_types)))
-        data.write('{:d} dihedral types\n'.format(len(topology.dihedral_types)))
-
+        if molecular:
+            for name, _, potentials, _ in sections:
+                data.write('{:d} {} types\n'.format(len(potentials), name.lower()))
         data.write('\n')
 
-        # Box data
-        if allclose_units(box.angles, u.unyt_array([90,90,90],'degree'), rtol=1e-5, atol=1e-8):
-            warnings.warn("Orthorhombic box detected")
-            box.lengths.convert_to_units(u.angstrom)
-            for i,dim in enumerate(['x', 'y', 'z']):
-                data.write('{0:.6f} {1:.6f} {2}lo {2}hi\n'.format(
-                    0, box.lengths.value[i],dim))
-        else:
-            warnings.warn("Non-orthorhombic box detected")
-            box.lengths.convert_to_units(u.angstrom)
-            box.angles.convert_to_units(u.radian)
-            vectors = box.get_vectors()
-            a, b, c = box.lengths
-            alpha, beta, gamma = box.angles
-
-            lx = a
-            xy = b * np.cos(gamma)
-            xz = c * np.cos(beta)
-            ly = np.sqrt(b**2 - xy**2)
-            yz = (b*c*np.cos(alpha) - xy*xz) / ly
-            lz = np.sqrt(c**2 - xz**2 - yz**2)
-
-            xhi = vectors[0][0]
-            yhi = vectors[1][1]
-            zhi = vectors[2][2]
-            xy = vectors[1][0]
-            xz = vectors[2][0]
-            yz = vectors[2][1]
-            xlo = u.unyt_array(0, xy.units)
-            ylo = u.unyt_array(0, xy.units)
-            zlo = u.unyt_array(0, xy.units)
-
-            xlo_bound = xlo + u.unyt_array(np.min([0.0, xy, xz, xy+xz]),
-                    xy.units)
-            xhi_bound = xhi + u.unyt_array(np.max([0.0, xy, xz, xy+xz]),
-                    xy.units)
-            ylo_bound = ylo + u.unyt_array(np.min([0.0, yz]), xy.units)
-            yhi_bound = yhi + u.unyt_array(np.max([0.0, yz]), xy.units)
-            zlo_bound = zlo
-            zhi_bound = zhi
-
-            data.write('{0:.6f} {1:.6f} xlo xhi\n'.format(
-                xlo_bound.value, xhi_bound.value))
-            data.write('{0:.6f} {1:.6f} ylo yhi\n'.format(
-                ylo_bound.value, yhi_bound.value))
-            data.write('{0:.6f} {1:.6f} zlo zhi\n'.format(
-                zlo_bound.value, zhi_bound.value))
-            data.write('{0:.6f} {1:.6f} {2:.6f} xy xz yz\n'.format(
-                xy.value, xz.value, yz.value))
-
-        # TODO: Get a dictionary of indices and atom types
-        if topology.is_typed():
-            # Write out mass data
-            data.write('\nMasses\n\n')
-            for atom_type in topology.atom_types:
-                data.write('{:d}\t{:.6f}\t# {}\n'.format(
-                    topology.atom_types.index(atom_type)+1,
-                    atom_type.mass.in_units(u.g/u.mol).value,
-                    atom_type.name
-                    ))
-
-            # TODO: Modified cross-interactions
-            # Pair coefficients
-            data.write('\nPair Coeffs # lj\n\n')
-            for idx, param in enumerate(topology.atom_types):
-                data.write('{}\t{:.5f}\t{:.5f}\n'.format(
-                    idx+1,
-                    param.parameters['epsilon'].in_units(u.Unit('kcal/mol')).value,
-                    param.parameters['sigma'].in_units(u.angstrom).value
-                    ))
-
-            if topology.bonds:
-                data.write('\nBond Coeffs\n\n')
-                for idx, bond_type in enumerate(topology.bond_types):
-                    data.write('{}\t{:.5f}\t{:.5f}\n'.format(
-                        idx+1,
-                        bond_type.parameters['k'].in_units(u.Unit('kcal/mol/angstrom**2')).value/2,
-                        bond_type.parameters['r_eq'].in_units(u.Unit('angstrom')).value
-                        ))
-
-            if topology.angles: 
-                data.write('\nAngle Coeffs\n\n')
-                for idx, angle_type in enumerate(topology.angle_types):
-                    data.write('{}\t{:.5f}\t{:.5f}\n'.format(
-                        idx+1,
-                        angle_type.parameters['k'].in_units(u.Unit('kcal/mol/radian**2')).value/2,
-                        angle_type.parameters['theta_eq'].in_units(u.Unit('degree')).value
-                        ))
-
-            # TODO: Write out multiple dihedral styles
-            if topology.dihedrals:
-                data.write('\nDihedral Coeffs\n\n')
-                for idx, dihedral_type in enumerate(topology.dihedral_types):
-                    rbtorsion = PotentialTemplateLibrary()['RyckaertBellemansTorsionPotential']
-                    if (dihedral_type.expression == sympify(rbtorsion.expression) or
-                        dihedral_type.name == rbtorsion.name):
-                        dihedral_type = convert_ryckaert_to_opls(dihedral_type)
-                    data.write('{}\t{:.5f}\t{:5f}\t{:5f}\t{:.5f}\n'.format(
-                        idx+1,
-                        dihedral_type.parameters['k1'].in_units(u.Unit('kcal/mol')).value,
-                        dihedral_type.parameters['k2'].in_units(u.Unit('kcal/mol')).value,
-                        dihedral_type.parameters['k3'].in_units(u.Unit('kcal/mol')).value,
-                        dihedral_type.parameters['k4'].in_units(u.Unit('kcal/mol')).value,
-                        ))
+        if topology.box is not None:
+            data.write(_box_bounds(topology.box, unit_system))
+
+        data.write('\nMasses\n\n')
+        masses = [unit_system.in_system(atom_type.mass) for atom_type in topology.atom_types]
+        data.write(''.join(
+            '{:d}\t{:.6f}\t# {}\n'.format(idx + 1, mass, atom_type.name)
+            for idx, (mass, atom_type) in enumerate(zip(masses, topology.atom_types))
+        ))
 
+        data.write(_pair_coefficients(topology, unit_system))
+
+        for name, connections, potentials, (style_names, lines) in sections:
+            if connections:
+                if len(set(style_names)) > 1:
+                    data.write('\n{} Coeffs # hybrid\n\n'.format(name))
+                    lines = ['{}\t{}'.format(style, line) for style, line in zip(style_names, lines)]
+                else:
+                    data.write('\n{} Coeffs # {}\n\n'.format(name, style_names[0]))
+                data.write(''.join('{:d}\t{}\n'.format(idx + 1, line) for idx, line in enumerate(lines)))
 
         # Atom data
         data.write('\nAtoms\n\n')
-        if atom_style == 'atomic':
-            atom_line = '{index:d}\t{type_index:d}\t{x:.6f}\t{y:.6f}\t{z:.6f}\n'
-        elif atom_style == 'charge':
-            atom_line = '{index:d}\t{type_index:d}\t{charge:.6f}\t{x:.6f}\t{y:.6f}\t{z:.6f}\n'
-        elif atom_style == 'molecular':
-            atom_line = '{index:d}\t{zero:d}\t{type_index:d}\t{x:.6f}\t{y:.6f}\t{z:.6f}\n'
-        elif atom_style == 'full':
-            atom_line ='{index:d}\t{zero:d}\t{type_index:d}\t{charge:.6f}\t{x:.6f}\t{y:.6f}\t{z:.6f}\n'
-
-        for i, site in enumerate(topology.sites):
-            data.write(atom_line.format(
-                index=topology.sites.index(site)+1,
-                type_index=topology.atom_types.index(site.atom_type)+1,
-                zero=0,charge=site.charge.to(u.elementary_charge).value,
-                x=site.position[0].in_units(u.angstrom).value,
-                y=site.position[1].in_units(u.angstrom).value,
-                z=site.position[2].in_units(u.angstrom).value))
-
-        if topology.bonds:
-            data.write('\nBonds\n\n')
-            for i, bond in enumerate(topology.bonds):
-                data.write('{:d}\t{:d}\t{:d}\t{:d}\n'.format(
-                i+1,
-                topology.bond_types.index(bond.connection_type)+1,
-                topology.sites.index(bond.connection_members[0])+1,
-                topology.sites.index(bond.connection_members[1])+1
+        xyz = np.asarray(compiled['positions'].value, dtype=float)
+        if topology.box is not None:
+            # The positions are wrapped into the box, with their periodic images as image flags
+            nm = unit_system.conversion_factor(u.nm)
+            fractional = topology.box.to_fractional(xyz / nm)
+            images = np.floor(fractional)
+            xyz = topology.box.from_fractional(fractional - images).value * nm
+        charges = np.asarray(compiled['charges'].value, dtype=float)
+        columns, formats = [np.arange(1, len(sites) + 1)], ['{:d}']
+        if molecular:
+            bonds = np.array([[site_index[id(member)] for member in bond.connection_members]
+                              for bond in topology.bonds], dtype=np.int64).reshape(-1, 2)
+            columns.append(connected_components(len(sites), bonds) + 1)
+            formats.append('{:d}')
+        columns.append(atom_types + 1)
+        formats.append('{:d}')
+        if atom_style in ['charge', 'full']:
+            columns.append(charges)
+            formats.append('{:.6f}')
+        columns.extend(xyz.T)
+        formats.extend(['{:.6f}'] * 3)
+        if topology.box is not None:
+            columns.extend(images.astype(np.int64).T)
+            formats.extend(['{:d}'] * 3)
+        atom_line = '\t'.join(formats) + '\n'
+        data.write(''.join(atom_line.format(*row) for row in zip(*[column.tolist() for column in columns])))
+
+        for name, connections, potentials, _ in sections:
+            if connections:
+                data.write('\n{}s\n\n'.format(name))
+                n_members = len(connections[0].connection_members)
+                members = np.array([[site_index[id(member)] for member in connection.connection_members]
+                                    for connection in connections], dtype=np.int64).reshape(-1, n_members)
+                types = _type_indices(topology, potentials, [connection.connection_type for connection in connections])
+                connection_line = '\t'.join(['{:d}'] * (n_members + 2)) + '\n'
+                data.write(''.join(
+                    connection_line.format(*row)
+                    for row in zip(range(1, len(connections) + 1), (types + 1).tolist(), *(members + 1).T.tolist())
                 ))
 
-        if topology.angles:
-            data.write('\nAngles\n\n')
-            for i, angle in enumerate(topology.angles):
-                data.write('{:d}\t{:d}\t{:d}\t{:d}\t{:d}\n'.format(
-                i+1,
-                topology.angle_types.index(angle.connection_type)+1,
-                topology.sites.index(angle.connection_members[0])+1,
-                topology.sites.index(angle.connection_members[1])+1,
-                topology.sites.index(angle.connection_members[2])+1
-                ))
 
-        if topology.dihedrals:
-            data.write('\nDihedrals\n\n')
-            for i, dihedral in enumerate(topology.dihedrals):
-                data.write('{:d}\t{:d}\t{:d}\t{:d}\t{:d}\t{:d}\n'.format(
-                i+1,
-                topology.dihedral_types.index(dihedral.connection_type)+1,
-                topology.sites.index(dihedral.connection_members[0])+1,
-                topology.sites.index(dihedral.connection_members[1])+1,
-                topology.sites.index(dihedral.connection_members[2])+1,
-                topology.sites.index(dihedral.connection_members[3])+1
-                ))
+def _type_indices(topology, potentials, objects):
+    """Return the index of the type (in `potentials`) of each site or connection"""
+    index = {id(potential): idx for idx, potential in enumerate(potentials)}
+    indices = np.empty(len(objects), dtype=np.int64)
+    for idx, potential in enumerate(objects):
+        if potential is None:
+            raise GMSOError('Cannot write the LAMMPS data file of a topology '
+                            'with sites or connections without a type')
+        position = index.get(id(potential))
+        indices[idx] = position if position is not None else topology.get_index(potential)
+    return indices
+
+
+def _coefficients(name, potentials, tables, styles):
+    """Return the LAMMPS style and the formatted coefficients of each potential
+
+    The potentials of each table (i.e. with the same expression) are matched
+    to a template once, and their coefficients are computed with array
+    operations on the parameters of the table.
+    """
+    library = PotentialTemplateLibrary()
+    row = {id(potential): idx for idx, potential in enumerate(potentials)}
+    style_names = [None] * len(potentials)
+    lines = [None] * len(potentials)
+    for table in tables.values():
+        template = library.match(table, names=list(styles) + ['RyckaertBellemansTorsionPotential'])
+        if template is not None and template.name == 'RyckaertBellemansTorsionPotential':
+            table = table.convert_form('OPLSTorsionPotential')
+            template = library['OPLSTorsionPotential']
+        if template is None or template.name not in styles:
+            raise GMSOError('Cannot write {} types with the expression {} to LAMMPS, '
+                            'the supported forms are {}'.format(name.lower(), table.expression, list(styles)))
+
+        style, line_format, coefficients = styles[template.name]
+        columns = [np.asarray(getattr(column, 'value', column)).tolist()
+                   for column in coefficients(table.parameters)]
+        for potential, values in zip(table.potentials, zip(*columns)):
+            style_names[row[id(potential)]] = style
+            lines[row[id(potential)]] = line_format.format(*values)
+    return style_names, lines
+
+
+def _pair_coefficients(topology, unit_system):
+    """Return the Pair Coeffs (or PairIJ Coeffs) section of a topology"""
+    pair_table = topology.pair_parameter_table()
+    epsilons = unit_system.in_system(pair_table.epsilon)
+    sigmas = unit_system.in_system(pair_table.sigma)
+    if pair_table.overridden.any() or pair_table.combining_rule != 'geometric':
+        i, j = pair_table.pairs()
+        return '\nPairIJ Coeffs # lj\n\n' + ''.join(
+            '{}\t{}\t{:.5f}\t{:.5f}\n'.format(*row)
+            for row in zip((i + 1).tolist(), (j + 1).tolist(),
+                           epsilons[i, j].tolist(), sigmas[i, j].tolist())
+        )
+    diagonal = np.arange(len(pair_table))
+    return '\nPair Coeffs # lj\n\n' + ''.join(
+        '{}\t{:.5f}\t{:.5f}\n'.format(*row)
+        for row in zip((diagonal + 1).tolist(),
+                       epsilons[diagonal, diagonal].tolist(), sigmas[diagonal, diagonal].tolist())
+    )
+
+
+def _box_bounds(box, unit_system):
+    """Return the bounds (and tilt factors) of a box, with its origin at zero"""
+    vectors = np.asarray(unit_system.in_system(box.get_vectors()), dtype=float)
+    if np.allclose(box.angles.to_value(u.degree), 90.0):
+        return ''.join('{0:.6f} {1:.6f} {2}lo {2}hi\n'.format(0.0, length, dim)
+                       for length, dim in zip(np.diag(vectors), ['x', 'y', 'z']))
+
+    # Unlike dump files, data files hold the bounds of the parallelepiped, not of its bounding box
+    (xhi, _, _), (xy, yhi, _), (xz, yz, zhi) = vectors
+    return ('{0:.6f} {1:.6f} xlo xhi\n'
+            '{0:.6f} {2:.6f} ylo yhi\n'
+            '{0:.6f} {3:.6f} zlo zhi\n'
+            '{4:.6f} {5:.6f} {6:.6f} xy xz yz\n').format(0.0, xhi, yhi, zhi, xy, xz, yz)
 
 
 def read_lammpsdata(filename, atom_style='full', unit_style='real', potential='lj'):
@@ -400,23 +454,32 @@ def _get_atoms(filename, topology, unit_style, type_list):
             if 'Atoms' in line.split():
                 break
     atom_lines = open(filename, 'r').readlines()[i+2:i+n_atoms+2]
-    for line in atom_lines:
+    # The elements are resolved once per atom type
+    type_elements = [
+        elements[idx] if idx >= 0 else None
+        for idx in elements_by_mass(np.array([atom_type.mass.value for atom_type in type_list])).tolist()
+    ]
+    xyz = np.array([line.split()[4:7] for line in atom_lines], dtype=float).reshape(-1, 3)
+    images = [line.split()[7:10] for line in atom_lines]
+    if topology.box is not None and all(len(image) == 3 for image in images):
+        # Positions are unwrapped with the image flags of the atoms
+        xyz += np.array(images, dtype=float).reshape(-1, 3).dot(topology.box.get_vectors().to_value(u.angstrom))
+    sites = []
+    for line, coord in zip(atom_lines, xyz):
         atom_line = line.split()
-        atom_type = atom_line[2]
+        atom_type = int(atom_line[2]) - 1
         charge = u.unyt_quantity(float(atom_line[3]), get_units(unit_style)['charge'])
-        coord = u.angstrom * u.unyt_array([
-            float(atom_line[4]),
-            float(atom_line[5]),
-            float(atom_line[6])])
         site = Atom(
             charge=charge,
-            position=coord,
-            atom_type=type_list[int(atom_type)-1]
+            position=u.unyt_array(coord, u.angstrom),
+            atom_type=type_list[atom_type]
             )
-        element = element_by_mass(site.atom_type.mass.value)
-        site.name = element.name
-        site.element = element
-        topology.add_site(site)
+        element = type_elements[atom_type]
+        if element is not None:
+            site.name = element.name
+            site.element = element
+        sites.append(site)
+    topology.add_sites(sites)
 
     topology.update_sites()
 
@@ -444,16 +507,10 @@ def _get_box_coordinates(filename, unit_style, topology):
             xz = float(tilts[1])
             yz = float(tilts[2])
            
-            xhi = float(x_line[1]) - np.max([0.0, xy, xz, xy+xz])
-            xlo = float(x_line[0]) - np.min([0.0, xy, xz, xy+xz])
-            yhi = float(y_line[1]) - np.max([0.0, yz])
-            ylo = float(y_line[0]) - np.min([0.0, yz])
-            zhi = float(z_line[1])
-            zlo = float(z_line[0])
-
-            lx = xhi - xlo
-            ly = yhi - ylo
-            lz = zhi - zlo
+            # The bounds are those of the parallelepiped, not of its bounding box
+            lx = x
+            ly = y
+            lz = z
 
             c = np.sqrt(lz**2 + xz**2 + yz**2)
             b = np.sqrt(ly**2 + xy**2)
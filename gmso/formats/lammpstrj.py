@@ -0,0 +1,203 @@
+"""Read and write LAMMPS dump (lammpstrj) trajectories"""
+from itertools import islice
+
+import numpy as np
+import unyt as u
+
+from gmso.core.box import Box
+from gmso.utils.units import LAMMPS_REAL
+from gmso.exceptions import GMSOError
+
+__all__ = ['iter_lammpstrj', 'write_lammpstrj']
+
+# The position columns of a dump, in order of preference, and whether they are scaled
+_POSITION_COLUMNS = (
+    (('x', 'y', 'z'), False),
+    (('xu', 'yu', 'zu'), False),
+    (('xs', 'ys', 'zs'), True),
+    (('xsu', 'ysu', 'zsu'), True)
+)
+
+
+def iter_lammpstrj(filename, top, unit_system=LAMMPS_REAL):
+    """Iterate over the positions and boxes of the frames of a LAMMPS dump file
+
+    The file is read one frame at a time: the header of a frame is parsed
+    line by line and its atom lines are read as a single block, from which
+    only the id and position columns are converted. Long trajectories are
+    hence processed in constant memory alongside a topology.
+
+    Orthorhombic and triclinic boxes are supported, as are unscaled
+    (x, y, z or xu, yu, zu) and scaled (xs, ys, zs or xsu, ysu, zsu)
+    positions, the first available being used in that order. The atoms
+    are sorted by their id if the dump has an id column.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the dump file
+    top : gmso.Topology
+        The topology of the trajectory, whose sites are in the order of the atom ids
+    unit_system : gmso.utils.units.UnitSystem, optional, default=gmso.utils.units.LAMMPS_REAL
+        The LAMMPS unit system of the dump file
+
+    Yields
+    ------
+    positions : unyt.unyt_array
+        The N x 3 positions of the atoms in the frame, in the length unit of the system
+    box : gmso.Box
+        The box of the frame
+    """
+    length = unit_system.base_quantities['length']
+    n_sites = top.n_sites
+    with open(filename, 'r') as dump_file:
+        while True:
+            line = dump_file.readline()
+            if not line.strip():
+                if not line:
+                    return
+                continue
+            if not line.startswith('ITEM: TIMESTEP'):
+                raise GMSOError('Expected a TIMESTEP item in {}, found {}'.format(filename, line.strip()))
+            dump_file.readline()
+
+            _expect_item(dump_file, 'NUMBER OF ATOMS', filename)
+            n_atoms = int(dump_file.readline())
+            if n_atoms != n_sites:
+                raise GMSOError('The dump file {} has a frame of {} atoms, while the topology '
+                                'has {} sites'.format(filename, n_atoms, n_sites))
+
+            box_header = _expect_item(dump_file, 'BOX BOUNDS', filename).split()[3:]
+            bounds = np.array([dump_file.readline().split() for _ in range(3)], dtype=float)
+            origin, vectors = _box_vectors(bounds, triclinic='xy' in box_header)
+
+            columns = _expect_item(dump_file, 'ATOMS', filename).split()[2:]
+            tokens = ''.join(islice(dump_file, n_atoms)).split()
+            if len(tokens) != n_atoms * len(columns):
+                raise GMSOError('Incomplete or malformed frame in {}'.format(filename))
+            xyz = _positions(tokens, columns, origin, vectors, filename)
+
+            if 'id' in columns:
+                ids = np.array(tokens[columns.index('id')::len(columns)], dtype=np.int64)
+                xyz = xyz[np.argsort(ids, kind='stable')]
+
+            yield xyz * length, Box.from_vectors(vectors * length)
+
+
+def _expect_item(dump_file, item, filename):
+    """Read the header line of an item of a frame"""
+    line = dump_file.readline()
+    if not line.startswith('ITEM: ' + item):
+        raise GMSOError('Expected a {} item in {}, found {}'.format(item, filename, line.strip()))
+    return line
+
+
+def _box_vectors(bounds, triclinic):
+    """Return the origin and the box vectors (as rows) of the box bounds of a dump frame
+
+    The bounds of a triclinic box are those of its bounding box, followed by
+    the tilt factors xy, xz and yz.
+    """
+    lo, hi = bounds[:, 0].copy(), bounds[:, 1].copy()
+    xy = xz = yz = 0.0
+    if triclinic:
+        xy, xz, yz = bounds[:, 2]
+        lo[0] -= min(0.0, xy, xz, xy + xz)
+        hi[0] -= max(0.0, xy, xz, xy + xz)
+        lo[1] -= min(0.0, yz)
+        hi[1] -= max(0.0, yz)
+    lx, ly, lz = hi - lo
+    return lo, np.array([[lx, 0.0, 0.0],
+                         [xy, ly, 0.0],
+                         [xz, yz, lz]])
+
+
+def _positions(tokens, columns, origin, vectors, filename):
+    """Convert the position columns of the atom lines of a frame"""
+    for names, scaled in _POSITION_COLUMNS:
+        if all(name in columns for name in names):
+            break
+    else:
+        raise GMSOError('The dump file {} has no position columns, found {}'.format(filename, columns))
+
+    xyz = np.empty(shape=(len(tokens) // len(columns), 3))
+    for dim, name in enumerate(names):
+        xyz[:, dim] = np.array(tokens[columns.index(name)::len(columns)], dtype=float)
+    if scaled:
+        xyz = origin + xyz.dot(vectors)
+    return xyz
+
+
+def write_lammpstrj(top, filename, frames, unit_system=LAMMPS_REAL):
+    """Write a trajectory of the configurations of a topology to a LAMMPS dump file
+
+    Each frame is written with the columns `id type x y z`, where the atom
+    types are numbered in the order of `Topology.atom_types`, as in
+    `gmso.formats.lammpsdata.write_lammpsdata`. The frames are consumed one at
+    a time, so a trajectory can be streamed from a generator, e.g.
+    `gmso.formats.lammpstrj.iter_lammpstrj` or `gmso.formats.gsd.iter_gsd_frames`.
+
+    Parameters
+    ----------
+    top : gmso.Topology
+        The topology of the trajectory
+    filename : str
+        Path of the output file
+    frames : iterable
+        The frames of the trajectory, each either the N x 3 positions of the
+        sites of the topology or a tuple of the positions and the gmso.Box of
+        the frame. Positions without units are assumed to be in nm. Frames
+        without a box use the box of the topology
+    unit_system : gmso.utils.units.UnitSystem, optional, default=gmso.utils.units.LAMMPS_REAL
+        The LAMMPS unit system of the dump file
+    """
+    n_sites = top.n_sites
+    type_index = {id(atom_type): idx + 1 for idx, atom_type in enumerate(top.atom_types)}
+    ids = np.arange(1, n_sites + 1).tolist()
+    types = [type_index.get(id(site.atom_type), 1) for site in top.sites]
+    atom_format = '{:d} {:d} {:.6f} {:.6f} {:.6f}\n'
+
+    with open(filename, 'w') as dump_file:
+        for step, frame in enumerate(frames):
+            if isinstance(frame, tuple):
+                positions, box = frame
+            else:
+                positions, box = frame, None
+            box = top.box if box is None else box
+            if box is None:
+                raise GMSOError('Frame {} has no box and the topology has no box'.format(step))
+
+            if isinstance(positions, u.unyt_array):
+                xyz = np.asarray(unit_system.in_system(positions), dtype=float)
+            else:
+                xyz = np.asarray(positions, dtype=float) * unit_system.conversion_factor(u.nm)
+            if xyz.shape != (n_sites, 3):
+                raise GMSOError('Expected positions of shape ({}, 3), got {}'.format(n_sites, xyz.shape))
+
+            dump_file.write('ITEM: TIMESTEP\n{:d}\n'.format(step))
+            dump_file.write('ITEM: NUMBER OF ATOMS\n{:d}\n'.format(n_sites))
+            dump_file.write(_box_bounds(box, unit_system))
+            dump_file.write('ITEM: ATOMS id type x y z\n')
+            dump_file.write(''.join(
+                atom_format.format(*row)
+                for row in zip(ids, types, *xyz.T.tolist())
+            ))
+
+
+def _box_bounds(box, unit_system):
+    """Return the BOX BOUNDS item of a box, with its origin at zero"""
+    vectors = np.asarray(unit_system.in_system(box.get_vectors()), dtype=float)
+    (lx, _, _), (xy, ly, _), (xz, yz, lz) = vectors
+    if np.allclose(box.angles.to_value(u.degree), 90.0):
+        return 'ITEM: BOX BOUNDS pp pp pp\n{}'.format(''.join(
+            '{:.6f} {:.6f}\n'.format(0.0, length) for length in (lx, ly, lz)
+        ))
+
+    return ('ITEM: BOX BOUNDS xy xz yz pp pp pp\n'
+            '{:.6f} {:.6f} {:.6f}\n'
+            '{:.6f} {:.6f} {:.6f}\n'
+            '{:.6f} {:.6f} {:.6f}\n').format(
+        min(0.0, xy, xz, xy + xz), lx + max(0.0, xy, xz, xy + xz), xy,
+        min(0.0, yz), ly + max(0.0, yz), xz,
+        0.0, lz, yz
+    )
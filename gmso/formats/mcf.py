@@ -2,13 +2,12 @@ import warnings
 import datetime
 
 import networkx as nx
-import sympy
 import unyt as u
 
 from gmso.core.topology import Topology
 from gmso.lib.potential_templates import PotentialTemplateLibrary
 from gmso.utils.compatibility import check_compatibility
-from gmso.utils.conversions import convert_ryckaert_to_opls
+from gmso.utils.conversions import convert_dihedral_type
 from gmso.exceptions import GMSOError
 
 
@@ -446,6 +445,17 @@ def _write_dihedral_information(mcf, top):
 
     mcf.write(header)
 
+    # Look up the style of each unique dihedral type once, RB torsions
+    # are converted to OPLS without modifying the topology
+    dihedral_styles = {}
+    for dihedral_type in top.dihedral_types:
+        dihedral_style = _get_dihedral_style(dihedral_type)
+        converted_type = dihedral_type
+        if dihedral_style == "ryckaert":
+            converted_type = convert_dihedral_type(dihedral_type, "OPLSTorsionPotential")
+            dihedral_style = "opls"
+        dihedral_styles[dihedral_type] = (dihedral_style, converted_type)
+
     # TODO: Are impropers buried in dihedrals?
     mcf.write("{:d}\n".format(len(top.dihedrals)))
     for (idx, dihedral) in enumerate(top.dihedrals):
@@ -462,13 +472,7 @@ def _write_dihedral_information(mcf, top):
                 dihedral.connection_members[3].idx + 1,
             )
         )
-        dihedral_style = _get_dihedral_style(dihedral)
-        # If ryckaert, convert to opls
-        if dihedral_style == "ryckaert":
-            dihedral.connection_type = convert_ryckaert_to_opls(
-                dihedral.connection_type
-            )
-            dihedral_style = "opls"
+        dihedral_style, dihedral_type = dihedral_styles[dihedral.connection_type]
         if dihedral_style == "opls":
             mcf.write(
                 "{:s}  "
@@ -478,19 +482,19 @@ def _write_dihedral_information(mcf, top):
                 "{:10.5f}\n".format(
                     dihedral_style,
                     0.5
-                    * dihedral.connection_type.parameters["k0"]
+                    * dihedral_type.parameters["k0"]
                     .in_units("kJ/mol")
                     .value,
                     0.5
-                    * dihedral.connection_type.parameters["k1"]
+                    * dihedral_type.parameters["k1"]
                     .in_units("kJ/mol")
                     .value,
                     0.5
-                    * dihedral.connection_type.parameters["k2"]
+                    * dihedral_type.parameters["k2"]
                     .in_units("kJ/mol")
                     .value,
                     0.5
-                    * dihedral.connection_type.parameters["k3"]
+                    * dihedral_type.parameters["k3"]
                     .in_units("kJ/mol")
                     .value,
                 )
@@ -502,11 +506,11 @@ def _write_dihedral_information(mcf, top):
                 "{:10.5f}  "
                 "{:10.5f}\n".format(
                     dihedral_style,
-                    dihedral.connection_type.parameters["k"]
+                    dihedral_type.parameters["k"]
                     .in_units("kJ/mol")
                     .value,
-                    dihedral.connection_type.parameters["n"],
-                    dihedral.connection_type.parameters["phi_eq"]
+                    dihedral_type.parameters["n"],
+                    dihedral_type.parameters["phi_eq"]
                     .in_units(u.degrees)
                     .value,
                 )
@@ -518,10 +522,10 @@ def _write_dihedral_information(mcf, top):
                 "{:10.5f}\n".format(
                     dihedral_style,
                     0.5
-                    * dihedral.connection_type.parameters["k"]
+                    * dihedral_type.parameters["k"]
                     .in_units("kJ/mol")
                     .value,
-                    dihedral.connection_type.parameters["phi_eq"]
+                    dihedral_type.parameters["phi_eq"]
                     .in_units(u.degrees)
                     .value,
                 )
@@ -694,8 +698,8 @@ def _get_dihedral_style(dihedral_type):
 
 def _get_potential_style(styles, potential):
 
+    template = potential_templates.match(potential, names=[ref.name for ref in styles.values()])
     for style, ref in styles.items():
-        if ref.independent_variables == potential.independent_variables:
-            if sympy.simplify(ref.expression - potential.expression) == 0:
-                return style
+        if template is not None and ref.name == template.name:
+            return style
     return False
@@ -1,10 +1,28 @@
+import os
+import re
 import datetime
+import warnings
 
+import numpy as np
+import sympy
 import unyt as u
 
-from gmso.core.element import element_by_atom_type
+from gmso.core.topology import Topology
+from gmso.core.subtopology import SubTopology
+from gmso.core.atom import Atom
+from gmso.core.bond import Bond
+from gmso.core.angle import Angle
+from gmso.core.dihedral import Dihedral
+from gmso.core.improper import Improper
+from gmso.core.atom_type import AtomType
+from gmso.core.bond_type import BondType
+from gmso.core.angle_type import AngleType
+from gmso.core.dihedral_type import DihedralType
+from gmso.core.improper_type import ImproperType
+from gmso.core.element import element_by_atom_type, element_by_atomic_number
 from gmso.lib.potential_templates import PotentialTemplateLibrary
 from gmso.utils.compatibility import check_compatibility
+from gmso.utils.connectivity import connected_components
 from gmso.exceptions import GMSOError
 
 
@@ -65,119 +83,264 @@ def write_top(top, filename, top_vars=None):
                     atom_type.name,
                     _lookup_atomic_number(atom_type),
                     atom_type.mass.in_units(u.amu).value,
-                    atom_type.charge.in_units(u.charge_electron).value,
+                    atom_type.charge.in_units(u.Unit(u.elementary_charge)).value,
                     'A',
                     atom_type.parameters['sigma'].in_units(u.nanometer).value,
                     atom_type.parameters['epsilon'].in_units(u.Unit('kJ/mol')).value,
                 )
             )
 
-
-        out_file.write(
-            '\n[ moleculetype ]\n'
-            '; name\t\tnrexcl\n'
-        )
-
-        # TODO: Better parsing of subtops into residues/molecules
-        n_unique_subtops = len(set([s.name for s in top.subtops]))
-        if n_unique_subtops > 1:
-            raise NotImplementedError
-        # Treat top without subtops as one residue-like "molecule"
-        elif n_unique_subtops == 0:
+        pair_table = top.pair_parameter_table()
+        if pair_table.overridden.any():
             out_file.write(
-                '{0}\t\t\t'
-                '{1}\n\n'.format(
-                    top.name,
-                    top_vars["nrexcl"], # Typically exclude 3 nearest neighbors
-                )
+                '\n[ nonbond_params ]\n'
+                '; ai\t\t'
+                'aj\t\t'
+                'funct\t\t'
+                'sigma\t\t'
+                'epsilon\n'
             )
-        # TODO: Lookup and join nrexcl from each subtop object
-        elif n_unique_subtops == 1:
-            out_file.write(
-                '{0}\t\t\t'
-                '{1}\n\n'.format(
-                    top.name,
-                    3
+            sigmas = pair_table.sigma.in_units(u.nanometer).value
+            epsilons = pair_table.epsilon.in_units(u.Unit('kJ/mol')).value
+            for i, j in zip(*pair_table.pairs(overridden_only=True)):
+                out_file.write(
+                    '{0}\t\t\t'
+                    '{1}\t\t\t'
+                    '{2}\t\t\t'
+                    '{3:.5f}\t\t\t'
+                    '{4:.5f}\n'.format(
+                        pair_table.atom_types[i].name,
+                        pair_table.atom_types[j].name,
+                        1,
+                        sigmas[i, j],
+                        epsilons[i, j],
+                    )
                 )
-            )
 
-        out_file.write(
-            '[ atoms ]\n'
-            '; nr\t\ttype\tresnr\tresidue\t\tatom\tcgnr\tcharge\t\tmass\n'
-        )
-        for site in top.sites:
-            out_file.write(
-                '{0}\t\t\t'
-                '{1}\t\t'
-                '{2}\t\t'
-                '{3}\t'
-                '{4}\t\t'
-                '{5}\t\t'
-                '{6:.5f}\t\t'
-                '{7:.5f}\n'.format(
-                    top.get_index(site) + 1,
-                    site.atom_type.name,
-                    1, # TODO: subtop idx
-                    top.name, # TODO: subtop.name
-                    _lookup_element_symbol(site.atom_type),
-                    1, # TODO: care about charge groups
-                    site.charge.in_units(u.charge_electron).value,
-                    site.atom_type.mass.in_units(u.amu).value,
-                )
-            )
+        molecule_types, molecules = _molecule_types(top)
+        for molecule_type in molecule_types:
+            _write_molecule_type(out_file, molecule_type, pot_types, top_vars)
 
         out_file.write(
-            '\n[ bonds ]\n'
-            ';   ai     aj  funct   c0      c1\n'
-        )
-        for bond in top.bonds:
-            out_file.write(
-                _write_connection(top, bond, pot_types[bond.connection_type])
+            '\n[ system ]\n'
+            '; name\n'
+            '{0}\n\n'.format(
+                top.name
             )
-
-        out_file.write(
-            '\n[ angles ]\n'
-            ';   ai     aj      ak      funct   c0      c1\n'
         )
-        for angle in top.angles:
-            out_file.write(
-                _write_connection(top, angle, pot_types[angle.connection_type])
-            )
 
         out_file.write(
-            '\n[ dihedrals ]\n'
-            ';   ai     aj      ak      al  funct   c0      c1      c2\n'
+            '[ molecules ]\n'
+            '; molecule\tnmols\n'
         )
-        for dihedral in top.dihedrals:
+        for name, n_molecules in molecules:
             out_file.write(
-                _write_connection(top, dihedral, pot_types[dihedral.connection_type])
+                '{0}\t\t{1}\n'.format(name, n_molecules)
             )
 
+
+class _MoleculeType(object):
+    """A unique molecule of a topology, to be written as a [ moleculetype ]"""
+    def __init__(self, name, sites, connections):
+        self.name = name
+        self.sites = sites
+        self.connections = connections
+
+
+def _molecule_types(top):
+    """Find the unique molecules of a topology and the runs of identical molecules
+
+    The molecules are the sub-topologies of the topology if they partition
+    its sites without connections between them, or else the connected
+    components of its bonds. Two molecules are identical if their sites have
+    the same AtomTypes and charges and their connections have the same
+    relative members and connection types, which is compared with a
+    fingerprint of index arrays per molecule. GROMACS molecules are blocks
+    of consecutive atoms, so the whole topology is written as a single
+    molecule if the molecules are not contiguous.
+
+    Returns
+    -------
+    molecule_types : list of _MoleculeType
+        The first molecule of each unique kind, in order
+    molecules : list of (str, int)
+        The name of each run of consecutive identical molecules and its length
+    """
+    sites = top.sites
+    site_index = {id(site): idx for idx, site in enumerate(sites)}
+    groups = [('bonds', top.bonds, 2), ('angles', top.angles, 3), ('dihedrals', top.dihedrals, 4)]
+    members = {
+        key: np.array([[site_index[id(member)] for member in connection.connection_members]
+                       for connection in connections], dtype=np.int64).reshape(-1, n_members)
+        for key, connections, n_members in groups
+    }
+
+    labels, names = _molecule_labels(top, sites, site_index, members)
+    n_molecules = labels[-1] + 1 if len(labels) > 0 else 0
+    if n_molecules > 1 and not np.all(np.diff(labels) >= 0):
+        warnings.warn('The molecules of the topology are not contiguous, '
+                      'writing the topology as a single molecule')
+        labels = np.zeros(len(sites), dtype=np.int64)
+        names = [top.name]
+        n_molecules = 1 if len(sites) > 0 else 0
+    starts = np.searchsorted(labels, np.arange(n_molecules))
+    sizes = np.diff(np.append(starts, len(sites)))
+
+    # Per site fingerprint: AtomType and charge
+    atom_type_ids = {}
+    site_types = np.array([atom_type_ids.setdefault(id(site.atom_type), len(atom_type_ids))
+                           for site in sites], dtype=np.int64)
+    charges = np.array([0.0 if site.charge is None else site.charge.to_value(u.C)
+                        for site in sites], dtype=float)
+    fingerprints = [
+        [size, site_types[start:start + size].tobytes(), charges[start:start + size].tobytes()]
+        for start, size in zip(starts.tolist(), sizes.tolist())
+    ]
+
+    # Per connection fingerprint: relative members and connection type, sorted per molecule
+    connection_order = {}
+    for key, connections, _ in groups:
+        connection_type_ids = {}
+        type_ids = np.array([connection_type_ids.setdefault(id(connection.connection_type),
+                                                            len(connection_type_ids))
+                             for connection in connections], dtype=np.int64)
+        molecule = labels[members[key][:, 0]]
+        relative = _canonical_members(members[key] - starts[molecule][:, np.newaxis])
+        order = np.lexsort((type_ids,) + tuple(relative.T[::-1]) + (molecule,))
+        rows = np.column_stack((relative, type_ids))[order]
+        bounds = np.searchsorted(molecule[order], np.arange(n_molecules + 1))
+        for idx, fingerprint in enumerate(fingerprints):
+            fingerprint.append(rows[bounds[idx]:bounds[idx + 1]].tobytes())
+        connection_order[key] = (order, bounds)
+
+    molecule_types = []
+    kinds = {}
+    molecule_kinds = []
+    for idx, fingerprint in enumerate(fingerprints):
+        fingerprint = tuple(fingerprint)
+        if fingerprint not in kinds:
+            kinds[fingerprint] = len(molecule_types)
+            start, size = starts[idx], sizes[idx]
+            connections = {}
+            for key, group_connections, _ in groups:
+                order, bounds = connection_order[key]
+                connections[key] = [group_connections[i] for i in order[bounds[idx]:bounds[idx + 1]]]
+            molecule_types.append(_MoleculeType(
+                _unique_name(names[idx], [molecule_type.name for molecule_type in molecule_types]),
+                sites[start:start + size],
+                connections
+            ))
+        molecule_kinds.append(kinds[fingerprint])
+
+    molecules = []
+    for kind in molecule_kinds:
+        if molecules and molecules[-1][0] == kind:
+            molecules[-1][1] += 1
+        else:
+            molecules.append([kind, 1])
+    return molecule_types, [(molecule_types[kind].name, count) for kind, count in molecules]
+
+
+def _canonical_members(members):
+    """Return the members of connections in the direction whose indices compare lowest
+
+    A connection is the same whether read forwards or backwards, e.g.
+    the angles 1-2-3 and 3-2-1.
+    """
+    reverse = members[:, ::-1]
+    differs = reverse != members
+    first_difference = np.argmax(differs, axis=1)
+    rows = np.arange(len(members))
+    flip = differs[rows, first_difference] & (reverse[rows, first_difference] < members[rows, first_difference])
+    return np.where(flip[:, np.newaxis], reverse, members)
+
+
+def _molecule_labels(top, sites, site_index, members):
+    """Return the index of the molecule of every site and the name of every molecule"""
+    if top.n_subtops > 0:
+        subtops = top.subtops
+        labels = np.full(len(sites), -1, dtype=np.int64)
+        for idx, subtop in enumerate(subtops):
+            labels[[site_index[id(site)] for site in subtop.sites]] = idx
+        if np.all(labels >= 0) and all(np.all(labels[group_members] == labels[group_members[:, :1]])
+                                       for group_members in members.values()):
+            # Number the molecules in the order of their first site
+            subtop_labels, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+            order = np.argsort(first)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            return rank[inverse], [_molecule_name(subtops[label].name) for label in subtop_labels[order]]
+
+    labels = connected_components(len(sites), members['bonds'])
+    n_molecules = labels.max() + 1 if len(labels) > 0 else 0
+    return labels, [top.name] * n_molecules
+
+
+def _molecule_name(name):
+    """Return the name of a molecule from the name of a sub-topology, without its residue index"""
+    return re.sub(r'\[\d+\]$', '', name) or name
+
+
+def _unique_name(name, names):
+    """Return a name which is not in names, adding a numeric suffix if needed"""
+    if name not in names:
+        return name
+    suffix = 1
+    while '{}{}'.format(name, suffix) in names:
+        suffix += 1
+    return '{}{}'.format(name, suffix)
+
+
+def _write_molecule_type(out_file, molecule_type, pot_types, top_vars):
+    """Write the [ moleculetype ] of a molecule with its atoms and connections"""
+    out_file.write(
+        '\n[ moleculetype ]\n'
+        '; name\t\tnrexcl\n'
+        '{0}\t\t\t'
+        '{1}\n\n'.format(
+            molecule_type.name,
+            top_vars["nrexcl"], # Typically exclude 3 nearest neighbors
+        )
+    )
+
+    out_file.write(
+        '[ atoms ]\n'
+        '; nr\t\ttype\tresnr\tresidue\t\tatom\tcgnr\tcharge\t\tmass\n'
+    )
+    site_index = {}
+    for idx, site in enumerate(molecule_type.sites):
+        site_index[id(site)] = idx + 1
         out_file.write(
-            '\n[ system ]\n'
-            '; name\n'
-            '{0}\n\n'.format(
-                top.name
+            '{0}\t\t\t'
+            '{1}\t\t'
+            '{2}\t\t'
+            '{3}\t'
+            '{4}\t\t'
+            '{5}\t\t'
+            '{6:.5f}\t\t'
+            '{7:.5f}\n'.format(
+                idx + 1,
+                site.atom_type.name,
+                1,
+                molecule_type.name,
+                _lookup_element_symbol(site.atom_type),
+                1, # TODO: care about charge groups
+                site.charge.in_units(u.Unit(u.elementary_charge)).value,
+                site.atom_type.mass.in_units(u.amu).value,
             )
         )
 
-        if len(set([s.name for s in top.subtops])) > 1:
-            raise NotImplementedError
-
-        # TODO: Write out atom types for each unique `subtop` in `atoms` section
-        # and write out number of molecules in `molecules` section
-        #if len(top.subtops) == 0:
-        out_file.write(
-            '[ molecules ]\n'
-            '; molecule\tnmols\n'
-            '{0}\t\t{1}'.format(top.name, 1)
-        )
-        #elif len(top.subtops) > 0:
-        #    out_file.write(
-        #        '[ molecules ]\n'
-        #        '; molecule\tnmols\n'
-        #        '{0}\t\t{1}'.format(top.subtops[0].name, top.n_subtops)
-        #    )
+    headers = {
+        'bonds': ';   ai     aj  funct   c0      c1\n',
+        'angles': ';   ai     aj      ak      funct   c0      c1\n',
+        'dihedrals': ';   ai     aj      ak      al  funct   c0      c1      c2\n',
+    }
+    for key, header in headers.items():
+        out_file.write('\n[ {} ]\n'.format(key) + header)
+        for connection in molecule_type.connections[key]:
+            out_file.write(
+                _write_connection(site_index, connection, pot_types[connection.connection_type])
+            )
 
 
 def _accepted_potentials():
@@ -236,7 +399,7 @@ def _lookup_element_symbol(atom_type):
     except GMSOError:
         return "X"
 
-def _write_connection(top, connection, potential_name):
+def _write_connection(site_index, connection, potential_name):
     """ Worker function to write a single dihedral
 
     This first gets the form of the dihedral and then sends to form-specific
@@ -250,13 +413,14 @@ def _write_connection(top, connection, potential_name):
             "PeriodicTorsionPotential": _periodic_torsion_writer,
             }
 
-    return worker_functions[potential_name](top, connection)
+    indices = [site_index[id(member)] for member in connection.connection_members]
+    return worker_functions[potential_name](indices, connection)
 
 
-def _harmonic_bond_potential_writer(top, bond):
+def _harmonic_bond_potential_writer(indices, bond):
     line = "\t{0}\t{1}\t{2}\t{3:.5f}\t{4:.5f}\n".format(
-            top.get_index(bond.connection_members[0]) + 1,
-            top.get_index(bond.connection_members[1]) + 1,
+            indices[0],
+            indices[1],
             '1',
             bond.connection_type.parameters['r_eq'].in_units(u.nm).value,
             bond.connection_type.parameters['k'].in_units(
@@ -265,11 +429,11 @@ def _harmonic_bond_potential_writer(top, bond):
     return line
 
 
-def _harmonic_angle_potential_writer(top, angle):
+def _harmonic_angle_potential_writer(indices, angle):
     line = "\t{0}\t{1}\t{2}\t{3}\t{4:.5f}\t{5:.5f}\n".format(
-            top.get_index(angle.connection_members[0]) + 1,
-            top.get_index(angle.connection_members[1]) + 1,
-            top.get_index(angle.connection_members[2]) + 1,
+            indices[0],
+            indices[1],
+            indices[2],
             '1',
             angle.connection_type.parameters['theta_eq'].in_units(u.degree).value,
             angle.connection_type.parameters['k'].in_units(
@@ -278,12 +442,12 @@ def _harmonic_angle_potential_writer(top, angle):
     return line
 
 
-def _ryckaert_bellemans_torsion_writer(top, dihedral):
+def _ryckaert_bellemans_torsion_writer(indices, dihedral):
     line = "\t{0}\t{1}\t{2}\t{3}\t{4}\t{5:.5f}\t{6:.5f}\t{7:.5f}\t{8:.5f}\t{9:.5f}\t{10:.5f}\n".format(
-            top.get_index(dihedral.connection_members[0]) + 1,
-            top.get_index(dihedral.connection_members[1]) + 1,
-            top.get_index(dihedral.connection_members[2]) + 1,
-            top.get_index(dihedral.connection_members[3]) + 1,
+            indices[0],
+            indices[1],
+            indices[2],
+            indices[3],
             '3',
             dihedral.connection_type.parameters['c0'].in_units(u.Unit('kJ/mol')).value,
             dihedral.connection_type.parameters['c1'].in_units(u.Unit('kJ/mol')).value,
@@ -295,12 +459,12 @@ def _ryckaert_bellemans_torsion_writer(top, dihedral):
     return line
 
 
-def _periodic_torsion_writer(top, dihedral):
+def _periodic_torsion_writer(indices, dihedral):
     line = "\t{0}\t{1}\t{2}\t{3}\t{4}\t{5:.5f}\t{6:.5f}\t{7}\n".format(
-            top.get_index(dihedral.connection_members[0]) + 1,
-            top.get_index(dihedral.connection_members[1]) + 1,
-            top.get_index(dihedral.connection_members[2]) + 1,
-            top.get_index(dihedral.connection_members[3]) + 1,
+            indices[0],
+            indices[1],
+            indices[2],
+            indices[3],
             '1',
             dihedral.connection_type.parameters['phi_eq'].in_units(u.degree).value,
             dihedral.connection_type.parameters['k'].in_units(u.Unit('kJ/(mol)')).value,
@@ -308,3 +472,456 @@ def _periodic_torsion_writer(top, dihedral):
             )
     return line
 
+
+
+def read_top(filename, defines=None, include_dirs=None):
+    """Read a GROMACS topology (.TOP) file into a gmso.core.Topology object
+
+    The file is read line by line, resolving `#include` files and the
+    `#define`, `#undef`, `#ifdef`, `#ifndef`, `#else` and `#endif`
+    preprocessor directives as grompp does, and substituting defined
+    macros in the data lines. The sites and connections of each
+    [ moleculetype ] are validated once, as a template, and the template is
+    copied for each of the molecules listed in [ molecules ].
+
+    Parameters
+    ----------
+    filename : str
+        Path of the topology file
+    defines : dict or iterable of str, optional, default=None
+        Macros to define before reading the file, as with `-DNAME` in the
+        `define` option of a GROMACS .mdp file, e.g. `{'FLEXIBLE': ''}`
+    include_dirs : list of str, optional, default=None
+        Directories to search for included files, after the directory of the
+        including file. The directories of the GMXLIB and GMXDATA environment
+        variables are searched last
+
+    Returns
+    -------
+    gmso.Topology
+        A typed topology with one SubTopology per molecule, without positions
+
+    Notes
+    -----
+    The [ atomtypes ], [ nonbond_params ], [ bondtypes ], [ angletypes ],
+    [ dihedraltypes ], [ moleculetype ], [ atoms ], [ bonds ], [ angles ],
+    [ dihedrals ], [ system ] and [ molecules ] sections are read. Harmonic
+    bonds and angles (function type 1), periodic (1, 4 and 9), Ryckaert-Bellemans
+    (3) and harmonic improper (2) dihedrals are supported. Multiple periodic
+    dihedrals (function type 9) of the same atoms, in consecutive lines of
+    [ dihedrals ] or [ dihedraltypes ], are read as a single DihedralType
+    summing a PeriodicTorsionPotential term per line.
+
+    The other sections are skipped with a warning. In particular, the
+    [ pairs ] and [ exclusions ] sections are not read, since a gmso.Topology
+    has no explicit 1-4 pairs or exclusions: writers derive them from the
+    bonds of the topology (e.g. `gen-pairs` in `write_top`), which differs
+    from the file if its pairs or exclusions are not those of the bonds.
+    """
+    if defines is None:
+        defines = {}
+    elif not isinstance(defines, dict):
+        defines = {name: '' for name in defines}
+    include_dirs = list(include_dirs or []) + _gromacs_include_dirs()
+
+    reader = _TopReader()
+    section = None
+    for line in _preprocess(filename, dict(defines), include_dirs):
+        if line.startswith('['):
+            section = line.strip('[] \t').lower()
+            continue
+        reader.read(section, line.split())
+
+    return reader.topology()
+
+
+def _gromacs_include_dirs():
+    """Return the directories of the GROMACS force fields from the environment"""
+    include_dirs = []
+    for variable, subdirectory in (('GMXLIB', ''), ('GMXDATA', 'top')):
+        if os.environ.get(variable):
+            include_dirs.extend(os.path.join(path, subdirectory)
+                                for path in os.environ[variable].split(os.pathsep))
+    return include_dirs
+
+
+def _preprocess(filename, defines, include_dirs, conditions=None):
+    """Yield the lines of a topology file, without comments, after preprocessing
+
+    Parameters
+    ----------
+    filename : str
+        Path of the file to read
+    defines : dict
+        The defined macros and their values, updated by `#define` and `#undef`
+    include_dirs : list of str
+        Directories to search for included files
+    conditions : list of bool, optional, default=None
+        Whether each enclosing `#ifdef`/`#ifndef` block is active, shared with
+        the including file
+    """
+    if conditions is None:
+        conditions = []
+    with open(filename, 'r') as top_file:
+        continued = ''
+        for line in top_file:
+            line = line.split(';', 1)[0].rstrip()
+            if line.endswith('\\'):
+                continued += line[:-1] + ' '
+                continue
+            line = (continued + line).strip()
+            continued = ''
+            if not line:
+                continue
+
+            if line.startswith('#'):
+                tokens = line[1:].split(None, 2)
+                if not tokens:
+                    continue
+                directive = tokens[0]
+                if directive == 'ifdef':
+                    conditions.append(tokens[1] in defines)
+                elif directive == 'ifndef':
+                    conditions.append(tokens[1] not in defines)
+                elif directive == 'else':
+                    if not conditions:
+                        raise GMSOError('#else without #ifdef in {}'.format(filename))
+                    conditions[-1] = not conditions[-1]
+                elif directive == 'endif':
+                    if not conditions:
+                        raise GMSOError('#endif without #ifdef in {}'.format(filename))
+                    conditions.pop()
+                elif not all(conditions):
+                    continue
+                elif directive == 'define':
+                    defines[tokens[1]] = tokens[2] if len(tokens) > 2 else ''
+                elif directive == 'undef':
+                    defines.pop(tokens[1], None)
+                elif directive == 'include':
+                    include = line[1:].split(None, 1)[1].strip().strip('"<>')
+                    yield from _preprocess(_find_include(include, filename, include_dirs),
+                                           defines, include_dirs, conditions)
+                elif directive == 'error':
+                    raise GMSOError('{}: {}'.format(filename, line))
+                else:
+                    warnings.warn('Ignoring the unknown directive {} in {}'.format(line, filename))
+                continue
+
+            if all(conditions):
+                if defines:
+                    line = ' '.join(defines.get(token, token) or token for token in line.split())
+                yield line
+
+
+def _find_include(include, filename, include_dirs):
+    """Return the path of an included file"""
+    for directory in [os.path.dirname(os.path.abspath(filename))] + include_dirs:
+        path = os.path.join(directory, include)
+        if os.path.isfile(path):
+            return path
+    raise GMSOError('Cannot find the file {} included in {}'.format(include, filename))
+
+
+class _MoleculeTemplate(object):
+    """The sites and connections of a [ moleculetype ], to be copied for each molecule"""
+    def __init__(self, name):
+        self.name = name
+        self.sites = []
+        self.connections = []
+
+    def instantiate(self):
+        """Return copies of the sites and connections of the template
+
+        The sites and connections of the template are validated when they
+        are created, so their copies are made without validating them again.
+        """
+        sites = [site.copy(update={'position_': site.position.copy()}) for site in self.sites]
+        index = {id(site): idx for idx, site in enumerate(self.sites)}
+        connections = [
+            connection.copy(update={'connection_members_': tuple(
+                sites[index[id(member)]] for member in connection.connection_members
+            )})
+            for connection in self.connections
+        ]
+        return sites, connections
+
+
+class _TopReader(object):
+    """Build a topology from the sections of a GROMACS topology"""
+    def __init__(self):
+        self.name = None
+        self.comb_rule = 2
+        self.atom_types = {}
+        self.atom_type_info = {}
+        self.pair_overrides = []
+        self.parameter_types = {'bondtypes': {}, 'angletypes': {}, 'dihedraltypes': {}}
+        self.templates = {}
+        self.template = None
+        self.last_parameter_type = None
+        self.last_dihedral = None
+        self.molecules = []
+        self.potentials = {}
+        self.skipped = set()
+        self.handlers = {
+            'defaults': self._read_defaults,
+            'atomtypes': self._read_atom_type,
+            'nonbond_params': self._read_nonbond_params,
+            'bondtypes': self._read_parameter_type,
+            'angletypes': self._read_parameter_type,
+            'dihedraltypes': self._read_parameter_type,
+            'moleculetype': self._read_molecule_type,
+            'atoms': self._read_atom,
+            'bonds': self._read_connection,
+            'angles': self._read_connection,
+            'dihedrals': self._read_connection,
+            'system': self._read_system,
+            'molecules': self._read_molecules,
+        }
+
+    def read(self, section, tokens):
+        """Read the tokens of a line of a section"""
+        if section not in self.handlers:
+            if section not in self.skipped:
+                warnings.warn('Skipping the [ {} ] section of the topology'.format(section))
+                self.skipped.add(section)
+            return
+        self.section = section
+        self.handlers[section](tokens)
+
+    def topology(self):
+        """Return the topology of the molecules read"""
+        top = Topology(name=self.name)
+        top.combining_rule = 'lorentz' if self.comb_rule == 2 else 'geometric'
+
+        connections = []
+        for name, n_molecules in self.molecules:
+            if name not in self.templates:
+                raise GMSOError('The molecule {} is not defined in the topology'.format(name))
+            template = self.templates[name]
+            for _ in range(n_molecules):
+                sites, molecule_connections = template.instantiate()
+                subtop = SubTopology(name=name)
+                top.add_subtopology(subtop, update=False)
+                for site in sites:
+                    subtop.add_site(site, update_types=False)
+                connections.extend(molecule_connections)
+
+        top.update_atom_types()
+        top.add_connections(connections)
+        for atom_type1, atom_type2, sigma, epsilon in self.pair_overrides:
+            top.add_pair_override(atom_type1, atom_type2, sigma, epsilon)
+        return top
+
+    def _read_defaults(self, tokens):
+        self.comb_rule = int(tokens[1])
+        if self.comb_rule not in (1, 2, 3):
+            raise GMSOError('Unknown combination rule {}'.format(self.comb_rule))
+
+    def _lennard_jones(self, v, w):
+        """Return sigma and epsilon from the V and W columns of the combination rule"""
+        if self.comb_rule != 1:
+            return v * u.nm, w * u.Unit('kJ/mol')
+        if v > 0.0 and w > 0.0:
+            return (w / v) ** (1.0 / 6.0) * u.nm, v ** 2 / (4.0 * w) * u.Unit('kJ/mol')
+        return 0.0 * u.nm, 0.0 * u.Unit('kJ/mol')
+
+    def _read_atom_type(self, tokens):
+        # name [bond_type] [at.num] mass charge ptype V W
+        ptype = len(tokens) - 3
+        if ptype < 3 or tokens[ptype] not in ('A', 'S', 'V', 'D'):
+            raise GMSOError('Cannot read the atom type {}'.format(' '.join(tokens)))
+        name = tokens[0]
+        columns = tokens[1:ptype - 2]
+        atomic_number = 0
+        bond_type = name
+        if len(columns) == 2:
+            bond_type, atomic_number = columns[0], int(columns[1])
+        elif len(columns) == 1:
+            if columns[0].isdigit():
+                atomic_number = int(columns[0])
+            else:
+                bond_type = columns[0]
+        sigma, epsilon = self._lennard_jones(float(tokens[-2]), float(tokens[-1]))
+        self.atom_types[name] = AtomType(
+            name=name,
+            atomclass=bond_type,
+            mass=float(tokens[ptype - 2]) * u.amu,
+            charge=float(tokens[ptype - 1]) * u.elementary_charge,
+            parameters={'sigma': sigma, 'epsilon': epsilon}
+        )
+        self.atom_type_info[name] = (bond_type, atomic_number)
+
+    def _read_nonbond_params(self, tokens):
+        sigma, epsilon = self._lennard_jones(float(tokens[3]), float(tokens[4]))
+        self.pair_overrides.append((tokens[0], tokens[1], sigma, epsilon))
+
+    def _read_parameter_type(self, tokens):
+        n_members = {'bondtypes': 2, 'angletypes': 3, 'dihedraltypes': 4}[self.section]
+        if self.section == 'dihedraltypes' and _is_int(tokens[2]):
+            # Old format with the bond types of the two central atoms only
+            n_members = 2
+        members = tuple(tokens[:n_members])
+        funct = int(tokens[n_members])
+        parameters = tuple(float(token) for token in tokens[n_members + 1:])
+        types = self.parameter_types[self.section]
+        key = (self.section, members)
+        if funct == 9 and self.last_parameter_type == key and types[members][0] == 9:
+            # The terms of a multiple periodic dihedral type
+            parameters = types[members][1] + parameters
+            types[members] = types[members[::-1]] = (funct, parameters)
+            return
+        # Only the first parameters of a type are kept
+        if members in types:
+            self.last_parameter_type = None
+            return
+        types[members] = (funct, parameters)
+        types.setdefault(members[::-1], (funct, parameters))
+        self.last_parameter_type = key
+
+    def _read_molecule_type(self, tokens):
+        self.template = _MoleculeTemplate(tokens[0])
+        self.templates[tokens[0]] = self.template
+        self.last_dihedral = None
+
+    def _read_atom(self, tokens):
+        atom_type = self.atom_types[tokens[1]]
+        _, atomic_number = self.atom_type_info[tokens[1]]
+        charge = float(tokens[6]) * u.elementary_charge if len(tokens) > 6 else atom_type.charge
+        mass = float(tokens[7]) * u.amu if len(tokens) > 7 else atom_type.mass
+        self.template.sites.append(Atom(
+            name=tokens[4],
+            atom_type=atom_type,
+            charge=charge,
+            mass=mass,
+            element=element_by_atomic_number(atomic_number) if atomic_number > 0 else None
+        ))
+
+    def _read_connection(self, tokens):
+        n_members = {'bonds': 2, 'angles': 3, 'dihedrals': 4}[self.section]
+        members = [self.template.sites[int(token) - 1] for token in tokens[:n_members]]
+        funct = int(tokens[n_members])
+        parameters = tuple(float(token) for token in tokens[n_members + 1:])
+        if not parameters:
+            funct, parameters = self._lookup_parameters(members, funct)
+
+        if self.section == 'dihedrals':
+            last_members, last_funct, last_parameters = self.last_dihedral or (None, None, None)
+            self.last_dihedral = (tuple(members), funct, parameters)
+            if funct == 9 and last_funct == 9 and last_members == tuple(members):
+                # The terms of a multiple periodic dihedral replace its previous terms
+                parameters = last_parameters + parameters
+                self.last_dihedral = (tuple(members), funct, parameters)
+                self.template.connections.pop()
+
+        connection_class, type_field, potential = self._potential(funct, parameters)
+        self.template.connections.append(connection_class(**{
+            'connection_members': members,
+            type_field: potential
+        }))
+
+    def _lookup_parameters(self, members, funct):
+        """Find the parameters of a connection in the [ *types ] sections"""
+        section = {'bonds': 'bondtypes', 'angles': 'angletypes', 'dihedrals': 'dihedraltypes'}[self.section]
+        types = self.parameter_types[section]
+        names = tuple(self.atom_type_info[member.atom_type.name][0] for member in members)
+        candidates = [names]
+        if section == 'dihedraltypes':
+            candidates += [
+                ('X', names[1], names[2], names[3]),
+                (names[0], names[1], names[2], 'X'),
+                ('X', names[1], names[2], 'X'),
+                ('X', 'X', names[2], names[3]),
+                (names[0], 'X', 'X', names[3]),
+                ('X', names[1], 'X', names[3]),
+                names[1:3],
+            ]
+            if funct in (2, 4):
+                candidates += [(names[0], 'X', 'X', names[3]), ('X', 'X', names[2], names[3])]
+        for key in candidates:
+            if key in types and types[key][0] == funct:
+                return types[key]
+        raise GMSOError('No parameters found for the {} of the atom types {}'.format(self.section[:-1], names))
+
+    def _potential(self, funct, parameters):
+        """Return the connection class, the type field and the (shared) potential of a connection"""
+        key = (self.section, funct, parameters)
+        if key not in self.potentials:
+            self.potentials[key] = _gromacs_potential(self.section, funct, parameters)
+        return self.potentials[key]
+
+    def _read_system(self, tokens):
+        self.name = ' '.join(tokens) if self.name is None else self.name + ' ' + ' '.join(tokens)
+
+    def _read_molecules(self, tokens):
+        self.molecules.append((tokens[0], int(tokens[1])))
+
+
+def _is_int(token):
+    try:
+        int(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _gromacs_potential(section, funct, parameters):
+    """Return the connection class, the name of its type field and the potential of a GROMACS connection"""
+    templates = PotentialTemplateLibrary()
+    kj = u.Unit('kJ/mol')
+    if section == 'bonds' and funct == 1:
+        return Bond, 'bond_type', BondType(parameters={
+            'r_eq': parameters[0] * u.nm,
+            'k': parameters[1] * u.Unit('kJ/(mol*nm**2)')
+        })
+    if section == 'angles' and funct == 1:
+        return Angle, 'angle_type', AngleType(parameters={
+            'theta_eq': parameters[0] * u.degree,
+            'k': parameters[1] * u.Unit('kJ/(mol*rad**2)')
+        })
+    if section == 'dihedrals' and funct == 9 and len(parameters) > 3:
+        return Dihedral, 'dihedral_type', _multiple_periodic_dihedral_type(parameters)
+    if section == 'dihedrals' and funct in (1, 9):
+        return Dihedral, 'dihedral_type', DihedralType.from_template(templates['PeriodicTorsionPotential'], parameters={
+            'phi_eq': parameters[0] * u.degree,
+            'k': parameters[1] * kj,
+            'n': parameters[2] * u.dimensionless
+        })
+    if section == 'dihedrals' and funct == 3:
+        return Dihedral, 'dihedral_type', DihedralType.from_template(
+            templates['RyckaertBellemansTorsionPotential'],
+            parameters={'c{}'.format(idx): value * kj for idx, value in enumerate(parameters)}
+        )
+    if section == 'dihedrals' and funct == 4:
+        return Improper, 'improper_type', ImproperType.from_template(templates['PeriodicTorsionPotential'], parameters={
+            'phi_eq': parameters[0] * u.degree,
+            'k': parameters[1] * kj,
+            'n': parameters[2] * u.dimensionless
+        })
+    if section == 'dihedrals' and funct == 2:
+        return Improper, 'improper_type', ImproperType.from_template(templates['HarmonicImproperPotential'], parameters={
+            'phi_eq': parameters[0] * u.degree,
+            'k': parameters[1] * u.Unit('kJ/(mol*rad**2)')
+        })
+    raise GMSOError('The function type {} of [ {} ] is not supported'.format(funct, section))
+
+
+def _multiple_periodic_dihedral_type(parameters):
+    """Return the DihedralType summing the periodic torsions of the (phi_eq, k, n) triplets of parameters"""
+    if len(parameters) % 3 != 0:
+        raise GMSOError('Expected phi_eq, k and n for each term of a multiple periodic '
+                        'dihedral, got {}'.format(parameters))
+    template = PotentialTemplateLibrary()['PeriodicTorsionPotential']
+    expression = 0
+    term_parameters = {}
+    for idx in range(len(parameters) // 3):
+        phi_eq, k, n = parameters[3 * idx:3 * idx + 3]
+        names = {name: '{}{}'.format(name, idx + 1) for name in ('k', 'n', 'phi_eq')}
+        expression += template.expression.subs({sympy.Symbol(name): sympy.Symbol(term_name)
+                                                for name, term_name in names.items()})
+        term_parameters[names['phi_eq']] = phi_eq * u.degree
+        term_parameters[names['k']] = k * u.Unit('kJ/mol')
+        term_parameters[names['n']] = n * u.dimensionless
+    return DihedralType(name='MultiplePeriodicTorsionPotential',
+                        expression=expression,
+                        independent_variables=template.independent_variables,
+                        parameters=term_parameters)
@@ -2,6 +2,9 @@ import json
 from pathlib import Path
 
 from gmso.abc.abstract_potential import AbstractPotential
+from gmso.utils.expression import (expression_fingerprint,
+                                   expressions_equivalent,
+                                   _lambdified_expression)
 from gmso.utils.singleton import Singleton
 from gmso.exceptions import GMSOError
 
@@ -42,12 +45,50 @@ class PotentialTemplate(AbstractPotential):
     def set_expression(self, *args, **kwargs):
         raise NotImplementedError
 
+    def compile(self):
+        """Compile the expression of the template to a NumPy function
+
+        The function is lambdified once per unique expression and shared
+        with the potentials of the same expression.
+
+        Returns
+        -------
+        callable
+            A function taking the values of the independent variables and
+            parameters of the expression as keyword arguments
+        """
+        variables = tuple(sorted(self.independent_variables, key=lambda symbol: symbol.name))
+        parameter_names = tuple(sorted(symbol.name for symbol in
+                                       self.expression.free_symbols - self.independent_variables))
+        function = _lambdified_expression(self.expression, variables, parameter_names)
+        names = tuple(variable.name for variable in variables) + parameter_names
+
+        def compiled(**values):
+            return function(*(values[name] for name in names))
+
+        return compiled
+
     class Config:
         allow_mutation = False
 
 
+def _template_key(potential):
+    """Return the key of the template index of a potential or template"""
+    return (expression_fingerprint(potential.expression),
+            frozenset(symbol.name for symbol in potential.independent_variables))
+
+
 class PotentialTemplateLibrary(Singleton):
-    """A singleton collection of all the potential templates"""
+    """A singleton collection of all the potential templates
+
+    The templates are loaded from their JSON files the first time they are
+    needed. For matching potentials to templates, every template is indexed
+    by the fingerprint of its expression (see
+    `gmso.utils.expression.expression_fingerprint`) and compiled to a NumPy
+    function once, so that identifying the form of a potential is a
+    dictionary lookup. User templates can be registered from a directory
+    of JSON files with the same treatment.
+    """
 
     def __init__(self):
         try:
@@ -56,7 +97,10 @@ class PotentialTemplateLibrary(Singleton):
             self.json_refs = POTENTIAL_JSONS
             potential_names = [pot_json.name for pot_json in POTENTIAL_JSONS]
             self._ref_dict = {potential.replace('.json', ''): None for potential in potential_names}
+            self._json_dirs = {name: JSON_DIR for name in self._ref_dict}
             self._user_ref_dict = {}
+            self._template_index = None
+            self._compiled = {}
 
     def get_available_template_names(self):
         return tuple(self._ref_dict.keys())
@@ -69,6 +113,115 @@ class PotentialTemplateLibrary(Singleton):
 
     def _load_from_json(self, item):
         if self._ref_dict[item] is None:
-            potential_dict = _load_template_json(item, JSON_DIR)
+            potential_dict = _load_template_json(item, self._json_dirs[item])
             self._ref_dict[item] = PotentialTemplate(**potential_dict)
         return self._ref_dict[item]
+
+    def _index(self):
+        """Return the index of the templates by fingerprint, building it on first use"""
+        if self._template_index is None:
+            self._template_index = {}
+            for name in self._ref_dict:
+                self._add_to_index(name)
+        return self._template_index
+
+    def _add_to_index(self, name):
+        template = self[name]
+        self._template_index.setdefault(_template_key(template), []).append(name)
+        self._compiled[name] = template.compile()
+
+    def compiled(self, name):
+        """Return the NumPy function of the expression of a template
+
+        Parameters
+        ----------
+        name : str
+            The name of the template
+
+        Returns
+        -------
+        callable
+            A function taking the values of the independent variables and
+            parameters of the expression as keyword arguments
+
+        See Also
+        --------
+        gmso.lib.potential_templates.PotentialTemplate.compile
+        """
+        if name not in self._ref_dict:
+            raise KeyError(f'Potential Template {name} not found.')
+        self._index()
+        return self._compiled[name]
+
+    def match(self, potential, names=None):
+        """Return the template whose form matches the expression of a potential
+
+        The potential is looked up in the index of templates by the
+        fingerprint of its expression, which is cached per expression, and the
+        match is confirmed with `gmso.utils.expression.expressions_equivalent`.
+        Since fingerprints are rounded, an equivalent expression may rarely
+        get another fingerprint, so the other templates are then compared
+        with `expressions_equivalent` as well.
+
+        Parameters
+        ----------
+        potential : gmso.ParametricPotential or gmso.lib.potential_templates.PotentialTemplate
+            The potential to match
+        names : iterable of str, optional, default=None
+            The names of the templates to consider, all the templates by default.
+            Templates with equivalent expressions (e.g. HarmonicTorsionPotential
+            and HarmonicImproperPotential) are returned in the order of `names`,
+            or of `get_available_template_names`
+
+        Returns
+        -------
+        gmso.lib.potential_templates.PotentialTemplate or None
+            The matching template, None if no template matches
+        """
+        indexed = self._index().get(_template_key(potential), [])
+        names = self.get_available_template_names() if names is None else names
+        candidates = [name for name in names if name in indexed]
+        # The templates of other fingerprints, for expressions on a rounding boundary
+        candidates += [name for name in names if name not in indexed]
+        for name in candidates:
+            template = self[name]
+            if (template.independent_variables == potential.independent_variables
+                    and expressions_equivalent(template.expression, potential.expression)):
+                return template
+        return None
+
+    def register_templates(self, directory):
+        """Register the potential templates of the JSON files in a directory
+
+        Each file `<name>.json` must hold the `name`, `expression` and
+        `independent_variables` of a template, same as the templates
+        shipped with GMSO. The templates are validated, indexed and compiled
+        when registered, and are then available like the other templates.
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path
+            The directory of the JSON files
+
+        Returns
+        -------
+        tuple of str
+            The names of the registered templates
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise GMSOError(f'{directory} is not a directory')
+
+        names = tuple(sorted(template_json.stem for template_json in directory.glob('*.json')))
+        for name in names:
+            if name in self._ref_dict:
+                raise GMSOError(f'Potential Template {name} already exists')
+
+        templates = {name: PotentialTemplate(**_load_template_json(name, directory)) for name in names}
+        for name, template in templates.items():
+            self._ref_dict[name] = template
+            self._json_dirs[name] = directory
+            self._user_ref_dict[name] = directory
+            if self._template_index is not None:
+                self._add_to_index(name)
+        return names
@@ -0,0 +1,225 @@
+"""Tabulated potentials for expressions that engines do not support natively"""
+import numpy as np
+import unyt as u
+
+from gmso.core.parametric_potential import ParametricPotential
+from gmso.utils.expression import _lambdified_expression
+from gmso.utils.parameter_table import parameter_tables_by_expression
+from gmso.utils.units import GROMACS, LAMMPS_REAL
+from gmso.exceptions import GMSOError
+
+__all__ = [
+    'tabulate',
+    'write_lammps_table',
+    'write_gromacs_tables'
+]
+
+
+def tabulate(potentials, grid, unit_system=GROMACS):
+    """Evaluate the value and the force of potentials over a grid
+
+    The potentials are grouped by expression and each group is evaluated in
+    a single broadcast call of its lambdified expression and analytic
+    derivative, which are cached per expression.
+
+    Parameters
+    ----------
+    potentials : gmso.ParametricPotential or iterable of gmso.ParametricPotential
+        The potentials to tabulate, each with a single independent variable
+    grid : unyt.unyt_array
+        The values of the independent variable at which to evaluate the potentials
+    unit_system : gmso.utils.units.UnitSystem, optional, default=gmso.utils.units.GROMACS
+        The unit system of the grid and of the parameters when evaluating the expressions
+
+    Returns
+    -------
+    grid : np.ndarray
+        The grid, in the unit system
+    values : np.ndarray
+        The P x N values of the P potentials at the N points of the grid
+    forces : np.ndarray
+        The P x N forces, i.e. the negative derivatives, of the potentials
+    """
+    if isinstance(potentials, ParametricPotential):
+        potentials = [potentials]
+    potentials = list(potentials)
+    if not isinstance(grid, u.unyt_array):
+        raise GMSOError('The grid to tabulate potentials on should be a unyt array')
+    grid = np.asarray(unit_system.in_system(grid), dtype=float).reshape(-1)
+
+    # Each potential instance is evaluated once, and its row is copied to all its positions
+    positions = {}
+    for idx, potential in enumerate(potentials):
+        positions.setdefault(id(potential), (potential, []))[1].append(idx)
+    values = np.full(shape=(len(potentials), grid.size), fill_value=np.nan)
+    forces = np.full(shape=(len(potentials), grid.size), fill_value=np.nan)
+
+    unique_potentials = [potential for potential, _ in positions.values()]
+    for table in parameter_tables_by_expression(unique_potentials).values():
+        if len(table.independent_variables) != 1:
+            raise GMSOError('Only potentials with a single independent variable can be tabulated, '
+                            'found {}'.format(table.independent_variables))
+        variable = next(iter(table.independent_variables))
+        parameter_names = tuple(table.parameters.keys())
+        parameters = table.in_units(unit_system)
+        if any(parameters[name].ndim > 1 for name in parameter_names):
+            raise GMSOError('Potentials with list parameters cannot be tabulated')
+
+        function = _lambdified_expression(table.expression, (variable,), parameter_names)
+        derivative = _lambdified_expression(table.expression, (variable,), parameter_names,
+                                            derivative=variable)
+        args = [grid[np.newaxis, :]] + [parameters[name].value[:, np.newaxis]
+                                        for name in parameter_names]
+        shape = (len(table), grid.size)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            table_values = np.broadcast_to(function(*args), shape)
+            table_forces = -np.broadcast_to(derivative(*args), shape)
+
+        rows, indices = zip(*[(row, idx)
+                              for row, potential in enumerate(table.potentials)
+                              for idx in positions[id(potential)][1]])
+        values[list(indices)] = table_values[list(rows)]
+        forces[list(indices)] = table_forces[list(rows)]
+
+    return grid, values, forces
+
+
+def _table_keywords(potentials, keywords):
+    """Return the keyword of each table of a LAMMPS table file"""
+    if keywords is None:
+        keywords = [
+            '-'.join(potential.member_types) if getattr(potential, 'member_types', None) else potential.name
+            for potential in potentials
+        ]
+    if len(keywords) != len(potentials):
+        raise GMSOError('Expected {} table keywords, got {}'.format(len(potentials), len(keywords)))
+    if len(set(keywords)) != len(keywords):
+        raise GMSOError('The keywords of the tables should be unique, got {}'.format(keywords))
+    return keywords
+
+
+def write_lammps_table(filename,
+                       potentials,
+                       r_min,
+                       r_max,
+                       n_points=1000,
+                       style='pair',
+                       keywords=None,
+                       unit_system=LAMMPS_REAL):
+    """Write potentials to a LAMMPS table file
+
+    The file holds one section per potential, to be used with
+    `pair_style table linear N` (`pair_coeff i j filename KEYWORD`) or
+    `bond_style table linear N` (`bond_coeff i filename KEYWORD`).
+
+    Parameters
+    ----------
+    filename : str
+        Path of the output file
+    potentials : gmso.ParametricPotential or iterable of gmso.ParametricPotential
+        The potentials to tabulate, e.g. the pair potentials of AtomType pairs or BondTypes
+    r_min : unyt.unyt_quantity
+        The first distance of the tables, must be greater than zero for pair tables
+    r_max : unyt.unyt_quantity
+        The last distance of the tables
+    n_points : int, optional, default=1000
+        The number of points of each table
+    style : str, ['pair', 'bond'], optional, default='pair'
+        The LAMMPS style the tables are written for
+    keywords : list of str, optional, default=None
+        The keyword of each section. Defaults to the member types of
+        connection types, e.g. 'opls_135-opls_140', or the names of the potentials
+    unit_system : gmso.utils.units.UnitSystem, optional, default=gmso.utils.units.LAMMPS_REAL
+        The LAMMPS unit system of the tables
+    """
+    if style not in ['pair', 'bond']:
+        raise GMSOError('LAMMPS tables can be written for the pair or bond style, not {}'.format(style))
+    if isinstance(potentials, ParametricPotential):
+        potentials = [potentials]
+    potentials = list(potentials)
+    keywords = _table_keywords(potentials, keywords)
+
+    grid = u.unyt_array(np.linspace(r_min.value, r_max.to_value(r_min.units), n_points), r_min.units)
+    if style == 'pair' and grid[0] <= 0.0:
+        raise GMSOError('The first distance of a LAMMPS pair table should be greater than zero')
+    grid, values, forces = tabulate(potentials, grid, unit_system=unit_system)
+    if not (np.all(np.isfinite(values)) and np.all(np.isfinite(forces))):
+        raise GMSOError('Potentials are not finite over the range of the tables')
+
+    indices = np.arange(1, n_points + 1)
+    row_format = '{:d} {:.10f} {:.10e} {:.10e}\n'
+    with open(filename, 'w') as table_file:
+        table_file.write('# LAMMPS {} tables written by GMSO, {} units\n'.format(style, unit_system.name))
+        for keyword, potential_values, potential_forces in zip(keywords, values, forces):
+            table_file.write('\n{}\n'.format(keyword))
+            if style == 'pair':
+                table_file.write('N {:d} R {:.10f} {:.10f}\n\n'.format(n_points, grid[0], grid[-1]))
+            else:
+                table_file.write('N {:d}\n\n'.format(n_points))
+            table_file.write(''.join(
+                row_format.format(*row)
+                for row in zip(indices.tolist(), grid.tolist(),
+                               potential_values.tolist(), potential_forces.tolist())
+            ))
+
+
+def write_gromacs_tables(filenames,
+                         potentials,
+                         r_max,
+                         spacing=0.002 * u.nm,
+                         style='nonbonded',
+                         unit_system=GROMACS):
+    """Write potentials to GROMACS table files, one file per potential
+
+    Nonbonded tables hold the columns x, f, -f', g, -g', h, -h', where f
+    is the Coulomb interaction 1/r, g (dispersion) is zero and h
+    (repulsion) is the potential, so C6 = 0 and C12 = 1 should be used
+    for the pair in the topology. Bonded tables (e.g. `table_b0.xvg` for
+    bonds of function type 8) hold the columns x, f, -f'. The tables start
+    at zero, where non finite values are replaced by zero.
+
+    Parameters
+    ----------
+    filenames : str or list of str
+        Path of the output file of each potential
+    potentials : gmso.ParametricPotential or iterable of gmso.ParametricPotential
+        The potentials to tabulate
+    r_max : unyt.unyt_quantity
+        The last distance of the tables, e.g. the cutoff plus the table extension
+    spacing : unyt.unyt_quantity, optional, default=0.002*u.nm
+        The spacing of the tables, GROMACS uses 0.002 nm in single precision
+    style : str, ['nonbonded', 'bonded'], optional, default='nonbonded'
+        The kind of tables to write
+    unit_system : gmso.utils.units.UnitSystem, optional, default=gmso.utils.units.GROMACS
+        The unit system of the tables
+    """
+    if style not in ['nonbonded', 'bonded']:
+        raise GMSOError('GROMACS tables can be nonbonded or bonded, not {}'.format(style))
+    if isinstance(potentials, ParametricPotential):
+        potentials = [potentials]
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    potentials = list(potentials)
+    if len(filenames) != len(potentials):
+        raise GMSOError('Expected {} filenames, got {}'.format(len(potentials), len(filenames)))
+
+    n_points = int(round(float(r_max / spacing))) + 1
+    grid = u.unyt_array(np.arange(n_points) * spacing.value, spacing.units)
+    grid, values, forces = tabulate(potentials, grid, unit_system=unit_system)
+    values[~np.isfinite(values)] = 0.0
+    forces[~np.isfinite(forces)] = 0.0
+
+    if style == 'nonbonded':
+        with np.errstate(divide='ignore'):
+            coulomb = np.where(grid > 0.0, 1.0 / grid, 0.0)
+            coulomb_force = np.where(grid > 0.0, 1.0 / grid ** 2, 0.0)
+        zeros = np.zeros_like(grid)
+
+    for filename, potential_values, potential_forces in zip(filenames, values, forces):
+        if style == 'nonbonded':
+            columns = (grid, coulomb, coulomb_force, zeros, zeros, potential_values, potential_forces)
+        else:
+            columns = (grid, potential_values, potential_forces)
+        with open(filename, 'w') as table_file:
+            table_file.write('# GROMACS {} table written by GMSO, {} units\n'.format(style, unit_system.name))
+            np.savetxt(table_file, np.column_stack(columns), fmt='%.10e')
@@ -89,6 +89,18 @@ class TestBond(BaseTest):
         top.add_connection(bond_eq)
         assert top.n_bonds == 1
 
+    def test_equivalent_members_key(self):
+        atom1 = Atom(name="AtomA")
+        atom2 = Atom(name="AtomB")
+        atom3 = Atom(name="AtomC")
+
+        bond = Bond(connection_members=[atom1, atom2])
+        bond_eq = Bond(connection_members=[atom2, atom1])
+        bond_not_eq = Bond(connection_members=[atom1, atom3])
+
+        assert bond._equivalent_members() == bond_eq._equivalent_members()
+        assert bond._equivalent_members() != bond_not_eq._equivalent_members()
+
     def test_equivalent_members_set(self):
         atom1 = Atom(name="AtomA")
         atom2 = Atom(name="AtomB")
@@ -101,3 +101,67 @@ class TestBox(BaseTest):
         box = Box([length, length, length])
 
         assert isinstance(box.lengths, u.unyt_array)
+
+    def test_fractional_round_trip(self):
+        box = Box(lengths=u.nm * [2.0, 2.5, 3.0], angles=u.degree * [80.0, 95.0, 110.0])
+        xyz = np.random.RandomState(0).uniform(-5.0, 5.0, size=(100, 3))
+        fractional = box.to_fractional(xyz * u.angstrom)
+        assert np.allclose(fractional.dot(box.get_vectors().to_value(u.angstrom)), xyz)
+        assert_allclose_units(box.from_fractional(fractional), xyz * u.angstrom)
+        assert np.allclose(box.to_fractional(box.get_vectors()), np.eye(3))
+
+    def test_wrap_triclinic(self):
+        box = Box(lengths=u.nm * [2.0, 2.5, 3.0], angles=u.degree * [80.0, 95.0, 110.0])
+        xyz = np.random.RandomState(0).uniform(-5.0, 5.0, size=(100, 3))
+
+        wrapped = box.wrap(xyz)
+        fractional = box.to_fractional(wrapped)
+        assert isinstance(wrapped, np.ndarray)
+        assert np.all(fractional >= -1e-12) and np.all(fractional < 1.0)
+        # Positions only move by whole box vectors
+        shifts = box.to_fractional(wrapped - xyz)
+        assert np.allclose(shifts, np.round(shifts))
+
+        centered = box.wrap(xyz * u.angstrom, centered=True)
+        assert centered.units == u.angstrom
+        assert np.all(np.abs(box.to_fractional(centered)) <= 0.5)
+
+    def test_minimum_image(self):
+        box = Box(lengths=u.nm * [2.0, 2.0, 2.0])
+        dxyz = u.nm * [[1.5, -1.5, 0.5], [3.9, 0.0, -2.1]]
+        assert_allclose_units(box.minimum_image(dxyz), u.nm * [[-0.5, 0.5, 0.5], [-0.1, 0.0, -0.1]],
+                              atol=1e-12 * u.nm)
+
+    def test_matrices_updated(self):
+        box = Box(lengths=u.nm * [2.0, 2.0, 2.0])
+        assert np.allclose(box.to_fractional([1.0, 1.0, 1.0]), 0.5)
+        box.lengths = u.nm * [4.0, 4.0, 4.0]
+        assert np.allclose(box.to_fractional([1.0, 1.0, 1.0]), 0.25)
+        box.angles = u.degree * [90.0, 90.0, 120.0]
+        assert np.allclose(box.from_fractional([1.0, 1.0, 0.0]).value, [2.0, 2.0 * np.sqrt(3.0), 0.0])
+
+    def test_make_molecules_whole(self, typed_ethane):
+        typed_ethane.box = Box(lengths=u.nm * [1.5, 2.0, 2.5], angles=u.degree * [80.0, 95.0, 110.0])
+        ref = typed_ethane.positions
+        # Split the molecule across the box, every site in another image
+        images = np.random.RandomState(0).randint(-2, 3, size=(typed_ethane.n_sites, 3))
+        images[0] = 0
+        for site, position in zip(typed_ethane.sites, ref + typed_ethane.box.from_fractional(images)):
+            site.position = position
+
+        whole = typed_ethane.box.make_molecules_whole(typed_ethane)
+        assert_allclose_units(whole, ref, atol=1e-8 * u.nm)
+        assert_allclose_units(typed_ethane.sites[1].position, ref[1] + typed_ethane.box.from_fractional(images[1]),
+                              atol=1e-8 * u.nm)
+
+    def test_from_vectors(self):
+        box = Box(lengths=u.nm * [2.0, 2.5, 3.0], angles=u.degree * [80.0, 95.0, 110.0])
+        assert Box.from_vectors(box.get_vectors()) == box
+        assert Box.from_vectors(box.get_vectors().to(u.angstrom)) == box
+        # Rotated vectors describe the same box
+        rotation = np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        assert Box.from_vectors(box.get_vectors().value.dot(rotation)) == box
+
+        orthorhombic = Box.from_vectors(np.diag([1.0, 2.0, 3.0]))
+        assert_allclose_units(orthorhombic.lengths, u.nm * [1.0, 2.0, 3.0])
+        assert_allclose_units(orthorhombic.angles, u.degree * [90.0, 90.0, 90.0])
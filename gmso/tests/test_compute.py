@@ -0,0 +1,108 @@
+import pytest
+import numpy as np
+import unyt as u
+
+from gmso.core.topology import Topology
+from gmso.core.atom import Atom
+from gmso.core.bond import Bond
+from gmso.core.bond_type import BondType
+from gmso.core.angle import Angle
+from gmso.core.angle_type import AngleType
+from gmso.core.dihedral import Dihedral
+from gmso.core.dihedral_type import DihedralType
+from gmso.compute import bonded_energy, forces
+from gmso.tests.base_test import BaseTest
+
+
+def _numerical_forces(top, delta=1e-6):
+    """Central finite differences of the bonded energy"""
+    expected = np.zeros(shape=(top.n_sites, 3))
+    for idx, site in enumerate(top.sites):
+        position = site.position.to_value(u.nm).copy()
+        for dim in range(3):
+            energies = []
+            for sign in (1.0, -1.0):
+                displaced = position.copy()
+                displaced[dim] += sign * delta
+                site.position = displaced * u.nm
+                energies.append(bonded_energy(top).to_value('kJ/mol'))
+            expected[idx, dim] = -(energies[0] - energies[1]) / (2 * delta)
+        site.position = position * u.nm
+    return expected
+
+
+class TestCompute(BaseTest):
+    @pytest.fixture
+    def stretched_bond(self):
+        top = Topology()
+        atom1 = Atom(name='A', position=[0.0, 0.0, 0.0] * u.nm)
+        atom2 = Atom(name='B', position=[0.15, 0.0, 0.0] * u.nm)
+        top.add_site(atom1)
+        top.add_site(atom2)
+        bond_type = BondType(parameters={'k': 1000 * u.Unit('kJ/mol/nm**2'), 'r_eq': 1.0 * u.angstrom})
+        top.add_connection(Bond(connection_members=[atom1, atom2], bond_type=bond_type))
+        return top
+
+    def test_bond_forces(self, stretched_bond):
+        site_forces = forces(stretched_bond)
+        assert site_forces.units == u.Unit('kJ/(mol*nm)')
+        assert np.allclose(site_forces.value, [[50.0, 0.0, 0.0], [-50.0, 0.0, 0.0]])
+        assert np.isclose(bonded_energy(stretched_bond).to_value('kJ/mol'), 0.5 * 1000 * 0.05 ** 2)
+
+    def test_compile_gradient(self, stretched_bond):
+        bond_type = stretched_bond.bonds[0].connection_type
+        from gmso.utils.units import GROMACS
+        gradient = bond_type.compile_gradient(unit_system=GROMACS)
+        assert np.allclose(gradient(r=np.array([0.1, 0.15]))['r'], [0.0, 50.0])
+        assert gradient is not bond_type.compile_gradient()
+
+    def test_compile_gradient_shared(self):
+        from gmso.utils.expression import _lambdified_expression
+        bond_types = [
+            BondType(parameters={'k': k * u.Unit('kJ/mol/nm**2'), 'r_eq': 0.1 * u.nm})
+            for k in [1000, 2000]
+        ]
+        _lambdified_expression.cache_clear()
+        for bond_type in bond_types:
+            bond_type.compile_gradient()
+        assert _lambdified_expression.cache_info().currsize == 1
+
+    def test_empty(self):
+        assert forces(Topology()).shape == (0, 3)
+
+    def test_forces_typed_ethane(self, typed_ethane):
+        rng = np.random.RandomState(12)
+        for site in typed_ethane.sites:
+            site.position = site.position + rng.uniform(-0.01, 0.01, size=3) * u.nm
+        site_forces = forces(typed_ethane)
+        assert site_forces.shape == (typed_ethane.n_sites, 3)
+        assert np.allclose(site_forces.value.sum(axis=0), 0.0, atol=1e-6)
+        assert np.allclose(site_forces.value, _numerical_forces(typed_ethane), rtol=1e-4, atol=1e-3)
+
+    @pytest.mark.parametrize('bend', [0.0, 0.01])
+    def test_linear_angle(self, bend):
+        top = Topology()
+        atoms = [Atom(name=name, position=position * u.nm) for name, position in
+                 [('O', [-0.116, 0.0, 0.0]), ('C', [0.0, bend, 0.0]), ('O', [0.116, 0.0, 0.0])]]
+        for atom in atoms:
+            top.add_site(atom)
+        angle_type = AngleType(parameters={'k': 500 * u.Unit('kJ/mol/rad**2'), 'theta_eq': 180 * u.degree})
+        top.add_connection(Angle(connection_members=atoms, angle_type=angle_type))
+
+        site_forces = forces(top)
+        assert np.all(np.isfinite(site_forces.value))
+        assert np.allclose(site_forces.value.sum(axis=0), 0.0, atol=1e-6)
+        if bend == 0.0:
+            assert np.allclose(site_forces.value, 0.0)
+        else:
+            assert np.allclose(site_forces.value, _numerical_forces(top), rtol=1e-4, atol=1e-3)
+
+    def test_collinear_dihedral(self):
+        top = Topology()
+        atoms = [Atom(name='C', position=[0.15 * idx, 0.0, 0.0] * u.nm) for idx in range(3)]
+        atoms.append(Atom(name='C', position=[0.45, 0.1, 0.0] * u.nm))
+        for atom in atoms:
+            top.add_site(atom)
+        top.add_connection(Dihedral(connection_members=atoms, dihedral_type=DihedralType()))
+
+        assert np.all(np.isfinite(forces(top).value))
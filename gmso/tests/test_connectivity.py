@@ -1,9 +1,11 @@
 import pytest
+import numpy as np
 
 from gmso.core.topology import Topology
 from gmso.core.bond import Bond
 from gmso.core.atom import Atom
 from gmso.tests.base_test import BaseTest
+from gmso.utils.connectivity import connected_components, neighbor_lists
 
 
 class TestConnectivity(BaseTest):
@@ -97,3 +99,76 @@ class TestConnectivity(BaseTest):
         assert mytop.n_angles == 8
         assert mytop.n_dihedrals == 6
         assert mytop.n_impropers == 2
+
+    def test_connected_components(self):
+        bonds = np.array([[5, 4], [0, 6], [6, 3], [4, 2], [1, 1]])
+        labels = connected_components(8, bonds)
+        assert labels.tolist() == [0, 1, 2, 0, 2, 2, 0, 3]
+
+    def test_connected_components_chain(self):
+        order = np.random.RandomState(0).permutation(1000)
+        bonds = np.column_stack([order[:-1], order[1:]])
+        assert (connected_components(1001, bonds) == [0] * 1000 + [1]).all()
+        assert connected_components(3, np.empty(shape=(0, 2))).tolist() == [0, 1, 2]
+
+    def test_neighbor_lists(self):
+        bonds = np.array([[3, 0], [1, 2], [0, 1], [0, 2]])
+        indptr, indices = neighbor_lists(5, bonds)
+        assert indptr.tolist() == [0, 3, 5, 7, 8, 8]
+        assert indices.tolist() == [1, 2, 3, 0, 2, 0, 1, 0]
+
+    def test_identify_connections_twice(self, ethane):
+        ethane.identify_connections()
+        ethane.identify_connections()
+
+        assert ethane.n_angles == 12
+        assert ethane.n_dihedrals == 9
+        assert ethane.n_impropers == 8
+        for dihedral in ethane.dihedrals:
+            first, second, third, fourth = dihedral.connection_members
+            bonded = [set(bond.connection_members) for bond in ethane.bonds]
+            assert {first, second} in bonded
+            assert {second, third} in bonded
+            assert {third, fourth} in bonded
+
+    def test_identify_connections_incremental(self, ethane):
+        ethane.identify_connections()
+        carbons = [site for site in ethane.sites if site.name in ('C1', 'C2')]
+        carbon_bond, = [bond for bond in ethane.bonds if set(bond.connection_members) == set(carbons)]
+
+        ethane.remove_connection(carbon_bond)
+        ethane.identify_connections(incremental=True)
+        assert ethane.n_bonds == 6
+        assert ethane.n_angles == 6
+        assert ethane.n_dihedrals == 0
+        assert ethane.n_impropers == 2
+
+        ethane.add_connection(Bond(connection_members=carbons), update_types=False)
+        ethane.identify_connections(incremental=True)
+        assert ethane.n_bonds == 7
+        assert ethane.n_angles == 12
+        assert ethane.n_dihedrals == 9
+        assert ethane.n_impropers == 8
+
+    def test_identify_connections_incremental_bridge(self):
+        mytop = Topology()
+        sites = [Atom(name=str(idx)) for idx in range(4)]
+        for site in sites:
+            mytop.add_site(site, update_types=False)
+        for idx in range(4):
+            mytop.add_connection(Bond(connection_members=[sites[idx], sites[(idx + 1) % 4]]),
+                                 update_types=False)
+        mytop.identify_connections()
+
+        mytop.add_connection(Bond(connection_members=[sites[1], sites[3]]), update_types=False)
+        mytop.identify_connections(incremental=True)
+        assert mytop.n_angles == 8
+        assert mytop.n_dihedrals == 6
+        assert mytop.n_impropers == 2
+
+    def test_identify_connections_incremental_unidentified(self, ethane):
+        # Without a previous identification, every bond is an edit
+        ethane.identify_connections(incremental=True)
+        assert ethane.n_angles == 12
+        assert ethane.n_dihedrals == 9
+        assert ethane.n_impropers == 8
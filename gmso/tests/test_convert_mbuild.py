@@ -1,3 +1,5 @@
+import warnings
+
 import pytest
 import unyt as u
 
@@ -140,6 +142,31 @@ class TestConvertMBuild(BaseTest):
             site_counter += subtop.n_sites
         assert site_counter == top.n_sites
 
+    def test_from_mbuild_mixed_hierarchy(self, mb_ethane):
+        top_cmpnd = mb.Compound()
+        top_cmpnd.add(mb_ethane)
+        top_cmpnd.add([mb.Compound(name='Ar', pos=[0.1 * i, 0.0, 0.0]) for i in range(20)])
+        top_cmpnd.periodicity = [3, 3, 3]
+
+        with warnings.catch_warnings(record=True) as record:
+            warnings.simplefilter('always')
+            top = from_mbuild(top_cmpnd)
+        assert not any('Numbers and spaces' in str(w.message) for w in record)
+
+        assert top.n_sites == 28
+        assert top.n_subtops == 21
+        assert top.n_bonds == 7
+        assert top.subtops[0].n_sites == 8
+        assert all(subtop.n_sites == 1 for subtop in top.subtops[1:])
+        for site, particle in zip(top.sites[8:], top_cmpnd.children[1:]):
+            assert site.name == 'Ar'
+            assert site.element.symbol == 'Ar'
+            assert_allclose_units(site.position, particle.pos * u.nm, rtol=1e-5, atol=1e-8 * u.nm)
+        # The bonds of the parent compound are not in the order of those of the ethane
+        particles = list(mb_ethane.particles())
+        assert ({frozenset(top.get_index(site) for site in bond.connection_members) for bond in top.bonds}
+                == {frozenset([particles.index(b1), particles.index(b2)]) for b1, b2 in mb_ethane.bonds()})
+
     def test_pass_box(self, mb_ethane):
         mb_box = Box(lengths=[3,3,3])
 
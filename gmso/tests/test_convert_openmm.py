@@ -3,13 +3,32 @@ import numpy as np
 import pytest
 
 from gmso.core.box import Box
-from gmso.external.convert_openmm import to_openmm
+from gmso.external.convert_openmm import to_openmm, to_system
 from gmso.tests.base_test import BaseTest
+from gmso.exceptions import GMSOError
 from gmso.utils.io import import_, has_openmm, has_simtk_unit
 from unyt.testing import assert_allclose_units
 
 if has_openmm and has_simtk_unit:
     simtk_unit = import_('simtk.unit')
+    openmm = import_('simtk.openmm')
+    app = import_('simtk.openmm.app')
+
+
+def _energies(system, positions):
+    """Return the energy of each force of an OpenMM System, in kJ/mol"""
+    for idx, force in enumerate(system.getForces()):
+        force.setForceGroup(idx)
+    context = openmm.Context(system, openmm.VerletIntegrator(1.0),
+                             openmm.Platform.getPlatformByName('Reference'))
+    context.setPositions(positions)
+    return {
+        system.getForce(idx).__class__.__name__:
+            context.getState(getEnergy=True, groups={idx}).getPotentialEnergy().value_in_unit(
+                simtk_unit.kilojoule_per_mole)
+        for idx in range(system.getNumForces())
+    }
+
 
 @pytest.mark.skipif(not has_openmm, reason="OpenMM is not installed")
 @pytest.mark.skipif(not has_simtk_unit, reason="SimTK is not installed")
@@ -49,3 +68,89 @@ class TestOpenMM(BaseTest):
         omm_top = to_openmm(typed_ar_system, openmm_object='modeller')
 
         assert isinstance(omm_top.positions.unit, type(simtk_unit.nanometer))
+
+    def test_openmm_bonds(self, typed_water_system):
+        omm_top = to_openmm(typed_water_system)
+        assert omm_top.getNumBonds() == typed_water_system.n_bonds
+
+    def test_to_system_forces(self, typed_ethane):
+        system = to_system(typed_ethane)
+        forces = {force.__class__.__name__: force for force in system.getForces()}
+
+        assert system.getNumParticles() == typed_ethane.n_sites
+        assert forces['HarmonicBondForce'].getNumBonds() == typed_ethane.n_bonds
+        assert forces['HarmonicAngleForce'].getNumAngles() == typed_ethane.n_angles
+        assert forces['RBTorsionForce'].getNumTorsions() == typed_ethane.n_dihedrals
+        assert forces['NonbondedForce'].getNumParticles() == typed_ethane.n_sites
+        assert 'CMMotionRemover' in forces
+        # OPLS uses the geometric combining rule
+        assert forces['CustomNonbondedForce'].getNumExclusions() == 7 + 12 + 9
+
+    def test_to_system_energies(self, typed_ethane, parmed_ethane):
+        system = to_system(typed_ethane, scaling_factors={'electrostatics14Scale': 0.5,
+                                                          'nonBonded14Scale': 0.5})
+        energies = _energies(system, typed_ethane.positions.to_value(u.nm))
+        reference = _energies(parmed_ethane.createSystem(nonbondedMethod=app.NoCutoff),
+                              parmed_ethane.positions)
+
+        for force, energy in reference.items():
+            assert np.isclose(energies[force], energy, rtol=1e-6, atol=1e-6)
+
+    def test_to_system_exceptions(self, typed_ethane):
+        system = to_system(typed_ethane, scaling_factors={'electrostatics14Scale': 0.5,
+                                                          'nonBonded14Scale': 0.0})
+        nonbonded, = [force for force in system.getForces()
+                      if isinstance(force, openmm.NonbondedForce)]
+        exceptions = [nonbonded.getExceptionParameters(idx) for idx in range(nonbonded.getNumExceptions())]
+        charges = [nonbonded.getParticleParameters(idx)[0] for idx in range(nonbonded.getNumParticles())]
+
+        assert len(exceptions) == 7 + 12 + 9
+        scaled = [(i, j, qq) for i, j, qq, _, _ in exceptions if qq._value != 0.0]
+        assert len(scaled) == 9
+        for i, j, qq in scaled:
+            assert np.isclose(qq._value, 0.5 * charges[i]._value * charges[j]._value)
+        assert all(epsilon._value == 0.0 for _, _, _, _, epsilon in exceptions)
+
+    def test_to_system_nonbonded_method(self, typed_ethane):
+        system = to_system(typed_ethane, nonbondedMethod=app.PME, nonbondedCutoff=1.0)
+        nonbonded, = [force for force in system.getForces()
+                      if isinstance(force, openmm.NonbondedForce)]
+        assert nonbonded.getNonbondedMethod() == openmm.NonbondedForce.PME
+        assert np.isclose(nonbonded.getCutoffDistance()._value, 1.0)
+        assert nonbonded.getUseSwitchingFunction()
+
+        typed_ethane.box = None
+        with pytest.raises(GMSOError):
+            to_system(typed_ethane, nonbondedMethod='PME')
+        with pytest.raises(GMSOError):
+            to_system(typed_ethane, nonbondedMethod='Unknown')
+
+    def test_to_system_constraints(self, typed_ethane):
+        system = to_system(typed_ethane, constraints=app.HBonds, flexibleConstraints=False)
+        bonds, = [force for force in system.getForces()
+                  if isinstance(force, openmm.HarmonicBondForce)]
+        assert system.getNumConstraints() == 6
+        assert bonds.getNumBonds() == 1
+
+        # The H-C-H angles, but not the H-C-C angles
+        system = to_system(typed_ethane, constraints=app.HAngles)
+        assert system.getNumConstraints() == 7 + 6
+
+    def test_to_system_rigid_water(self, typed_water_system):
+        system = to_system(typed_water_system, rigidWater=True)
+        assert system.getNumConstraints() == 3 * 2
+        distances = sorted(system.getConstraintParameters(idx)[2]._value for idx in range(6))
+        assert np.allclose(distances, [0.09572] * 4 + [0.15139] * 2, atol=1e-5)
+
+        system = to_system(typed_water_system, rigidWater=False)
+        assert system.getNumConstraints() == 0
+
+    def test_to_system_hydrogen_mass(self, typed_ethane):
+        system = to_system(typed_ethane, hydrogenMass=3.0 * u.amu)
+        masses = [system.getParticleMass(idx)._value for idx in range(system.getNumParticles())]
+        assert np.isclose(sum(masses), sum(site.atom_type.mass.to_value(u.amu) for site in typed_ethane.sites))
+        assert sorted(masses)[:6] == [3.0] * 6
+
+    def test_to_system_untyped(self, water_system):
+        with pytest.raises(GMSOError):
+            to_system(water_system)
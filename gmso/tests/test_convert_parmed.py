@@ -52,6 +52,30 @@ class TestConvertParmEd(BaseTest):
         assert_allclose_units(top.box.lengths, lengths, rtol=1e-5, atol=1e-8)
         assert_allclose_units(top.box.angles, angles, rtol=1e-5, atol=1e-8)
 
+    def test_from_parmed_replicated_structure(self):
+        struc = pmd.load_file(get_fn('ethane.top'), xyz=get_fn('ethane.gro'))
+        struc = struc * 10
+        top = from_parmed(struc)
+        assert top.n_sites == 80
+        assert top.n_subtops == 10
+        assert top.n_connections == 280
+        assert len(top.atom_types) == 2
+        assert len(set(id(site.atom_type) for site in top.sites)) == 2
+        assert len(set(id(bond.connection_type) for bond in top.bonds)) == 2
+
+        for site, atom in zip(top.sites, struc.atoms):
+            assert site.name == atom.name
+            assert site.atom_type.name == atom.atom_type.name
+            assert_allclose_units(site.charge, atom.charge * u.elementary_charge,
+                                  rtol=1e-5, atol=1e-30 * u.C)
+            assert_allclose_units(site.position, [atom.xx, atom.xy, atom.xz] * u.angstrom,
+                                  rtol=1e-5, atol=1e-8 * u.nm)
+        for bond, pmd_bond in zip(top.bonds, struc.bonds):
+            assert bond.connection_members[0] is top.sites[pmd_bond.atom1.idx]
+            assert bond.connection_members[1] is top.sites[pmd_bond.atom2.idx]
+            assert_allclose_units(bond.connection_type.parameters['r_eq'],
+                                  pmd_bond.type.req * u.angstrom, rtol=1e-5, atol=1e-8 * u.nm)
+
     def test_to_parmed_simple(self):
         struc = pmd.load_file(get_fn('ethane.top'), xyz=get_fn('ethane.gro'))
         struc.title = "Ethane"
@@ -106,6 +130,28 @@ class TestConvertParmEd(BaseTest):
             assert struc_from_top.rb_torsions[i].atom4.name == struc.rb_torsions[i].atom4.name
             assert struc_from_top.rb_torsions[i].type == struc.rb_torsions[i].type
 
+    def test_to_parmed_replicated_structure(self):
+        struc = pmd.load_file(get_fn('ethane.top'), xyz=get_fn('ethane.gro'))
+        struc = struc * 10
+        struc_from_top = to_parmed(from_parmed(struc))
+
+        assert len(struc_from_top.residues) == 10
+        assert len(struc_from_top.bond_types) == 2
+        assert len(struc_from_top.angle_types) == 2
+        assert len(struc_from_top.rb_torsion_types) == 1
+        assert len(set(id(atom.atom_type) for atom in struc_from_top.atoms)) == 2
+        assert len(set(id(bond.type) for bond in struc_from_top.bonds)) == 2
+        assert np.allclose(struc_from_top.coordinates, struc.coordinates)
+        assert np.allclose(struc_from_top.box, struc.box)
+        for atom, ref_atom in zip(struc_from_top.atoms, struc.atoms):
+            assert np.isclose(atom.charge, ref_atom.charge)
+            assert np.isclose(atom.mass, ref_atom.mass)
+            assert atom.residue.number == ref_atom.residue.idx
+        for bond, ref_bond in zip(struc_from_top.bonds, struc.bonds):
+            assert bond.atom1.idx == ref_bond.atom1.idx
+            assert bond.atom2.idx == ref_bond.atom2.idx
+            assert bond.type == ref_bond.type
+
     def test_to_parmed_incompatible_expression(self):
         struc = pmd.load_file(get_fn('ethane.top'), xyz=get_fn('ethane.gro'))
         top = from_parmed(struc)
@@ -93,3 +93,31 @@ class TestElement(BaseTest):
     def test_bad_atomic_number(self, atomic_number):
         with pytest.raises(GMSOError):
             element.element_by_atomic_number(atomic_number)
+
+    def test_elements_by_mass(self):
+        masses = np.array([12.011, 1.008, 58.9, 58.7, 2.5, 12.011])
+        indices = element.elements_by_mass(masses)
+        assert indices.tolist()[-1] == indices.tolist()[0]
+        assert [element.elements[idx] for idx in indices[[0, 1, 2, 3]]] == [
+            element.Carbon, element.Hydrogen, element.Cobalt, element.Nickel]
+        assert indices[4] == -1
+
+        closest = element.elements_by_mass([35, 2.5, 0.0, 1000.0] * u.amu, exact=False)
+        assert [element.elements[idx] for idx in closest] == [
+            element.Chlorine, element.Hydrogen, element.Hydrogen, element.Ununoctium]
+
+        for mass in [1.0079, 35.453, 209.0, 262.0]:
+            assert element.elements[element.elements_by_mass(mass)] == element.element_by_mass(mass)
+
+    def test_elements_by_symbol(self):
+        indices = element.elements_by_symbol(['C', 'N1', 'c', 'Xx', 'O', 'C'])
+        assert indices[3] == -1
+        assert [element.elements[idx] for idx in indices[[0, 1, 2, 4, 5]]] == [
+            element.Carbon, element.Nitrogen, element.Carbon, element.Oxygen, element.Carbon]
+        assert element.elements_by_symbol([]).shape == (0,)
+
+    def test_elements_by_atomic_number(self):
+        indices = element.elements_by_atomic_number(np.array([6, 1, 0, 118, 119]))
+        assert indices[2] == -1 and indices[4] == -1
+        assert [element.elements[idx] for idx in indices[[0, 1, 3]]] == [
+            element.Carbon, element.Hydrogen, element.Ununoctium]
@@ -3,7 +3,7 @@ import pytest
 import sympy
 import unyt as u
 
-from gmso.utils.expression import _PotentialExpression
+from gmso.utils.expression import _PotentialExpression, expression_fingerprint, expressions_equivalent
 from gmso.tests.base_test import BaseTest
 
 
@@ -242,3 +242,30 @@ class TestExpression(BaseTest):
         assert expression_3 != expression_2
         assert expression_1 != expression_3
 
+    @pytest.mark.parametrize('expression_1,expression_2', [
+        ('0.5*k*(r-r_eq)**2', 'k*(r_eq-r)**2/2'),
+        ('4*epsilon*((sigma/r)**12 - (sigma/r)**6)', '4*epsilon*sigma**6*(sigma**6 - r**6)/r**12'),
+        ('k*(1 + cos(n*phi - phi_eq))', 'k + k*cos(phi_eq - n*phi)'),
+    ])
+    def test_expressions_equivalent(self, expression_1, expression_2):
+        expression_1 = sympy.sympify(expression_1)
+        expression_2 = sympy.sympify(expression_2)
+        assert expressions_equivalent(expression_1, expression_2)
+        assert expression_fingerprint(expression_1) == expression_fingerprint(expression_2)
+
+    @pytest.mark.parametrize('expression_1,expression_2', [
+        ('0.5*k*(r-r_eq)**2', 'k*(r-r_eq)**2'),
+        ('0.5*k*(r-r_eq)**2', '0.5*k*(theta-theta_eq)**2'),
+        ('k*(1 + cos(n*phi - phi_eq))', 'k*(1 - cos(n*phi - phi_eq))'),
+    ])
+    def test_expressions_not_equivalent(self, expression_1, expression_2):
+        expression_1 = sympy.sympify(expression_1)
+        expression_2 = sympy.sympify(expression_2)
+        assert not expressions_equivalent(expression_1, expression_2)
+        assert expression_fingerprint(expression_1) != expression_fingerprint(expression_2)
+
+    def test_fingerprint_non_numeric_expression(self):
+        expression = sympy.sympify('sqrt(r - 2)')
+        assert expression_fingerprint(expression) == (('r',), expression)
+        assert expressions_equivalent(expression, sympy.sympify('(r - 2)**(1/2)'))
+
@@ -6,6 +6,7 @@ import unyt as u
 from lxml.etree import DocumentInvalid
 
 from gmso.core.forcefield import ForceField
+from gmso.utils.ff_utils import LazyPotentialDict
 from gmso.tests.utils import get_path
 from gmso.tests.base_test import BaseTest
 from gmso.exceptions import ForceFieldParseError
@@ -200,3 +201,54 @@ class TestForceFieldFromXML(BaseTest):
         assert len(dihedral_types_grouped_by_expression['0.5*z*(r - r_eq)**2']) == 2
         assert len(improper_types_gropued_by_expression['0.5*z*(r - r_eq)**2']) == 1
 
+    def test_ff_from_xml_n_workers(self):
+        xmls = [get_path('opls_charmm_buck.xml'), get_path('trimmed_charmm.xml')]
+        sequential_ff = ForceField.from_xml(xmls)
+        parallel_ff = ForceField.from_xml(xmls, n_workers=2)
+
+        assert parallel_ff.name == sequential_ff.name
+        assert parallel_ff.version == sequential_ff.version
+        assert parallel_ff.scaling_factors == sequential_ff.scaling_factors
+        for attr in ['atom_types', 'bond_types', 'angle_types',
+                     'dihedral_types', 'improper_types']:
+            assert list(getattr(parallel_ff, attr).keys()) == list(getattr(sequential_ff, attr).keys())
+            for key, potential in getattr(sequential_ff, attr).items():
+                assert getattr(parallel_ff, attr)[key] == potential
+        assert parallel_ff.potential_groups.keys() == sequential_ff.potential_groups.keys()
+
+    def test_ff_from_xml_lazy(self):
+        xmls = [get_path('opls_charmm_buck.xml'), get_path('trimmed_charmm.xml')]
+        eager_ff = ForceField.from_xml(xmls)
+        lazy_ff = ForceField.from_xml(xmls, lazy=True)
+
+        assert lazy_ff.name == eager_ff.name
+        assert lazy_ff.scaling_factors == eager_ff.scaling_factors
+        for attr in ['atom_types', 'bond_types', 'angle_types',
+                     'dihedral_types', 'improper_types']:
+            lazy_types = getattr(lazy_ff, attr)
+            assert isinstance(lazy_types, LazyPotentialDict)
+            assert lazy_types.n_parsed == 0
+            assert list(lazy_types.keys()) == list(getattr(eager_ff, attr).keys())
+            for key, potential in getattr(eager_ff, attr).items():
+                assert lazy_types[key] == potential
+            assert lazy_types.n_parsed == len(lazy_types)
+        assert lazy_ff.potential_groups.keys() == eager_ff.potential_groups.keys()
+
+    def test_ff_from_xml_lazy_single_lookup(self, named_groups_ff):
+        lazy_ff = ForceField.from_xml(get_path('ff-example1.xml'), lazy=True)
+        assert 'Xe' in lazy_ff.atom_types
+        assert lazy_ff.atom_types.n_parsed == 0
+
+        xe = lazy_ff.atom_types['Xe']
+        assert xe == named_groups_ff.atom_types['Xe']
+        assert lazy_ff.atom_types.n_parsed == 1
+        assert lazy_ff.atom_types['Xe'] is xe
+        for group in lazy_ff.potential_groups.values():
+            if 'Xe' in group:
+                assert group['Xe'] is xe
+
+    def test_ff_from_xml_lazy_missing_params(self):
+        lazy_ff = ForceField.from_xml(get_path('ff-example-missing-parameter.xml'), lazy=True)
+        assert lazy_ff.atom_types['Xe'].parameters['B'] == u.unyt_quantity(5.0, u.nm)
+        with pytest.raises(ForceFieldParseError):
+            lazy_ff.atom_types['Ar']
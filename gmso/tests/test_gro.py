@@ -38,6 +38,16 @@ class TestGro(BaseTest):
 
         write_gro(top, 'out.gro')
 
+    def test_write_gro_negative_positions(self):
+        top = from_parmed(pmd.load_file(get_fn('ethane.gro'), structure=True))
+        top.sites[0].position -= top.box.lengths
+
+        write_gro(top, 'out.gro')
+        read = read_gro('out.gro')
+        assert np.min(read.positions) >= 0
+        assert_allclose_units(read.positions[0], top.sites[0].position + top.box.lengths,
+                              rtol=1e-3, atol=1e-3 * u.nm)
+
     def test_write_gro_non_orthogonal(self):
         top = from_parmed(pmd.load_file(get_fn('ethane.gro'), structure=True))
         top.box.angles = u.degree * [90, 90, 120]
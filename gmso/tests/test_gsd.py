@@ -1,16 +1,23 @@
+import numpy as np
 import unyt as u
 import pytest
+from unyt.testing import assert_allclose_units
 
-from gmso.formats.gsd import write_gsd
+from gmso.core.box import Box
+from gmso.formats.gsd import read_gsd, iter_gsd_frames, write_gsd, GSDTrajectoryWriter
 from gmso.external.convert_parmed import from_parmed
 from gmso.tests.base_test import BaseTest
 from gmso.utils.io import get_fn
 from gmso.utils.io import import_, has_gsd, has_parmed
+from gmso.exceptions import GMSOError
 
 
 if has_parmed:
     pmd = import_('parmed')
 
+if has_gsd:
+    import gsd.hoomd
+
 @pytest.mark.skipif(not has_gsd, reason="gsd is not installed")
 @pytest.mark.skipif(not has_parmed, reason="ParmEd is not installed")
 class TestGsd(BaseTest):
@@ -27,3 +34,146 @@ class TestGsd(BaseTest):
         top.box.angles = u.degree * [90, 90, 120]
 
         write_gsd(top, 'out.gsd')
+
+    def test_write_gsd_triclinic_box(self, typed_ethane):
+        typed_ethane.box = Box(lengths=[2.0, 2.5, 3.0] * u.nm, angles=[80.0, 95.0, 110.0] * u.degree)
+        write_gsd(typed_ethane, 'ethane.gsd', ref_distance=0.1 * u.nm)
+        with gsd.hoomd.open('ethane.gsd', mode='rb') as gsd_file:
+            snapshot = gsd_file[0]
+
+        assert read_gsd('ethane.gsd', ref_distance=0.1 * u.nm).box == typed_ethane.box
+        lx, ly, lz, xy, xz, yz = snapshot.configuration.box
+        vectors = np.array([[lx, 0.0, 0.0], [xy * ly, ly, 0.0], [xz * lz, yz * lz, lz]])
+        # The positions are inside the box centered on the origin
+        fractional = snapshot.particles.position.dot(np.linalg.inv(vectors))
+        assert np.all(np.abs(fractional) <= 0.5)
+
+    def test_write_gsd_connections(self, typed_ethane):
+        write_gsd(typed_ethane, 'ethane.gsd')
+        with gsd.hoomd.open('ethane.gsd', mode='rb') as gsd_file:
+            snapshot = gsd_file[0]
+
+        assert snapshot.particles.N == 8
+        assert snapshot.particles.types == ['opls_135', 'opls_140']
+        for idx, site in enumerate(typed_ethane.sites):
+            assert snapshot.particles.types[snapshot.particles.typeid[idx]] == site.atom_type.name
+
+        assert snapshot.bonds.N == 7
+        assert snapshot.bonds.types == ['opls_135-opls_135', 'opls_135-opls_140']
+        assert snapshot.angles.N == 12
+        assert snapshot.angles.types == ['opls_135-opls_135-opls_140', 'opls_140-opls_135-opls_140']
+        assert snapshot.dihedrals.N == 9
+        assert snapshot.dihedrals.types == ['opls_140-opls_135-opls_135-opls_140']
+        assert snapshot.pairs.N == 9
+        assert snapshot.pairs.types == ['opls_140-opls_140']
+        assert snapshot.impropers.N == 0
+
+        sites = typed_ethane.sites
+        for bond, group in zip(typed_ethane.bonds, snapshot.bonds.group):
+            assert [sites.index(member) for member in bond.connection_members] == list(group)
+
+    def test_write_gsd_no_special_pairs(self, typed_ethane):
+        write_gsd(typed_ethane, 'ethane.gsd', write_special_pairs=False)
+        with gsd.hoomd.open('ethane.gsd', mode='rb') as gsd_file:
+            assert gsd_file[0].pairs.N == 0
+
+    def test_read_gsd(self, typed_ethane):
+        write_gsd(typed_ethane, 'ethane.gsd', ref_distance=0.1 * u.nm, shift_coords=False)
+        top = read_gsd('ethane.gsd', ref_distance=0.1 * u.nm)
+
+        assert top.n_sites == 8
+        assert top.n_bonds == 7
+        assert top.n_angles == 12
+        assert top.n_dihedrals == 9
+        assert top.n_impropers == 0
+        assert [site.name for site in top.sites] == [site.atom_type.name for site in typed_ethane.sites]
+        assert_allclose_units(top.positions, typed_ethane.positions.to(u.nm), rtol=1e-5, atol=1e-6 * u.nm)
+        assert_allclose_units(top.box.lengths, typed_ethane.box.lengths.to(u.nm), rtol=1e-6)
+        for site, ref_site in zip(top.sites, typed_ethane.sites):
+            assert_allclose_units(site.mass, ref_site.mass.to(site.mass.units), rtol=1e-5)
+            assert np.isclose(site.charge.to_value(u.C), ref_site.charge.to_value(u.C), rtol=1e-5)
+
+        sites = top.sites
+        ref_sites = typed_ethane.sites
+        for bond, ref_bond in zip(top.bonds, typed_ethane.bonds):
+            assert ([sites.index(member) for member in bond.connection_members]
+                    == [ref_sites.index(member) for member in ref_bond.connection_members])
+
+    def test_read_gsd_triclinic(self, typed_ethane):
+        write_gsd(typed_ethane, 'ethane.gsd', shift_coords=False)
+        with gsd.hoomd.open('ethane.gsd', mode='rb') as gsd_file:
+            snapshot = gsd_file[0]
+        snapshot.configuration.box = [2.0, 3.0, 4.0, 0.5, 0.0, 0.0]
+        with gsd.hoomd.open('triclinic.gsd', mode='wb') as gsd_file:
+            gsd_file.append(snapshot)
+
+        box = read_gsd('triclinic.gsd').box
+        assert_allclose_units(box.lengths, [2.0, 1.5 * np.sqrt(5.0), 4.0] * u.nm)
+        assert_allclose_units(box.angles, [90.0, 90.0, np.degrees(np.arctan(2.0))] * u.degree)
+
+    def test_iter_gsd_frames(self, typed_ethane):
+        write_gsd(typed_ethane, 'ethane.gsd', shift_coords=False)
+        with gsd.hoomd.open('ethane.gsd', mode='rb') as gsd_file:
+            snapshot = gsd_file[0]
+        with gsd.hoomd.open('traj.gsd', mode='wb') as gsd_file:
+            for step in range(4):
+                snapshot.configuration.step = step
+                snapshot.configuration.box = [2.0 + step, 2.0, 2.0, 0.0, 0.0, 0.0]
+                snapshot.particles.position = snapshot.particles.position + 0.1
+                gsd_file.append(snapshot)
+
+        frames = list(iter_gsd_frames('traj.gsd', start=1, step=2))
+        assert len(frames) == 2
+        for step, (positions, box) in zip([1, 3], frames):
+            assert positions.shape == (8, 3)
+            assert_allclose_units(positions,
+                                  typed_ethane.positions.to(u.nm) + 0.1 * (step + 1) * u.nm,
+                                  rtol=1e-5, atol=1e-6 * u.nm)
+            assert_allclose_units(box.lengths, [2.0 + step, 2.0, 2.0] * u.nm)
+
+    def test_trajectory_writer(self, typed_ethane):
+        positions = typed_ethane.positions.to_value(u.nm)
+        with GSDTrajectoryWriter(typed_ethane, 'traj.gsd', shift_coords=False) as writer:
+            writer.append(positions + 0.1)
+            writer.append((positions + 0.2) * u.nm,
+                          box=Box(lengths=[2.0, 2.0, 2.0] * u.nm),
+                          velocities=np.ones((8, 3)) * u.angstrom / u.ps)
+            assert writer.n_frames == 3
+            time_unit = writer.unit_system.base_quantities['time'].to_value(u.ps)
+
+        with gsd.hoomd.open('traj.gsd', mode='rb') as gsd_file:
+            assert len(gsd_file) == 3
+            first, second, third = gsd_file[0], gsd_file[1], gsd_file[2]
+        assert second.configuration.step == 1
+        assert third.configuration.step == 2
+        assert second.bonds.N == 7
+        assert second.particles.types == first.particles.types
+        assert np.array_equal(third.particles.typeid, first.particles.typeid)
+        assert np.allclose(second.particles.position, positions + 0.1, atol=1e-6)
+        assert np.allclose(third.particles.velocity, 0.1 * time_unit)
+        assert np.allclose(second.configuration.box, first.configuration.box)
+        assert np.allclose(third.configuration.box, [2.0, 2.0, 2.0, 0.0, 0.0, 0.0])
+
+        frames = list(iter_gsd_frames('traj.gsd'))
+        assert_allclose_units(frames[2][0], (positions + 0.2) * u.nm, rtol=1e-5, atol=1e-6 * u.nm)
+
+    def test_trajectory_writer_previous_box(self, typed_ethane):
+        typed_ethane.box = Box(lengths=[3.0, 3.0, 3.0] * u.nm)
+        positions = typed_ethane.positions.to_value(u.nm)
+        with GSDTrajectoryWriter(typed_ethane, 'traj.gsd') as writer:
+            writer.append(positions, box=Box(lengths=[5.0, 5.0, 5.0] * u.nm))
+            writer.append(positions + 4.0)
+
+        with gsd.hoomd.open('traj.gsd', mode='rb') as gsd_file:
+            third = gsd_file[2]
+        assert np.allclose(third.configuration.box, [5.0, 5.0, 5.0, 0.0, 0.0, 0.0])
+        assert np.all(np.abs(third.particles.position) <= 2.5)
+
+        frames = list(iter_gsd_frames('traj.gsd'))
+        assert frames[0][1] == typed_ethane.box
+        assert frames[2][1] == Box(lengths=[5.0, 5.0, 5.0] * u.nm)
+
+    def test_trajectory_writer_invalid_positions(self, typed_ethane):
+        with GSDTrajectoryWriter(typed_ethane, 'traj.gsd') as writer:
+            with pytest.raises(GMSOError):
+                writer.append(np.zeros((7, 3)))
@@ -7,6 +7,7 @@ from gmso.core.dihedral_type import DihedralType
 from gmso.lib.potential_templates import PotentialTemplateLibrary
 from gmso.utils.conversions import convert_ryckaert_to_opls
 from gmso.utils.conversions import convert_opls_to_ryckaert
+from gmso.utils.conversions import convert_dihedral_type, convert_dihedral_types
 from gmso.exceptions import GMSOError
 from unyt.testing import assert_allclose_units
 class TestInternalConversions(BaseTest):
@@ -201,3 +202,47 @@ class TestInternalConversions(BaseTest):
 
         assert_allclose_units([*opls_connection_type.parameters.values()],
                            [*final_connection_type.parameters.values()], rtol=1e-5, atol=1e-8)
+
+    def test_convert_dihedral_type_cached(self, templates):
+        params = { 'k0' : 1.38   * u.Unit('kJ/mol'),
+                   'k1' : -0.51  * u.Unit('kJ/mol'),
+                   'k2' : 2.2    * u.Unit('kJ/mol'),
+                   'k3' : -0.25  * u.Unit('kJ/mol'),
+                   'k4' : 1.44   * u.Unit('kJ/mol')
+                 }
+
+        opls_torsion_potential = templates['OPLSTorsionPotential']
+        opls_connection_types = [
+            DihedralType(name=opls_torsion_potential.name,
+                         expression=opls_torsion_potential.expression,
+                         independent_variables=opls_torsion_potential.independent_variables,
+                         parameters=dict(params))
+            for _ in range(2)
+        ]
+
+        cache = {}
+        ryckaert_connection_type = convert_dihedral_type(
+                opls_connection_types[0], 'RyckaertBellemansTorsionPotential', cache=cache)
+        assert ryckaert_connection_type == convert_opls_to_ryckaert(opls_connection_types[0])
+        assert convert_dihedral_type(
+                opls_connection_types[1], 'RyckaertBellemansTorsionPotential', cache=cache) is ryckaert_connection_type
+        assert convert_dihedral_type(
+                opls_connection_types[1], 'RyckaertBellemansTorsionPotential') is not ryckaert_connection_type
+        assert len(cache) == 1
+        assert convert_dihedral_type(
+                opls_connection_types[0], 'OPLSTorsionPotential') is opls_connection_types[0]
+
+        with pytest.raises(GMSOError):
+            convert_dihedral_type(opls_connection_types[0], 'PeriodicTorsionPotential')
+
+    def test_convert_dihedral_types(self, typed_ethane):
+        original_dihedral_types = typed_ethane.dihedral_types
+        converted = convert_dihedral_types(typed_ethane, 'OPLSTorsionPotential')
+
+        assert set(converted.keys()) == set(original_dihedral_types)
+        for ryckaert_connection_type, opls_connection_type in converted.items():
+            assert opls_connection_type.name == 'OPLSTorsionPotential'
+            assert opls_connection_type == convert_ryckaert_to_opls(ryckaert_connection_type)
+        assert typed_ethane.dihedral_types == original_dihedral_types
+        for dihedral in typed_ethane.dihedrals:
+            assert dihedral.connection_type.name != 'OPLSTorsionPotential'
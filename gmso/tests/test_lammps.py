@@ -1,5 +1,10 @@
+import numpy as np
 import gmso
 from gmso.core.box import Box
+from gmso.core.improper import Improper
+from gmso.core.improper_type import ImproperType
+from gmso.core.dihedral_type import DihedralType
+from gmso.lib.potential_templates import PotentialTemplateLibrary
 from gmso.formats.lammpsdata import write_lammpsdata, read_lammpsdata
 from gmso.tests.base_test import BaseTest
 from gmso.tests.utils import get_path
@@ -20,6 +25,77 @@ class TestLammpsWriter(BaseTest):
     def test_water_lammps(self, typed_water_system):
         write_lammpsdata(typed_water_system, 'data.water')
 
+    def test_write_lammps_pair_overrides(self, typed_ethane):
+        type1, type2 = typed_ethane.atom_types[:2]
+        typed_ethane.add_pair_override(type1, type2, sigma=3.0 * u.angstrom,
+                                       epsilon=0.1 * u.Unit('kcal/mol'))
+        write_lammpsdata(typed_ethane, 'data.ethane')
+        with open('data.ethane') as f:
+            lines = f.read().splitlines()
+        start = lines.index('PairIJ Coeffs # lj') + 2
+        pair_lines = lines[start:start+3]
+        assert [line.split()[:2] for line in pair_lines] == [['1', '1'], ['1', '2'], ['2', '2']]
+        assert pair_lines[1].split()[2:] == ['0.10000', '3.00000']
+
+    def test_molecule_ids(self, typed_water_system):
+        write_lammpsdata(typed_water_system, 'data.water')
+        with open('data.water') as f:
+            lines = f.read().splitlines()
+        start = lines.index('Atoms') + 2
+        assert [line.split()[1] for line in lines[start:start+6]] == ['1', '1', '1', '2', '2', '2']
+
+    def test_image_flags(self, typed_ethane):
+        typed_ethane.box = Box(lengths=[1.0, 1.0, 1.0] * u.nm, angles=[80.0, 95.0, 110.0] * u.degree)
+        typed_ethane.sites[0].position += typed_ethane.box.from_fractional([2.0, -1.0, 0.0])
+        images = np.floor(typed_ethane.box.to_fractional(typed_ethane.positions)).astype(int)
+        write_lammpsdata(typed_ethane, 'data.ethane')
+        with open('data.ethane') as f:
+            lines = f.read().splitlines()
+        start = lines.index('Atoms') + 2
+        written = np.array([line.split()[7:] for line in lines[start:start+8]], dtype=int)
+        assert (written == images).all()
+
+        read = read_lammpsdata('data.ethane')
+        assert_allclose_units(read.positions, typed_ethane.positions.to(u.angstrom), atol=1e-5 * u.angstrom)
+
+    def test_write_lammps_mixing(self, typed_ethane):
+        typed_ethane.combining_rule = 'lorentz'
+        write_lammpsdata(typed_ethane, 'data.ethane')
+        with open('data.ethane') as f:
+            lines = f.read().splitlines()
+        start = lines.index('PairIJ Coeffs # lj') + 2
+        assert lines[start+1].split() == ['1', '2', '0.04450', '3.00000']
+
+    def test_write_lammps_impropers_hybrid_dihedrals(self, typed_ethane):
+        templates = PotentialTemplateLibrary()
+        periodic = DihedralType.from_template(templates['PeriodicTorsionPotential'], parameters={
+            'k': 1.0 * u.Unit('kcal/mol'), 'n': 3 * u.dimensionless, 'phi_eq': 180.0 * u.degree})
+        typed_ethane.dihedrals[0].connection_type = periodic
+        improper_type = ImproperType.from_template(templates['HarmonicImproperPotential'], parameters={
+            'k': 10.0 * u.Unit('kcal/mol/radian**2'), 'phi_eq': 0.0 * u.degree})
+        typed_ethane.add_connection(Improper(connection_members=typed_ethane.sites[:4],
+                                             improper_type=improper_type))
+        typed_ethane.update_connection_types()
+
+        write_lammpsdata(typed_ethane, 'data.ethane')
+        with open('data.ethane') as f:
+            lines = f.read().splitlines()
+        assert '1 impropers' in lines
+        assert '2 dihedral types' in lines
+        start = lines.index('Dihedral Coeffs # hybrid') + 2
+        styles = {line.split()[1]: line.split()[2:] for line in lines[start:start+2]}
+        assert styles['opls'] == ['0.00000', '-0.00000', '0.30000', '-0.00000']
+        assert styles['fourier'] == ['1', '1.00000', '3', '180.00000']
+        dihedral_types = {line.split()[0]: line.split()[1] for line in lines[start:start+2]}
+        start = lines.index('Dihedrals') + 2
+        assert dihedral_types[lines[start].split()[1]] == 'fourier'
+        assert dihedral_types[lines[start+1].split()[1]] == 'opls'
+
+        start = lines.index('Improper Coeffs # harmonic') + 2
+        assert lines[start].split() == ['1', '5.00000', '0.00000']
+        start = lines.index('Impropers') + 2
+        assert lines[start].split() == ['1', '1', '1', '2', '3', '4']
+
     def test_read_lammps(self, filename=get_path('data.lammps')):
         read_lammpsdata(filename)
 
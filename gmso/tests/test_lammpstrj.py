@@ -0,0 +1,62 @@
+import numpy as np
+import unyt as u
+import pytest
+from unyt.testing import assert_allclose_units
+
+from gmso.core.box import Box
+from gmso.formats.lammpstrj import iter_lammpstrj, write_lammpstrj
+from gmso.tests.base_test import BaseTest
+from gmso.exceptions import GMSOError
+
+
+class TestLammpstrj(BaseTest):
+    def test_write_read_lammpstrj(self, typed_ethane):
+        positions = typed_ethane.positions.to(u.nm)
+        frames = [positions + step * 0.1 * u.nm for step in range(3)]
+        frames[2] = (frames[2], Box(lengths=[3.0, 3.0, 3.0] * u.nm))
+        write_lammpstrj(typed_ethane, 'traj.lammpstrj', iter(frames))
+
+        read = list(iter_lammpstrj('traj.lammpstrj', typed_ethane))
+        assert len(read) == 3
+        for step, (xyz, box) in enumerate(read):
+            assert xyz.units == u.angstrom
+            assert_allclose_units(xyz, positions + step * 0.1 * u.nm, atol=1e-6 * u.nm)
+        assert read[0][1] == typed_ethane.box
+        assert_allclose_units(read[2][1].lengths, [30.0, 30.0, 30.0] * u.angstrom)
+
+        with open('traj.lammpstrj') as dump_file:
+            lines = dump_file.read().splitlines()
+        assert lines[8] == 'ITEM: ATOMS id type x y z'
+        types = [int(line.split()[1]) for line in lines[9:17]]
+        assert types == [typed_ethane.atom_types.index(site.atom_type) + 1 for site in typed_ethane.sites]
+
+    def test_read_triclinic_scaled(self, typed_ethane):
+        box = Box(lengths=[2.0, 2.5, 3.0] * u.nm, angles=[80.0, 95.0, 110.0] * u.degree)
+        xyz = np.random.RandomState(0).uniform(0.0, 1.0, size=(typed_ethane.n_sites, 3))
+        unscaled = xyz.dot(box.get_vectors().to_value(u.angstrom))
+        (_, _, _), (xy, ly, _), (xz, yz, lz) = box.get_vectors().to_value(u.angstrom)
+        order = np.random.RandomState(1).permutation(typed_ethane.n_sites)
+
+        with open('triclinic.lammpstrj', 'w') as dump_file:
+            dump_file.write('ITEM: TIMESTEP\n100\nITEM: NUMBER OF ATOMS\n8\n')
+            dump_file.write('ITEM: BOX BOUNDS xy xz yz pp pp pp\n')
+            dump_file.write('{} {} {}\n'.format(1.0 + min(0.0, xy, xz, xy + xz),
+                                                1.0 + 20.0 + max(0.0, xy, xz, xy + xz), xy))
+            dump_file.write('{} {} {}\n'.format(1.0 + min(0.0, yz), 1.0 + ly + max(0.0, yz), xz))
+            dump_file.write('{} {} {}\n'.format(1.0, 1.0 + lz, yz))
+            dump_file.write('ITEM: ATOMS element xs ys zs id\n')
+            for idx in order:
+                dump_file.write('C {} {} {} {}\n'.format(*xyz[idx], idx + 1))
+
+        (positions, read_box), = iter_lammpstrj('triclinic.lammpstrj', typed_ethane)
+        assert read_box == box
+        assert_allclose_units(positions, (unscaled + 1.0) * u.angstrom, atol=1e-8 * u.angstrom)
+
+    def test_read_wrong_number_of_atoms(self, typed_ethane, water_system):
+        write_lammpstrj(water_system, 'water.lammpstrj', [water_system.positions])
+        with pytest.raises(GMSOError):
+            list(iter_lammpstrj('water.lammpstrj', typed_ethane))
+
+    def test_write_invalid_positions(self, typed_ethane):
+        with pytest.raises(GMSOError):
+            write_lammpstrj(typed_ethane, 'traj.lammpstrj', [np.zeros(shape=(3, 3))])
@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+import unyt as u
+from unyt.testing import assert_allclose_units
+
+from gmso.core.bond_type import BondType
+from gmso.core.dihedral_type import DihedralType
+from gmso.lib.potential_templates import PotentialTemplateLibrary
+from gmso.utils.conversions import convert_ryckaert_to_opls
+from gmso.utils.parameter_table import ParameterTable, parameter_tables_by_expression
+from gmso.tests.base_test import BaseTest
+from gmso.exceptions import GMSOError
+
+
+class TestParameterTable(BaseTest):
+    @pytest.fixture
+    def bond_types(self):
+        return [
+            BondType(parameters={'k': 1000 * u.Unit('kJ/mol/nm**2'), 'r_eq': 0.14 * u.nm}),
+            BondType(parameters={'k': 500 * u.Unit('kcal/mol/angstrom**2'), 'r_eq': 1.1 * u.angstrom}),
+            BondType(parameters={'k': 2000 * u.Unit('kJ/mol/nm**2'), 'r_eq': 0.1 * u.nm}),
+        ]
+
+    @pytest.fixture
+    def ryckaert_types(self):
+        template = PotentialTemplateLibrary()['RyckaertBellemansTorsionPotential']
+        return [
+            DihedralType.from_template(template, parameters={
+                'c0': c0 * u.Unit('kJ/mol'),
+                'c1': 0.76 * u.Unit('kJ/mol'),
+                'c2': -0.22 * u.Unit('kJ/mol'),
+                'c3': 3.55 * u.Unit('kJ/mol'),
+                'c4': 0.55 * u.Unit('kJ/mol'),
+                'c5': 0.0 * u.Unit('kJ/mol'),
+            })
+            for c0 in [1.53, 0.2, -0.9]
+        ]
+
+    def test_parameter_table(self, bond_types):
+        table = ParameterTable(bond_types)
+        assert len(table) == 3
+        assert table.expression == bond_types[0].expression
+        assert set(table.parameters.keys()) == {'k', 'r_eq'}
+        for idx, bond_type in enumerate(bond_types):
+            assert_allclose_units(table['k'][idx], bond_type.parameters['k'].to(table['k'].units))
+            assert_allclose_units(table['r_eq'][idx], bond_type.parameters['r_eq'].to(table['r_eq'].units))
+
+    def test_in_units(self, bond_types):
+        table = ParameterTable(bond_types)
+        converted = table.in_units({'k': 'kcal/mol/angstrom**2'})
+        assert converted['k'].units == u.Unit('kcal/mol/angstrom**2')
+        assert converted['r_eq'] is table['r_eq']
+        for idx, bond_type in enumerate(bond_types):
+            assert np.isclose(converted['k'][idx].value,
+                              bond_type.parameters['k'].to_value('kcal/mol/angstrom**2'))
+
+    def test_update_potentials(self, bond_types):
+        table = ParameterTable(bond_types)
+        table.convert_to_units({'k': 'kcal/mol/angstrom**2', 'r_eq': 'angstrom'})
+        table.parameters['r_eq'] *= 2
+        table.update_potentials()
+        assert_allclose_units(bond_types[0].parameters['r_eq'], 2.8 * u.angstrom)
+        for bond_type in bond_types:
+            assert bond_type.parameters['k'].units == u.Unit('kcal/mol/angstrom**2')
+
+    def test_convert_form(self, ryckaert_types):
+        expected = [convert_ryckaert_to_opls(dihedral_type) for dihedral_type in ryckaert_types]
+        table = ParameterTable(ryckaert_types)
+        opls_table = table.convert_form('OPLSTorsionPotential')
+        assert opls_table.expression == PotentialTemplateLibrary()['OPLSTorsionPotential'].expression
+        assert table.convert_form('RyckaertBellemansTorsionPotential') is table
+
+        opls_table.update_potentials()
+        for dihedral_type, expected_type in zip(ryckaert_types, expected):
+            assert dihedral_type.expression == expected_type.expression
+            assert set(dihedral_type.parameters.keys()) == set(expected_type.parameters.keys())
+            for name, value in expected_type.parameters.items():
+                assert_allclose_units(dihedral_type.parameters[name], value)
+
+    def test_convert_form_invalid(self, bond_types):
+        with pytest.raises(GMSOError):
+            ParameterTable(bond_types).convert_form('OPLSTorsionPotential')
+
+    def test_mixed_expressions(self, bond_types, ryckaert_types):
+        with pytest.raises(GMSOError):
+            ParameterTable(bond_types + ryckaert_types)
+
+    def test_parameter_tables_by_expression(self, bond_types, ryckaert_types):
+        tables = parameter_tables_by_expression(bond_types + ryckaert_types)
+        assert len(tables) == 2
+        assert tables[str(bond_types[0].expression)].potentials == tuple(bond_types)
+        assert tables[str(ryckaert_types[0].expression)].potentials == tuple(ryckaert_types)
@@ -2,10 +2,17 @@ import os
 import glob
 import pytest
 
+import json
+
+import numpy as np
 import sympy
+import unyt as u
 
+from gmso.core.atom_type import AtomType
+from gmso.core.dihedral_type import DihedralType
 from gmso.lib.potential_templates import PotentialTemplateLibrary, JSON_DIR
 from gmso.tests.base_test import BaseTest
+from gmso.exceptions import GMSOError
 
 
 class TestPotentialTemplates(BaseTest):
@@ -87,3 +94,65 @@ class TestPotentialTemplates(BaseTest):
         names = templates.get_available_template_names()
         assert isinstance(names, tuple)
         assert len(names) == len(glob.glob(os.path.join(JSON_DIR, '*.json')))
+
+    def test_match(self, templates):
+        atom_type = AtomType(expression='4*epsilon*(sigma**12/r**12 - sigma**6/r**6)',
+                             independent_variables={'r'},
+                             parameters={'epsilon': 1 * u.Unit('kJ/mol'), 'sigma': 1 * u.nm})
+        assert templates.match(atom_type) is templates['LennardJonesPotential']
+
+        dihedral_type = DihedralType(expression='c0 + c1*cos(phi) + c2*cos(phi)**2 + c3*cos(phi)**3 '
+                                                '+ c4*cos(phi)**4 + c5*cos(phi)**5',
+                                     independent_variables={'phi'},
+                                     parameters={'c{}'.format(i): 1.0 * u.Unit('kJ/mol') for i in range(6)})
+        assert templates.match(dihedral_type).name == 'RyckaertBellemansTorsionPotential'
+
+    def test_match_names(self, templates):
+        harmonic = templates['HarmonicTorsionPotential']
+        assert templates.match(harmonic, names=['HarmonicImproperPotential']).name == 'HarmonicImproperPotential'
+        assert templates.match(harmonic, names=['HarmonicTorsionPotential']).name == 'HarmonicTorsionPotential'
+        assert templates.match(harmonic, names=['LennardJonesPotential']) is None
+
+    def test_match_other_fingerprint(self, templates, monkeypatch):
+        import gmso.lib.potential_templates
+        atom_type = AtomType(expression='4*epsilon*((sigma/r)**12 - (sigma/r)**6)',
+                             independent_variables={'r'},
+                             parameters={'epsilon': 1 * u.Unit('kJ/mol'), 'sigma': 1 * u.nm})
+        # An expression on a rounding boundary gets a fingerprint of no template
+        templates._index()
+        monkeypatch.setattr(gmso.lib.potential_templates, '_template_key', lambda potential: ('boundary',))
+        assert templates.match(atom_type) is templates['LennardJonesPotential']
+        assert templates.match(atom_type, names=['MiePotential']) is None
+
+    def test_no_match(self, templates):
+        atom_type = AtomType(expression='a*r**3', independent_variables={'r'},
+                             parameters={'a': 1 * u.Unit('kJ/mol/nm**3')})
+        assert templates.match(atom_type) is None
+
+    def test_compiled(self, templates):
+        lennard_jones = templates.compiled('LennardJonesPotential')
+        assert np.allclose(lennard_jones(r=np.array([1.0, 2 ** (1 / 6)]), epsilon=1.0, sigma=1.0),
+                           [0.0, -1.0])
+
+    def test_register_templates(self, templates):
+        with open('CubicBondPotential.json', 'w') as template_json:
+            json.dump({'name': 'CubicBondPotential',
+                       'expression': 'k * (r - r_eq)**3',
+                       'independent_variables': 'r'}, template_json)
+        try:
+            assert templates.register_templates('.') == ('CubicBondPotential',)
+            assert 'CubicBondPotential' in templates.get_available_template_names()
+            assert templates['CubicBondPotential'].expression == sympy.sympify('k * (r - r_eq)**3')
+
+            atom_type = AtomType(expression='k*(r - r_eq)**3', independent_variables={'r'},
+                                 parameters={'k': 1 * u.Unit('kJ/mol/nm**3'), 'r_eq': 1 * u.nm})
+            assert templates.match(atom_type) is templates['CubicBondPotential']
+            assert np.isclose(templates.compiled('CubicBondPotential')(r=2.0, k=1.0, r_eq=1.0), 1.0)
+
+            with pytest.raises(GMSOError):
+                templates.register_templates('.')
+        finally:
+            templates._ref_dict.pop('CubicBondPotential', None)
+            templates._json_dirs.pop('CubicBondPotential', None)
+            templates._user_ref_dict.pop('CubicBondPotential', None)
+            templates._template_index = None
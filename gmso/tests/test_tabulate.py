@@ -0,0 +1,111 @@
+import pytest
+import numpy as np
+import unyt as u
+
+from gmso.core.atom_type import AtomType
+from gmso.core.bond_type import BondType
+from gmso.lib.tabulate import tabulate, write_lammps_table, write_gromacs_tables
+from gmso.tests.base_test import BaseTest
+from gmso.exceptions import GMSOError
+
+
+class TestTabulate(BaseTest):
+    @pytest.fixture
+    def buckingham_types(self):
+        return [
+            AtomType(name='B{}'.format(idx),
+                     expression='a*exp(-b*r) - c/r**6',
+                     independent_variables={'r'},
+                     parameters={'a': a * u.Unit('kJ/mol'),
+                                 'b': 30.0 / u.nm,
+                                 'c': 0.002 * u.Unit('kJ*nm**6/mol')})
+            for idx, a in enumerate([1.0e5, 2.0e5, 4.0e5])
+        ]
+
+    @pytest.fixture
+    def bond_types(self):
+        return [
+            BondType(parameters={'k': 1000 * u.Unit('kJ/mol/nm**2'), 'r_eq': 0.14 * u.nm},
+                     member_types=('C', 'H')),
+            BondType(expression='D*(1-exp(-alpha*(r-r_eq)))**2',
+                     parameters={'D': 400 * u.Unit('kJ/mol'), 'alpha': 20 / u.nm, 'r_eq': 0.1 * u.nm},
+                     independent_variables={'r'},
+                     member_types=('O', 'H')),
+        ]
+
+    def test_tabulate(self, buckingham_types):
+        grid, values, forces = tabulate(buckingham_types, u.unyt_array([0.2, 0.3, 0.4], u.nm))
+        assert values.shape == forces.shape == (3, 3)
+        for potential, potential_values, potential_forces in zip(buckingham_types, values, forces):
+            a = potential.parameters['a'].value
+            assert np.allclose(potential_values, a * np.exp(-30 * grid) - 0.002 / grid ** 6)
+            assert np.allclose(potential_forces, 30 * a * np.exp(-30 * grid) - 6 * 0.002 / grid ** 7)
+
+    def test_tabulate_mixed_expressions(self, bond_types):
+        grid, values, forces = tabulate(bond_types, u.unyt_array([1.0, 1.4], u.angstrom))
+        assert np.allclose(grid, [0.1, 0.14])
+        assert np.allclose(values[0], 0.5 * 1000 * (grid - 0.14) ** 2)
+        assert np.allclose(forces[0], -1000 * (grid - 0.14))
+        assert np.allclose(values[1], 400 * (1 - np.exp(-20 * (grid - 0.1))) ** 2)
+
+    def test_tabulate_duplicates(self, bond_types):
+        harmonic, morse = bond_types
+        grid, values, forces = tabulate([harmonic, morse, harmonic, harmonic],
+                                        u.unyt_array([1.0, 1.2, 1.4, 1.6], u.angstrom))
+        assert not np.isnan(values).any() and not np.isnan(forces).any()
+        for row in (0, 2, 3):
+            assert np.allclose(values[row], 0.5 * 1000 * (grid - 0.14) ** 2)
+            assert np.allclose(forces[row], -1000 * (grid - 0.14))
+        assert np.allclose(values[1], 400 * (1 - np.exp(-20 * (grid - 0.1))) ** 2)
+
+    def test_tabulate_units(self, bond_types):
+        from gmso.utils.units import LAMMPS_REAL
+        grid, values, forces = tabulate(bond_types[0], u.unyt_array([1.0], u.angstrom),
+                                        unit_system=LAMMPS_REAL)
+        assert np.allclose(grid, [1.0])
+        assert np.allclose(values[0], 0.5 * 1000 / 4.184 / 100 * (1.0 - 1.4) ** 2)
+
+    def test_write_lammps_pair_table(self, buckingham_types):
+        write_lammps_table('pair.table', buckingham_types, 1.5 * u.angstrom, 10 * u.angstrom, n_points=100)
+        with open('pair.table') as table_file:
+            lines = table_file.read().splitlines()
+        for atom_type in buckingham_types:
+            idx = lines.index(atom_type.name)
+            assert lines[idx + 1] == 'N 100 R 1.5000000000 10.0000000000'
+            assert len(lines[idx + 3].split()) == 4
+            assert lines[idx + 102].split()[0] == '100'
+
+    def test_write_lammps_bond_table(self, bond_types):
+        write_lammps_table('bond.table', bond_types, 0.5 * u.angstrom, 3.0 * u.angstrom,
+                           n_points=50, style='bond')
+        with open('bond.table') as table_file:
+            lines = table_file.read().splitlines()
+        assert 'C-H' in lines and 'O-H' in lines
+        assert lines[lines.index('C-H') + 1] == 'N 50'
+
+    def test_write_lammps_table_invalid(self, buckingham_types):
+        with pytest.raises(GMSOError):
+            write_lammps_table('pair.table', buckingham_types, 0.0 * u.angstrom, 10 * u.angstrom)
+        with pytest.raises(GMSOError):
+            write_lammps_table('pair.table', buckingham_types, 1.0 * u.angstrom, 10 * u.angstrom,
+                               keywords=['A', 'A', 'B'])
+        with pytest.raises(GMSOError):
+            write_lammps_table('pair.table', buckingham_types, 1.0 * u.angstrom, 10 * u.angstrom,
+                               style='angle')
+
+    def test_write_gromacs_tables(self, buckingham_types):
+        filenames = ['table_{}.xvg'.format(atom_type.name) for atom_type in buckingham_types]
+        write_gromacs_tables(filenames, buckingham_types, 1.0 * u.nm)
+        data = np.loadtxt(filenames[0])
+        assert data.shape == (501, 7)
+        assert np.allclose(data[0], 0.0)
+        assert np.allclose(data[-1, 0], 1.0)
+        assert np.allclose(data[-1, 1], 1.0)
+        assert np.allclose(data[-1, 5], 1.0e5 * np.exp(-30) - 0.002)
+
+    def test_write_gromacs_bonded_table(self, bond_types):
+        write_gromacs_tables('table_b0.xvg', bond_types[1], 0.3 * u.nm,
+                             spacing=0.001 * u.nm, style='bonded')
+        data = np.loadtxt('table_b0.xvg')
+        assert data.shape == (301, 3)
+        assert np.isclose(data[100, 1], 0.0)
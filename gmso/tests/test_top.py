@@ -1,14 +1,17 @@
 import pytest
+import numpy as np
 
 import unyt as u
+from unyt.testing import assert_allclose_units
 import parmed as pmd
 
 import gmso
-from gmso.formats.top import write_top
+from gmso.core.topology import Topology
+from gmso.formats.top import read_top, write_top
 from gmso.tests.base_test import BaseTest
 from gmso.utils.io import get_fn
 from gmso.tests.utils import get_path
-from gmso.exceptions import EngineIncompatibilityError
+from gmso.exceptions import EngineIncompatibilityError, GMSOError
 
 
 class TestTop(BaseTest):
@@ -103,3 +106,177 @@ class TestTop(BaseTest):
         assert struct.defaults.gen_pairs == "yes"
         assert struct.defaults.fudgeLJ == 0.5
         assert struct.defaults.fudgeQQ == 0.5
+
+    def test_nonbond_params(self, typed_ethane):
+        type1, type2 = typed_ethane.atom_types[:2]
+        typed_ethane.add_pair_override(type1, type2, sigma=0.3 * u.nm,
+                                       epsilon=0.5 * u.Unit('kJ/mol'))
+        write_top(typed_ethane, 'system.top')
+        with open('system.top') as f:
+            lines = f.read().splitlines()
+        start = lines.index('[ nonbond_params ]') + 2
+        assert lines[start].split() == [type1.name, type2.name, '1', '0.30000', '0.50000']
+
+    def _molecules(self, filename):
+        with open(filename) as f:
+            lines = f.read().splitlines()
+        start = lines.index('[ molecules ]') + 2
+        return lines.count('[ moleculetype ]'), [line.split() for line in lines[start:] if line.strip()]
+
+    def test_molecule_types(self, typed_water_system):
+        write_top(typed_water_system, 'water.top')
+        n_molecule_types, molecules = self._molecules('water.top')
+        assert n_molecule_types == 1
+        assert molecules == [['water', '2']]
+
+        struct = pmd.load_file('water.top')
+        assert len(struct.atoms) == typed_water_system.n_sites
+        assert len(struct.bonds) == typed_water_system.n_bonds
+        assert len(struct.angles) == typed_water_system.n_angles
+
+    def test_distinct_molecule_types(self, typed_water_system):
+        site = typed_water_system.sites[-1]
+        site.charge = site.charge * 0.5
+        write_top(typed_water_system, 'water.top')
+        n_molecule_types, molecules = self._molecules('water.top')
+        assert n_molecule_types == 2
+        assert molecules == [['water', '1'], ['water1', '1']]
+
+    def test_molecule_types_without_subtops(self, typed_water_system):
+        top = Topology(name='waters')
+        top.add_sites(typed_water_system.sites)
+        top.add_connections(typed_water_system.connections)
+        write_top(top, 'water.top')
+        n_molecule_types, molecules = self._molecules('water.top')
+        assert n_molecule_types == 1
+        assert molecules == [['waters', '2']]
+
+    @pytest.mark.parametrize('top', ['typed_water_system', 'typed_ethane'])
+    def test_read_top(self, top, request):
+        top = request.getfixturevalue(top)
+        write_top(top, 'system.top')
+        read = read_top('system.top')
+
+        assert read.name == top.name
+        assert read.n_sites == top.n_sites
+        assert read.n_bonds == top.n_bonds
+        assert read.n_angles == top.n_angles
+        assert read.n_dihedrals == top.n_dihedrals
+        assert len(read.atom_types) == len(top.atom_types)
+        for site, ref_site in zip(read.sites, top.sites):
+            assert site.atom_type.name == ref_site.atom_type.name
+            assert np.isclose(site.charge.to_value(u.C), ref_site.charge.to_value(u.C), atol=1e-24)
+
+        write_top(read, 'roundtrip.top')
+        with open('system.top') as f1, open('roundtrip.top') as f2:
+            assert f1.read().splitlines()[1:] == f2.read().splitlines()[1:]
+
+    def test_read_top_preprocessor(self):
+        with open('ff.itp', 'w') as f:
+            f.write(
+                '[ defaults ]\n'
+                '1  2  yes  0.5  0.5\n\n'
+                '[ atomtypes ]\n'
+                '; name  bond_type  at.num  mass  charge  ptype  sigma  epsilon\n'
+                'OW  OW  8  15.9994  0.0  A  0.315  0.636\n'
+                'HW  HW  1  1.008  0.0  A  0.0  0.0\n\n'
+                '[ bondtypes ]\n'
+                'OW  HW  1  0.09572  502416.0\n\n'
+                '#define HOH_ANGLE 104.52 628.02\n'
+            )
+        with open('system.top', 'w') as f:
+            f.write(
+                '#include "ff.itp"\n\n'
+                '[ moleculetype ]\n'
+                'SOL  2\n\n'
+                '[ atoms ]\n'
+                '1  OW  1  SOL  OW  1  -0.834  ; oxygen\n'
+                '2  HW  1  SOL  HW1  1  0.417\n'
+                '3  HW  1  SOL  HW2  1  0.417\n\n'
+                '#ifdef FLEXIBLE\n'
+                '[ bonds ]\n'
+                '1  2  1\n'
+                '1  3  1\n'
+                '#else\n'
+                '[ settles ]\n'
+                '1  1  0.09572  0.15139\n'
+                '#endif\n\n'
+                '[ angles ]\n'
+                '2  1  3  1  HOH_ANGLE\n\n'
+                '[ system ]\n'
+                'Water box\n\n'
+                '[ molecules ]\n'
+                'SOL  100\n'
+            )
+
+        rigid = read_top('system.top')
+        assert rigid.name == 'Water box'
+        assert rigid.n_sites == 300
+        assert rigid.n_subtops == 100
+        assert rigid.n_bonds == 0
+        assert rigid.n_angles == 100
+        assert len(rigid.angle_types) == 1
+        assert_allclose_units(rigid.angles[0].angle_type.parameters['theta_eq'], 104.52 * u.degree)
+        assert rigid.sites[0].atom_type.mass == 15.9994 * u.amu
+        assert rigid.sites[0].element.symbol == 'O'
+
+        flexible = read_top('system.top', defines=['FLEXIBLE'])
+        assert flexible.n_bonds == 200
+        assert len(flexible.bond_types) == 1
+        assert_allclose_units(flexible.bonds[0].bond_type.parameters['r_eq'], 0.09572 * u.nm)
+        assert len(set(id(site) for site in flexible.sites)) == 300
+        assert flexible.bonds[-1].connection_members[0] is flexible.sites[-3]
+
+    def test_read_top_multiple_periodic_dihedrals(self):
+        with open('butane.top', 'w') as f:
+            f.write(
+                '[ defaults ]\n'
+                '1  2  yes  0.5  0.5\n\n'
+                '[ atomtypes ]\n'
+                'CT  CT  6  12.011  0.0  A  0.35  0.276\n\n'
+                '[ dihedraltypes ]\n'
+                'CT  CT  CT  CT  9  0.0  1.0  1\n'
+                'CT  CT  CT  CT  9  180.0  0.5  2\n'
+                'CT  CT  CT  CT  9  0.0  0.25  3\n\n'
+                '[ moleculetype ]\n'
+                'BUT  3\n\n'
+                '[ atoms ]\n'
+                '1  CT  1  BUT  C1  1  0.0\n'
+                '2  CT  1  BUT  C2  1  0.0\n'
+                '3  CT  1  BUT  C3  1  0.0\n'
+                '4  CT  1  BUT  C4  1  0.0\n\n'
+                '[ dihedrals ]\n'
+                '{}\n'
+                '[ pairs ]\n'
+                '1  4  1\n\n'
+                '[ system ]\n'
+                'Butane\n\n'
+                '[ molecules ]\n'
+                'BUT  2\n'
+            )
+
+        for dihedrals in ['1  2  3  4  9\n',
+                          '1  2  3  4  9  0.0  1.0  1\n'
+                          '1  2  3  4  9  180.0  0.5  2\n'
+                          '1  2  3  4  9  0.0  0.25  3\n']:
+            with open('butane.top') as f:
+                content = f.read()
+            with open('system.top', 'w') as f:
+                f.write(content.replace('{}', dihedrals))
+            with pytest.warns(UserWarning, match='pairs'):
+                top = read_top('system.top')
+
+            assert top.n_dihedrals == 2
+            dihedral_type = top.dihedrals[0].dihedral_type
+            assert dihedral_type is top.dihedrals[1].dihedral_type
+            assert dihedral_type.name == 'MultiplePeriodicTorsionPotential'
+            assert_allclose_units(dihedral_type.parameters['k2'], 0.5 * u.Unit('kJ/mol'))
+            assert_allclose_units(dihedral_type.parameters['phi_eq2'], 180.0 * u.degree)
+            assert_allclose_units(dihedral_type.parameters['n3'], 3.0 * u.dimensionless)
+            assert len(dihedral_type.parameters) == 9
+
+    def test_read_top_missing_include(self):
+        with open('system.top', 'w') as f:
+            f.write('#include "missing.itp"\n')
+        with pytest.raises(GMSOError):
+            read_top('system.top')
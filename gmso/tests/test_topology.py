@@ -23,7 +23,7 @@ from gmso.tests.base_test import BaseTest
 from gmso.exceptions import GMSOError
 from unyt.testing import assert_allclose_units
 from gmso.tests.base_test import BaseTest
-from gmso.utils.io import get_fn, import_, has_parmed
+from gmso.utils.io import get_fn, import_, has_parmed, has_scipy
 
 
 if has_parmed:
@@ -63,6 +63,34 @@ class TestTopology(BaseTest):
 
         assert len(top.connections) == 1
 
+    def test_add_sites(self):
+        atom_type = AtomType(name='A')
+        sites = [Atom(name='site', atom_type=atom_type) for _ in range(3)]
+
+        top = Topology()
+        top.add_sites(sites, update_types=False)
+        assert top.n_sites == 3
+        assert len(top.atom_types) == 0
+
+        top = Topology()
+        top.add_sites(sites)
+        assert top.n_sites == 3
+        assert len(top.atom_types) == 1
+        assert top.typed
+
+    def test_add_connections(self):
+        atoms = [Atom(name='atom{}'.format(idx)) for idx in range(4)]
+        bond_type = BondType()
+        bonds = [Bond(connection_members=[atoms[idx], atoms[idx + 1]], bond_type=bond_type)
+                 for idx in range(3)]
+
+        top = Topology()
+        added = top.add_connections(bonds + [Bond(connection_members=[atoms[1], atoms[0]])])
+        assert top.n_sites == 4
+        assert top.n_bonds == 3
+        assert added[3] is bonds[0]
+        assert len(top.bond_types) == 1
+
     def test_add_box(self):
         top = Topology()
         box = Box(2*u.nm*np.ones(3))
@@ -386,6 +414,29 @@ class TestTopology(BaseTest):
         top.add_subtopology(subtop)
         assert top.n_subtops == 1
 
+    def test_add_subtopology_sites(self):
+        top = Topology()
+        top.add_site(Atom(name='Ar'))
+        subtop = SubTopology()
+        sites = [Atom(name='C'), Atom(name='H')]
+        for site in sites:
+            subtop.add_site(site)
+
+        top.add_subtopology(subtop)
+        assert top.n_sites == 3
+        assert all(site in top.sites for site in sites)
+
+    def test_add_sites_equivalent_atom_types(self):
+        top = Topology()
+        first, second = AtomType(name='CT'), AtomType(name='CT')
+        sites = [Atom(name='C', atom_type=atom_type) for atom_type in (first, second, second)]
+
+        top.add_sites(sites)
+        assert top.n_sites == 3
+        assert len(top.atom_types) == 1
+        assert all(site.atom_type is first for site in sites)
+        assert first.topology is top
+
     def test_parametrization(self):
         top = Topology()
 
@@ -536,3 +587,151 @@ class TestTopology(BaseTest):
         prev_idx = typed_methylnitroaniline.get_index(dihedral_type_to_test)
         typed_methylnitroaniline.dihedrals[0].connection_type.name = 'changed name'
         assert typed_methylnitroaniline.get_index(dihedral_type_to_test) != prev_idx
+
+    def test_pair_parameter_table(self, typed_ethane):
+        typed_ethane.combining_rule = 'lorentz'
+        table = typed_ethane.pair_parameter_table()
+        assert len(table) == len(typed_ethane.atom_types)
+        assert table.sigma.shape == (len(table), len(table))
+        for i, type1 in enumerate(typed_ethane.atom_types):
+            for j, type2 in enumerate(typed_ethane.atom_types):
+                assert_allclose_units(
+                    table.sigma[i, j],
+                    ((type1.parameters['sigma'] + type2.parameters['sigma']) / 2).to(u.nm))
+                assert_allclose_units(
+                    table.epsilon[i, j],
+                    ((type1.parameters['epsilon'] * type2.parameters['epsilon']) ** 0.5).to('kJ/mol'))
+        assert not table.overridden.any()
+
+    def test_pair_parameter_table_geometric(self, typed_ethane):
+        typed_ethane.combining_rule = 'geometric'
+        table = typed_ethane.pair_parameter_table()
+        type1, type2 = typed_ethane.atom_types[:2]
+        assert_allclose_units(
+            table.get(type1, type2)[0],
+            ((type1.parameters['sigma'] * type2.parameters['sigma']) ** 0.5).to(u.nm))
+
+    def test_pair_parameter_table_cached(self, typed_ethane):
+        typed_ethane.combining_rule = 'lorentz'
+        table = typed_ethane.pair_parameter_table()
+        assert typed_ethane.pair_parameter_table() is table
+
+        typed_ethane.combining_rule = 'geometric'
+        geometric_table = typed_ethane.pair_parameter_table()
+        assert geometric_table is not table
+
+        changed_type = typed_ethane.atom_types[0]
+        changed_type.parameters = {'sigma': 0.5 * u.nm,
+                                   'epsilon': 1.0 * u.Unit('kJ/mol')}
+        changed_table = typed_ethane.pair_parameter_table()
+        assert changed_table is not geometric_table
+        assert_allclose_units(changed_table.get(changed_type, changed_type)[0], 0.5 * u.nm)
+
+    def test_pair_parameter_table_overrides(self, typed_ethane):
+        type1, type2 = typed_ethane.atom_types[:2]
+        typed_ethane.add_pair_override(type2.name, type1, sigma=0.1 * u.nm,
+                                       epsilon=0.2 * u.Unit('kJ/mol'))
+        table = typed_ethane.pair_parameter_table()
+        i, j = table.index(type1), table.index(type2)
+        assert table.overridden[i, j] and table.overridden[j, i]
+        assert table.overridden.sum() == 2
+        assert_allclose_units(table.sigma[j, i], 0.1 * u.nm)
+        assert_allclose_units(table.epsilon[i, j], 0.2 * u.Unit('kJ/mol'))
+        overridden_i, overridden_j = table.pairs(overridden_only=True)
+        assert list(zip(overridden_i, overridden_j)) == [(min(i, j), max(i, j))]
+
+    def test_pair_parameter_table_shared_names(self):
+        from gmso.utils.mixing import PairParameterTable
+        atom_types = [
+            AtomType(name=name, charge=charge * u.elementary_charge,
+                     parameters={'sigma': sigma * u.nm, 'epsilon': 1.0 * u.Unit('kJ/mol')})
+            for name, charge, sigma in [('CT', 0.0, 0.3), ('CT', -0.2, 0.4), ('HC', 0.1, 0.2)]
+        ]
+        table = PairParameterTable(atom_types, overrides={
+            ('HC', 'CT'): {'sigma': 0.1 * u.nm, 'epsilon': 0.5 * u.Unit('kJ/mol')}
+        })
+        assert [table.index(atom_type) for atom_type in atom_types] == [0, 1, 2]
+        assert_allclose_units(table.sigma[0, 0], 0.3 * u.nm)
+        assert_allclose_units(table.sigma[1, 1], 0.4 * u.nm)
+        assert_allclose_units(table.sigma[0, 1], 0.35 * u.nm)
+        assert table.overridden.sum() == 4
+        for i in (0, 1):
+            assert_allclose_units(table.get(atom_types[i], atom_types[2])[0], 0.1 * u.nm)
+            assert_allclose_units(table.epsilon[2, i], 0.5 * u.Unit('kJ/mol'))
+        assert table.index('HC') == 2
+        with pytest.raises(GMSOError):
+            table.index('CT')
+
+    def test_pair_parameter_table_missing_params(self):
+        top = Topology()
+        top.add_site(Atom(atom_type=AtomType(expression='A*r', parameters={'A': 1 * u.kJ})))
+        with pytest.raises(GMSOError):
+            top.pair_parameter_table()
+
+    def test_to_unit_system(self, typed_ethane):
+        from gmso.utils.units import LAMMPS_REAL
+        compiled = typed_ethane.to_unit_system(LAMMPS_REAL)
+        assert compiled['positions'].shape == (typed_ethane.n_sites, 3)
+        assert compiled['positions'].units == u.angstrom
+        for idx, site in enumerate(typed_ethane.sites):
+            assert np.allclose(compiled['positions'][idx].value, site.position.to_value(u.angstrom))
+            assert np.isclose(compiled['charges'][idx].value, site.charge.to_value(u.elementary_charge))
+            assert np.isclose(compiled['masses'][idx].value, site.mass.to_value('g/mol'))
+        assert np.allclose(compiled['box_lengths'].value, typed_ethane.box.lengths.to_value(u.angstrom))
+
+        assert sum(len(table) for table in compiled['bond_types'].values()) == len(typed_ethane.bond_types)
+        for table in compiled['bond_types'].values():
+            assert table['k'].units == u.Unit('kcal/mol/angstrom**2')
+            for idx, bond_type in enumerate(table.potentials):
+                assert np.isclose(table['k'][idx].value,
+                                  bond_type.parameters['k'].to_value('kcal/mol/angstrom**2'))
+        for table in compiled['angle_types'].values():
+            assert table['theta_eq'].units == u.degree
+
+    def test_to_unit_system_empty(self):
+        from gmso.utils.units import GROMACS
+        compiled = Topology().to_unit_system(GROMACS)
+        assert compiled['positions'].shape == (0, 3)
+        assert compiled['box_lengths'] is None
+        assert compiled['atom_types'] == {}
+
+    @pytest.mark.skipif(not has_scipy, reason="SciPy is not installed")
+    def test_adjacency(self, typed_ethane):
+        adjacency = typed_ethane.adjacency()
+        sites = list(typed_ethane.sites)
+        assert adjacency.format == 'csr'
+        assert adjacency.shape == (8, 8)
+        assert adjacency.nnz == 2 * typed_ethane.n_bonds
+        assert (adjacency != adjacency.T).nnz == 0
+        for bond in typed_ethane.bonds:
+            i, j = (sites.index(member) for member in bond.connection_members)
+            assert adjacency[i, j] == adjacency[j, i] == 1
+
+        assert typed_ethane.adjacency(format='coo').format == 'coo'
+
+    @pytest.mark.skipif(not has_scipy, reason="SciPy is not installed")
+    def test_adjacency_bond_types(self, typed_ethane):
+        weights = typed_ethane.adjacency(weights='bond_type')
+        sites = list(typed_ethane.sites)
+        for bond in typed_ethane.bonds:
+            i, j = (sites.index(member) for member in bond.connection_members)
+            assert typed_ethane.bond_types[weights[i, j] - 1] == bond.bond_type
+
+        typed_ethane.bonds[0].bond_type = None
+        i, j = (sites.index(member) for member in typed_ethane.bonds[0].connection_members)
+        assert typed_ethane.adjacency(weights='bond_type')[i, j] == -1
+
+        with pytest.raises(GMSOError):
+            typed_ethane.adjacency(weights='bond_order')
+
+    def test_remove_connection(self, ethane):
+        bond = ethane.bonds[0]
+        n_sites = ethane.n_sites
+        removed = ethane.remove_connection(Bond(connection_members=bond.connection_members[::-1]))
+
+        assert removed is bond
+        assert ethane.n_bonds == 6
+        assert bond not in ethane.connections
+        assert ethane.n_sites == n_sites
+        with pytest.raises(GMSOError):
+            ethane.remove_connection(bond)
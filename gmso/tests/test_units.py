@@ -0,0 +1,83 @@
+import gc
+import weakref
+
+import pytest
+import numpy as np
+import unyt as u
+from unyt.testing import assert_allclose_units
+
+from gmso.utils.units import UnitSystem, LAMMPS_REAL, LAMMPS_METAL, GROMACS
+from gmso.tests.base_test import BaseTest
+from gmso.exceptions import GMSOError
+
+
+class TestUnitSystem(BaseTest):
+    @pytest.mark.parametrize('quantity,expected', [
+        (1.0 * u.nm, 10.0 * u.angstrom),
+        (4.184 * u.Unit('kJ/mol'), 1.0 * u.Unit('kcal/mol')),
+        (418.4 * u.Unit('kJ/mol/nm**2'), 1.0 * u.Unit('kcal/mol/angstrom**2')),
+        (4.184 * u.Unit('kJ/mol/rad**2'), 1.0 * u.Unit('kcal/mol/rad**2')),
+        (np.pi * u.radian, 180.0 * u.degree),
+        (1.0 * u.Unit('nm/ps'), 0.01 * u.Unit('angstrom/fs')),
+        (12.011 * u.amu, 12.011 * u.Unit('g/mol')),
+        (300.0 * u.K, 300.0 * u.K),
+        (2.0 * u.dimensionless, 2.0 * u.dimensionless),
+    ])
+    def test_lammps_real(self, quantity, expected):
+        converted = LAMMPS_REAL.convert(quantity)
+        assert converted.units == expected.units
+        assert_allclose_units(converted, expected)
+
+    def test_charge(self):
+        for unit_system in [LAMMPS_REAL, LAMMPS_METAL, GROMACS]:
+            assert np.isclose(unit_system.in_system(-1.0 * u.elementary_charge), -1.0)
+
+    def test_energy_units(self):
+        assert LAMMPS_METAL.units_for('kJ/mol/nm') == u.Unit('eV/angstrom')
+        assert GROMACS.units_for('kcal/mol/angstrom**6') == u.Unit('kJ/mol/nm**6')
+        assert GROMACS.units_for('mol/kcal') == u.Unit('mol/kJ')
+
+    def test_convert_array(self):
+        values = u.unyt_array([[1.0, 2.0, 3.0]], u.nm)
+        converted = LAMMPS_REAL.convert(values)
+        assert converted.shape == (1, 3)
+        assert np.allclose(converted.value, [[10.0, 20.0, 30.0]])
+
+    def test_cached_factor(self):
+        assert GROMACS.conversion_factor('kcal/mol') == GROMACS.conversion_factor(u.Unit('kcal/mol'))
+        assert np.isclose(GROMACS.conversion_factor('kcal/mol'), 4.184)
+
+    def test_cache_released(self):
+        reduced = UnitSystem.reduced(ref_distance=0.35 * u.nm)
+        assert np.isclose(reduced.in_system(0.7 * u.nm), 2.0)
+        assert u.nm in reduced._factors
+        ref = weakref.ref(reduced)
+        del reduced
+        gc.collect()
+        assert ref() is None
+
+    def test_reduced(self):
+        reduced = UnitSystem.reduced(ref_distance=0.35 * u.nm,
+                                     ref_mass=12.0 * u.Unit('g/mol'),
+                                     ref_energy=0.5 * u.Unit('kJ/mol'))
+        assert reduced.units_for('nm') == u.dimensionless
+        assert np.isclose(reduced.in_system(0.7 * u.nm), 2.0)
+        assert np.isclose(reduced.in_system(6.0 * u.amu), 0.5)
+        assert np.isclose(reduced.in_system(1.0 * u.Unit('kJ/mol')), 2.0)
+        assert np.isclose(reduced.in_system(1.0 * u.Unit('kJ/mol/nm**2')), 0.5 * 0.35 ** 2 / 0.25)
+        assert np.isclose(reduced.in_system(90 * u.degree), np.pi / 2)
+        assert np.isclose(reduced.in_system((0.5 * u.Unit('kJ/mol') / u.physical_constants.kb).to('K')), 1.0)
+
+    def test_reduced_charge(self):
+        # Same charge factor as write_gsd
+        ref_distance = 1.0 * u.nm
+        ref_energy = 1.0 * u.Unit('kcal/mol')
+        e0 = u.physical_constants.eps_0.in_units(u.elementary_charge ** 2 / u.Unit('kcal*angstrom/mol'))
+        charge_factor = (4.0 * np.pi * e0 * ref_distance * ref_energy) ** 0.5
+        reduced = UnitSystem.reduced(ref_distance=ref_distance, ref_energy=ref_energy)
+        assert np.isclose(reduced.in_system(1.0 * u.elementary_charge),
+                          (1.0 * u.elementary_charge / charge_factor).to_value('dimensionless'))
+
+    def test_invalid_dimensions(self):
+        with pytest.raises(GMSOError):
+            UnitSystem('invalid', length=u.nm, mass=u.nm, time=u.ps, energy=u.Unit('kJ/mol'))
@@ -1,6 +1,5 @@
-import sympy
-
 from gmso.exceptions import EngineIncompatibilityError
+from gmso.utils.expression import expression_fingerprint, expressions_equivalent
 
 
 def check_compatibility(topology, accepted_potentials):
@@ -24,15 +23,16 @@ def check_compatibility(topology, accepted_potentials):
     """
 
     potential_forms_dict = dict()
+    templates_lookup = _fingerprint_lookup(accepted_potentials)
     for atom_type in topology.atom_types:
-        potential_form = _check_single_potential(atom_type, accepted_potentials)
+        potential_form = _check_single_potential(atom_type, accepted_potentials, templates_lookup)
         if not potential_form:
             raise EngineIncompatibilityError
         else:
             potential_forms_dict.update(potential_form)
 
     for connection_type in topology.connection_types:
-        potential_form = _check_single_potential(connection_type, accepted_potentials)
+        potential_form = _check_single_potential(connection_type, accepted_potentials, templates_lookup)
         if not potential_form:
             raise EngineIncompatibilityError
         else:
@@ -41,10 +41,26 @@ def check_compatibility(topology, accepted_potentials):
     return potential_forms_dict
 
 
-def _check_single_potential(potential, accepted_potentials):
-    """Checks to see if a single given potential is in the list of accepted potentials"""
+def _fingerprint_lookup(accepted_potentials):
+    """Group a list of potentials by the fingerprint of their expression"""
+    lookup = dict()
     for ref in accepted_potentials:
-        if ref.independent_variables == potential.independent_variables:
-            if sympy.simplify(ref.expression - potential.expression) == 0:
-                return {potential: ref.name}
+        lookup.setdefault(expression_fingerprint(ref.expression), []).append(ref)
+    return lookup
+
+
+def _check_single_potential(potential, accepted_potentials, templates_lookup=None):
+    """Checks to see if a single given potential is in the list of accepted potentials
+
+    The potential is first looked up by the fingerprint of its expression, the
+    full list of accepted potentials is only scanned if that lookup fails.
+    """
+    if templates_lookup is None:
+        templates_lookup = _fingerprint_lookup(accepted_potentials)
+    candidates = templates_lookup.get(expression_fingerprint(potential.expression), [])
+    for refs in (candidates, accepted_potentials):
+        for ref in refs:
+            if ref.independent_variables == potential.independent_variables:
+                if expressions_equivalent(ref.expression, potential.expression):
+                    return {potential: ref.name}
     return False
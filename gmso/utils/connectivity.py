@@ -1,192 +1,308 @@
-import networkx as nx
+from itertools import combinations
+
+import numpy as np
 
 from gmso.core.angle import Angle
 from gmso.core.dihedral import Dihedral
 from gmso.core.improper import Improper
+from gmso.utils.io import import_
 
-CONNS = {
-    'angle': Angle,
-    'dihedral': Dihedral,
-    'improper': Improper
-}
-
-EDGES = {
-    'angle': ((0, 1),),
-    'dihedral': ((0, 1), (1, 2)),
-    'improper': ((0, 1), (0, 2), (1, 2))
-}
 
-
-def identify_connections(top):
+def identify_connections(top, incremental=False):
     """Identify all possible connections within a topology
 
-    Notes: We are using networkx graph matching to match
-    the topology's bonding graph to smaller sub-graphs that
-    correspond to an angle, dihedral, improper etc.
-    The matching is actually done via the line-graph of the
-    topology bonding graph.
-    [ahy]: IIRC we chose to use line-graph as opposed the actual graph
-    because the graph-matching (on the actual graph) would miss certain
-    angles/dihedrals/impropers if there were cycles or bridge bonds
-    that would effectively hide the angle/dihedral/dihedral
-    [ahy]: In the event of virtual sites/drude particles, the matching
-    process may have to change in the _detect, _format, or _add methods.
-    Personally, I think modifying the _add methods to exclude angles/dihedrals
-    with virtual sites would be be the best approach. I
-    don't think we would want to change how we construct any of the
-    NetworkX graphs.
-    """
-
-    compound = nx.Graph()
-
-    for b in top.bonds:
-        compound.add_edge(b.connection_members[0], b.connection_members[1])
+    The angles, dihedrals and impropers are enumerated from the neighbors
+    of the sites in the bonding graph, see `neighbor_lists`:
 
-    compound_line_graph = nx.line_graph(compound)
+    * an angle i-j-k for every pair of neighbors i and k of a site j
+    * a dihedral i-j-k-l for every bond j-k, neighbor i (other than k) of j
+      and neighbor l (other than j and i) of k
+    * an improper j-i-k-l for every triple of neighbors i, k and l of a
+      site j
 
-    angle_matches = _detect_connections(compound_line_graph, type_='angle')
-    dihedral_matches = _detect_connections(compound_line_graph, type_='dihedral')
-    improper_matches = _detect_connections(compound_line_graph, type_='improper')
-
-    for conn_matches, conn_type in zip(
-            (angle_matches, dihedral_matches, improper_matches),
-            ('angle', 'dihedral', 'improper')):
-        if conn_matches:
-            _add_connections(top, conn_matches, conn_type=conn_type)
+    As with matching the line graph of the bonding graph, angles and
+    dihedrals are found across cycles and bridge bonds, and three membered
+    rings are not impropers. Connections equivalent to one already in the
+    topology are not added again.
 
+    Parameters
+    ----------
+    top : gmso.Topology
+        The topology whose connections to identify
+    incremental : bool, optional, default=False
+        If True, only the connections through the bonds added to or removed
+        from the topology since its connections were last identified are
+        considered: those through added bonds are added and those through
+        removed bonds are removed. The cost is then proportional to the
+        size of the neighborhood of the edited bonds, not of the topology
+    """
+    if incremental:
+        _update_connections(top)
+        top._bond_edits.clear()
+        return top
+
+    sites = list(top.sites)
+    members = _member_indices(top, top.bonds)
+    indptr, indices = neighbor_lists(len(sites), members)
+    neighbors = [indices[indptr[idx]:indptr[idx + 1]].tolist() for idx in range(len(sites))]
+
+    angles = [
+        (first, center, second)
+        for center, neighbors_j in enumerate(neighbors)
+        for first, second in combinations(neighbors_j, 2)
+    ]
+    dihedrals = [
+        (first, j, k, last)
+        for j, k in members.tolist()
+        for first in neighbors[j] if first != k
+        for last in neighbors[k] if last != j and last != first
+    ]
+    impropers = [
+        (center, *branches)
+        for center, neighbors_j in enumerate(neighbors)
+        for branches in combinations(neighbors_j, 3)
+    ]
+
+    for connection_class, matches in ((Angle, angles), (Dihedral, dihedrals), (Improper, impropers)):
+        if matches:
+            _add_connections(top, sites, matches, connection_class)
+
+    top._bond_edits.clear()
     return top
 
 
-def _add_connections(top, matches, conn_type):
-    for tuple_ in matches:
-        to_add_conn = CONNS[conn_type](connection_members=[*tuple_])
-        top.add_connection(to_add_conn, update_types=False)
-
-
-def _detect_connections(compound_line_graph, type_='angle'):
-    connection = nx.Graph()
-    for edge in EDGES[type_]:
-        assert len(edge) == 2, 'Edges should be of length 2'
-        connection.add_edge(edge[0], edge[1])
-
-    matcher = nx.algorithms.isomorphism.GraphMatcher(compound_line_graph, connection)
-
-    formatter_fns = {
-        'angle': _format_subgraph_angle,
-        'dihedral': _format_subgraph_dihedral,
-        'improper': _format_subgraph_improper,
-    }
-
-    conn_matches = []
-    for m in matcher.subgraph_isomorphisms_iter():
-        new_connection = formatter_fns[type_](m)
-        conn_matches.append(new_connection)
-
-    if conn_matches:
-        conn_matches = _trim_duplicates(conn_matches)
-
-    return conn_matches
-
-
-def _get_sorted_by_n_connections(m):
-    """get sorted by n connections for the matching graph"""
-    small = nx.Graph()
-    for k, v in m.items():
-        small.add_edge(k[0], k[1])
-    return sorted(small.adj, key=lambda x: len(small[x])), small
-
+def _update_connections(top):
+    """Add and remove the connections through the bonds edited since connections were last identified"""
+    current = top._bond_neighbors
+    added, removed = [], []
+    for pair, was_bonded in top._bond_edits.items():
+        site1, site2 = pair
+        bonded = site2 in current.get(site1, {})
+        if bonded and not was_bonded:
+            added.append((site1, site2))
+        elif was_bonded and not bonded:
+            removed.append((site1, site2))
+
+    # The graph before the edits only differs around the edited bonds
+    old_neighbors = {}
+    for site1, site2 in added + removed:
+        for site in (site1, site2):
+            if site not in old_neighbors:
+                old_neighbors[site] = dict(current.get(site, {}))
+    for site1, site2 in added:
+        old_neighbors[site1].pop(site2, None)
+        old_neighbors[site2].pop(site1, None)
+    for site1, site2 in removed:
+        old_neighbors[site1][site2] = None
+        old_neighbors[site2][site1] = None
+
+    def _old(site):
+        return old_neighbors[site] if site in old_neighbors else current.get(site, {})
+
+    def _current(site):
+        return current.get(site, {})
+
+    site_index = top._sites.index
+    for connection_class, matches in _connections_through(removed, _old, site_index).items():
+        for connection in _new_connections(connection_class, matches):
+            for key in _equivalent_keys(connection):
+                if key in top._unique_connections:
+                    top.remove_connection(top._unique_connections[key])
+
+    for connection_class, matches in _connections_through(added, _current, site_index).items():
+        connections = [
+            connection for connection in _new_connections(connection_class, matches)
+            if not any(key in top._unique_connections for key in _equivalent_keys(connection))
+        ]
+        top.add_connections(connections, update_types=False)
+
+
+def _connections_through(bonds, neighbors, site_index):
+    """Enumerate the angles, dihedrals and impropers through some bonds of a bonding graph
+
+    Returns the members of the connections of each class, without duplicates.
+    The branches of impropers are ordered by their index in the topology,
+    as with `identify_connections`.
+    """
+    angles, dihedrals, impropers = {}, {}, {}
+    for site1, site2 in bonds:
+        neighbors1 = [site for site in neighbors(site1) if site is not site2]
+        neighbors2 = [site for site in neighbors(site2) if site is not site1]
+        for first, second, first_neighbors, second_neighbors in ((site1, site2, neighbors1, neighbors2),
+                                                                (site2, site1, neighbors2, neighbors1)):
+            for other in second_neighbors:
+                angles.setdefault((second, frozenset([first, other])), (first, second, other))
+                # The bond as the middle bond and as the first bond of dihedrals
+                for last in neighbors(other):
+                    if last is not second and last is not first:
+                        dihedral = (first, second, other, last)
+                        dihedrals.setdefault(frozenset([dihedral, dihedral[::-1]]), dihedral)
+                for before in first_neighbors:
+                    if before is not other:
+                        dihedral = (before, first, second, other)
+                        dihedrals.setdefault(frozenset([dihedral, dihedral[::-1]]), dihedral)
+            for branches in combinations(second_neighbors, 2):
+                branches = sorted((first,) + branches, key=site_index)
+                impropers.setdefault((second, frozenset(branches)), (second, *branches))
+
+    return {Angle: list(angles.values()), Dihedral: list(dihedrals.values()), Improper: list(impropers.values())}
+
+
+def _new_connections(connection_class, matches):
+    """Create connections of members, the first being validated and the others copied from it"""
+    if not matches:
+        return []
+    prototype = connection_class(connection_members=list(matches[0]))
+    return [prototype] + [
+        prototype.copy(update={'connection_members_': tuple(match)})
+        for match in matches[1:]
+    ]
+
+
+def _equivalent_keys(connection):
+    """Get the keys in `Topology._unique_connections` of the connections equivalent to a connection
+
+    Impropers only have their second and third branches interchangeable, the
+    same center and branches give three impropers with a different last branch.
+    """
+    if not isinstance(connection, Improper):
+        return [connection._equivalent_members()]
+    center, first, second, third = connection.connection_members
+    return [
+        connection.copy(update={'connection_members_': (center, *branches)})._equivalent_members()
+        for branches in ((first, second, third), (first, third, second), (second, third, first))
+    ]
 
-def _format_subgraph_angle(m):
-    """Format the angle subgraph
 
-    Since we are matching compound line graphs,
-    back out the actual nodes, not just the edges
+def neighbor_lists(n_sites, bonds):
+    """Get the neighbors of every site of a bond graph as compressed sparse rows
 
     Parameters
     ----------
-    m : dict
-        keys are the compound line graph nodes
-        Values are the sub-graph matches (to the angle, dihedral, or improper)
+    n_sites : int
+        The number of sites of the graph
+    bonds : np.ndarray
+        The M x 2 indices of the sites of the M bonds
 
     Returns
-    ------
-    connection : list of nodes, in order of bonding
-        (start, middle, end) """
-
-    (sort_by_n_connections, _) = _get_sorted_by_n_connections(m)
-    start = sort_by_n_connections[0]
-    end = sort_by_n_connections[1]
-    middle = sort_by_n_connections[2]
-    return [start, middle, end]
-
+    -------
+    indptr : np.ndarray
+        The N + 1 offsets of the neighbors of each site in `indices`
+    indices : np.ndarray
+        The 2M indices of the neighbors of the sites, those of site i being
+        `indices[indptr[i]:indptr[i + 1]]` in increasing order
+    """
+    indptr, indices, _ = _compressed_rows(n_sites, bonds)
+    return indptr, indices
 
-def _format_subgraph_dihedral(m):
-    """Format the dihedral subgraph
 
-    Since we are matching compound line graphs,
-    back out the actual nodes, not just the edges
+def adjacency_matrix(n_sites, bonds, weights=None, format='csr'):
+    """Get the adjacency matrix of a bond graph as a scipy sparse matrix
 
     Parameters
     ----------
-    m : dict
-        keys are the compound line graph nodes
-        Values are the sub-graph matches (to the angle, dihedral, or improper)
+    n_sites : int
+        The number of sites of the graph
+    bonds : np.ndarray
+        The M x 2 indices of the sites of the M bonds
+    weights : np.ndarray, optional, default=None
+        The M values of the entries of the bonds, e.g. the index of their
+        type. If None, every entry is 1
+    format : str, optional, default='csr'
+        The scipy.sparse format of the matrix, e.g. 'csr', 'csc', 'coo' or 'lil'
 
     Returns
-    ------
-    connection : list of nodes, in order of bonding
-        (start, mid1, mid2, end)
+    -------
+    scipy.sparse.spmatrix
+        The symmetric N x N adjacency matrix of the graph
     """
-    (sort_by_n_connections, small) = _get_sorted_by_n_connections(m)
-    start = sort_by_n_connections[0]
-    if sort_by_n_connections[2] in small.neighbors(start):
-        mid1 = sort_by_n_connections[2]
-        mid2 = sort_by_n_connections[3]
-    else:
-        mid1 = sort_by_n_connections[3]
-        mid2 = sort_by_n_connections[2]
-
-    end = sort_by_n_connections[1]
-    return [start, mid1, mid2, end]
+    sparse = import_('scipy.sparse')
+    bonds = np.asarray(bonds, dtype=np.int64).reshape(-1, 2)
+    if weights is None:
+        weights = np.ones(len(bonds), dtype=np.int8)
+    indptr, indices, order = _compressed_rows(n_sites, bonds)
+    data = np.concatenate([weights, weights])[order]
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(n_sites, n_sites))
+    return matrix.asformat(format)
 
 
-def _format_subgraph_improper(m):
-    """ Format the dihedral subgraph
+def connected_components(n_sites, bonds):
+    """Label the connected components (i.e. molecules) of a bond graph
 
-    Since we are matching compound line graphs,
-    back out the actual nodes, not just the edges
+    The components are found with array operations: every site points to a
+    site of lower or equal index, each bond hooks the root of its larger
+    root onto the smaller one, and the pointers are compressed to the roots,
+    until no bond joins two roots. This takes a number of passes logarithmic
+    in the size of the components.
 
     Parameters
     ----------
-    m : dict
-        keys are the compound line graph nodes
-        Values are the sub-graph matches (to the angle, dihedral, or improper)
+    n_sites : int
+        The number of sites of the graph
+    bonds : np.ndarray
+        The M x 2 indices of the sites of the M bonds
 
     Returns
-    ------
-    connection : list of nodes, in order of bonding
-        (central, branch1, branch2, branch3)
-
-    Notes
-    ------
-    Given the way impropers are matched, sometimes a cyclic 3-ring system gets returned
+    -------
+    np.ndarray
+        The index of the component of every site. Components are numbered
+        in the order of their first site
     """
-    (sort_by_n_connections, _) = _get_sorted_by_n_connections(m)
-    if len(sort_by_n_connections) == 4:
-        central = sort_by_n_connections[3]
-        branch1, branch2, branch3 = sorted(sort_by_n_connections[:3])
-        return [central, branch1, branch2, branch3]
-    return None
-
-
-def _trim_duplicates(all_matches):
-    """Remove redundant sub-graph matches
-
-    Is there a better way to do this? Like when we format the subgraphs,
-    can we impose an ordering so it's easier to eliminate redundant matches?
+    bonds = np.asarray(bonds, dtype=np.int64).reshape(-1, 2)
+    roots = np.arange(n_sites, dtype=np.int64)
+    while bonds.size > 0:
+        first, second = roots[bonds[:, 0]], roots[bonds[:, 1]]
+        joined = first != second
+        if not joined.any():
+            break
+        first, second = first[joined], second[joined]
+        np.minimum.at(roots, np.maximum(first, second), np.minimum(first, second))
+        compressed = roots[roots]
+        while not np.array_equal(compressed, roots):
+            roots = compressed
+            compressed = roots[roots]
+    # The root of a component is its first site
+    return np.unique(roots, return_inverse=True)[1].astype(np.int64)
+
+
+def _compressed_rows(n_sites, bonds):
+    """Sort both directions of the bonds by site and neighbor
+
+    Returns the row offsets, the neighbor of each entry and the positions
+    of the entries in the bonds followed by the reversed bonds.
+    """
+    bonds = np.asarray(bonds, dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([bonds[:, 0], bonds[:, 1]])
+    columns = np.concatenate([bonds[:, 1], bonds[:, 0]])
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(n_sites + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_sites), out=indptr[1:])
+    return indptr, columns[order], order
+
+
+def _member_indices(top, connections):
+    """Get the C x n indices of the members of connections in the sites of a topology"""
+    site_index = {id(site): idx for idx, site in enumerate(top.sites)}
+    connections = list(connections)
+    n_members = len(connections[0].connection_members) if connections else 2
+    return np.array([
+        [site_index[id(member)] for member in connection.connection_members]
+        for connection in connections
+    ], dtype=np.int64).reshape(-1, n_members)
+
+
+def _add_connections(top, sites, matches, connection_class):
+    """Add the connections of site indices which are not already in the topology
+
+    The first connection is validated and the others are copied from it
+    with their members.
     """
-    trimmed_list = []
-    for match in all_matches:
-        if match and match not in trimmed_list and match[::-1] not in trimmed_list:
-            trimmed_list.append(match)
-    return trimmed_list
+    prototype = connection_class(connection_members=[sites[idx] for idx in matches[0]])
+    connections = [prototype] + [
+        prototype.copy(update={'connection_members_': tuple(sites[idx] for idx in match)})
+        for match in matches[1:]
+    ]
+    top.add_connections([
+        connection for connection in connections
+        if connection._equivalent_members() not in top._unique_connections
+    ], update_types=False)
@@ -1,11 +1,50 @@
-
-import sympy
-import unyt as u
+import numpy as np
 
 import gmso
 from gmso.lib.potential_templates import PotentialTemplateLibrary
+from gmso.utils.expression import expressions_equivalent
 from gmso.exceptions import GMSOError 
 
+def _opls_to_ryckaert_parameters(parameters):
+    """Convert OPLS parameters (unyt quantities or arrays) to Ryckaert-Bellemans parameters"""
+    f0 = parameters['k0']
+    f1 = parameters['k1']
+    f2 = parameters['k2']
+    f3 = parameters['k3']
+    f4 = parameters['k4']
+
+    return {
+            'c0' : (f2 + 0.5 * (f0 + f1 + f3)),
+            'c1' : (0.5 * (-f1 + 3. * f3)),
+            'c2' : (-f2 + 4. * f4),
+            'c3' : (-2. * f3),
+            'c4' : (-4. * f4),
+            'c5' : np.zeros_like(f0.to('kJ/mol'))
+    }
+
+
+def _ryckaert_to_opls_parameters(parameters):
+    """Convert Ryckaert-Bellemans parameters (unyt quantities or arrays) to OPLS parameters"""
+    c0 = parameters['c0']
+    c1 = parameters['c1']
+    c2 = parameters['c2']
+    c3 = parameters['c3']
+    c4 = parameters['c4']
+    c5 = parameters['c5']
+
+    if np.any(c5 != 0.0):
+        raise GMSOError('Cannot convert Ryckaert-Bellemans dihedral '
+                'to OPLS dihedral if c5 is not equal to zero.')
+
+    return {
+            'k0' : 2. * (c0 + c1 + c2 + c3 + c4),
+            'k1' : (-2. * c1 - (3./2.) * c3),
+            'k2' : (-c2 - c4),
+            'k3' : ((-1./2.) * c3),
+            'k4' : ((-1./4.) * c4)
+    }
+
+
 def convert_opls_to_ryckaert(opls_connection_type):
     """Convert an OPLS dihedral to Ryckaert-Bellemans dihedral
 
@@ -22,28 +61,15 @@ def convert_opls_to_ryckaert(opls_connection_type):
     valid_connection_type = False
     if ( opls_connection_type.independent_variables ==
          opls_torsion_potential.independent_variables ):
-        if sympy.simplify(opls_connection_type.expression -
-                          opls_torsion_potential.expression) == 0:
+        if expressions_equivalent(opls_connection_type.expression,
+                                  opls_torsion_potential.expression):
             valid_connection_type = True
     if not valid_connection_type:
         raise GMSOError('Cannot use convert_opls_to_ryckaert '
             'function to convert a ConnectionType that is not an '
             'OPLSTorsionPotential')
 
-    f0 = opls_connection_type.parameters['k0']
-    f1 = opls_connection_type.parameters['k1']
-    f2 = opls_connection_type.parameters['k2']
-    f3 = opls_connection_type.parameters['k3']
-    f4 = opls_connection_type.parameters['k4']
-
-    converted_params = {
-            'c0' : (f2 + 0.5 * (f0 + f1 + f3)),
-            'c1' : (0.5 * (-f1 + 3. * f3)),
-            'c2' : (-f2 + 4. * f4),
-            'c3' : (-2. * f3),
-            'c4' : (-4. * f4),
-            'c5' : 0. * u.Unit('kJ/mol')
-    }
+    converted_params = _opls_to_ryckaert_parameters(opls_connection_type.parameters)
     ryckaert_bellemans_torsion_potential = templates['RyckaertBellemansTorsionPotential']
     name = ryckaert_bellemans_torsion_potential.name
     expression = ryckaert_bellemans_torsion_potential.expression
@@ -71,8 +97,8 @@ def convert_ryckaert_to_opls(ryckaert_connection_type):
     valid_connection_type = False
     if ( ryckaert_connection_type.independent_variables ==
          ryckaert_bellemans_torsion_potential.independent_variables ):
-        if sympy.simplify(ryckaert_connection_type.expression -
-                ryckaert_bellemans_torsion_potential.expression) == 0:
+        if expressions_equivalent(ryckaert_connection_type.expression,
+                ryckaert_bellemans_torsion_potential.expression):
             valid_connection_type = True
     if not valid_connection_type:
         raise GMSOError('Cannot use convert_ryckaert_to_opls '
@@ -80,24 +106,7 @@ def convert_ryckaert_to_opls(ryckaert_connection_type):
             'RyckaertBellemansTorsionPotential')
 
 
-    c0 = ryckaert_connection_type.parameters['c0']
-    c1 = ryckaert_connection_type.parameters['c1']
-    c2 = ryckaert_connection_type.parameters['c2']
-    c3 = ryckaert_connection_type.parameters['c3']
-    c4 = ryckaert_connection_type.parameters['c4']
-    c5 = ryckaert_connection_type.parameters['c5']
-
-    if c5 != 0.0:
-        raise GMSOError('Cannot convert Ryckaert-Bellemans dihedral '
-                'to OPLS dihedral if c5 is not equal to zero.')
-
-    converted_params = {
-            'k0' : 2. * (c0 + c1 + c2 + c3 + c4),
-            'k1' : (-2. * c1 - (3./2.) * c3),
-            'k2' : (-c2 - c4),
-            'k3' : ((-1./2.) * c3),
-            'k4' : ((-1./4.) * c4)
-    }
+    converted_params = _ryckaert_to_opls_parameters(ryckaert_connection_type.parameters)
 
     name = opls_torsion_potential.name
     expression = opls_torsion_potential.expression
@@ -111,3 +120,90 @@ def convert_ryckaert_to_opls(ryckaert_connection_type):
 
     return opls_connection_type
 
+
+
+_DIHEDRAL_CONVERSIONS = {
+    ('OPLSTorsionPotential', 'RyckaertBellemansTorsionPotential'): convert_opls_to_ryckaert,
+    ('RyckaertBellemansTorsionPotential', 'OPLSTorsionPotential'): convert_ryckaert_to_opls,
+}
+
+_DIHEDRAL_PARAMETER_CONVERSIONS = {
+    ('OPLSTorsionPotential', 'RyckaertBellemansTorsionPotential'): _opls_to_ryckaert_parameters,
+    ('RyckaertBellemansTorsionPotential', 'OPLSTorsionPotential'): _ryckaert_to_opls_parameters,
+}
+
+def _dihedral_form(dihedral_type):
+    """Return the name of the template a dihedral type matches, None if no template of the conversions matches"""
+    template = PotentialTemplateLibrary().match(
+        dihedral_type, names=sorted(set(source for source, _ in _DIHEDRAL_CONVERSIONS)))
+    return template.name if template is not None else None
+
+
+def convert_dihedral_type(dihedral_type, target_form, cache=None):
+    """Convert a dihedral type to the functional form of a potential template
+
+    If a cache is given, each unique dihedral type is converted at most once
+    with it, the result being stored by the dihedral type and the target
+    form. The converted dihedral types are then shared and should not be
+    modified. A dihedral type that is already in the target form is
+    returned as is.
+
+    Parameters
+    ----------
+    dihedral_type : gmso.DihedralType
+        The dihedral type to convert
+    target_form : str, ['OPLSTorsionPotential', 'RyckaertBellemansTorsionPotential']
+        The name of the potential template to convert to
+    cache : dict, optional, default=None
+        The dihedral types already converted, updated with the conversion
+
+    Returns
+    -------
+    gmso.DihedralType
+        The dihedral type in the target form
+    """
+    cache = {} if cache is None else cache
+    key = (dihedral_type, target_form)
+    if key not in cache:
+        source_form = _dihedral_form(dihedral_type)
+        if source_form == target_form:
+            return dihedral_type
+        if (source_form, target_form) not in _DIHEDRAL_CONVERSIONS:
+            raise GMSOError(
+                'Cannot convert {} to {}, the supported conversions are {}'.format(
+                    dihedral_type.name, target_form, list(_DIHEDRAL_CONVERSIONS.keys())
+                )
+            )
+        cache[key] = _DIHEDRAL_CONVERSIONS[(source_form, target_form)](dihedral_type)
+    return cache[key]
+
+
+def convert_dihedral_types(top, target_form):
+    """Convert all the dihedral types of a topology to the functional form of a potential template
+
+    The topology is not modified, use the returned dictionary to look up
+    the converted dihedral type of a dihedral, e.g.
+    `converted[dihedral.connection_type]`. Equal dihedral types share a
+    single converted dihedral type.
+
+    Parameters
+    ----------
+    top : gmso.Topology
+        The topology whose dihedral types to convert
+    target_form : str, ['OPLSTorsionPotential', 'RyckaertBellemansTorsionPotential']
+        The name of the potential template to convert to
+
+    Returns
+    -------
+    dict
+        A dictionary mapping every dihedral type of the topology to its converted dihedral type
+
+    See Also
+    --------
+    convert_dihedral_type : Convert a single dihedral type
+    """
+    cache = {}
+    return {
+        dihedral_type: convert_dihedral_type(dihedral_type, target_form, cache=cache)
+        for dihedral_type in top.dihedral_types
+    }
@@ -1,5 +1,7 @@
 import warnings
+from functools import lru_cache
 
+import numpy as np
 import sympy
 
 import unyt as u
@@ -7,9 +9,17 @@ import unyt as u
 from gmso.utils.misc import unyt_to_hashable
 
 __all__ = [
-    '_PotentialExpression'
+    '_PotentialExpression',
+    'expression_fingerprint',
+    'expressions_equivalent'
 ]
 
+# Number of points, seed and range of the random samples used to fingerprint expressions
+_N_SAMPLE_POINTS = 8
+_SAMPLE_SEED = 42
+_SAMPLE_RANGE = (0.5, 1.5)
+_FINGERPRINT_DIGITS = 8
+
 
 class _PotentialExpression:
     """A general Expression class with parameters
@@ -305,3 +315,114 @@ class _PotentialExpression:
                         f'Potential expression and parameter symbols do not agree, '
                         f'extraneous symbols: {extra_syms}'
                     )
+
+
+@lru_cache(maxsize=None)
+def _sample_expression(expression):
+    """Evaluate an expression at seeded random values of its free symbols
+
+    Every free symbol (sorted by name) is given the same random values for
+    every expression, so that equivalent expressions with the same free
+    symbols evaluate to the same values. Returns the names of the free symbols
+    along with the values, which are None if the expression cannot be
+    evaluated to finite real numbers.
+    """
+    symbols = tuple(sorted(expression.free_symbols, key=lambda symbol: symbol.name))
+    names = tuple(symbol.name for symbol in symbols)
+    points = np.random.RandomState(_SAMPLE_SEED).uniform(*_SAMPLE_RANGE,
+                                                         size=(len(symbols), _N_SAMPLE_POINTS))
+    try:
+        with np.errstate(all='ignore'):
+            values = sympy.lambdify(symbols, expression, modules='numpy')(*points)
+        values = np.broadcast_to(np.asarray(values), (_N_SAMPLE_POINTS,))
+    except (TypeError, ValueError, NameError, ZeroDivisionError):
+        return names, None
+
+    if np.iscomplexobj(values) or values.dtype == object:
+        return names, None
+    values = values.astype(float)
+    if not np.all(np.isfinite(values)):
+        return names, None
+    return names, values
+
+
+@lru_cache(maxsize=None)
+def expression_fingerprint(expression):
+    """Return a hashable fingerprint of a sympy expression
+
+    The fingerprint is the names of the free symbols of the expression and
+    its values, rounded to a few significant digits, at seeded random values
+    of these symbols. Mathematically equivalent expressions (e.g. `0.5*k*x**2`
+    and `k*x**2/2`) almost always get the same fingerprint, which can
+    therefore be used as a dictionary key to match expressions in O(1). If the
+    expression cannot be evaluated numerically, the fingerprint is the
+    (structural) expression itself.
+
+    Parameters
+    ----------
+    expression : sympy.Expr
+        The expression to fingerprint
+
+    Returns
+    -------
+    tuple
+        The fingerprint of the expression
+
+    See Also
+    --------
+    expressions_equivalent : Check whether two expressions are equivalent
+    """
+    names, values = _sample_expression(expression)
+    if values is None:
+        return names, expression
+    return names, tuple(float('{:.{}g}'.format(value, _FINGERPRINT_DIGITS)) for value in values)
+
+
+@lru_cache(maxsize=None)
+def expressions_equivalent(expression1, expression2):
+    """Check whether two sympy expressions are mathematically equivalent
+
+    Structurally equal expressions are equivalent. Otherwise, the expressions
+    are compared numerically at seeded random values of their free symbols,
+    which is orders of magnitude faster than `sympy.simplify`. `sympy.simplify`
+    is only used as a fallback for expressions which cannot be evaluated
+    numerically. The result is cached.
+
+    Parameters
+    ----------
+    expression1 : sympy.Expr
+        The first expression
+    expression2 : sympy.Expr
+        The second expression
+
+    Returns
+    -------
+    bool
+        True if the expressions are equivalent
+    """
+    if expression1 == expression2:
+        return True
+
+    names1, values1 = _sample_expression(expression1)
+    names2, values2 = _sample_expression(expression2)
+    if names1 != names2:
+        return False
+    if values1 is not None and values2 is not None:
+        return bool(np.allclose(values1, values2, rtol=1e-8, atol=1e-12))
+
+    return sympy.simplify(expression1 - expression2) == 0
+
+
+@lru_cache(maxsize=None)
+def _lambdified_expression(expression, variables, parameter_names, derivative=None):
+    """Return a NumPy function of (*variables, *parameters) evaluating an expression
+
+    If `derivative` is a symbol, the function evaluates the derivative of the
+    expression with respect to it instead. The (derivative of the) expression
+    is derived and lambdified once per unique expression, variables and
+    parameter names, and shared by all the potentials with that expression.
+    """
+    symbols = list(variables) + [sympy.Symbol(name) for name in parameter_names]
+    if derivative is not None:
+        expression = sympy.diff(expression, derivative)
+    return sympy.lambdify(symbols, expression, modules='numpy')
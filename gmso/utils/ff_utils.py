@@ -1,6 +1,8 @@
 import os
 import re
 from collections import ChainMap
+from collections.abc import MutableMapping
+from functools import lru_cache
 
 import unyt as u
 from sympy import sympify
@@ -17,6 +19,10 @@ __all__ = ['validate',
            'parse_ff_metadata',
            'parse_ff_atomtypes',
            'parse_ff_connection_types',
+           'parse_ff_file',
+           'index_ff_file',
+           'LazyPotentialDict',
+           'check_member_types',
            'DICT_KEY_SEPARATOR']
 
 DICT_KEY_SEPARATOR = '~'
@@ -85,21 +91,30 @@ def _consolidate_params(params_dict, expression, update_orig=True):
         return new_dict
 
 
-def _check_atomtype_existence(tag, ref_dict):
+def _get_member_types(tag):
     at1 = tag.attrib.get('type1', tag.attrib.get('class1', None))
     at2 = tag.attrib.get('type2', tag.attrib.get('class2', None))
     at3 = tag.attrib.get('type3', tag.attrib.get('class3', None))
     at4 = tag.attrib.get('type4', tag.attrib.get('class4', None))
 
-    atom_classes_set = set(value.atomclass for value in ref_dict.values() if value)
-
     member_types = list(filter(lambda x: x is not None, [at1, at2, at3, at4]))
-    member_types = ['*' if mem_type == '' else mem_type for mem_type in member_types]
+    return ['*' if mem_type == '' else mem_type for mem_type in member_types]
+
+
+def check_member_types(member_types, ref_dict, atom_classes_set=None):
+    """Verify that every member type is a known AtomType name or AtomClass"""
+    if atom_classes_set is None:
+        atom_classes_set = set(value.atomclass for value in ref_dict.values() if value)
     for member in member_types:
         if member == '*':
             continue
         if member not in ref_dict and member not in atom_classes_set:
             raise ForceFieldParseError('AtomType/AtomClass {} not present in AtomTypes reference in the xml'.format(member))
+
+
+def _check_atomtype_existence(tag, ref_dict):
+    member_types = _get_member_types(tag)
+    check_member_types(member_types, ref_dict)
     return member_types
 
 
@@ -120,12 +135,17 @@ def _parse_default_units(unit_tag):
     return units_map
 
 
+@lru_cache(maxsize=1)
+def _default_schema():
+    schema_path = os.path.join(os.path.split(os.path.abspath(__file__))[0], 'schema', 'ff-gmso.xsd')
+    xml_doc = etree.parse(schema_path)
+    return etree.XMLSchema(xml_doc)
+
+
 def validate(xml_path_or_etree, schema=None):
     """Validate a given xml file or etree.ElementTree with a reference schema"""
     if schema is None:
-        schema_path = os.path.join(os.path.split(os.path.abspath(__file__))[0], 'schema', 'ff-gmso.xsd')
-        xml_doc = etree.parse(schema_path)
-        xml_schema = etree.XMLSchema(xml_doc)
+        xml_schema = _default_schema()
     else:
         xml_schema = schema
 
@@ -161,6 +181,44 @@ def parse_ff_metadata(element):
     return ff_meta
 
 
+def _parse_atom_type(atom_type, atom_types_expression, param_unit_dict, units_dict):
+    """Create a topology.core.AtomType from a single AtomType element"""
+    ctor_kwargs = {
+        'name': 'AtomType',
+        'mass': 0.0 * u.g / u.mol,
+        'expression': '4*epsilon*((sigma/r)**12 - (sigma/r)**6)',
+        'parameters': None,
+        'charge': 0.0 * u.elementary_charge,
+        'independent_variables': None,
+        'atomclass': '',
+        'doi': '',
+        'overrides': '',
+        'definition': '',
+        'description': '',
+        'topology': None
+    }
+
+    if atom_types_expression:
+        ctor_kwargs['expression'] = atom_types_expression
+
+    for kwarg in ctor_kwargs.keys():
+        ctor_kwargs[kwarg] = atom_type.attrib.get(kwarg, ctor_kwargs[kwarg])
+    if isinstance(ctor_kwargs['mass'], str):
+        ctor_kwargs['mass'] = u.unyt_quantity(float(ctor_kwargs['mass']), units_dict['mass'])
+    if isinstance(ctor_kwargs['overrides'], str):
+        ctor_kwargs['overrides'] = set(ctor_kwargs['overrides'].split(','))
+    if isinstance(ctor_kwargs['charge'], str):
+        ctor_kwargs['charge'] = u.unyt_quantity(float(ctor_kwargs['charge']), units_dict['charge'])
+    params_dict = _parse_params_values(atom_type, param_unit_dict, 'AtomType')
+    if not ctor_kwargs['parameters'] and params_dict:
+        ctor_kwargs['parameters'] = params_dict
+        valued_param_vars = set(sympify(param) for param in params_dict.keys())
+        ctor_kwargs['independent_variables'] = sympify(atom_types_expression).free_symbols - valued_param_vars
+
+    _check_valid_string(ctor_kwargs['name'])
+    return AtomType(**ctor_kwargs)
+
+
 def parse_ff_atomtypes(atomtypes_el, ff_meta):
     """Given an xml element tree rooted at AtomType, traverse the tree to form a proper topology.core.AtomType"""
     atomtypes_dict = {}
@@ -172,40 +230,10 @@ def parse_ff_atomtypes(atomtypes_el, ff_meta):
 
     # Parse all the atomTypes and create a new AtomType
     for atom_type in atomtypes_el.getiterator('AtomType'):
-        ctor_kwargs = {
-            'name': 'AtomType',
-            'mass': 0.0 * u.g / u.mol,
-            'expression': '4*epsilon*((sigma/r)**12 - (sigma/r)**6)',
-            'parameters': None,
-            'charge': 0.0 * u.elementary_charge,
-            'independent_variables': None,
-            'atomclass': '',
-            'doi': '',
-            'overrides': '',
-            'definition': '',
-            'description': '',
-            'topology': None
-        }
-
-        if atom_types_expression:
-            ctor_kwargs['expression'] = atom_types_expression
-
-        for kwarg in ctor_kwargs.keys():
-            ctor_kwargs[kwarg] = atom_type.attrib.get(kwarg, ctor_kwargs[kwarg])
-        if isinstance(ctor_kwargs['mass'], str):
-            ctor_kwargs['mass'] = u.unyt_quantity(float(ctor_kwargs['mass']), units_dict['mass'])
-        if isinstance(ctor_kwargs['overrides'], str):
-            ctor_kwargs['overrides'] = set(ctor_kwargs['overrides'].split(','))
-        if isinstance(ctor_kwargs['charge'], str):
-            ctor_kwargs['charge'] = u.unyt_quantity(float(ctor_kwargs['charge']), units_dict['charge'])
-        params_dict = _parse_params_values(atom_type, param_unit_dict, 'AtomType')
-        if not ctor_kwargs['parameters'] and params_dict:
-            ctor_kwargs['parameters'] = params_dict
-            valued_param_vars = set(sympify(param) for param in params_dict.keys())
-            ctor_kwargs['independent_variables'] = sympify(atom_types_expression).free_symbols - valued_param_vars
-
-        _check_valid_string(ctor_kwargs['name'])
-        this_atom_type = AtomType(**ctor_kwargs)
+        this_atom_type = _parse_atom_type(atom_type,
+                                          atom_types_expression,
+                                          param_unit_dict,
+                                          units_dict)
         atomtypes_dict[this_atom_type.name] = this_atom_type
         if this_atom_type.atomclass:
             atomclass_atom_types = atomclasses_dict.get(this_atom_type.atomclass, [])
@@ -221,43 +249,270 @@ TAG_TO_CLASS_MAP = {
 }
 
 
+def _parse_connection_type(connection_type, connectiontype_expression, param_unit_dict,
+                           child_tag, atomtypes_dict):
+    """Create a connection type from a single BondType/AngleType/DihedralType/ImproperType element"""
+    ctor_kwargs = {
+        'name': child_tag,
+        'expression': '0.5 * k * (r-r_eq)**2',
+        'parameters': None,
+        'independent_variables': None,
+        'member_types': None
+    }
+    if connectiontype_expression:
+        ctor_kwargs['expression'] = connectiontype_expression
+
+    for kwarg in ctor_kwargs.keys():
+        ctor_kwargs[kwarg] = connection_type.attrib.get(kwarg, ctor_kwargs[kwarg])
+
+    if atomtypes_dict is None:
+        ctor_kwargs['member_types'] = _get_member_types(connection_type)
+    else:
+        ctor_kwargs['member_types'] = _check_atomtype_existence(connection_type, atomtypes_dict)
+    if not ctor_kwargs['parameters']:
+        ctor_kwargs['parameters'] = _parse_params_values(connection_type,
+                                                         param_unit_dict,
+                                                         child_tag,
+                                                         ctor_kwargs['expression'])
+
+    valued_param_vars = set(sympify(param) for param in ctor_kwargs['parameters'].keys())
+    ctor_kwargs['independent_variables'] = sympify(connectiontype_expression).free_symbols - valued_param_vars
+    return TAG_TO_CLASS_MAP[child_tag](**ctor_kwargs)
+
+
 def parse_ff_connection_types(connectiontypes_el, atomtypes_dict, child_tag='BondType'):
-    """Given an XML etree Element rooted at BondTypes, parse the XML to create topology.core.AtomTypes,"""
+    """Given an XML etree Element rooted at BondTypes, parse the XML to create topology.core.AtomTypes,
+
+    If atomtypes_dict is None, the member types are not checked against the
+    AtomTypes reference, see `check_member_types`.
+    """
     connectiontypes_dict = {}
     connectiontype_expression = connectiontypes_el.attrib.get('expression', None)
     param_unit_dict = _parse_param_units(connectiontypes_el)
 
     # Parse all the bondTypes and create a new BondType
     for connection_type in connectiontypes_el.getiterator(child_tag):
-        ctor_kwargs = {
-            'name': child_tag,
-            'expression': '0.5 * k * (r-r_eq)**2',
-            'parameters': None,
-            'independent_variables': None,
-            'member_types': None
-        }
-        if connectiontype_expression:
-            ctor_kwargs['expression'] = connectiontype_expression
-
-        for kwarg in ctor_kwargs.keys():
-            ctor_kwargs[kwarg] = connection_type.attrib.get(kwarg, ctor_kwargs[kwarg])
-
-        ctor_kwargs['member_types'] = _check_atomtype_existence(connection_type, atomtypes_dict)
-        if not ctor_kwargs['parameters']:
-            ctor_kwargs['parameters'] = _parse_params_values(connection_type,
-                                                             param_unit_dict,
-                                                             child_tag,
-                                                             ctor_kwargs['expression'])
-
-        valued_param_vars = set(sympify(param) for param in ctor_kwargs['parameters'].keys())
-        ctor_kwargs['independent_variables'] = sympify(connectiontype_expression).free_symbols - valued_param_vars
-        this_conn_type_key = DICT_KEY_SEPARATOR.join(ctor_kwargs['member_types'])
-        this_conn_type = TAG_TO_CLASS_MAP[child_tag](**ctor_kwargs)
+        this_conn_type = _parse_connection_type(connection_type,
+                                                connectiontype_expression,
+                                                param_unit_dict,
+                                                child_tag,
+                                                atomtypes_dict)
+        this_conn_type_key = DICT_KEY_SEPARATOR.join(this_conn_type.member_types)
         connectiontypes_dict[this_conn_type_key] = this_conn_type
 
     return connectiontypes_dict
 
 
+_CONNECTION_TAGS = (('BondTypes', 'BondType', 'bond_types'),
+                    ('AngleTypes', 'AngleType', 'angle_types'),
+                    ('DihedralTypes', 'DihedralType', 'dihedral_types'),
+                    ('DihedralTypes', 'ImproperType', 'improper_types'))
+
+
+def _parse_ff_header(ff_tree):
+    """Parse the name, version and metadata of a forcefield XML tree"""
+    ff_el = ff_tree.getroot()
+    ff_meta_tree = ff_tree.find('FFMetaData')
+    if ff_meta_tree is not None:
+        ff_meta_map = parse_ff_metadata(ff_meta_tree)
+    else:
+        ff_meta_map = {'scaling_factors': {'electrostatics14Scale': 1.0,
+                                           'nonBonded14Scale': 1.0}}
+    ff_meta_map.setdefault('Units', _parse_default_units(None))
+
+    return {
+        'name': ff_el.attrib['name'],
+        'version': ff_el.attrib['version'],
+        'meta': ff_meta_map,
+        'atom_classes': set(),
+        'atom_types': [],
+        'bond_types': [],
+        'angle_types': [],
+        'dihedral_types': [],
+        'improper_types': []
+    }
+
+
+def parse_ff_file(loc_or_etree):
+    """Validate and parse a single forcefield XML file into its potential tables
+
+    This is the per-file step of `gmso.ForceField.from_xml`. Member types of
+    the connection types are not checked here, since they can refer to
+    AtomTypes from other files; use `check_member_types` after merging.
+    When called with a file location, the returned dictionary only contains
+    picklable objects so that files can be parsed in separate processes.
+
+    Parameters
+    ----------
+    loc_or_etree : str or etree._ElementTree
+        The forcefield XML location or XML Element Tree
+
+    Returns
+    -------
+    dict
+        The name, version and metadata of the forcefield along with lists of
+        (group_name, potentials_dict) tuples for the atom, bond, angle,
+        dihedral and improper types, in the order they appear in the file
+    """
+    ff_tree = loc_or_etree
+    if not isinstance(loc_or_etree, etree._ElementTree):
+        ff_tree = etree.parse(loc_or_etree)
+    validate(ff_tree)
+
+    parsed = _parse_ff_header(ff_tree)
+    ff_meta_map = parsed['meta']
+
+    for atom_types in ff_tree.findall('AtomTypes'):
+        this_atom_types_group = parse_ff_atomtypes(atom_types, ff_meta_map).maps[0]
+        parsed['atom_types'].append((atom_types.attrib.get('name', None), this_atom_types_group))
+        parsed['atom_classes'].update(atom_type.atomclass for atom_type in this_atom_types_group.values())
+
+    for tag, child_tag, key in _CONNECTION_TAGS:
+        for connection_types in ff_tree.findall(tag):
+            parsed[key].append((
+                connection_types.attrib.get('name', None),
+                parse_ff_connection_types(connection_types, None, child_tag=child_tag)
+            ))
+
+    return parsed
+
+
+class _LazyPotential(object):
+    """Parse a single potential from its XML element on first call"""
+    def __init__(self, parse, element):
+        self._parse = parse
+        self._element = element
+        self._potential = None
+
+    def __call__(self):
+        if self._potential is None:
+            self._potential = self._parse(self._element)
+            self._element = None
+        return self._potential
+
+
+class LazyPotentialDict(MutableMapping):
+    """A dictionary of potentials which are parsed from XML on first lookup
+
+    The keys are read from the XML index up front, so that membership tests,
+    iteration over the keys and `len` never parse any potentials. Each value
+    is created the first time it is looked up and is shared with every other
+    `LazyPotentialDict` (e.g. `ForceField.potential_groups`) holding that key.
+    """
+    def __init__(self, lazy_potentials=None):
+        self._data = dict(lazy_potentials or {})
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, _LazyPotential):
+            return value()
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return '<LazyPotentialDict {:d} potentials, {:d} parsed, id: {}>'.format(
+            len(self), self.n_parsed, id(self))
+
+    @property
+    def n_parsed(self):
+        """The number of potentials that have been parsed"""
+        return sum(1 for value in self._data.values()
+                   if not isinstance(value, _LazyPotential) or value._potential is not None)
+
+    def update(self, other=(), **kwargs):
+        if isinstance(other, LazyPotentialDict):
+            self._data.update(other._data)
+            other = ()
+        super(LazyPotentialDict, self).update(other, **kwargs)
+
+
+def index_ff_file(loc_or_etree):
+    """Validate a single forcefield XML file and index its potentials without parsing them
+
+    This is the lazy counterpart of `parse_ff_file`, with the same return
+    format, except that every potentials dictionary is a `LazyPotentialDict`.
+    Only the names (or member types) of the potentials are read here, units
+    and parameters of a group are parsed when one of its potentials is first
+    looked up.
+
+    Parameters
+    ----------
+    loc_or_etree : str or etree._ElementTree
+        The forcefield XML location or XML Element Tree
+
+    Returns
+    -------
+    dict
+        The name, version and metadata of the forcefield along with lists of
+        (group_name, LazyPotentialDict) tuples for the atom, bond, angle,
+        dihedral and improper types, in the order they appear in the file
+    """
+    ff_tree = loc_or_etree
+    if not isinstance(loc_or_etree, etree._ElementTree):
+        ff_tree = etree.parse(loc_or_etree)
+    validate(ff_tree)
+
+    parsed = _parse_ff_header(ff_tree)
+    ff_meta_map = parsed['meta']
+
+    def _group_param_units(group_el):
+        """Parse the ParametersUnitDef of a group once, when first needed"""
+        param_unit_dicts = []
+
+        def _get():
+            if not param_unit_dicts:
+                param_unit_dicts.append(_parse_param_units(group_el))
+            return param_unit_dicts[0]
+        return _get
+
+    for atom_types in ff_tree.findall('AtomTypes'):
+        param_units = _group_param_units(atom_types)
+
+        def _parse(element, expression=atom_types.attrib.get('expression', None),
+                   param_units=param_units):
+            return _parse_atom_type(element, expression, param_units(), ff_meta_map['Units'])
+
+        lazy_potentials = {}
+        for atom_type in atom_types.getiterator('AtomType'):
+            name = atom_type.attrib.get('name', 'AtomType')
+            _check_valid_string(name)
+            lazy_potentials[name] = _LazyPotential(_parse, atom_type)
+            parsed['atom_classes'].add(atom_type.attrib.get('atomclass', ''))
+        parsed['atom_types'].append((atom_types.attrib.get('name', None),
+                                     LazyPotentialDict(lazy_potentials)))
+
+    for tag, child_tag, key in _CONNECTION_TAGS:
+        for connection_types in ff_tree.findall(tag):
+            param_units = _group_param_units(connection_types)
+
+            def _parse(element, expression=connection_types.attrib.get('expression', None),
+                       param_units=param_units, child_tag=child_tag):
+                return _parse_connection_type(element, expression, param_units(), child_tag, None)
+
+            lazy_potentials = {}
+            for connection_type in connection_types.getiterator(child_tag):
+                this_conn_type_key = DICT_KEY_SEPARATOR.join(_get_member_types(connection_type))
+                lazy_potentials[this_conn_type_key] = _LazyPotential(_parse, connection_type)
+            parsed[key].append((connection_types.attrib.get('name', None),
+                                LazyPotentialDict(lazy_potentials)))
+
+    return parsed
+
+
 def _parse_unit_string(string):
     """
     Converts a string with unyt units and physical constants to a taggable unit value
@@ -284,4 +539,7 @@ def _parse_unit_string(string):
             sympy_subs.append((symbol.name, float(symbol_unit.in_base().value)))
             unyt_subs.append((symbol.name, symbol_unit.units.get_base_equivalent().expr))
 
-    return u.Unit(float(expr.subs(sympy_subs)) * u.Unit(str(expr.subs(unyt_subs))))
+    unit = u.Unit(float(expr.subs(sympy_subs)) * u.Unit(str(expr.subs(unyt_subs))))
+    # Re-parse the unit from its string form so that quantities carrying it
+    # survive pickling (which serializes units as strings) unchanged
+    return u.Unit(str(unit))
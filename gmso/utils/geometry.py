@@ -6,16 +6,31 @@ def coord_shift(xyz, box):
     if necessary. For example, if coordinates are 0, L, then a shift
     is applied to move coordinates to -L/2, L/2. If a shift is not
     necessary, the points are returned unmodified.
+
+    If `box` is a gmso.Box, the check and the shift (by half of each box
+    vector) are done in fractional coordinates, so that triclinic boxes
+    are supported, and the points are then wrapped into the box centered
+    on the origin.
     Parameters
     ----------
     xyz : unyt_array of points with shape N x 3
-    box : gmso.Box
+    box : gmso.Box or unyt_array of the box lengths
     Returns
     -------
     xyz : unyt_array of points with shape N x 3
     """
 
-    box_max = box.lengths/2.
+    if hasattr(box, 'to_fractional'):
+        fractional = box.to_fractional(xyz)
+        if np.greater(fractional, 0.5).any():
+            fractional -= 0.5
+        elif np.less(fractional, -0.5).any():
+            fractional += 0.5
+        fractional -= np.floor(fractional + 0.5)
+        return box._like(box.from_fractional(fractional), xyz)
+
+    lengths = box.lengths if hasattr(box, 'lengths') else box
+    box_max = lengths/2.
     box_min = -box_max
     # Shift all atoms
     if np.greater(xyz, box_max).any():
@@ -119,3 +119,10 @@ try:
     del unit
 except ImportError:
     has_simtk_unit = False
+
+try:
+    import scipy
+    has_scipy = True
+    del scipy
+except ImportError:
+    has_scipy = False
@@ -0,0 +1,150 @@
+"""Combining rules and pairwise nonbonded parameter tables"""
+import numpy as np
+import unyt as u
+
+from gmso.exceptions import GMSOError
+
+
+SIGMA_UNITS = u.nm
+EPSILON_UNITS = u.Unit('kJ/mol')
+
+
+def _lorentz(sigmas, epsilons):
+    """Lorentz-Berthelot mixing of per-type sigma and epsilon arrays"""
+    return (0.5 * (sigmas[:, np.newaxis] + sigmas[np.newaxis, :]),
+            np.sqrt(np.outer(epsilons, epsilons)))
+
+
+def _geometric(sigmas, epsilons):
+    """Geometric mixing of per-type sigma and epsilon arrays"""
+    return (np.sqrt(np.outer(sigmas, sigmas)),
+            np.sqrt(np.outer(epsilons, epsilons)))
+
+
+COMBINING_RULES = {
+    'lorentz': _lorentz,
+    'geometric': _geometric
+}
+
+
+class PairParameterTable(object):
+    """The sigma and epsilon of every pair of AtomTypes in a topology
+
+    The table holds two symmetric T x T unyt arrays, where T is the number of
+    AtomTypes, whose rows and columns follow the order of the AtomTypes. The
+    cross interactions are given by the combining rule, unless a pair is
+    explicitly overridden (NBFIX).
+
+    Parameters
+    ----------
+    atom_types : list of gmso.AtomType
+        The AtomTypes, each of which must have `sigma` and `epsilon` parameters
+    combining_rule : str, ['lorentz', 'geometric'], default='lorentz'
+        The combining rule for the cross interactions
+    overrides : dict, optional, default=None
+        A dictionary mapping pairs of AtomType names to a dictionary
+        with the `sigma` and `epsilon` of that pair. The override of a pair
+        of names applies to every pair of AtomTypes with those names
+
+    Attributes
+    ----------
+    atom_types : tuple of gmso.AtomType
+        The AtomTypes, in the order of the rows/columns of the table
+    sigma : unyt.unyt_array
+        The T x T matrix of sigma, in nm
+    epsilon : unyt.unyt_array
+        The T x T matrix of epsilon, in kJ/mol
+    overridden : np.ndarray
+        A T x T boolean mask of the pairs that are not given by the combining rule
+    """
+    def __init__(self, atom_types, combining_rule='lorentz', overrides=None):
+        if combining_rule not in COMBINING_RULES:
+            raise GMSOError('Combining rule must be `lorentz` or `geometric`')
+        self.atom_types = tuple(atom_types)
+        self.combining_rule = combining_rule
+        # Distinct AtomTypes may share a name, so the rows are looked up by
+        # instance, then by content, and only then by name
+        self._index = {id(atom_type): idx for idx, atom_type in enumerate(self.atom_types)}
+        self._content_index = {}
+        self._name_index = {}
+        for idx, atom_type in enumerate(self.atom_types):
+            self._content_index.setdefault(atom_type, idx)
+            self._name_index.setdefault(atom_type.name, []).append(idx)
+
+        sigmas = np.empty(len(self.atom_types))
+        epsilons = np.empty(len(self.atom_types))
+        for idx, atom_type in enumerate(self.atom_types):
+            try:
+                sigmas[idx] = atom_type.parameters['sigma'].to_value(SIGMA_UNITS)
+                epsilons[idx] = atom_type.parameters['epsilon'].to_value(EPSILON_UNITS)
+            except KeyError:
+                raise GMSOError(
+                    'AtomType {} does not have sigma and epsilon parameters, '
+                    'cannot build a table of pair parameters'.format(atom_type.name))
+
+        sigma, epsilon = COMBINING_RULES[combining_rule](sigmas, epsilons)
+        overridden = np.zeros(sigma.shape, dtype=bool)
+
+        for (name1, name2), params in (overrides or {}).items():
+            if name1 not in self._name_index or name2 not in self._name_index:
+                continue
+            for i, j in ((self._name_index[name1], self._name_index[name2]),
+                         (self._name_index[name2], self._name_index[name1])):
+                pairs = np.ix_(i, j)
+                sigma[pairs] = params['sigma'].to_value(SIGMA_UNITS)
+                epsilon[pairs] = params['epsilon'].to_value(EPSILON_UNITS)
+                overridden[pairs] = True
+
+        self.sigma = u.unyt_array(sigma, SIGMA_UNITS)
+        self.epsilon = u.unyt_array(epsilon, EPSILON_UNITS)
+        self.overridden = overridden
+
+    def __len__(self):
+        return len(self.atom_types)
+
+    def __repr__(self):
+        return '<PairParameterTable {:d} AtomTypes, {}, {:d} overridden pairs, id: {}>'.format(
+            len(self), self.combining_rule, int(np.triu(self.overridden).sum()), id(self))
+
+    def index(self, atom_type):
+        """Return the row/column of an AtomType (or AtomType name) in the table
+
+        A name can only be looked up if a single AtomType of the table has it.
+        """
+        if not isinstance(atom_type, str):
+            if id(atom_type) in self._index:
+                return self._index[id(atom_type)]
+            if atom_type in self._content_index:
+                return self._content_index[atom_type]
+        name = atom_type if isinstance(atom_type, str) else atom_type.name
+        rows = self._name_index.get(name, [])
+        if len(rows) == 0:
+            raise GMSOError('AtomType {} is not in the table'.format(name))
+        if len(rows) > 1:
+            raise GMSOError('{} AtomTypes of the table are named {}, look up '
+                            'the AtomType itself instead'.format(len(rows), name))
+        return rows[0]
+
+    def get(self, atom_type1, atom_type2):
+        """Return the (sigma, epsilon) of a pair of AtomTypes"""
+        i, j = self.index(atom_type1), self.index(atom_type2)
+        return self.sigma[i, j], self.epsilon[i, j]
+
+    def pairs(self, overridden_only=False):
+        """Return the indices (i, j), with i <= j, of the unique pairs of the table
+
+        Parameters
+        ----------
+        overridden_only : bool, optional, default=False
+            If True, only return the pairs that are explicitly overridden
+
+        Returns
+        -------
+        tuple of np.ndarray
+            The row and column indices of the pairs, in row-major order
+        """
+        i, j = np.triu_indices(len(self))
+        if overridden_only:
+            mask = self.overridden[i, j]
+            i, j = i[mask], j[mask]
+        return i, j
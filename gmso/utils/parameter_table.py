@@ -0,0 +1,214 @@
+"""Vectorized parameters of potentials sharing an expression"""
+import warnings
+from collections.abc import Mapping
+
+import numpy as np
+import unyt as u
+
+from gmso.lib.potential_templates import PotentialTemplateLibrary
+from gmso.utils.conversions import _dihedral_form, _DIHEDRAL_PARAMETER_CONVERSIONS
+from gmso.utils.units import UnitSystem
+from gmso.exceptions import GMSOError
+
+
+def _stack_quantities(values):
+    """Stack a list of unyt quantities (or lists thereof) into a single unyt array"""
+    first = values[0][0] if isinstance(values[0], list) else values[0]
+    units = first.units
+
+    def _value(quantity):
+        # Identity checks first, comparing units is comparatively slow
+        if quantity.units is units or quantity.units.expr is units.expr or quantity.units == units:
+            return quantity.value
+        return quantity.to_value(units)
+
+    if isinstance(values[0], list):
+        if len(set(len(value) for value in values)) != 1:
+            raise GMSOError('Cannot tabulate list parameters of different lengths')
+        data = [[_value(quantity) for quantity in value] for value in values]
+    else:
+        data = [_value(quantity) for quantity in values]
+    return u.unyt_array(np.array(data, dtype=float), units)
+
+
+class ParameterTable(object):
+    """The parameters of a group of potentials sharing an expression as unyt arrays
+
+    A ParameterTable holds one unyt array per parameter, whose i-th entry is
+    the value of that parameter for the i-th potential. This allows converting
+    the units or the functional form of thousands of potentials with a handful
+    of array operations, and writing the results back to the potentials.
+
+    Parameters
+    ----------
+    potentials : iterable of gmso.ParametricPotential
+        The potentials, all with the same expression, independent variables
+        and parameter names
+
+    Attributes
+    ----------
+    potentials : tuple of gmso.ParametricPotential
+        The potentials of the table, in order
+    expression : sympy.Expr
+        The expression of the parameters of the table
+    independent_variables : set of sympy.Symbol
+        The independent variables of the expression
+    parameters : dict
+        The name of each parameter and its values as a unyt array. List
+        valued parameters are stored as 2D arrays
+    """
+    def __init__(self, potentials):
+        self.potentials = tuple(potentials)
+        if len(self.potentials) == 0:
+            raise GMSOError('Cannot create a ParameterTable without potentials')
+
+        ref = self.potentials[0]
+        for potential in self.potentials[1:]:
+            if (potential.expression != ref.expression
+                    or potential.independent_variables != ref.independent_variables
+                    or potential.parameters.keys() != ref.parameters.keys()):
+                raise GMSOError(
+                    'All the potentials of a ParameterTable should have the same expression, '
+                    'independent variables and parameters. {} and {} differ'.format(ref, potential)
+                )
+
+        self.expression = ref.expression
+        self.independent_variables = ref.independent_variables
+        self.parameters = {
+            name: _stack_quantities([potential.parameters[name] for potential in self.potentials])
+            for name in ref.parameters
+        }
+
+    @classmethod
+    def _from_arrays(cls, potentials, expression, independent_variables, parameters):
+        """Create a table of potentials from already tabulated parameters"""
+        table = cls.__new__(cls)
+        table.potentials = potentials
+        table.expression = expression
+        table.independent_variables = independent_variables
+        table.parameters = parameters
+        return table
+
+    def __len__(self):
+        return len(self.potentials)
+
+    def __getitem__(self, item):
+        return self.parameters[item]
+
+    def __repr__(self):
+        return '<ParameterTable {:d} potentials, expression: {}, id: {}>'.format(
+            len(self), self.expression, id(self))
+
+    def in_units(self, units):
+        """Return the parameters converted to the given units
+
+        Parameters
+        ----------
+        units : dict or gmso.utils.units.UnitSystem
+            A dictionary mapping parameter names to unyt.Unit objects
+            (or strings). Parameters which are not in the dictionary
+            are returned as is. If a UnitSystem, all the parameters
+            are converted to that system
+
+        Returns
+        -------
+        dict
+            The name of each parameter and its (converted) values as a unyt array
+        """
+        if isinstance(units, UnitSystem):
+            return {name: units.convert(values) for name, values in self.parameters.items()}
+        return {
+            name: values.in_units(units[name]) if name in units else values
+            for name, values in self.parameters.items()
+        }
+
+    def convert_to_units(self, units):
+        """Convert the parameters of the table to the given units, in place
+
+        Parameters
+        ----------
+        units : dict or gmso.utils.units.UnitSystem
+            A dictionary mapping parameter names to unyt.Unit objects (or strings),
+            or a UnitSystem to convert all the parameters to
+        """
+        self.parameters = self.in_units(units)
+
+    def convert_form(self, target_form):
+        """Convert the table to the functional form of a potential template
+
+        The conversion of all the potentials is done with array operations.
+        The potentials themselves are not modified until
+        `ParameterTable.update_potentials` is called on the returned table.
+
+        Parameters
+        ----------
+        target_form : str, ['OPLSTorsionPotential', 'RyckaertBellemansTorsionPotential']
+            The name of the potential template to convert to
+
+        Returns
+        -------
+        gmso.utils.parameter_table.ParameterTable
+            A table of the same potentials with the converted expression and parameters
+
+        See Also
+        --------
+        gmso.utils.conversions.convert_dihedral_type :
+            Convert a single dihedral type to the form of a potential template
+        """
+        source_form = _dihedral_form(self)
+        if source_form == target_form:
+            return self
+        if (source_form, target_form) not in _DIHEDRAL_PARAMETER_CONVERSIONS:
+            raise GMSOError(
+                'Cannot convert the table to {}, the supported conversions are {}'.format(
+                    target_form, list(_DIHEDRAL_PARAMETER_CONVERSIONS.keys())
+                )
+            )
+
+        template = PotentialTemplateLibrary()[target_form]
+        return self._from_arrays(self.potentials,
+                                 template.expression,
+                                 template.independent_variables,
+                                 _DIHEDRAL_PARAMETER_CONVERSIONS[(source_form, target_form)](self.parameters))
+
+    def update_potentials(self):
+        """Write the parameters (and expression) of the table back to its potentials"""
+        for idx, potential in enumerate(self.potentials):
+            parameters = {
+                name: list(values[idx]) if values.ndim > 1 else values[idx]
+                for name, values in self.parameters.items()
+            }
+            if potential.expression == self.expression:
+                potential.set_expression(parameters=parameters)
+            else:
+                # The parameters of the previous expression are merged in
+                # and then dropped, which would warn for every potential
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    potential.set_expression(expression=self.expression,
+                                             parameters=parameters,
+                                             independent_variables=self.independent_variables)
+
+
+def parameter_tables_by_expression(potentials):
+    """Group potentials by their expression and tabulate the parameters of each group
+
+    Parameters
+    ----------
+    potentials : iterable or dict of gmso.ParametricPotential
+        The potentials (or a dictionary of them, e.g. `ForceField.bond_types`) to tabulate
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each expression (as a string) to the ParameterTable
+        of the potentials with that expression
+    """
+    if isinstance(potentials, Mapping):
+        potentials = potentials.values()
+
+    # Group by the sympy expression itself, printing it only once per group
+    groups = {}
+    for potential in potentials:
+        groups.setdefault(potential.expression, []).append(potential)
+    return {str(expression): ParameterTable(group) for expression, group in groups.items()}
@@ -0,0 +1,279 @@
+"""Unit systems of simulation engines and cached conversions to them"""
+import numpy as np
+import unyt as u
+from unyt import dimensions as dims
+
+from gmso.utils.misc import conversion_factor
+from gmso.exceptions import GMSOError
+
+__all__ = [
+    'UnitSystem',
+    'LAMMPS_REAL',
+    'LAMMPS_METAL',
+    'GROMACS'
+]
+
+
+class UnitSystem(object):
+    """The units in which a simulation engine expects its input
+
+    A UnitSystem defines one unit for each of length, mass, time, energy,
+    charge, temperature and angle. Any other quantity is expressed as a
+    product of powers of these, e.g. a harmonic bond constant is an
+    energy per squared length. Since most engines do not define their energy
+    unit from their mass, length and time units (e.g. kcal/mol, g/mol and fs
+    for LAMMPS real units), a quantity whose dimensions contain an energy is
+    expressed in the energy unit of the system rather than in its mass,
+    length and time units. Angles are expressed in the angle unit of the
+    system, while angle stiffnesses (per squared angle) are always expressed
+    per squared radian, as every supported engine does.
+
+    The conversion factor from a unit to a system is computed once per
+    dimensions and cached by the system, so converting an array is a single
+    multiplication.
+
+    Parameters
+    ----------
+    name : str
+        The name of the unit system
+    length, mass, time, energy, charge, temperature, angle : unyt.Unit or unyt.unyt_quantity
+        The unit of each base quantity. If `reduced` is True, these are the
+        reference quantities of the system. The charge defaults to the
+        elementary charge, the temperature to K and the angle to degrees
+    reduced : bool, optional, default=False
+        If True, the quantities converted to this system are dimensionless
+        multiples of the reference quantities
+
+    See Also
+    --------
+    gmso.utils.units.UnitSystem.reduced :
+        Create a system of reduced units from a reference distance, mass and energy
+    gmso.Topology.to_unit_system :
+        Convert the positions, charges, masses and parameters of a topology to a UnitSystem
+    """
+    def __init__(self,
+                 name,
+                 length,
+                 mass,
+                 time,
+                 energy,
+                 charge=u.elementary_charge,
+                 temperature=u.K,
+                 angle=u.degree,
+                 reduced=False):
+        self.name = name
+        self.reduced = reduced
+        self.base_quantities = {
+            'length': _as_quantity(length, dims.length, reduced),
+            'mass': _as_quantity(mass, dims.mass, reduced),
+            'time': _as_quantity(time, dims.time, reduced),
+            'energy': _as_quantity(energy, dims.energy, reduced),
+            'charge': _as_quantity(charge, dims.charge_mks, reduced),
+            'temperature': _as_quantity(temperature, dims.temperature, reduced),
+            'angle': _as_quantity(angle, dims.angle, reduced)
+        }
+        # The conversion targets by dimensions and the conversion factors by units
+        self._targets = {}
+        self._factors = {}
+
+    @classmethod
+    def reduced(cls,
+                name='reduced',
+                ref_distance=1.0 * u.nm,
+                ref_mass=1.0 * u.Unit('g/mol'),
+                ref_energy=1.0 * u.Unit('kcal/mol')):
+        """Create a system of reduced units, e.g. LAMMPS lj units or HOOMD
+
+        The time, charge and temperature units follow from the reference
+        distance, mass and energy, and angles are in radians.
+
+        Parameters
+        ----------
+        name : str, optional, default='reduced'
+            The name of the unit system
+        ref_distance : unyt.unyt_quantity, optional, default=1.0*u.nm
+            Reference distance for conversion to reduced units
+        ref_mass : unyt.unyt_quantity, optional, default=1.0*u.Unit('g/mol')
+            Reference mass for conversion to reduced units
+        ref_energy : unyt.unyt_quantity, optional, default=1.0*u.Unit('kcal/mol')
+            Reference energy for conversion to reduced units
+
+        Returns
+        -------
+        gmso.utils.units.UnitSystem
+            The reduced unit system
+        """
+        ref_distance = _as_quantity(ref_distance, dims.length, True)
+        ref_mass = _as_quantity(ref_mass, dims.mass, True)
+        ref_energy = _as_quantity(ref_energy, dims.energy, True)
+        return cls(name,
+                   length=ref_distance,
+                   mass=ref_mass,
+                   time=(ref_distance * (ref_mass / ref_energy) ** 0.5).to('ps'),
+                   energy=ref_energy,
+                   charge=((4.0 * np.pi * u.physical_constants.eps_0 * ref_distance * ref_energy) ** 0.5).to('C'),
+                   temperature=(ref_energy / u.physical_constants.kb).to('K'),
+                   angle=u.radian,
+                   reduced=True)
+
+    def __repr__(self):
+        return '<UnitSystem {}, {}, id: {}>'.format(
+            self.name,
+            ', '.join('{}: {}'.format(name, quantity) for name, quantity in self.base_quantities.items()),
+            id(self))
+
+    def units_for(self, units):
+        """Return the units in this system of quantities with the given units
+
+        Parameters
+        ----------
+        units : unyt.Unit or str
+            The units of the quantities
+
+        Returns
+        -------
+        unyt.Unit
+            The units of the system, dimensionless for a reduced system
+        """
+        return self._conversion_target(u.Unit(units).dimensions)[1]
+
+    def conversion_factor(self, units):
+        """Return the factor converting values with the given units to this system
+
+        Parameters
+        ----------
+        units : unyt.Unit or str
+            The units of the values to convert
+
+        Returns
+        -------
+        float
+            The conversion factor
+        """
+        return self._conversion_factor(u.Unit(units))
+
+    def convert(self, quantity):
+        """Convert a unyt quantity or array to this system
+
+        Parameters
+        ----------
+        quantity : unyt.unyt_array or unyt.unyt_quantity
+            The quantity to convert
+
+        Returns
+        -------
+        unyt.unyt_array or unyt.unyt_quantity
+            The converted quantity, dimensionless for a reduced system
+        """
+        factor = self._conversion_factor(quantity.units)
+        return type(quantity)(quantity.value * factor, self.units_for(quantity.units))
+
+    def in_system(self, quantity):
+        """Return the values of a unyt quantity or array in this system, as floats
+
+        Parameters
+        ----------
+        quantity : unyt.unyt_array or unyt.unyt_quantity
+            The quantity to convert
+
+        Returns
+        -------
+        float or np.ndarray
+            The converted values
+        """
+        return quantity.value * self._conversion_factor(quantity.units)
+
+    def _conversion_target(self, dimensions):
+        """Return the SI value and the units of the unit of this system with the given dimensions"""
+        if dimensions not in self._targets:
+            self._targets[dimensions] = _conversion_target(self, dimensions)
+        return self._targets[dimensions]
+
+    def _conversion_factor(self, units):
+        """Return the factor converting values in `units` to this system"""
+        if units not in self._factors:
+            target_value, _ = self._conversion_target(units.dimensions)
+            self._factors[units] = conversion_factor(units) / target_value
+        return self._factors[units]
+
+
+def _as_quantity(unit_or_quantity, dimensions, reduced):
+    """Return a unit or quantity with the given dimensions as a unyt_quantity
+
+    Unless reduced, the magnitude of a quantity (e.g. `u.elementary_charge`)
+    is folded into a unit, so that converted quantities carry proper units.
+    """
+    if reduced and isinstance(unit_or_quantity, u.unyt_array):
+        quantity = unit_or_quantity
+    else:
+        quantity = 1.0 * u.Unit(unit_or_quantity)
+    if quantity.units.dimensions != dimensions:
+        raise GMSOError('{} does not have the dimensions {}'.format(quantity, dimensions))
+    return quantity
+
+
+def _conversion_target(unit_system, dimensions):
+    """Return the SI value and the units of the unit of a system with the given dimensions"""
+    powers = {dim: 0 for dim in dims.base_dimensions}
+    if dimensions != 1:
+        for dim, power in dimensions.as_powers_dict().items():
+            power = float(power)
+            powers[dim] = int(power) if power.is_integer() else power
+    if any(powers[dim] != 0 for dim in (dims.luminous_intensity, dims.logarithmic)):
+        raise GMSOError('Cannot convert quantities with dimensions {} '
+                        'to a UnitSystem'.format(dimensions))
+
+    charge_power = powers[dims.current_mks]
+    time_power = powers[dims.time] - charge_power
+    mass_power = powers[dims.mass]
+    length_power = powers[dims.length]
+
+    # An energy contributes one mass and minus two time dimensions, whatever
+    # its units. Only factor out whole energies that fully account for the time
+    energy_power = -time_power / 2
+    if (energy_power != 0 and float(energy_power).is_integer()
+            and mass_power * energy_power > 0 and abs(mass_power) >= abs(energy_power)):
+        energy_power = int(energy_power)
+        mass_power -= energy_power
+        length_power -= 2 * energy_power
+        time_power += 2 * energy_power
+    else:
+        energy_power = 0
+
+    base = unit_system.base_quantities
+    angle = base['angle'] if powers[dims.angle] > 0 else 1.0 * u.radian
+    target_value = 1.0
+    target_units = None
+    for quantity, power in ((base['energy'], energy_power),
+                            (base['charge'], charge_power),
+                            (base['mass'], mass_power),
+                            (base['length'], length_power),
+                            (base['time'], time_power),
+                            (base['temperature'], powers[dims.temperature]),
+                            (angle, powers[dims.angle])):
+        if power != 0:
+            target_value *= (float(quantity.value) * conversion_factor(quantity.units)) ** power
+            units = quantity.units ** power
+            target_units = units if target_units is None else target_units * units
+    if unit_system.reduced or target_units is None:
+        target_units = u.dimensionless
+    return target_value, target_units
+
+
+LAMMPS_REAL = UnitSystem('lammps_real',
+                         length=u.angstrom,
+                         mass=u.Unit('g/mol'),
+                         time=u.fs,
+                         energy=u.Unit('kcal/mol'))
+
+LAMMPS_METAL = UnitSystem('lammps_metal',
+                          length=u.angstrom,
+                          mass=u.Unit('g/mol'),
+                          time=u.ps,
+                          energy=u.eV)
+
+GROMACS = UnitSystem('gromacs',
+                     length=u.nm,
+                     mass=u.Unit('amu'),
+                     time=u.ps,
+                     energy=u.Unit('kJ/mol'))